@@ -38,6 +38,7 @@ import {
   analyzeFrameForReframe,
   generateNarrationScript,
 } from "./claude-visual-fx.js";
+import { providerFetch } from "../shared/transport.js";
 
 /**
  * Motion graphic generation options
@@ -242,7 +243,7 @@ Or if clarification needed:
   "clarification": "Which clip do you want to trim?"
 }`;
 
-      const response = await fetch(`${this.baseUrl}/messages`, {
+      const response = await providerFetch(`${this.baseUrl}/messages`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -323,7 +324,7 @@ Respond with JSON array:
 ]`;
 
     try {
-      const response = await fetch(`${this.baseUrl}/messages`, {
+      const response = await providerFetch(`${this.baseUrl}/messages`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
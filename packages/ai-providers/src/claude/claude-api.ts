@@ -2,6 +2,8 @@
  * Shared Claude API request helpers and types for split helper modules.
  */
 
+import { providerFetch } from "../shared/transport.js";
+
 /** Parameters needed to make a Claude Messages API call */
 export interface ClaudeApiParams {
   apiKey: string;
@@ -27,7 +29,7 @@ export async function callClaude(
     temperature?: number;
   }
 ): Promise<string> {
-  const response = await fetch(`${params.baseUrl}/messages`, {
+  const response = await providerFetch(`${params.baseUrl}/messages`, {
     method: "POST",
     headers: {
       "Content-Type": "application/json",
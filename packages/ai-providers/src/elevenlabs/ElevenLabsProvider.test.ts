@@ -85,3 +85,33 @@ describe("ElevenLabsProvider.textToSpeech 429 retry", () => {
     expect(fetchMock).toHaveBeenCalledTimes(1);
   });
 });
+
+describe("ElevenLabsProvider.textToSpeechWithTimestamps", () => {
+  it("decodes the audio and maps the character alignment", async () => {
+    const fetchMock = vi.fn().mockResolvedValue({
+      ok: true,
+      status: 200,
+      json: async () => ({
+        audio_base64: Buffer.from([1, 2, 3]).toString("base64"),
+        alignment: {
+          characters: ["H", "i"],
+          character_start_times_seconds: [0, 0.1],
+          character_end_times_seconds: [0.1, 0.2],
+        },
+      }),
+    } as unknown as Response);
+    vi.stubGlobal("fetch", fetchMock);
+    const provider = new ElevenLabsProvider();
+    await provider.initialize({ apiKey: "test-key" });
+
+    const result = await provider.textToSpeechWithTimestamps("Hi", { voiceId: "rachel" });
+    expect(result.success).toBe(true);
+    expect([...(result.audioBuffer ?? [])]).toEqual([1, 2, 3]);
+    expect(result.alignment).toEqual({
+      characters: ["H", "i"],
+      startTimes: [0, 0.1],
+      endTimes: [0.1, 0.2],
+    });
+    expect(String(fetchMock.mock.calls[0][0])).toMatch(/\/with-timestamps$/);
+  });
+});
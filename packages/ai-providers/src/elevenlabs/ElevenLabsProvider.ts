@@ -3,6 +3,7 @@ import type {
   AICapability,
   ProviderConfig,
 } from "../interface/types.js";
+import { providerFetch } from "../shared/transport.js";
 
 /**
  * Voice clone options
@@ -127,6 +128,17 @@ export interface TTSResult {
   characterCount?: number;
 }
 
+/**
+ * TTS result with per-character timings (seconds from the start of the audio)
+ */
+export interface TTSTimestampResult extends TTSResult {
+  alignment?: {
+    characters: string[];
+    startTimes: number[];
+    endTimes: number[];
+  };
+}
+
 /**
  * Known ElevenLabs voices with their IDs
  * These are the default voices available in ElevenLabs
@@ -194,7 +206,7 @@ export function resolveVoiceId(input: string | undefined): string {
   );
 }
 
-/** One retry absorbs transient concurrent-limit overlap; see textToSpeech. */
+/** One retry absorbs transient concurrent-limit overlap; see postSpeech. */
 const TTS_429_MAX_RETRIES = 1;
 const TTS_429_RETRY_DELAY_MS = 2000;
 
@@ -232,7 +244,7 @@ export class ElevenLabsProvider implements AIProvider {
     }
 
     try {
-      const response = await fetch(`${this.baseUrl}/voices`, {
+      const response = await providerFetch(`${this.baseUrl}/voices`, {
         headers: {
           "xi-api-key": this.apiKey,
         },
@@ -274,44 +286,12 @@ export class ElevenLabsProvider implements AIProvider {
         };
       }
 
-      const model = options.model || "eleven_v3";
-
-      // ElevenLabs subscriptions cap concurrent requests (5 on the standard
-      // tier) and reject overflow with 429 too_many_concurrent_requests.
-      // One short-backoff retry absorbs transient overlap with other
-      // in-flight requests without masking a genuinely saturated account.
-      let response: Response;
-      for (let attempt = 0; ; attempt++) {
-        response = await fetch(
-          `${this.baseUrl}/text-to-speech/${voiceId}`,
-          {
-            method: "POST",
-            headers: {
-              "xi-api-key": this.apiKey,
-              "Content-Type": "application/json",
-              Accept: "audio/mpeg",
-            },
-            body: JSON.stringify({
-              text,
-              model_id: model,
-              voice_settings: {
-                stability: options.stability ?? 0.5,
-                similarity_boost: options.similarityBoost ?? 0.75,
-                style: options.style ?? 0,
-                use_speaker_boost: true,
-              },
-              ...(options.speed !== undefined && { speed: options.speed }),
-            }),
-          }
-        );
-        if (response.status === 429 && attempt < TTS_429_MAX_RETRIES) {
-          await new Promise((resolveDelay) =>
-            setTimeout(resolveDelay, TTS_429_RETRY_DELAY_MS * (attempt + 1))
-          );
-          continue;
-        }
-        break;
-      }
+      const response = await this.postSpeech(
+        `/text-to-speech/${voiceId}`,
+        "audio/mpeg",
+        text,
+        options
+      );
 
       if (!response.ok) {
         const error = await response.text();
@@ -337,6 +317,114 @@ export class ElevenLabsProvider implements AIProvider {
     }
   }
 
+  /**
+   * Generate speech plus per-character timings. Lets callers synthesize
+   * several short lines in one request and cut the audio back apart.
+   */
+  async textToSpeechWithTimestamps(
+    text: string,
+    options: TTSOptions = {}
+  ): Promise<TTSTimestampResult> {
+    if (!this.apiKey) {
+      return {
+        success: false,
+        error: "ElevenLabs API key not configured",
+      };
+    }
+
+    try {
+      let voiceId: string;
+      try {
+        voiceId = resolveVoiceId(options.voiceId);
+      } catch (voiceError) {
+        return {
+          success: false,
+          error: voiceError instanceof Error ? voiceError.message : String(voiceError),
+        };
+      }
+
+      const response = await this.postSpeech(
+        `/text-to-speech/${voiceId}/with-timestamps`,
+        "application/json",
+        text,
+        options
+      );
+      if (!response.ok) {
+        const error = await response.text();
+        return {
+          success: false,
+          error: `TTS failed: ${error}`,
+        };
+      }
+
+      const data = (await response.json()) as {
+        audio_base64?: string;
+        alignment?: {
+          characters?: string[];
+          character_start_times_seconds?: number[];
+          character_end_times_seconds?: number[];
+        };
+      };
+      if (!data.audio_base64 || !data.alignment?.characters) {
+        return { success: false, error: "TTS failed: response had no audio or alignment" };
+      }
+      return {
+        success: true,
+        audioBuffer: Buffer.from(data.audio_base64, "base64"),
+        characterCount: text.length,
+        alignment: {
+          characters: data.alignment.characters,
+          startTimes: data.alignment.character_start_times_seconds ?? [],
+          endTimes: data.alignment.character_end_times_seconds ?? [],
+        },
+      };
+    } catch (error) {
+      return {
+        success: false,
+        error: error instanceof Error ? error.message : "Unknown error",
+      };
+    }
+  }
+
+  private async postSpeech(
+    path: string,
+    accept: string,
+    text: string,
+    options: TTSOptions
+  ): Promise<Response> {
+    const model = options.model || "eleven_v3";
+
+    // ElevenLabs subscriptions cap concurrent requests (5 on the standard
+    // tier) and reject overflow with 429 too_many_concurrent_requests.
+    // For direct callers, one short-backoff retry absorbs transient overlap
+    // with other in-flight requests without masking a saturated account.
+    // `vibe build` turns transport 429 retries off and retries in its own
+    // scheduler instead, which also shrinks the lane.
+    return providerFetch(
+      `${this.baseUrl}${path}`,
+      {
+        method: "POST",
+        headers: {
+          "xi-api-key": this.apiKey ?? "",
+          "Content-Type": "application/json",
+          Accept: accept,
+        },
+        body: JSON.stringify({
+          text,
+          model_id: model,
+          voice_settings: {
+            stability: options.stability ?? 0.5,
+            similarity_boost: options.similarityBoost ?? 0.75,
+            style: options.style ?? 0,
+            use_speaker_boost: true,
+          },
+          ...(options.speed !== undefined && { speed: options.speed }),
+        }),
+      },
+      { retries: TTS_429_MAX_RETRIES, baseDelayMs: TTS_429_RETRY_DELAY_MS }
+    );
+  }
+
   /**
    * Get user subscription info (quota)
    */
@@ -348,7 +436,7 @@ export class ElevenLabsProvider implements AIProvider {
     if (!this.apiKey) return null;
 
     try {
-      const response = await fetch(`${this.baseUrl}/user/subscription`, {
+      const response = await providerFetch(`${this.baseUrl}/user/subscription`, {
         headers: {
           "xi-api-key": this.apiKey,
         },
@@ -399,7 +487,7 @@ export class ElevenLabsProvider implements AIProvider {
         body.duration_seconds = duration;
       }
 
-      const response = await fetch(`${this.baseUrl}/sound-generation`, {
+      const response = await providerFetch(`${this.baseUrl}/sound-generation`, {
         method: "POST",
         headers: {
           "xi-api-key": this.apiKey,
@@ -466,7 +554,7 @@ export class ElevenLabsProvider implements AIProvider {
         body.seed = options.seed;
       }
 
-      const response = await fetch(`${this.baseUrl}/music`, {
+      const response = await providerFetch(`${this.baseUrl}/music`, {
         method: "POST",
         headers: {
           "xi-api-key": this.apiKey,
@@ -519,7 +607,7 @@ export class ElevenLabsProvider implements AIProvider {
         : audioData;
       formData.append("audio", audioBlob, "audio.mp3");
 
-      const response = await fetch(`${this.baseUrl}/audio-isolation`, {
+      const response = await providerFetch(`${this.baseUrl}/audio-isolation`, {
         method: "POST",
         headers: {
           "xi-api-key": this.apiKey,
@@ -602,7 +690,7 @@ export class ElevenLabsProvider implements AIProvider {
         formData.append("files", blob, `sample_${i + 1}.mp3`);
       }
 
-      const response = await fetch(`${this.baseUrl}/voices/add`, {
+      const response = await providerFetch(`${this.baseUrl}/voices/add`, {
         method: "POST",
         headers: {
           "xi-api-key": this.apiKey,
@@ -644,7 +732,7 @@ export class ElevenLabsProvider implements AIProvider {
     }
 
     try {
-      const response = await fetch(`${this.baseUrl}/voices/${voiceId}`, {
+      const response = await providerFetch(`${this.baseUrl}/voices/${voiceId}`, {
         method: "DELETE",
         headers: {
           "xi-api-key": this.apiKey,
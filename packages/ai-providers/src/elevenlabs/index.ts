@@ -6,6 +6,7 @@ export {
   type Voice,
   type TTSOptions,
   type TTSResult,
+  type TTSTimestampResult,
   type MusicOptions,
   type MusicResult,
   type SoundEffectOptions,
@@ -19,6 +19,7 @@ import type { GeminiTextModel } from "./gemini-models.js";
 import type { StoryboardSegment } from "../claude/ClaudeProvider.js";
 import { analyzeContent as analyzeContentImpl } from "./gemini-storyboard.js";
 import { errorMessage, fetchJson, sleep } from "../shared/http.js";
+import { providerFetch } from "../shared/transport.js";
 
 /**
  * Gemini model types for image generation
@@ -633,7 +634,7 @@ export class GeminiProvider implements AIProvider {
         payload.tools = [{ googleSearch: {} }];
       }
 
-      const response = await fetch(
+      const response = await providerFetch(
         `${this.baseUrl}/models/${modelId}:generateContent?key=${this.apiKey}`,
         {
           method: "POST",
@@ -793,7 +794,7 @@ export class GeminiProvider implements AIProvider {
         generationConfig,
       };
 
-      const response = await fetch(
+      const response = await providerFetch(
         `${this.baseUrl}/models/${modelId}:generateContent?key=${this.apiKey}`,
         {
           method: "POST",
@@ -968,7 +969,7 @@ export class GeminiProvider implements AIProvider {
         generationConfig,
       };
 
-      const response = await fetch(
+      const response = await providerFetch(
         `${this.baseUrl}/models/${modelId}:generateContent?key=${this.apiKey}`,
         {
           method: "POST",
@@ -1082,7 +1083,7 @@ export class GeminiProvider implements AIProvider {
         generationConfig,
       };
 
-      const response = await fetch(
+      const response = await providerFetch(
         `${this.baseUrl}/models/${modelId}:generateContent?key=${this.apiKey}`,
         {
           method: "POST",
@@ -1182,7 +1183,7 @@ Example response:
 
 Respond with ONLY the JSON array, no other text.`;
 
-      const response = await fetch(
+      const response = await providerFetch(
         `${this.baseUrl}/models/${GEMINI_DEFAULT_TEXT_MODEL}:generateContent?key=${this.apiKey}`,
         {
           method: "POST",
@@ -5,6 +5,7 @@
  */
 
 import { GEMINI_DEFAULT_TEXT_MODEL, resolveGeminiTextModel } from "./gemini-models.js";
+import { providerFetch } from "../shared/transport.js";
 
 // ---------------------------------------------------------------------------
 // Types
@@ -285,7 +286,7 @@ UNIVERSAL RULES:
 - whiteSpace: "nowrap" on all text`;
 
   try {
-    const response = await fetch(
+    const response = await providerFetch(
       `${api.baseUrl}/models/${modelId}:generateContent?key=${api.apiKey}`,
       {
         method: "POST",
@@ -404,7 +405,7 @@ Respond with ONLY valid JSON (no markdown):
 }`;
 
   try {
-    const response = await fetch(
+    const response = await providerFetch(
       `${api.baseUrl}/models/${modelId}:generateContent?key=${api.apiKey}`,
       {
         method: "POST",
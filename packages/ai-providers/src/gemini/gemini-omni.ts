@@ -20,6 +20,7 @@
 
 import type { GenerateOptions, VideoResult } from "../interface/types.js";
 import type { ProviderConfig } from "../interface/index.js";
+import { providerFetch } from "../shared/transport.js";
 
 const OMNI_MODEL = "gemini-omni-flash-preview";
 const INTERACTIONS_URL = "https://generativelanguage.googleapis.com/v1beta/interactions";
@@ -96,7 +97,7 @@ export class OmniProvider {
     };
 
     try {
-      const res = await fetch(INTERACTIONS_URL, {
+      const res = await providerFetch(INTERACTIONS_URL, {
         method: "POST",
         headers: { "Content-Type": "application/json", "x-goog-api-key": this.apiKey },
         body: JSON.stringify(body),
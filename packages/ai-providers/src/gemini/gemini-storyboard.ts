@@ -8,6 +8,7 @@
 import type { StoryboardSegment } from "../claude/ClaudeProvider.js";
 import { buildStoryboardSystemPrompt, buildStoryboardUserMessage } from "../storyboard-prompt.js";
 import { GEMINI_DEFAULT_TEXT_MODEL } from "./gemini-models.js";
+import { providerFetch } from "../shared/transport.js";
 
 /** Parameters for Gemini API calls */
 export interface GeminiApiParams {
@@ -48,7 +49,7 @@ export async function analyzeContent(
       },
     };
 
-    const response = await fetch(
+    const response = await providerFetch(
       `${api.baseUrl}/models/${GEMINI_DEFAULT_TEXT_MODEL}:generateContent?key=${api.apiKey}`,
       {
         method: "POST",
@@ -6,6 +6,7 @@ import type {
   VideoResult,
 } from "../interface/types.js";
 import type { ImageResult } from "../openai-image/OpenAIImageProvider.js";
+import { providerFetch } from "../shared/transport.js";
 
 /**
  * Grok Imagine model versions
@@ -136,7 +137,7 @@ export class GrokProvider implements AIProvider {
         body.resolution = options.resolution;
       }
 
-      const response = await fetch(`${this.baseUrl}/images/generations`, {
+      const response = await providerFetch(`${this.baseUrl}/images/generations`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -222,7 +223,7 @@ export class GrokProvider implements AIProvider {
         body.aspect_ratio = options.aspectRatio;
       }
 
-      const response = await fetch(`${this.baseUrl}/images/edits`, {
+      const response = await providerFetch(`${this.baseUrl}/images/edits`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -304,7 +305,7 @@ export class GrokProvider implements AIProvider {
         body.image = { url: options.referenceImage as string };
       }
 
-      const response = await fetch(`${this.baseUrl}/videos/generations`, {
+      const response = await providerFetch(`${this.baseUrl}/videos/generations`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -350,7 +351,7 @@ export class GrokProvider implements AIProvider {
     }
 
     try {
-      const response = await fetch(`${this.baseUrl}/videos/${id}`, {
+      const response = await providerFetch(`${this.baseUrl}/videos/${id}`, {
         headers: {
           Authorization: `Bearer ${this.apiKey}`,
         },
@@ -426,7 +427,7 @@ export class GrokProvider implements AIProvider {
     if (!this.apiKey) return false;
 
     try {
-      const response = await fetch(`${this.baseUrl}/videos/${id}`, {
+      const response = await providerFetch(`${this.baseUrl}/videos/${id}`, {
         method: "DELETE",
         headers: {
           Authorization: `Bearer ${this.apiKey}`,
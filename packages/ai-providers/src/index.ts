@@ -13,6 +13,22 @@
 export * from "./interface/index.js";
 export { providerRegistry, getBestProviderForCapability } from "./interface/registry.js";
 
+// Shared HTTP transport (keep-alive pools, retries, per-host caps, metrics)
+export {
+  providerFetch,
+  configureTransport,
+  transportMetrics,
+  resetTransport,
+  withTransportOptions,
+  LATENCY_BUCKETS_MS,
+} from "./shared/transport.js";
+export type {
+  TransportConfig,
+  TransportRequestOptions,
+  TransportMetrics,
+  HostMetrics,
+} from "./shared/transport.js";
+
 // Plugin metadata registry — must be imported before any provider's index.ts
 // since `defineProvider` calls assert their referenced apiKey was registered.
 // `api-keys.ts` declares all 11 apiKeys + 1 virtual provider (openrouter).
@@ -58,7 +74,7 @@ export { ClaudeProvider, claudeProvider } from "./claude/index.js";
 export type { MotionOptions, MotionResult, RemotionComponent, StoryboardSegment } from "./claude/index.js";
 export { OllamaProvider, ollamaProvider } from "./ollama/index.js";
 export { ElevenLabsProvider, elevenLabsProvider, KNOWN_VOICES, resolveVoiceId } from "./elevenlabs/index.js";
-export type { Voice, TTSOptions, TTSResult, MusicOptions, MusicResult, SoundEffectOptions, SoundEffectResult, AudioIsolationResult, VoiceCloneOptions, VoiceCloneResult } from "./elevenlabs/index.js";
+export type { Voice, TTSOptions, TTSResult, TTSTimestampResult, MusicOptions, MusicResult, SoundEffectOptions, SoundEffectResult, AudioIsolationResult, VoiceCloneOptions, VoiceCloneResult } from "./elevenlabs/index.js";
 export {
   KokoroProvider,
   kokoroProvider,
@@ -66,8 +82,19 @@ export {
   KOKORO_MODEL_ID,
   loadKokoroFromWorkspace,
   loadBundledKokoroRuntime,
+  KokoroWorkerPool,
+  getKokoroWorkerPool,
+  defaultKokoroPoolSize,
+} from "./kokoro/index.js";
+export type {
+  KokoroTTSOptions,
+  KokoroTTSResult,
+  KokoroLoadEvent,
+  KokoroPcmChunk,
+  KokoroPoolSynthesisOptions,
+  KokoroWorkerPoolOptions,
+  KokoroWorkerPoolStats,
 } from "./kokoro/index.js";
-export type { KokoroTTSOptions, KokoroTTSResult, KokoroLoadEvent } from "./kokoro/index.js";
 export { OpenAIImageProvider, openaiImageProvider } from "./openai-image/index.js";
 export type { ImageOptions, ImageResult, ImageEditOptions, GPTImageModel } from "./openai-image/index.js";
 export { OpenAiTtsProvider, openaiTtsProvider, OPENAI_TTS_VOICES } from "./openai-tts/index.js";
@@ -6,6 +6,7 @@ import type {
   GenerateOptions,
   VideoResult,
 } from "../interface/types.js";
+import { providerFetch } from "../shared/transport.js";
 
 /**
  * Kling model versions (v2.5+)
@@ -240,7 +241,7 @@ export class KlingProvider implements AIProvider {
           };
         }
 
-        const response = await fetch(`${this.baseUrl}/videos/image2video`, {
+        const response = await providerFetch(`${this.baseUrl}/videos/image2video`, {
           method: "POST",
           headers: {
             "Content-Type": "application/json",
@@ -253,7 +254,7 @@ export class KlingProvider implements AIProvider {
       }
 
       // Text-to-video
-      const response = await fetch(`${this.baseUrl}/videos/text2video`, {
+      const response = await providerFetch(`${this.baseUrl}/videos/text2video`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -345,7 +346,7 @@ export class KlingProvider implements AIProvider {
     try {
       const token = this.generateToken();
 
-      const response = await fetch(`${this.baseUrl}/videos/${type}/${id}`, {
+      const response = await providerFetch(`${this.baseUrl}/videos/${type}/${id}`, {
         headers: {
           "Content-Type": "application/json",
           Authorization: `Bearer ${token}`,
@@ -469,7 +470,7 @@ export class KlingProvider implements AIProvider {
         body.negative_prompt = options.negativePrompt;
       }
 
-      const response = await fetch(`${this.baseUrl}/videos/video-extend`, {
+      const response = await providerFetch(`${this.baseUrl}/videos/video-extend`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -503,7 +504,7 @@ export class KlingProvider implements AIProvider {
     try {
       const token = this.generateToken();
 
-      const response = await fetch(`${this.baseUrl}/videos/video-extend/${id}`, {
+      const response = await providerFetch(`${this.baseUrl}/videos/video-extend/${id}`, {
         headers: {
           "Content-Type": "application/json",
           Authorization: `Bearer ${token}`,
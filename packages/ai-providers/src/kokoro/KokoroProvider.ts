@@ -72,11 +72,18 @@ export interface KokoroTTSResult {
  * so the provider stays unit-testable without pulling the full transformers.js
  * type graph into the dependency surface.
  */
-interface KokoroModel {
+export interface KokoroModel {
   generate(
     text: string,
     options: { voice?: string; speed?: number },
-  ): Promise<{ toWav(): ArrayBuffer }>;
+  ): Promise<KokoroAudio>;
+}
+
+/** transformers.js `RawAudio`: mono float32 samples plus a WAV encoder. */
+export interface KokoroAudio {
+  toWav(): ArrayBuffer;
+  audio?: Float32Array;
+  sampling_rate?: number;
 }
 
 interface KokoroLoadOptions {
@@ -273,7 +280,11 @@ export function mapKokoroImportError(err: unknown): Error {
   return err instanceof Error ? err : new Error(String(err));
 }
 
-function loadModel(progress?: (event: KokoroLoadEvent) => void): Promise<KokoroModel> {
+/**
+ * Load (or reuse) this thread's Kokoro model. One instance per thread: the
+ * main thread for {@link KokoroProvider}, each worker for `KokoroWorkerPool`.
+ */
+export function loadKokoroModel(progress?: (event: KokoroLoadEvent) => void): Promise<KokoroModel> {
   if (modelPromise) return modelPromise;
   modelPromise = (async () => {
     const runtime = await loadKokoroRuntime();
@@ -349,7 +360,7 @@ export class KokoroProvider implements AIProvider {
     }
 
     try {
-      const model = await loadModel(options.onProgress);
+      const model = await loadKokoroModel(options.onProgress);
       const audio = await model.generate(text, {
         voice: options.voice ?? KOKORO_DEFAULT_VOICE,
         speed: options.speed ?? 1,
@@ -0,0 +1,137 @@
+/**
+ * KokoroWorkerPool unit tests. Workers are in-process fakes that answer the
+ * pool's message protocol, so no thread or model is ever started.
+ */
+
+import { EventEmitter } from "node:events";
+import { describe, expect, it } from "vitest";
+import {
+  KokoroWorkerPool,
+  defaultKokoroPoolSize,
+  encodeWavFloat32,
+  type KokoroWorkerLike,
+  type KokoroWorkerRequest,
+  type KokoroWorkerResponse,
+} from "./KokoroWorkerPool.js";
+
+class FakeWorker extends EventEmitter implements KokoroWorkerLike {
+  readonly requests: KokoroWorkerRequest[] = [];
+  terminated = false;
+
+  postMessage(request: KokoroWorkerRequest): void {
+    this.requests.push(request);
+  }
+
+  reply(message: KokoroWorkerResponse): void {
+    this.emit("message", message);
+  }
+
+  ref(): void {}
+  unref(): void {}
+  async terminate(): Promise<number> {
+    this.terminated = true;
+    return 0;
+  }
+}
+
+function fakePool(size: number) {
+  const workers: FakeWorker[] = [];
+  const pool = new KokoroWorkerPool({
+    size,
+    createWorker: () => {
+      const worker = new FakeWorker();
+      workers.push(worker);
+      return worker;
+    },
+  });
+  return { pool, workers };
+}
+
+describe("KokoroWorkerPool", () => {
+  it("spreads cues across workers and queues the rest", async () => {
+    const { pool, workers } = fakePool(2);
+    const results = ["One.", "Two.", "Three."].map((cue) => pool.synthesize(cue));
+
+    expect(workers).toHaveLength(2);
+    expect(pool.stats()).toMatchObject({ workers: 2, queued: 1 });
+
+    const [first, second] = workers;
+    first.reply({ type: "chunk", id: 1, samples: new Float32Array([0.5]), sampleRate: 24_000 });
+    first.reply({ type: "done", id: 1 });
+    // The freed worker picks up the queued cue; no third worker is spawned.
+    expect(first.requests.map((request) => request.text)).toEqual(["One.", "Three."]);
+    second.reply({ type: "done", id: 2 });
+    first.reply({ type: "done", id: 3 });
+
+    const [one] = await Promise.all(results);
+    expect(one).toMatchObject({ success: true, characterCount: 4 });
+    expect(one.audioBuffer?.readFloatLE(44)).toBe(0.5);
+    expect(pool.stats()).toMatchObject({ workers: 2, warm: 2, completed: 3, queued: 0 });
+    await pool.close();
+    expect(workers.every((worker) => worker.terminated)).toBe(true);
+  });
+
+  it("streams PCM chunks and forwards load progress", async () => {
+    const { pool, workers } = fakePool(1);
+    const chunks: number[] = [];
+    const progress: string[] = [];
+    const result = pool.synthesize("Hello there. Bye.", {
+      voice: "am_michael",
+      onChunk: (chunk) => chunks.push(chunk.samples.length),
+      onProgress: (event) => progress.push(event.status),
+    });
+
+    const [worker] = workers;
+    expect(worker.requests[0]).toMatchObject({ text: "Hello there. Bye.", voice: "am_michael" });
+    worker.reply({ type: "progress", id: 1, event: { status: "download" } });
+    worker.reply({ type: "chunk", id: 1, samples: new Float32Array(3), sampleRate: 24_000 });
+    worker.reply({ type: "chunk", id: 1, samples: new Float32Array(2), sampleRate: 24_000 });
+    worker.reply({ type: "done", id: 1 });
+
+    expect((await result).audioBuffer?.length).toBe(44 + 5 * 4);
+    expect(chunks).toEqual([3, 2]);
+    expect(progress).toEqual(["download"]);
+    await pool.close();
+  });
+
+  it("fails the in-flight cue when a worker dies and replaces the worker", async () => {
+    const { pool, workers } = fakePool(1);
+    const first = pool.synthesize("One.");
+    const second = pool.synthesize("Two.");
+
+    workers[0].emit("error", new Error("onnxruntime crashed"));
+    expect(await first).toEqual({ success: false, error: "onnxruntime crashed" });
+
+    await new Promise((resolve) => setImmediate(resolve));
+    expect(workers).toHaveLength(2);
+    workers[1].reply({ type: "done", id: 2 });
+    expect((await second).success).toBe(true);
+    await pool.close();
+  });
+
+  it("rejects empty text without touching a worker", async () => {
+    const { pool, workers } = fakePool(1);
+    expect(await pool.synthesize("   ")).toEqual({ success: false, error: "Empty text" });
+    expect(workers).toHaveLength(0);
+  });
+});
+
+describe("defaultKokoroPoolSize", () => {
+  it("uses a quarter of the cores, between 1 and 4", () => {
+    expect(defaultKokoroPoolSize(2)).toBe(1);
+    expect(defaultKokoroPoolSize(8)).toBe(2);
+    expect(defaultKokoroPoolSize(64)).toBe(4);
+  });
+});
+
+describe("encodeWavFloat32", () => {
+  it("writes a mono IEEE-float header", () => {
+    const samples = new Float32Array([0.25, -0.25]);
+    const wav = encodeWavFloat32([{ samples, sampleRate: 24_000 }]);
+    expect(wav.toString("ascii", 0, 4)).toBe("RIFF");
+    expect(wav.readUInt16LE(20)).toBe(3);
+    expect(wav.readUInt32LE(24)).toBe(24_000);
+    expect(wav.readUInt32LE(40)).toBe(8);
+    expect(wav.readFloatLE(48)).toBe(-0.25);
+  });
+});
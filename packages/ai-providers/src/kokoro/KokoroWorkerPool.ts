@@ -0,0 +1,308 @@
+import { existsSync } from "node:fs";
+import { availableParallelism } from "node:os";
+import { fileURLToPath } from "node:url";
+import { Worker } from "node:worker_threads";
+
+import type { KokoroLoadEvent, KokoroTTSOptions, KokoroTTSResult } from "./KokoroProvider.js";
+
+/** Parent → worker: synthesize one cue. */
+export interface KokoroWorkerRequest {
+  id: number;
+  text: string;
+  voice?: string;
+  speed?: number;
+}
+
+/** Worker → parent. A job ends with exactly one `done` or `error`. */
+export type KokoroWorkerResponse =
+  | { type: "progress"; id: number; event: KokoroLoadEvent }
+  | { type: "chunk"; id: number; samples: Float32Array; sampleRate: number }
+  | { type: "wav"; id: number; wav: ArrayBuffer }
+  | { type: "done"; id: number }
+  | { type: "error"; id: number; error: string };
+
+/** A slice of mono float32 PCM, delivered as soon as the worker has it. */
+export interface KokoroPcmChunk {
+  samples: Float32Array;
+  sampleRate: number;
+}
+
+export interface KokoroPoolSynthesisOptions extends KokoroTTSOptions {
+  /** Called for every PCM chunk, in order, before the promise resolves. */
+  onChunk?: (chunk: KokoroPcmChunk) => void;
+}
+
+/** Minimal `Worker` surface the pool needs; tests pass a fake. */
+export interface KokoroWorkerLike {
+  postMessage(message: KokoroWorkerRequest): void;
+  on(event: "message", listener: (message: KokoroWorkerResponse) => void): unknown;
+  on(event: "error", listener: (error: Error) => void): unknown;
+  on(event: "exit", listener: (code: number) => void): unknown;
+  ref(): void;
+  unref(): void;
+  terminate(): Promise<number>;
+}
+
+export interface KokoroWorkerPoolOptions {
+  /** Worker count. Defaults to {@link defaultKokoroPoolSize}. */
+  size?: number;
+  /** Idle workers are terminated (and their model freed) after this long. */
+  idleMs?: number;
+  createWorker?: () => KokoroWorkerLike;
+}
+
+export interface KokoroWorkerPoolStats {
+  size: number;
+  /** Workers currently alive. */
+  workers: number;
+  /** Workers that have finished at least one cue (model loaded). */
+  warm: number;
+  queued: number;
+  completed: number;
+  failed: number;
+}
+
+const DEFAULT_IDLE_MS = 60_000;
+const MAX_DEFAULT_WORKERS = 4;
+
+/**
+ * Default pool size: a quarter of the cores, 1–4. onnxruntime already runs
+ * each inference on several intra-op threads, and every worker holds its own
+ * copy of the model (~300MB resident), so more workers stop paying off fast.
+ */
+export function defaultKokoroPoolSize(cpuCount = availableParallelism()): number {
+  return Math.max(1, Math.min(MAX_DEFAULT_WORKERS, Math.floor(cpuCount / 4)));
+}
+
+interface Job {
+  id: number;
+  request: KokoroWorkerRequest;
+  options: KokoroPoolSynthesisOptions;
+  chunks: KokoroPcmChunk[];
+  wav?: ArrayBuffer;
+  resolve: (result: KokoroTTSResult) => void;
+}
+
+interface Slot {
+  worker: KokoroWorkerLike;
+  job?: Job;
+  warm: boolean;
+  idleTimer?: ReturnType<typeof setTimeout>;
+}
+
+/**
+ * Kokoro synthesis on a pool of worker threads. Each worker loads the model
+ * once and keeps it while the pool is in use, so a build with many beats
+ * pays the model load once per worker instead of blocking the main thread
+ * for every cue. Workers are spawned on demand up to `size`, are unref'd
+ * while idle (an idle pool never keeps the process alive), and exit after
+ * `idleMs` without work.
+ *
+ * Results match {@link import("./KokoroProvider.js").KokoroProvider.textToSpeech}:
+ * a float32 WAV, or `{ success: false, error }`.
+ */
+export class KokoroWorkerPool {
+  private readonly size: number;
+  private readonly idleMs: number;
+  private readonly createWorker: () => KokoroWorkerLike;
+  private readonly slots: Slot[] = [];
+  private readonly queue: Job[] = [];
+  private nextId = 1;
+  private completed = 0;
+  private failed = 0;
+  private closed = false;
+
+  constructor(opts: KokoroWorkerPoolOptions = {}) {
+    this.size = Math.max(1, Math.floor(opts.size ?? defaultKokoroPoolSize()));
+    this.idleMs = opts.idleMs ?? DEFAULT_IDLE_MS;
+    this.createWorker = opts.createWorker ?? spawnKokoroWorker;
+  }
+
+  synthesize(text: string, options: KokoroPoolSynthesisOptions = {}): Promise<KokoroTTSResult> {
+    if (!text || !text.trim()) return Promise.resolve({ success: false, error: "Empty text" });
+    if (this.closed) return Promise.resolve({ success: false, error: "Kokoro pool is closed" });
+    return new Promise((resolve) => {
+      const id = this.nextId++;
+      this.queue.push({
+        id,
+        request: { id, text, voice: options.voice, speed: options.speed },
+        options,
+        chunks: [],
+        resolve,
+      });
+      this.pump();
+    });
+  }
+
+  stats(): KokoroWorkerPoolStats {
+    return {
+      size: this.size,
+      workers: this.slots.length,
+      warm: this.slots.filter((slot) => slot.warm).length,
+      queued: this.queue.length,
+      completed: this.completed,
+      failed: this.failed,
+    };
+  }
+
+  /** Terminate every worker. Queued and running cues fail. */
+  async close(): Promise<void> {
+    this.closed = true;
+    for (const job of this.queue.splice(0)) this.finish(job, "Kokoro pool is closed");
+    await Promise.all([...this.slots].map((slot) => this.retire(slot, "Kokoro pool is closed")));
+  }
+
+  private pump(): void {
+    while (this.queue.length > 0) {
+      let slot = this.slots.find((candidate) => !candidate.job);
+      if (!slot && this.slots.length < this.size) slot = this.spawn();
+      if (!slot) return;
+      const job = this.queue.shift() as Job;
+      if (slot.idleTimer) clearTimeout(slot.idleTimer);
+      slot.job = job;
+      slot.worker.ref();
+      slot.worker.postMessage(job.request);
+    }
+  }
+
+  private spawn(): Slot {
+    const slot: Slot = { worker: this.createWorker(), warm: false };
+    slot.worker.on("message", (message) => this.onMessage(slot, message));
+    slot.worker.on("error", (error) => void this.retire(slot, error.message));
+    slot.worker.on("exit", (code) => void this.retire(slot, `Kokoro worker exited (${code})`));
+    this.slots.push(slot);
+    return slot;
+  }
+
+  private onMessage(slot: Slot, message: KokoroWorkerResponse): void {
+    const job = slot.job;
+    if (!job || message.id !== job.id) return;
+    switch (message.type) {
+      case "progress":
+        job.options.onProgress?.(message.event);
+        return;
+      case "chunk": {
+        const chunk = { samples: message.samples, sampleRate: message.sampleRate };
+        job.chunks.push(chunk);
+        job.options.onChunk?.(chunk);
+        return;
+      }
+      case "wav":
+        job.wav = message.wav;
+        return;
+      case "done":
+        slot.warm = true;
+        this.release(slot);
+        this.finish(job);
+        return;
+      case "error":
+        this.release(slot);
+        this.finish(job, message.error);
+        return;
+    }
+  }
+
+  private release(slot: Slot): void {
+    slot.job = undefined;
+    slot.worker.unref();
+    if (this.queue.length > 0) {
+      this.pump();
+      return;
+    }
+    slot.idleTimer = setTimeout(() => void this.retire(slot), this.idleMs);
+    slot.idleTimer.unref?.();
+  }
+
+  /** Drop a worker from the pool, failing its in-flight cue if any. */
+  private async retire(slot: Slot, error?: string): Promise<void> {
+    const index = this.slots.indexOf(slot);
+    if (index === -1) return;
+    this.slots.splice(index, 1);
+    if (slot.idleTimer) clearTimeout(slot.idleTimer);
+    if (slot.job) this.finish(slot.job, error ?? "Kokoro worker stopped");
+    slot.job = undefined;
+    await slot.worker.terminate().catch(() => undefined);
+    // A crashed worker leaves room for a replacement.
+    if (!this.closed) this.pump();
+  }
+
+  private finish(job: Job, error?: string): void {
+    if (error !== undefined) {
+      this.failed += 1;
+      job.resolve({ success: false, error });
+      return;
+    }
+    this.completed += 1;
+    const audioBuffer = job.wav ? Buffer.from(job.wav) : encodeWavFloat32(job.chunks);
+    job.resolve({ success: true, audioBuffer, characterCount: job.request.text.length });
+  }
+}
+
+/**
+ * Mono IEEE-float WAV, the same layout transformers.js `RawAudio.toWav()`
+ * writes, so pooled and in-process narration files are interchangeable.
+ */
+export function encodeWavFloat32(chunks: KokoroPcmChunk[]): Buffer {
+  const sampleRate = chunks[0]?.sampleRate ?? 24_000;
+  const sampleCount = chunks.reduce((sum, chunk) => sum + chunk.samples.length, 0);
+  const dataBytes = sampleCount * 4;
+  const out = Buffer.alloc(44 + dataBytes);
+  out.write("RIFF", 0, "ascii");
+  out.writeUInt32LE(36 + dataBytes, 4);
+  out.write("WAVE", 8, "ascii");
+  out.write("fmt ", 12, "ascii");
+  out.writeUInt32LE(16, 16);
+  out.writeUInt16LE(3, 20); // IEEE float
+  out.writeUInt16LE(1, 22); // mono
+  out.writeUInt32LE(sampleRate, 24);
+  out.writeUInt32LE(sampleRate * 4, 28);
+  out.writeUInt16LE(4, 32);
+  out.writeUInt16LE(32, 34);
+  out.write("data", 36, "ascii");
+  out.writeUInt32LE(dataBytes, 40);
+  let offset = 44;
+  for (const chunk of chunks) {
+    const { buffer, byteOffset, byteLength } = chunk.samples;
+    const bytes = Buffer.from(buffer, byteOffset, byteLength);
+    bytes.copy(out, offset);
+    offset += bytes.length;
+  }
+  return out;
+}
+
+/**
+ * Path of the compiled worker entry next to this module, or `null` when it
+ * is missing — running from source, or a bundle that inlined this module
+ * without emitting `kokoro-worker.js` — and callers stay on the main thread.
+ */
+export function kokoroWorkerEntry(): string | null {
+  const path = fileURLToPath(new URL("./kokoro-worker.js", import.meta.url));
+  return existsSync(path) ? path : null;
+}
+
+function spawnKokoroWorker(): KokoroWorkerLike {
+  const entry = kokoroWorkerEntry();
+  if (!entry) throw new Error("Kokoro worker entry not found");
+  return new Worker(entry) as unknown as KokoroWorkerLike;
+}
+
+let sharedPool: KokoroWorkerPool | null | undefined;
+
+/**
+ * The process-wide pool, created on first use. `VIBE_KOKORO_WORKERS` sets
+ * the size; `0` disables the pool. Returns `null` when the pool is disabled
+ * or the worker entry is not available, and callers synthesize in-process.
+ */
+export function getKokoroWorkerPool(): KokoroWorkerPool | null {
+  if (sharedPool !== undefined) return sharedPool;
+  const raw = process.env.VIBE_KOKORO_WORKERS?.trim();
+  const requested = raw ? Number(raw) : undefined;
+  if (requested === 0 || !kokoroWorkerEntry()) {
+    sharedPool = null;
+    return sharedPool;
+  }
+  sharedPool = new KokoroWorkerPool({
+    size: requested !== undefined && Number.isFinite(requested) ? requested : undefined,
+  });
+  return sharedPool;
+}
@@ -1,4 +1,5 @@
 export * from "./KokoroProvider.js";
+export * from "./KokoroWorkerPool.js";
 
 import { defineProvider } from "../define-provider.js";
 
@@ -0,0 +1,47 @@
+/**
+ * Worker-thread entry for {@link import("./KokoroWorkerPool.js").KokoroWorkerPool}.
+ *
+ * Each worker loads its own Kokoro model once (the module-scope singleton in
+ * `KokoroProvider.ts` is per thread) and then synthesizes one cue at a time
+ * with `generate()`, exactly as the in-process path does, so both produce the
+ * same audio. It goes back as one float32 PCM chunk with the sample buffer
+ * transferred, not copied.
+ */
+
+import { parentPort } from "node:worker_threads";
+
+import { KOKORO_DEFAULT_VOICE, loadKokoroModel } from "./KokoroProvider.js";
+import type { KokoroAudio } from "./KokoroProvider.js";
+import type { KokoroWorkerRequest, KokoroWorkerResponse } from "./KokoroWorkerPool.js";
+
+const port = parentPort;
+if (!port) throw new Error("kokoro-worker must run inside a worker thread");
+
+function post(message: KokoroWorkerResponse, transfer: ArrayBuffer[] = []): void {
+  port!.postMessage(message, transfer);
+}
+
+function sendAudio(id: number, audio: KokoroAudio): void {
+  if (audio.audio && audio.sampling_rate) {
+    const samples = audio.audio.slice();
+    post({ type: "chunk", id, samples, sampleRate: audio.sampling_rate }, [
+      samples.buffer as ArrayBuffer,
+    ]);
+    return;
+  }
+  // Models without raw samples (test fakes) hand back a finished WAV.
+  const wav = audio.toWav();
+  post({ type: "wav", id, wav }, [wav]);
+}
+
+port.on("message", async (request: KokoroWorkerRequest) => {
+  const { id, text } = request;
+  try {
+    const model = await loadKokoroModel((event) => post({ type: "progress", id, event }));
+    const options = { voice: request.voice ?? KOKORO_DEFAULT_VOICE, speed: request.speed ?? 1 };
+    sendAudio(id, await model.generate(text, options));
+    post({ type: "done", id });
+  } catch (error) {
+    post({ type: "error", id, error: error instanceof Error ? error.message : String(error) });
+  }
+});
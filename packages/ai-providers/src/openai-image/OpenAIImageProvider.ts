@@ -3,6 +3,7 @@ import type {
   AICapability,
   ProviderConfig,
 } from "../interface/types.js";
+import { providerFetch } from "../shared/transport.js";
 
 /**
  * GPT Image model types
@@ -148,7 +149,7 @@ export class OpenAIImageProvider implements AIProvider {
         body.style = options.style || "vivid";
       }
 
-      const response = await fetch(`${this.baseUrl}/images/generations`, {
+      const response = await providerFetch(`${this.baseUrl}/images/generations`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -296,7 +297,7 @@ export class OpenAIImageProvider implements AIProvider {
         formData.append("size", options.size);
       }
 
-      const response = await fetch(`${this.baseUrl}/images/edits`, {
+      const response = await providerFetch(`${this.baseUrl}/images/edits`, {
         method: "POST",
         headers: {
           Authorization: `Bearer ${this.apiKey}`,
@@ -369,7 +370,7 @@ export class OpenAIImageProvider implements AIProvider {
       formData.append("n", String(options.n || 1));
       formData.append("size", options.size || "1024x1024");
 
-      const response = await fetch(`${this.baseUrl}/images/variations`, {
+      const response = await providerFetch(`${this.baseUrl}/images/variations`, {
         method: "POST",
         headers: {
           Authorization: `Bearer ${this.apiKey}`,
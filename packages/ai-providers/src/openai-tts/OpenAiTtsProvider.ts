@@ -3,6 +3,7 @@ import type {
   AICapability,
   ProviderConfig,
 } from "../interface/types.js";
+import { providerFetch } from "../shared/transport.js";
 
 /**
  * OpenAI TTS models.
@@ -103,9 +104,9 @@ export class OpenAiTtsProvider implements AIProvider {
     }
 
     try {
-      let response: Response;
-      for (let attempt = 0; ; attempt++) {
-        response = await fetch(`${this.baseUrl}/audio/speech`, {
+      const response = await providerFetch(
+        `${this.baseUrl}/audio/speech`,
+        {
           method: "POST",
           headers: {
             Authorization: `Bearer ${this.apiKey}`,
@@ -119,15 +120,9 @@ export class OpenAiTtsProvider implements AIProvider {
             ...(options.speed !== undefined && { speed: options.speed }),
             ...(options.instructions !== undefined && { instructions: options.instructions }),
           }),
-        });
-        if (response.status === 429 && attempt < TTS_429_MAX_RETRIES) {
-          await new Promise((resolveDelay) =>
-            setTimeout(resolveDelay, TTS_429_RETRY_DELAY_MS * (attempt + 1)),
-          );
-          continue;
-        }
-        break;
-      }
+        },
+        { retries: TTS_429_MAX_RETRIES, baseDelayMs: TTS_429_RETRY_DELAY_MS },
+      );
 
       if (!response.ok) {
         const error = await response.text();
@@ -8,6 +8,7 @@ import type {
 } from "../interface/types.js";
 import type { StoryboardSegment } from "../claude/ClaudeProvider.js";
 import { analyzeContent as analyzeContentImpl } from "./openai-storyboard.js";
+import { providerFetch } from "../shared/transport.js";
 
 /**
  * OpenAI GPT provider for natural language timeline commands
@@ -114,7 +115,7 @@ Or if clarification needed:
   "clarification": "Which clip do you want to trim?"
 }`;
 
-      const response = await fetch(`${this.baseUrl}/chat/completions`, {
+      const response = await providerFetch(`${this.baseUrl}/chat/completions`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -395,7 +396,7 @@ The segments should divide the script into natural phrases that align with video
 Each segment should be 3-10 seconds long.`;
 
     try {
-      const response = await fetch(`${this.baseUrl}/chat/completions`, {
+      const response = await providerFetch(`${this.baseUrl}/chat/completions`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -7,6 +7,7 @@
 
 import type { StoryboardSegment } from "../claude/ClaudeProvider.js";
 import { buildStoryboardSystemPrompt, buildStoryboardUserMessage } from "../storyboard-prompt.js";
+import { providerFetch } from "../shared/transport.js";
 
 /**
  * Generate a storyboard from script content using OpenAI GPT-5-mini.
@@ -28,7 +29,7 @@ export async function analyzeContent(
   const temperature = creativity === "high" ? 1.0 : 0.7;
 
   try {
-    const response = await fetch("https://api.openai.com/v1/chat/completions", {
+    const response = await providerFetch("https://api.openai.com/v1/chat/completions", {
       method: "POST",
       headers: {
         "Content-Type": "application/json",
@@ -4,6 +4,7 @@ import type {
   ProviderConfig,
   VideoResult,
 } from "../interface/types.js";
+import { providerFetch } from "../shared/transport.js";
 
 /**
  * Video upscale options
@@ -160,7 +161,7 @@ export class ReplicateProvider implements AIProvider {
 
       const version = modelVersions[model] || modelVersions["real-esrgan"];
 
-      const response = await fetch(`${this.baseUrl}/predictions`, {
+      const response = await providerFetch(`${this.baseUrl}/predictions`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -252,7 +253,7 @@ export class ReplicateProvider implements AIProvider {
         };
       }
 
-      const response = await fetch(`${this.baseUrl}/predictions`, {
+      const response = await providerFetch(`${this.baseUrl}/predictions`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -309,7 +310,7 @@ export class ReplicateProvider implements AIProvider {
     }
 
     try {
-      const response = await fetch(`${this.baseUrl}/predictions/${id}`, {
+      const response = await providerFetch(`${this.baseUrl}/predictions/${id}`, {
         headers: {
           Authorization: `Bearer ${this.apiToken}`,
         },
@@ -401,7 +402,7 @@ export class ReplicateProvider implements AIProvider {
     }
 
     try {
-      const response = await fetch(`${this.baseUrl}/predictions/${id}/cancel`, {
+      const response = await providerFetch(`${this.baseUrl}/predictions/${id}/cancel`, {
         method: "POST",
         headers: {
           Authorization: `Bearer ${this.apiToken}`,
@@ -460,7 +461,7 @@ export class ReplicateProvider implements AIProvider {
         input.temperature = options.temperature;
       }
 
-      const response = await fetch(`${this.baseUrl}/predictions`, {
+      const response = await providerFetch(`${this.baseUrl}/predictions`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -587,7 +588,7 @@ export class ReplicateProvider implements AIProvider {
       }
 
       // Using resemble-enhance model for audio restoration
-      const response = await fetch(`${this.baseUrl}/predictions`, {
+      const response = await providerFetch(`${this.baseUrl}/predictions`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -727,7 +728,7 @@ export class ReplicateProvider implements AIProvider {
         };
       }
 
-      const response = await fetch(`${this.baseUrl}/predictions`, {
+      const response = await providerFetch(`${this.baseUrl}/predictions`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -821,7 +822,7 @@ export class ReplicateProvider implements AIProvider {
         };
       }
 
-      const response = await fetch(`${this.baseUrl}/predictions`, {
+      const response = await providerFetch(`${this.baseUrl}/predictions`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
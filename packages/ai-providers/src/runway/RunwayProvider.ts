@@ -5,6 +5,7 @@ import type {
   GenerateOptions,
   VideoResult,
 } from "../interface/types.js";
+import { providerFetch } from "../shared/transport.js";
 
 /**
  * Runway model versions
@@ -219,7 +220,7 @@ export class RunwayProvider implements AIProvider {
     }
 
     try {
-      const response = await fetch(`${this.baseUrl}/tasks/${id}`, {
+      const response = await providerFetch(`${this.baseUrl}/tasks/${id}`, {
         headers: {
           Authorization: `Bearer ${this.apiKey}`,
           "X-Runway-Version": RunwayProvider.API_VERSION,
@@ -280,7 +281,7 @@ export class RunwayProvider implements AIProvider {
     }
 
     try {
-      const response = await fetch(`${this.baseUrl}/tasks/${id}/cancel`, {
+      const response = await providerFetch(`${this.baseUrl}/tasks/${id}/cancel`, {
         method: "POST",
         headers: {
           Authorization: `Bearer ${this.apiKey}`,
@@ -303,7 +304,7 @@ export class RunwayProvider implements AIProvider {
     }
 
     try {
-      const response = await fetch(`${this.baseUrl}/tasks/${id}`, {
+      const response = await providerFetch(`${this.baseUrl}/tasks/${id}`, {
         method: "DELETE",
         headers: {
           Authorization: `Bearer ${this.apiKey}`,
@@ -352,19 +353,10 @@ export class RunwayProvider implements AIProvider {
    * Fetch with retry for transient errors (429, 503)
    */
   private async fetchWithRetry(url: string, init: RequestInit): Promise<Response> {
-    let lastResponse: Response | undefined;
-    for (let attempt = 0; attempt < RunwayProvider.MAX_RETRIES; attempt++) {
-      const response = await fetch(url, init);
-      if (response.status !== 429 && response.status !== 503) {
-        return response;
-      }
-      lastResponse = response;
-      const retryAfter = response.headers.get("Retry-After");
-      const delayMs = retryAfter ? parseInt(retryAfter, 10) * 1000 : (2 ** (attempt + 1)) * 1000;
-      console.error(`[Runway] ${response.status} — retrying in ${delayMs / 1000}s (attempt ${attempt + 1}/${RunwayProvider.MAX_RETRIES})`);
-      await this.sleep(delayMs);
-    }
-    return lastResponse!;
+    return providerFetch(url, init, {
+      retries: RunwayProvider.MAX_RETRIES - 1,
+      baseDelayMs: 2000,
+    });
   }
 
   /**
@@ -1,3 +1,5 @@
+import { providerFetch } from "./transport.js";
+
 export class ProviderHttpError extends Error {
   readonly status: number;
   readonly body: string;
@@ -15,7 +17,7 @@ export async function fetchJson<T>(
   url: string,
   init: RequestInit
 ): Promise<T> {
-  const response = await fetch(url, init);
+  const response = await providerFetch(url, init);
   if (!response.ok) {
     throw new ProviderHttpError(label, response.status, await response.text());
   }
@@ -0,0 +1,164 @@
+import { afterEach, describe, expect, it, vi } from "vitest";
+import {
+  backoffDelay,
+  configureTransport,
+  parseRetryAfter,
+  providerFetch,
+  resetTransport,
+  transportMetrics,
+  withTransportOptions,
+} from "./transport.js";
+
+function reply(status: number, headers: Record<string, string> = {}): Response {
+  return {
+    ok: status >= 200 && status < 300,
+    status,
+    headers: new Headers(headers),
+  } as unknown as Response;
+}
+
+afterEach(async () => {
+  vi.unstubAllGlobals();
+  await resetTransport();
+});
+
+describe("providerFetch", () => {
+  it("retries a 429 after the Retry-After delay and records the retry", async () => {
+    const fetchMock = vi
+      .fn()
+      .mockResolvedValueOnce(reply(429, { "retry-after": "0" }))
+      .mockResolvedValueOnce(reply(200));
+    vi.stubGlobal("fetch", fetchMock);
+
+    const response = await providerFetch("https://api.example.test/v1/jobs", { method: "POST" });
+
+    expect(response.status).toBe(200);
+    expect(fetchMock).toHaveBeenCalledTimes(2);
+    expect(transportMetrics().hosts["api.example.test"]).toMatchObject({
+      requests: 2,
+      retries: 1,
+      inFlight: 0,
+    });
+  });
+
+  it("returns the response when Retry-After is longer than the cap", async () => {
+    const fetchMock = vi.fn().mockResolvedValue(reply(429, { "retry-after": "3600" }));
+    vi.stubGlobal("fetch", fetchMock);
+
+    const response = await providerFetch("https://api.example.test/v1/jobs");
+
+    expect(response.status).toBe(429);
+    expect(fetchMock).toHaveBeenCalledTimes(1);
+  });
+
+  it("does not retry a 429 that reports an exhausted quota", async () => {
+    const body = '{"error":{"code":"insufficient_quota","message":"You exceeded your current quota"}}';
+    const quota = new Response(body, { status: 429 });
+    const fetchMock = vi.fn().mockResolvedValue(quota);
+    vi.stubGlobal("fetch", fetchMock);
+
+    const response = await providerFetch("https://api.example.test/v1/jobs", { method: "POST" });
+
+    expect(response.status).toBe(429);
+    expect(await response.text()).toBe(body);
+    expect(fetchMock).toHaveBeenCalledTimes(1);
+  });
+
+  it("leaves 429s to callers that own rate-limit retries", async () => {
+    const fetchMock = vi
+      .fn()
+      .mockResolvedValueOnce(reply(429, { "retry-after": "0" }))
+      .mockResolvedValueOnce(reply(503, { "retry-after": "0" }))
+      .mockResolvedValueOnce(reply(200));
+    vi.stubGlobal("fetch", fetchMock);
+
+    const first = await withTransportOptions({ retryRateLimits: false }, () =>
+      providerFetch("https://api.example.test/v1/jobs", { method: "POST" })
+    );
+    expect(first.status).toBe(429);
+    expect(fetchMock).toHaveBeenCalledTimes(1);
+
+    // Other retryable statuses are still retried inside the scope.
+    const second = await withTransportOptions({ retryRateLimits: false }, () =>
+      providerFetch("https://api.example.test/v1/jobs", { method: "POST" })
+    );
+    expect(second.status).toBe(200);
+    expect(fetchMock).toHaveBeenCalledTimes(3);
+  });
+
+  it("retries other 5xx only for idempotent methods", async () => {
+    const fetchMock = vi.fn().mockResolvedValue(reply(502));
+    vi.stubGlobal("fetch", fetchMock);
+    const options = { retries: 1, baseDelayMs: 1 };
+
+    await providerFetch("https://api.example.test/v1/jobs", { method: "POST" }, options);
+    expect(fetchMock).toHaveBeenCalledTimes(1);
+
+    await providerFetch("https://api.example.test/v1/jobs/1", {}, options);
+    expect(fetchMock).toHaveBeenCalledTimes(3);
+  });
+
+  it("never retries a body it cannot replay", async () => {
+    const fetchMock = vi.fn().mockResolvedValue(reply(503));
+    vi.stubGlobal("fetch", fetchMock);
+
+    await providerFetch("https://api.example.test/upload", {
+      method: "POST",
+      body: new ReadableStream(),
+    });
+
+    expect(fetchMock).toHaveBeenCalledTimes(1);
+  });
+
+  it("caps concurrent requests per host", async () => {
+    configureTransport({ hostConcurrency: { "slow.example.test": 1 } });
+    const releases: Array<() => void> = [];
+    const fetchMock = vi.fn(
+      () => new Promise<Response>((resolve) => releases.push(() => resolve(reply(200))))
+    );
+    vi.stubGlobal("fetch", fetchMock);
+
+    const first = providerFetch("https://slow.example.test/a");
+    const second = providerFetch("https://slow.example.test/b");
+    const other = providerFetch("https://fast.example.test/c");
+    await vi.waitFor(() => expect(fetchMock).toHaveBeenCalledTimes(2));
+    expect(transportMetrics().hosts["slow.example.test"]).toMatchObject({ inFlight: 1, queued: 1 });
+
+    releases[0]();
+    await first;
+    await vi.waitFor(() => expect(fetchMock).toHaveBeenCalledTimes(3));
+    releases[1]();
+    releases[2]();
+    await Promise.all([second, other]);
+    expect(transportMetrics()).toMatchObject({ requests: 3, inFlight: 0, queued: 0 });
+  });
+
+  it("counts every completed request in the latency histogram", async () => {
+    vi.stubGlobal("fetch", vi.fn().mockResolvedValue(reply(200)));
+
+    await providerFetch("https://api.example.test/v1/a");
+    await providerFetch("https://api.example.test/v1/b");
+
+    const host = transportMetrics().hosts["api.example.test"];
+    expect(host.latencyBuckets.reduce((sum, count) => sum + count, 0)).toBe(2);
+  });
+});
+
+describe("parseRetryAfter", () => {
+  it("accepts delta-seconds and HTTP dates", () => {
+    expect(parseRetryAfter("2")).toBe(2000);
+    const now = Date.parse("2026-01-01T00:00:00Z");
+    expect(parseRetryAfter("Thu, 01 Jan 2026 00:00:05 GMT", now)).toBe(5000);
+    expect(parseRetryAfter("soon")).toBeUndefined();
+    expect(parseRetryAfter(null)).toBeUndefined();
+  });
+});
+
+describe("backoffDelay", () => {
+  it("doubles per attempt with at least half the step as jitter floor", () => {
+    expect(backoffDelay(0, 1000, () => 0)).toBe(500);
+    expect(backoffDelay(0, 1000, () => 1)).toBe(1000);
+    expect(backoffDelay(2, 1000, () => 1)).toBe(4000);
+    expect(backoffDelay(10, 1000, () => 1)).toBe(30_000);
+  });
+});
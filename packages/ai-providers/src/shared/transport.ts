@@ -0,0 +1,378 @@
+/**
+ * Shared HTTP transport for every provider.
+ *
+ * `providerFetch` is a drop-in for `fetch` that adds, per host:
+ *   - a pooled keep-alive dispatcher, so a parallel build reuses TLS
+ *     connections instead of handshaking on most requests;
+ *   - a concurrency cap — requests past it wait for a free slot;
+ *   - a request timeout, combined with any caller `signal`;
+ *   - retries with exponential backoff and jitter that honor `Retry-After`;
+ *   - metrics: in-flight and queued requests, retries, timeouts and a
+ *     latency histogram ({@link transportMetrics}).
+ *
+ * Retries are conservative so a retried POST never bills twice: 429 and
+ * 503 (the server did not take the request) are retried for every method;
+ * other 5xx and network errors only for GET/HEAD. Bodies that cannot be
+ * replayed (streams) are never retried, and neither is a 429 whose body
+ * reports an exhausted quota or balance, which waiting does not fix.
+ * Callers that retry rate limits themselves (the CLI's build scheduler)
+ * turn 429 retries off for everything they run with
+ * {@link withTransportOptions}, so the two layers never multiply.
+ *
+ * The global `fetch` is looked up per call, so `vi.stubGlobal("fetch", …)`
+ * in tests keeps working. The per-host dispatchers are built from the same
+ * undici `Agent` class Node's fetch uses (found through undici's global
+ * dispatcher symbol), so no second copy of undici is needed. When the global
+ * dispatcher is something else — a proxy agent installed by the user — it is
+ * left alone and only the caps, timeouts and retries apply.
+ */
+
+import { AsyncLocalStorage } from "node:async_hooks";
+
+export interface TransportConfig {
+  /** Concurrent requests per host unless overridden in `hostConcurrency`. */
+  defaultHostConcurrency: number;
+  /** Per-host caps, keyed by `URL.host` (e.g. `"api.elevenlabs.io"`). */
+  hostConcurrency: Record<string, number>;
+  /** How long an idle pooled connection stays open. */
+  keepAliveTimeoutMs: number;
+  /** Default timeout for a whole request, body included. `0` disables it. */
+  timeoutMs: number;
+  /** Default retry count on retryable failures. */
+  retries: number;
+  baseDelayMs: number;
+  maxDelayMs: number;
+  /** A `Retry-After` longer than this is not waited out; the response is returned. */
+  maxRetryAfterMs: number;
+}
+
+export interface TransportRequestOptions {
+  /** Override {@link TransportConfig.timeoutMs} for this request. */
+  timeoutMs?: number;
+  /** Override {@link TransportConfig.retries} for this request. */
+  retries?: number;
+  /** Override {@link TransportConfig.baseDelayMs} for this request. */
+  baseDelayMs?: number;
+  /** Extra statuses to retry for this request, on top of the defaults. */
+  retryStatuses?: number[];
+  /** `false` returns a 429 to the caller instead of retrying it. Default true. */
+  retryRateLimits?: boolean;
+}
+
+/** Upper bounds (ms) of the latency histogram buckets; the last bucket is open. */
+export const LATENCY_BUCKETS_MS = [50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000];
+
+export interface HostMetrics {
+  inFlight: number;
+  queued: number;
+  requests: number;
+  retries: number;
+  timeouts: number;
+  failures: number;
+  /** Counts per {@link LATENCY_BUCKETS_MS} bucket, plus one overflow bucket. */
+  latencyBuckets: number[];
+  latencySumMs: number;
+}
+
+export interface TransportMetrics {
+  inFlight: number;
+  queued: number;
+  requests: number;
+  retries: number;
+  timeouts: number;
+  failures: number;
+  hosts: Record<string, HostMetrics>;
+}
+
+const DEFAULT_CONFIG: TransportConfig = {
+  defaultHostConcurrency: 16,
+  hostConcurrency: {},
+  keepAliveTimeoutMs: 30_000,
+  timeoutMs: 10 * 60_000,
+  retries: 2,
+  baseDelayMs: 1000,
+  maxDelayMs: 30_000,
+  maxRetryAfterMs: 60_000,
+};
+
+/** Retried for every method: the server rejected the request before doing work. */
+const ALWAYS_RETRY_STATUSES = new Set([429, 503]);
+/** Retried only for idempotent methods. */
+const IDEMPOTENT_RETRY_STATUSES = new Set([500, 502, 504]);
+/** A 429 body saying the account is out of quota or credit: retrying cannot succeed. */
+const QUOTA_EXHAUSTED_PATTERN =
+  /insufficient[_ ]quota|exceeded your current quota|quota[_ ]exceeded|payment.*required|insufficient.*(credit|funds|balance)|balance.*(not.*enough|insufficient)|credits?.*exhausted/i;
+
+let config: TransportConfig = { ...DEFAULT_CONFIG };
+
+interface HostState {
+  name: string;
+  active: number;
+  waiters: Array<() => void>;
+  agent?: PooledAgent;
+  metrics: HostMetrics;
+}
+
+/** undici's cross-copy global dispatcher slot; Node's fetch reads it too. */
+const GLOBAL_DISPATCHER = Symbol.for("undici.globalDispatcher.1");
+
+interface PooledAgent {
+  close(): Promise<void>;
+}
+type AgentConstructor = new (options: {
+  keepAliveTimeout: number;
+  keepAliveMaxTimeout: number;
+  connections: number;
+}) => PooledAgent;
+
+const hosts = new Map<string, HostState>();
+const scopedOptions = new AsyncLocalStorage<TransportRequestOptions>();
+
+/** Merge `overrides` into the transport config. Later calls win. */
+export function configureTransport(overrides: Partial<TransportConfig>): void {
+  config = {
+    ...config,
+    ...overrides,
+    hostConcurrency: { ...config.hostConcurrency, ...overrides.hostConcurrency },
+  };
+}
+
+/**
+ * Run `fn` with `options` as the defaults for every {@link providerFetch}
+ * it makes, including from callbacks and timers it starts. Options passed
+ * to a single request still win.
+ */
+export function withTransportOptions<T>(options: TransportRequestOptions, fn: () => T): T {
+  return scopedOptions.run({ ...scopedOptions.getStore(), ...options }, fn);
+}
+
+/**
+ * `fetch` through the shared transport. Resolves with the final response —
+ * including a non-OK one once retries are exhausted — and rejects only on
+ * network errors, timeouts and aborts, like `fetch`.
+ */
+export async function providerFetch(
+  input: string | URL,
+  init: RequestInit = {},
+  requestOptions: TransportRequestOptions = {}
+): Promise<Response> {
+  const options = { ...scopedOptions.getStore(), ...requestOptions };
+  const url = typeof input === "string" ? new URL(input) : input;
+  const host = hostState(url.host);
+  const method = (init.method ?? "GET").toUpperCase();
+  const idempotent = method === "GET" || method === "HEAD";
+  const maxRetries = isReplayable(init.body) ? (options.retries ?? config.retries) : 0;
+  const extraStatuses = new Set(options.retryStatuses ?? []);
+
+  for (let attempt = 0; ; attempt++) {
+    await acquire(host);
+    const started = performance.now();
+    let response: Response;
+    try {
+      response = await globalThis.fetch(input, {
+        ...init,
+        signal: requestSignal(init.signal, options.timeoutMs ?? config.timeoutMs),
+        ...dispatcherInit(host),
+      } as RequestInit);
+    } catch (error) {
+      release(host, started);
+      const timedOut = error instanceof Error && error.name === "TimeoutError";
+      if (timedOut) host.metrics.timeouts += 1;
+      const retryable = idempotent && !timedOut && !init.signal?.aborted && isNetworkError(error);
+      if (!retryable || attempt >= maxRetries) {
+        host.metrics.failures += 1;
+        throw error;
+      }
+      host.metrics.retries += 1;
+      await sleep(backoffDelay(attempt, options.baseDelayMs ?? config.baseDelayMs));
+      continue;
+    }
+    release(host, started);
+
+    const status = response.status;
+    const retryable =
+      status === 429
+        ? options.retryRateLimits !== false
+        : ALWAYS_RETRY_STATUSES.has(status) ||
+          extraStatuses.has(status) ||
+          (idempotent && IDEMPOTENT_RETRY_STATUSES.has(status));
+    if (!retryable || attempt >= maxRetries) return response;
+    if (status === 429 && (await reportsQuotaExhausted(response))) return response;
+    const retryAfter = parseRetryAfter(response.headers?.get("retry-after") ?? null);
+    if (retryAfter !== undefined && retryAfter > config.maxRetryAfterMs) return response;
+    // Drain the discarded body so its connection goes back to the pool.
+    await response.body?.cancel().catch(() => undefined);
+    host.metrics.retries += 1;
+    await sleep(retryAfter ?? backoffDelay(attempt, options.baseDelayMs ?? config.baseDelayMs));
+  }
+}
+
+/** Whether a 429's body (read from a clone, so the caller still gets it) reports a billing limit. */
+async function reportsQuotaExhausted(response: Response): Promise<boolean> {
+  if (typeof response.clone !== "function") return false;
+  const body = await response
+    .clone()
+    .text()
+    .catch(() => "");
+  return QUOTA_EXHAUSTED_PATTERN.test(body);
+}
+
+/**
+ * Delay before retry `attempt` (0-based): exponential from `baseDelayMs`,
+ * capped at `maxDelayMs`, with "equal jitter" — at least half the step, so
+ * concurrent clients spread out without retrying immediately.
+ */
+export function backoffDelay(
+  attempt: number,
+  baseDelayMs = config.baseDelayMs,
+  random: () => number = Math.random
+): number {
+  const step = Math.min(config.maxDelayMs, baseDelayMs * 2 ** attempt);
+  return Math.round(step / 2 + random() * (step / 2));
+}
+
+/** `Retry-After` as milliseconds: delta-seconds or an HTTP date. */
+export function parseRetryAfter(value: string | null, now = Date.now()): number | undefined {
+  if (!value) return undefined;
+  const trimmed = value.trim();
+  if (/^\d+(\.\d+)?$/.test(trimmed)) return Math.round(Number(trimmed) * 1000);
+  const date = Date.parse(trimmed);
+  return Number.isNaN(date) ? undefined : Math.max(0, date - now);
+}
+
+export function transportMetrics(): TransportMetrics {
+  const out: TransportMetrics = {
+    inFlight: 0,
+    queued: 0,
+    requests: 0,
+    retries: 0,
+    timeouts: 0,
+    failures: 0,
+    hosts: {},
+  };
+  for (const [name, state] of hosts) {
+    const metrics = { ...state.metrics, latencyBuckets: [...state.metrics.latencyBuckets] };
+    out.hosts[name] = metrics;
+    out.inFlight += metrics.inFlight;
+    out.queued += metrics.queued;
+    out.requests += metrics.requests;
+    out.retries += metrics.retries;
+    out.timeouts += metrics.timeouts;
+    out.failures += metrics.failures;
+  }
+  return out;
+}
+
+/** Close pooled connections and forget all state and config. For tests and shutdown. */
+export async function resetTransport(): Promise<void> {
+  const agents = [...hosts.values()].map((state) => state.agent);
+  hosts.clear();
+  config = { ...DEFAULT_CONFIG };
+  await Promise.all(agents.map((agent) => agent?.close().catch(() => undefined)));
+}
+
+function hostState(name: string): HostState {
+  let state = hosts.get(name);
+  if (!state) {
+    state = {
+      name,
+      active: 0,
+      waiters: [],
+      metrics: {
+        inFlight: 0,
+        queued: 0,
+        requests: 0,
+        retries: 0,
+        timeouts: 0,
+        failures: 0,
+        latencyBuckets: new Array(LATENCY_BUCKETS_MS.length + 1).fill(0),
+        latencySumMs: 0,
+      },
+    };
+    hosts.set(name, state);
+  }
+  return state;
+}
+
+function hostLimit(name: string): number {
+  const limit = config.hostConcurrency[name] ?? config.defaultHostConcurrency;
+  return Number.isFinite(limit) && limit >= 1 ? Math.floor(limit) : 1;
+}
+
+/**
+ * `{ dispatcher }` for the host's keep-alive pool, or `{}` until Node's
+ * fetch has installed its default `Agent` (after the first request) or when
+ * a non-`Agent` global dispatcher is in place.
+ */
+function dispatcherInit(state: HostState): { dispatcher?: PooledAgent } {
+  if (!state.agent) {
+    const current = (globalThis as Record<symbol, unknown>)[GLOBAL_DISPATCHER];
+    const ctor = (current as { constructor?: unknown } | undefined)?.constructor;
+    if (typeof ctor !== "function" || ctor.name !== "Agent") return {};
+    state.agent = new (ctor as AgentConstructor)({
+      keepAliveTimeout: config.keepAliveTimeoutMs,
+      keepAliveMaxTimeout: Math.max(config.keepAliveTimeoutMs, 10 * 60_000),
+      connections: hostLimit(state.name),
+    });
+  }
+  return { dispatcher: state.agent };
+}
+
+/** Wait for a slot under the host's cap. Slots are handed over in FIFO order. */
+async function acquire(state: HostState): Promise<void> {
+  state.metrics.queued += 1;
+  if (state.active >= hostLimit(state.name)) {
+    await new Promise<void>((resolve) => state.waiters.push(resolve));
+  } else {
+    state.active += 1;
+  }
+  state.metrics.queued -= 1;
+  state.metrics.inFlight += 1;
+  state.metrics.requests += 1;
+}
+
+/** Slots are held until response headers arrive; the body is read outside the cap. */
+function release(state: HostState, started: number): void {
+  const elapsed = performance.now() - started;
+  state.metrics.inFlight -= 1;
+  state.metrics.latencySumMs += elapsed;
+  const bucket = LATENCY_BUCKETS_MS.findIndex((bound) => elapsed <= bound);
+  state.metrics.latencyBuckets[bucket === -1 ? LATENCY_BUCKETS_MS.length : bucket] += 1;
+  const next = state.waiters.shift();
+  if (next) next();
+  else state.active -= 1;
+}
+
+function requestSignal(
+  callerSignal: AbortSignal | null | undefined,
+  timeoutMs: number
+): AbortSignal | undefined {
+  if (!(timeoutMs > 0)) return callerSignal ?? undefined;
+  const timeout = AbortSignal.timeout(timeoutMs);
+  if (!callerSignal) return timeout;
+  return typeof AbortSignal.any === "function"
+    ? AbortSignal.any([callerSignal, timeout])
+    : callerSignal;
+}
+
+function sleep(ms: number): Promise<void> {
+  return new Promise((resolve) => setTimeout(resolve, ms));
+}
+
+function isReplayable(body: RequestInit["body"]): boolean {
+  return (
+    body === undefined ||
+    body === null ||
+    typeof body === "string" ||
+    body instanceof ArrayBuffer ||
+    ArrayBuffer.isView(body) ||
+    body instanceof URLSearchParams ||
+    body instanceof FormData ||
+    body instanceof Blob
+  );
+}
+
+/** undici reports connection failures as `TypeError: fetch failed`. */
+function isNetworkError(error: unknown): boolean {
+  return error instanceof TypeError;
+}
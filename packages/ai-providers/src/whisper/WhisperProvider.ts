@@ -6,6 +6,7 @@ import type {
   TranscriptResult,
   TranscriptWord,
 } from "../interface/types.js";
+import { providerFetch } from "../shared/transport.js";
 
 /**
  * OpenAI Whisper provider for speech-to-text.
@@ -71,7 +72,7 @@ export class WhisperProvider implements AIProvider {
         formData.append("language", lang);
       }
 
-      const response = await fetch(`${this.baseUrl}/audio/transcriptions`, {
+      const response = await providerFetch(`${this.baseUrl}/audio/transcriptions`, {
         method: "POST",
         headers: {
           Authorization: `Bearer ${this.apiKey}`,
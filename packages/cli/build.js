@@ -57,13 +57,41 @@ const banner = {
   ].join("\n"),
 };
 
+// Command manifest: load every command once here so the shipped bin can
+// describe the whole tree without importing it (see
+// src/commands/_shared/command-manifest.ts). Bundled with the same settings
+// as the bin so command modules evaluate exactly as they will at runtime.
 await build({
-  entryPoints: ["src/index.ts"],
+  entryPoints: ["src/commands/_shared/emit-command-manifest.ts"],
   bundle: true,
   platform: "node",
   target: "node20",
   format: "esm",
-  outfile: "dist/index.js",
+  outfile: "dist/emit-command-manifest.mjs",
+  banner,
+  external,
+  conditions: ["import"],
+  logLevel: "warning",
+});
+const commandManifest = execFileSync(process.execPath, ["dist/emit-command-manifest.mjs"], {
+  encoding: "utf-8",
+  env: { ...process.env, VIBE_DEBUG: "" },
+});
+rmSync("dist/emit-command-manifest.mjs");
+
+await build({
+  entryPoints: { index: "src/index.ts" },
+  bundle: true,
+  platform: "node",
+  target: "node20",
+  format: "esm",
+  outdir: "dist",
+  // Each command module becomes its own chunk next to dist/index.js, loaded
+  // only when argv dispatches to it. Chunks stay in dist/ so
+  // `import.meta.url`-relative paths (CONTEXT.md, kokoro-worker.js) resolve
+  // as they did from the single-file bundle.
+  splitting: true,
+  define: { __VIBE_COMMAND_MANIFEST__: JSON.stringify(commandManifest) },
   banner,
   external,
   sourcemap: false,
@@ -76,11 +104,17 @@ await build({
 
 await build({
   entryPoints: {
+    // Library entry for `import from "@vibeframe/cli"`; dist/index.js is
+    // the bin and runs the CLI on import.
+    lib: "src/lib.ts",
     "engine/index": "src/engine/index.ts",
     "tools/manifest/index": "src/tools/manifest/index.ts",
     "tools/define-tool": "src/tools/define-tool.ts",
     "tools/adapters/mcp": "src/tools/adapters/mcp.ts",
     "tools/adapters/agent": "src/tools/adapters/agent.ts",
+    // Spawned by the Kokoro worker pool as `./kokoro-worker.js` next to
+    // dist/index.js; without it local TTS stays on the main thread.
+    "kokoro-worker": "../ai-providers/src/kokoro/kokoro-worker.ts",
   },
   bundle: true,
   platform: "node",
@@ -101,4 +135,4 @@ execFileSync(
   { stdio: "inherit" }
 );
 
-console.log("Bundle complete: dist/index.js + public subpaths");
+console.log("Bundle complete: dist/index.js + command chunks + public subpaths");
@@ -0,0 +1,137 @@
+import { afterEach, beforeEach, describe, expect, it } from "vitest";
+import {
+  existsSync,
+  mkdirSync,
+  mkdtempSync,
+  readFileSync,
+  rmSync,
+  statSync,
+  writeFileSync,
+} from "node:fs";
+import { tmpdir } from "node:os";
+import { join } from "node:path";
+import {
+  blobPath,
+  collectBlobGarbage,
+  restoreAsset,
+  storeAssetBuffer,
+  storeAssetFile,
+} from "./blob-store.js";
+
+let dir: string;
+
+beforeEach(() => {
+  dir = mkdtempSync(join(tmpdir(), "vibe-blobs-"));
+});
+
+afterEach(() => {
+  delete process.env.VIBE_ASSET_LINK;
+  rmSync(dir, { recursive: true, force: true });
+});
+
+function writeMetadata(name: string, paths: { canonicalPath: string; cachePath: string }): void {
+  mkdirSync(join(dir, ".vibeframe", "assets"), { recursive: true });
+  writeFileSync(join(dir, ".vibeframe", "assets", `${name}.json`), JSON.stringify(paths));
+}
+
+describe("storeAssetBuffer", () => {
+  it("writes the bytes once and links every target to the blob", async () => {
+    const asset = join(dir, "assets", "narration-hook.mp3");
+    const cache = join(dir, ".vibeframe", "cache", "assets", "narration-abc.mp3");
+
+    const stored = await storeAssetBuffer(dir, Buffer.from("voice"), [asset, cache]);
+
+    expect(stored.method).not.toBe("copy");
+    expect(readFileSync(asset, "utf-8")).toBe("voice");
+    expect(readFileSync(cache, "utf-8")).toBe("voice");
+    if (stored.method === "hardlink") {
+      expect(statSync(asset).ino).toBe(statSync(blobPath(dir, stored.sha256)).ino);
+    }
+  });
+
+  it("replaces a linked target without writing through to the old blob", async () => {
+    const asset = join(dir, "assets", "backdrop-hook.png");
+    const first = await storeAssetBuffer(dir, Buffer.from("first"), [asset]);
+    await storeAssetBuffer(dir, Buffer.from("second"), [asset]);
+
+    expect(readFileSync(asset, "utf-8")).toBe("second");
+    expect(readFileSync(blobPath(dir, first.sha256), "utf-8")).toBe("first");
+  });
+
+  it("copies when linking is turned off", async () => {
+    process.env.VIBE_ASSET_LINK = "copy";
+    const asset = join(dir, "assets", "keyframe-hook.png");
+
+    const stored = await storeAssetBuffer(dir, Buffer.from("frame"), [asset]);
+
+    expect(stored.method).toBe("copy");
+    expect(statSync(asset).ino).not.toBe(statSync(blobPath(dir, stored.sha256)).ino);
+  });
+});
+
+describe("restoreAsset", () => {
+  it("adopts a cache entry written before the store existed", async () => {
+    const cache = join(dir, ".vibeframe", "cache", "assets", "music-abc.mp3");
+    mkdirSync(join(dir, ".vibeframe", "cache", "assets"), { recursive: true });
+    writeFileSync(cache, "legacy");
+    const asset = join(dir, "assets", "music-hook.mp3");
+
+    const restored = await restoreAsset(dir, cache, [asset]);
+
+    expect(readFileSync(asset, "utf-8")).toBe("legacy");
+    expect(existsSync(blobPath(dir, restored.sha256))).toBe(true);
+  });
+});
+
+describe("storeAssetFile", () => {
+  it("dedupes a downloaded file against an existing blob", async () => {
+    const first = join(dir, "assets", "video-a.mp4");
+    const stored = await storeAssetBuffer(dir, Buffer.from("clip"), [first]);
+    const downloaded = join(dir, "assets", "video-b.mp4");
+    writeFileSync(downloaded, "clip");
+
+    const adopted = await storeAssetFile(dir, downloaded, []);
+
+    expect(adopted.sha256).toBe(stored.sha256);
+    expect(readFileSync(downloaded, "utf-8")).toBe("clip");
+  });
+});
+
+describe("collectBlobGarbage", () => {
+  it("removes unreferenced blobs and their cache entries, keeping referenced ones", async () => {
+    const liveAsset = join(dir, "assets", "narration-hook.mp3");
+    const liveCache = join(dir, ".vibeframe", "cache", "assets", "narration-new.mp3");
+    const staleCache = join(dir, ".vibeframe", "cache", "assets", "narration-old.mp3");
+    const stale = await storeAssetBuffer(dir, Buffer.from("old take"), [staleCache]);
+    const live = await storeAssetBuffer(dir, Buffer.from("new take"), [liveAsset, liveCache]);
+    writeMetadata("narration-hook", {
+      canonicalPath: "assets/narration-hook.mp3",
+      cachePath: ".vibeframe/cache/assets/narration-new.mp3",
+    });
+
+    const preview = await collectBlobGarbage(dir, { dryRun: true });
+    expect(preview).toMatchObject({ blobs: 2, kept: 1, removed: 1, dryRun: true });
+    expect(existsSync(staleCache)).toBe(true);
+
+    const result = await collectBlobGarbage(dir);
+    expect(result).toMatchObject({
+      kept: 1,
+      removed: 1,
+      removedCacheEntries: [".vibeframe/cache/assets/narration-old.mp3"],
+    });
+    expect(existsSync(blobPath(dir, stale.sha256))).toBe(false);
+    expect(existsSync(staleCache)).toBe(false);
+    expect(existsSync(blobPath(dir, live.sha256))).toBe(true);
+    expect(readFileSync(liveAsset, "utf-8")).toBe("new take");
+  });
+
+  it("never deletes canonical asset files", async () => {
+    const asset = join(dir, "assets", "backdrop-gone.png");
+    await storeAssetBuffer(dir, Buffer.from("orphan"), [asset]);
+
+    const result = await collectBlobGarbage(dir);
+
+    expect(result.removed).toBe(1);
+    expect(readFileSync(asset, "utf-8")).toBe("orphan");
+  });
+});
@@ -0,0 +1,437 @@
+/**
+ * @module _shared/blob-store
+ *
+ * Content-addressed store for generated build assets under
+ * `.vibeframe/cache/blobs/`. Each distinct file is stored once, named by its
+ * sha256, and every place the build needs it — the canonical
+ * `assets/<kind>-<beat>.<ext>` and the `.vibeframe/cache/assets/` entries —
+ * is materialized from the blob as a reflink (copy-on-write clone) where the
+ * filesystem supports it, a hardlink otherwise, and a plain copy as the last
+ * resort. A new asset costs one write instead of two, and a cache restore
+ * costs a link instead of a copy.
+ *
+ * Materialization always links to a temp name and renames it over the
+ * target, so regenerating an asset replaces the directory entry and never
+ * writes through a hardlink into the blob. `index.json` records which
+ * project-relative paths reference each blob; `vibe cache gc` drops blobs
+ * that no `build-report.json` or `.vibeframe/assets/` metadata still points
+ * at, together with the cache entries linked to them.
+ *
+ * `VIBE_ASSET_LINK=copy` turns linking off for filesystems or tools that
+ * misbehave with shared inodes.
+ */
+
+import { createHash, randomUUID } from "node:crypto";
+import { constants, createReadStream } from "node:fs";
+import {
+  copyFile,
+  link,
+  mkdir,
+  readdir,
+  readFile,
+  rename,
+  rm,
+  stat,
+  writeFile,
+} from "node:fs/promises";
+import { dirname, isAbsolute, join, relative, resolve, sep } from "node:path";
+
+export const BLOB_STORE_SUBDIR = join(".vibeframe", "cache", "blobs");
+
+const INDEX_FILENAME = "index.json";
+const SHA256_RE = /^[0-9a-f]{64}$/;
+
+export type MaterializeMethod = "reflink" | "hardlink" | "copy";
+
+const METHODS: readonly MaterializeMethod[] = ["reflink", "hardlink", "copy"];
+
+export interface StoredBlob {
+  sha256: string;
+  size: number;
+  /** How the targets were materialized (the weakest method used). */
+  method: MaterializeMethod;
+}
+
+interface BlobIndexEntry {
+  size: number;
+  /** Project-relative paths materialized from this blob. */
+  refs: string[];
+}
+
+interface BlobIndex {
+  version: 1;
+  blobs: Record<string, BlobIndexEntry>;
+}
+
+export interface BlobGcResult {
+  projectDir: string;
+  dryRun: boolean;
+  /** Blobs found in the store. */
+  blobs: number;
+  /** Blobs still referenced by the build report or asset metadata. */
+  kept: number;
+  removed: number;
+  /** Bytes released: removed blobs plus cache entries that were not links to them. */
+  freedBytes: number;
+  /** Project-relative cache entries removed with their blob. */
+  removedCacheEntries: string[];
+}
+
+export function blobStoreDir(projectDir: string): string {
+  return join(projectDir, BLOB_STORE_SUBDIR);
+}
+
+export function blobPath(projectDir: string, sha256: string): string {
+  return join(blobStoreDir(projectDir), sha256.slice(0, 2), sha256);
+}
+
+/**
+ * Store `data` once and materialize it at every path in `targets`
+ * (absolute, inside the project). Parent directories are created.
+ */
+export async function storeAssetBuffer(
+  projectDir: string,
+  data: Buffer,
+  targets: string[]
+): Promise<StoredBlob> {
+  const sha256 = createHash("sha256").update(data).digest("hex");
+  const blob = blobPath(projectDir, sha256);
+  if (!(await blobIntact(blob, data.length))) {
+    await mkdir(dirname(blob), { recursive: true });
+    const tmp = tempSibling(blob);
+    await writeFile(tmp, data);
+    await rename(tmp, blob);
+  }
+  return linkTargets(projectDir, sha256, data.length, targets);
+}
+
+/**
+ * Adopt a file that already exists on disk (a downloaded video, a legacy
+ * cache entry) into the store, then materialize it at `targets`. The source
+ * path itself becomes a link to the blob. Pass `sha256` when the caller
+ * already hashed the bytes, e.g. while downloading them.
+ */
+export async function storeAssetFile(
+  projectDir: string,
+  sourcePath: string,
+  targets: string[],
+  sha256?: string
+): Promise<StoredBlob> {
+  const { size } = await stat(sourcePath);
+  const digest = sha256 ?? (await hashFile(sourcePath));
+  const blob = blobPath(projectDir, digest);
+  if (!(await blobIntact(blob, size))) {
+    await materialize(sourcePath, blob, projectDir);
+  }
+  return linkTargets(projectDir, digest, size, [sourcePath, ...targets]);
+}
+
+/**
+ * Cache hit: materialize `targets` from the cache entry at `cachePath`.
+ * Entries written before the store existed are adopted on first restore.
+ */
+export async function restoreAsset(
+  projectDir: string,
+  cachePath: string,
+  targets: string[]
+): Promise<StoredBlob> {
+  const index = await readIndex(projectDir);
+  const rel = projectRelative(projectDir, cachePath);
+  for (const [sha256, entry] of Object.entries(index.blobs)) {
+    if (!entry.refs.includes(rel)) continue;
+    if (await blobIntact(blobPath(projectDir, sha256), entry.size)) {
+      return linkTargets(projectDir, sha256, entry.size, targets);
+    }
+  }
+  return storeAssetFile(projectDir, cachePath, targets);
+}
+
+/**
+ * Remove blobs that neither `build-report.json` nor any asset metadata file
+ * references, along with the `.vibeframe/cache/` entries linked to them.
+ * Canonical files under `assets/` are never deleted.
+ */
+export async function collectBlobGarbage(
+  projectDir: string,
+  opts: { dryRun?: boolean } = {}
+): Promise<BlobGcResult> {
+  const dryRun = opts.dryRun === true;
+  const result: BlobGcResult = {
+    projectDir,
+    dryRun,
+    blobs: 0,
+    kept: 0,
+    removed: 0,
+    freedBytes: 0,
+    removedCacheEntries: [],
+  };
+  const onDisk = await listBlobs(projectDir);
+  result.blobs = onDisk.size;
+  if (onDisk.size === 0) return result;
+
+  return withIndex(projectDir, async (index) => {
+    const referenced = await referencedPaths(projectDir);
+    const live = new Set<string>();
+    for (const rel of referenced) {
+      const sha256 = await contentOf(projectDir, rel, index);
+      if (sha256) live.add(sha256);
+    }
+
+    for (const [sha256, size] of onDisk) {
+      const refs = index.blobs[sha256]?.refs ?? [];
+      if (live.has(sha256)) {
+        result.kept += 1;
+        // Drop refs whose file is gone or now holds other content.
+        const current: string[] = [];
+        for (const ref of refs) {
+          if ((await contentOf(projectDir, ref, index, sha256)) === sha256) current.push(ref);
+        }
+        if (!dryRun && index.blobs[sha256]) index.blobs[sha256].refs = current;
+        continue;
+      }
+
+      const blob = blobPath(projectDir, sha256);
+      const blobIno = await stat(blob).then((s) => s.ino, () => undefined);
+      result.removed += 1;
+      result.freedBytes += size;
+      for (const ref of refs) {
+        if (!isCacheEntry(ref) || referenced.has(ref)) continue;
+        const abs = join(projectDir, ref);
+        const info = await stat(abs).catch(() => undefined);
+        if (!info || info.size !== size) continue;
+        if (info.ino !== blobIno) {
+          // A reflink or copy: only remove it if it still holds this content.
+          if ((await hashFile(abs)) !== sha256) continue;
+          result.freedBytes += info.size;
+        }
+        result.removedCacheEntries.push(ref);
+        if (!dryRun) await rm(abs, { force: true });
+      }
+      if (!dryRun) {
+        await rm(blob, { force: true });
+        delete index.blobs[sha256];
+      }
+    }
+    if (!dryRun) {
+      for (const sha256 of Object.keys(index.blobs)) {
+        if (!onDisk.has(sha256)) delete index.blobs[sha256];
+      }
+    }
+    return result;
+  });
+}
+
+// ── Materialization ──────────────────────────────────────────────────────
+
+/**
+ * First method that worked for each store, so a filesystem without reflink
+ * support pays the failed clone attempt once per process, not per asset.
+ */
+const preferredMethod = new Map<string, MaterializeMethod>();
+
+async function linkTargets(
+  projectDir: string,
+  sha256: string,
+  size: number,
+  targets: string[]
+): Promise<StoredBlob> {
+  const blob = blobPath(projectDir, sha256);
+  let method: MaterializeMethod = "reflink";
+  for (const target of targets) {
+    const used = await materialize(blob, target, projectDir);
+    if (METHODS.indexOf(used) > METHODS.indexOf(method)) method = used;
+  }
+  const rels = targets.map((target) => projectRelative(projectDir, target));
+  await withIndex(projectDir, (index) => {
+    for (const entry of Object.values(index.blobs)) {
+      entry.refs = entry.refs.filter((ref) => !rels.includes(ref));
+    }
+    const entry = (index.blobs[sha256] ??= { size, refs: [] });
+    entry.size = size;
+    entry.refs = [...new Set([...entry.refs, ...rels])].sort();
+  });
+  return { sha256, size, method };
+}
+
+async function materialize(
+  source: string,
+  target: string,
+  projectDir: string
+): Promise<MaterializeMethod> {
+  if (await sameInode(source, target)) return "hardlink";
+  await mkdir(dirname(target), { recursive: true });
+  const store = blobStoreDir(projectDir);
+  const candidates =
+    process.env.VIBE_ASSET_LINK === "copy"
+      ? (["copy"] as const)
+      : METHODS.slice(METHODS.indexOf(preferredMethod.get(store) ?? "reflink"));
+  const tmp = tempSibling(target);
+  let lastError: unknown;
+  for (const method of candidates) {
+    try {
+      await linkWith(method, source, tmp);
+    } catch (error) {
+      lastError = error;
+      await rm(tmp, { force: true });
+      continue;
+    }
+    if (!preferredMethod.has(store)) preferredMethod.set(store, method);
+    await rename(tmp, target);
+    return method;
+  }
+  throw lastError;
+}
+
+async function linkWith(method: MaterializeMethod, source: string, dest: string): Promise<void> {
+  switch (method) {
+    case "reflink":
+      await copyFile(source, dest, constants.COPYFILE_FICLONE_FORCE);
+      return;
+    case "hardlink":
+      await link(source, dest);
+      return;
+    case "copy":
+      await copyFile(source, dest);
+      return;
+  }
+}
+
+async function sameInode(a: string, b: string): Promise<boolean> {
+  const [sa, sb] = await Promise.all([stat(a).catch(() => null), stat(b).catch(() => null)]);
+  return sa !== null && sb !== null && sa.dev === sb.dev && sa.ino === sb.ino;
+}
+
+/** Present with the recorded size; a blob edited in place is treated as missing. */
+async function blobIntact(blob: string, size: number): Promise<boolean> {
+  const info = await stat(blob).catch(() => null);
+  return info !== null && info.size === size;
+}
+
+function tempSibling(path: string): string {
+  return `${path}.${randomUUID().slice(0, 8)}.tmp`;
+}
+
+async function hashFile(path: string): Promise<string> {
+  const hash = createHash("sha256");
+  for await (const chunk of createReadStream(path)) hash.update(chunk as Buffer);
+  return hash.digest("hex");
+}
+
+// ── Index ────────────────────────────────────────────────────────────────
+
+/** Serializes index updates from concurrent beats in this process. */
+const indexQueues = new Map<string, Promise<unknown>>();
+
+function withIndex<T>(projectDir: string, fn: (index: BlobIndex) => T | Promise<T>): Promise<T> {
+  const key = blobStoreDir(projectDir);
+  const run = (indexQueues.get(key) ?? Promise.resolve()).then(async () => {
+    const index = await readIndex(projectDir);
+    const before = JSON.stringify(index);
+    const result = await fn(index);
+    if (JSON.stringify(index) !== before) await writeIndex(projectDir, index);
+    return result;
+  });
+  indexQueues.set(key, run.catch(() => undefined));
+  return run;
+}
+
+async function readIndex(projectDir: string): Promise<BlobIndex> {
+  try {
+    const parsed = JSON.parse(
+      await readFile(join(blobStoreDir(projectDir), INDEX_FILENAME), "utf-8")
+    ) as BlobIndex;
+    if (parsed.version === 1 && parsed.blobs && typeof parsed.blobs === "object") return parsed;
+  } catch {
+    // Missing or unreadable: start empty. GC falls back to hashing files.
+  }
+  return { version: 1, blobs: {} };
+}
+
+async function writeIndex(projectDir: string, index: BlobIndex): Promise<void> {
+  const path = join(blobStoreDir(projectDir), INDEX_FILENAME);
+  await mkdir(dirname(path), { recursive: true });
+  const tmp = tempSibling(path);
+  await writeFile(tmp, JSON.stringify(index, null, 2) + "\n", "utf-8");
+  await rename(tmp, path);
+}
+
+// ── GC helpers ───────────────────────────────────────────────────────────
+
+async function listBlobs(projectDir: string): Promise<Map<string, number>> {
+  const blobs = new Map<string, number>();
+  const store = blobStoreDir(projectDir);
+  const shards = await readdir(store, { withFileTypes: true }).catch(() => []);
+  for (const shard of shards) {
+    if (!shard.isDirectory()) continue;
+    for (const name of await readdir(join(store, shard.name)).catch(() => [])) {
+      if (!SHA256_RE.test(name)) continue;
+      const info = await stat(join(store, shard.name, name)).catch(() => null);
+      if (info?.isFile()) blobs.set(name, info.size);
+    }
+  }
+  return blobs;
+}
+
+/**
+ * Every project-relative path named by `build-report.json` or a
+ * `.vibeframe/assets/*.json` metadata file: string values under `path`
+ * or `*Path` keys, at any depth.
+ */
+async function referencedPaths(projectDir: string): Promise<Set<string>> {
+  const sources = [join(projectDir, "build-report.json")];
+  const metadataDir = join(projectDir, ".vibeframe", "assets");
+  for (const name of await readdir(metadataDir).catch(() => [])) {
+    if (name.endsWith(".json")) sources.push(join(metadataDir, name));
+  }
+  const paths = new Set<string>();
+  const visit = (value: unknown, key: string): void => {
+    if (typeof value === "string") {
+      if ((key === "path" || key.endsWith("Path")) && value) {
+        paths.add(projectRelative(projectDir, value));
+      }
+    } else if (Array.isArray(value)) {
+      for (const item of value) visit(item, key);
+    } else if (value && typeof value === "object") {
+      for (const [k, v] of Object.entries(value)) visit(v, k);
+    }
+  };
+  for (const source of sources) {
+    try {
+      visit(JSON.parse(await readFile(source, "utf-8")), "");
+    } catch {
+      // Unreadable report or metadata references nothing.
+    }
+  }
+  return paths;
+}
+
+/**
+ * Content hash of a project file: the recorded blob when the file is still a
+ * hardlink to it, otherwise by hashing the file.
+ */
+async function contentOf(
+  projectDir: string,
+  rel: string,
+  index: BlobIndex,
+  hint?: string
+): Promise<string | undefined> {
+  const abs = join(projectDir, rel);
+  const info = await stat(abs).catch(() => null);
+  if (!info?.isFile()) return undefined;
+  const recorded =
+    hint ?? Object.keys(index.blobs).find((sha) => index.blobs[sha].refs.includes(rel));
+  if (recorded) {
+    const blob = await stat(blobPath(projectDir, recorded)).catch(() => null);
+    if (blob && blob.dev === info.dev && blob.ino === info.ino) return recorded;
+  }
+  return hashFile(abs);
+}
+
+function isCacheEntry(rel: string): boolean {
+  return rel.startsWith(`.vibeframe/cache/`) && !rel.startsWith(`.vibeframe/cache/blobs/`);
+}
+
+function projectRelative(projectDir: string, path: string): string {
+  const abs = isAbsolute(path) ? path : resolve(projectDir, path);
+  return relative(projectDir, abs).split(sep).join("/");
+}
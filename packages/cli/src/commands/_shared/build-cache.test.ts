@@ -3,6 +3,8 @@ import { describe, expect, it } from "vitest";
 import {
   characterCacheDescriptor,
   keyframeCacheDescriptor,
+  narrationCacheDescriptor,
+  narrationContentCacheDescriptor,
   videoCacheDescriptor,
 } from "./build-cache.js";
 
@@ -91,3 +93,19 @@ describe("keyframeCacheDescriptor", () => {
     ).not.toBe(a.key);
   });
 });
+
+describe("narrationContentCacheDescriptor", () => {
+  const base = {
+    cue: "Welcome back.",
+    provider: "elevenlabs",
+    voice: "rachel",
+    ext: "mp3" as const,
+  };
+
+  it("shares one entry across beats reading the same cue", () => {
+    const shared = narrationContentCacheDescriptor(base);
+    expect(shared.path).toBe(`.vibeframe/cache/assets/narration-${shared.key}.mp3`);
+    expect(narrationCacheDescriptor({ ...base, beatId: "intro" }).key).not.toBe(shared.key);
+    expect(narrationContentCacheDescriptor({ ...base, voice: "adam" }).key).not.toBe(shared.key);
+  });
+});
@@ -45,6 +45,24 @@ export function narrationCacheDescriptor(opts: {
   });
 }
 
+/**
+ * Beat-independent narration key: identical (cue, provider, voice) in two
+ * beats — or a cue moved to a renamed beat — maps to one synthesized file.
+ */
+export function narrationContentCacheDescriptor(opts: {
+  cue: string;
+  provider: string;
+  voice?: unknown;
+  ext: "mp3" | "wav";
+}): CacheAssetDescriptor {
+  return cacheAssetDescriptor("narration", {
+    cue: opts.cue,
+    provider: opts.provider,
+    voice: opts.voice,
+    ext: opts.ext,
+  });
+}
+
 export function backdropCacheDescriptor(opts: {
   beatId: string;
   cue: string;
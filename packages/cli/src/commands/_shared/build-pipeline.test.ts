@@ -0,0 +1,59 @@
+import { describe, expect, it } from "vitest";
+import { BeatStageTracker, type BeatPipelineEvent } from "./build-pipeline.js";
+
+describe("BeatStageTracker", () => {
+  it("reports in-flight stages across beats and the hidden downstream time", async () => {
+    let clock = 0;
+    const events: BeatPipelineEvent[] = [];
+    const tracker = new BeatStageTracker((event) => events.push(event), () => clock);
+
+    // Beat a: narration 0-10, then transcript 10-30. Beat b: video 0-25.
+    let finishVideo!: () => void;
+    const video = tracker.track(
+      "b",
+      "visual",
+      () => new Promise<void>((resolve) => (finishVideo = resolve))
+    );
+    await tracker.track("a", "narration", async () => {
+      clock = 10;
+    });
+    const transcript = tracker.track("a", "transcript", async () => {
+      clock = 25;
+      finishVideo();
+      await video;
+      clock = 30;
+    });
+    await Promise.all([video, transcript]);
+
+    expect(events[0]).toEqual({
+      type: "beat-stage-start",
+      beatId: "b",
+      stage: "visual",
+      inFlight: 1,
+    });
+    expect(events).toContainEqual({
+      type: "beat-stage-start",
+      beatId: "a",
+      stage: "transcript",
+      inFlight: 2,
+    });
+    expect(tracker.summarize()).toEqual({
+      type: "pipeline-overlap",
+      wallMs: 30,
+      overlappedMs: 15,
+      downstreamMs: 20,
+    });
+    expect(events[events.length - 1].type).toBe("pipeline-overlap");
+  });
+
+  it("still reports a stage as done when it throws", async () => {
+    const events: BeatPipelineEvent[] = [];
+    const tracker = new BeatStageTracker((event) => events.push(event));
+    await expect(
+      tracker.track("a", "music", async () => {
+        throw new Error("boom");
+      })
+    ).rejects.toThrow("boom");
+    expect(events.map((event) => event.type)).toEqual(["beat-stage-start", "beat-stage-done"]);
+  });
+});
@@ -0,0 +1,115 @@
+/**
+ * @module _shared/build-pipeline
+ *
+ * Per-beat stage tracking for `vibe build`. The asset fan-out no longer runs
+ * as one barrier followed by the next phase: a beat's transcript starts as
+ * soon as its narration lands, while other beats are still waiting on video.
+ * The tracker times each beat's stages, reports how many stages are running
+ * across beats at every transition, and summarises how much downstream work
+ * was hidden under the asset fan-out.
+ */
+
+export type BeatPipelineStage = "narration" | "backdrop" | "visual" | "music" | "transcript";
+
+/** Asset stages; anything else is downstream work that can overlap them. */
+const ASSET_STAGES: ReadonlySet<BeatPipelineStage> = new Set([
+  "narration",
+  "backdrop",
+  "visual",
+  "music",
+]);
+
+export type BeatPipelineEvent =
+  | { type: "beat-stage-start"; beatId: string; stage: BeatPipelineStage; inFlight: number }
+  | {
+      type: "beat-stage-done";
+      beatId: string;
+      stage: BeatPipelineStage;
+      latencyMs: number;
+      inFlight: number;
+    }
+  | {
+      type: "pipeline-overlap";
+      /** First stage start to last stage end. */
+      wallMs: number;
+      /** Downstream (transcript) time spent while some beat's assets were still running. */
+      overlappedMs: number;
+      /** Total downstream time; `overlappedMs / downstreamMs` is the hidden share. */
+      downstreamMs: number;
+    };
+
+interface StageSpan {
+  stage: BeatPipelineStage;
+  start: number;
+  end?: number;
+}
+
+export class BeatStageTracker {
+  private readonly spans: StageSpan[] = [];
+  private inFlight = 0;
+
+  constructor(
+    private readonly emit: (event: BeatPipelineEvent) => void,
+    private readonly now: () => number = () => performance.now()
+  ) {}
+
+  /** Time `task` as `stage` of `beatId`, emitting start/done around it. */
+  async track<T>(beatId: string, stage: BeatPipelineStage, task: () => Promise<T>): Promise<T> {
+    const span: StageSpan = { stage, start: this.now() };
+    this.spans.push(span);
+    this.inFlight += 1;
+    this.emit({ type: "beat-stage-start", beatId, stage, inFlight: this.inFlight });
+    try {
+      return await task();
+    } finally {
+      span.end = this.now();
+      this.inFlight -= 1;
+      this.emit({
+        type: "beat-stage-done",
+        beatId,
+        stage,
+        latencyMs: Math.round(span.end - span.start),
+        inFlight: this.inFlight,
+      });
+    }
+  }
+
+  /** Emit and return the overlap summary for every span finished so far. */
+  summarize(): Extract<BeatPipelineEvent, { type: "pipeline-overlap" }> {
+    const done = this.spans.filter((span): span is Required<StageSpan> => span.end !== undefined);
+    const assets = mergeIntervals(done.filter((span) => ASSET_STAGES.has(span.stage)));
+    let overlappedMs = 0;
+    let downstreamMs = 0;
+    for (const span of done) {
+      if (ASSET_STAGES.has(span.stage)) continue;
+      downstreamMs += span.end - span.start;
+      for (const [start, end] of assets) {
+        overlappedMs += Math.max(0, Math.min(end, span.end) - Math.max(start, span.start));
+      }
+    }
+    const wallMs =
+      done.length > 0
+        ? Math.max(...done.map((span) => span.end)) - Math.min(...done.map((span) => span.start))
+        : 0;
+    const event = {
+      type: "pipeline-overlap" as const,
+      wallMs: Math.round(wallMs),
+      overlappedMs: Math.round(overlappedMs),
+      downstreamMs: Math.round(downstreamMs),
+    };
+    this.emit(event);
+    return event;
+  }
+}
+
+function mergeIntervals(spans: Array<Required<StageSpan>>): Array<[number, number]> {
+  const sorted = spans.map((span): [number, number] => [span.start, span.end]);
+  sorted.sort((a, b) => a[0] - b[0]);
+  const merged: Array<[number, number]> = [];
+  for (const interval of sorted) {
+    const last = merged[merged.length - 1];
+    if (last && interval[0] <= last[1]) last[1] = Math.max(last[1], interval[1]);
+    else merged.push([...interval]);
+  }
+  return merged;
+}
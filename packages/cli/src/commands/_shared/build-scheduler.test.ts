@@ -0,0 +1,194 @@
+import { afterEach, describe, expect, it, vi } from "vitest";
+import { providerFetch, resetTransport } from "@vibeframe/ai-providers";
+import {
+  BuildScheduler,
+  detectRateLimit,
+  isRetryableFailure,
+  resolveLaneBudget,
+} from "./build-scheduler.js";
+
+function deferred(): { promise: Promise<void>; resolve: () => void } {
+  let resolve!: () => void;
+  const promise = new Promise<void>((r) => (resolve = r));
+  return { promise, resolve };
+}
+
+describe("resolveLaneBudget", () => {
+  it("layers kind and kind:provider overrides over the defaults", () => {
+    expect(resolveLaneBudget("tts", "elevenlabs")).toEqual({
+      concurrency: 4,
+      ratePerMinute: undefined,
+    });
+    expect(resolveLaneBudget("tts", "openai")).toEqual({ concurrency: 8, ratePerMinute: undefined });
+    expect(
+      resolveLaneBudget("video", "kling", {
+        video: { concurrency: 5 },
+        "video:kling": { ratePerMinute: 3 },
+      })
+    ).toEqual({ concurrency: 5, ratePerMinute: 3 });
+  });
+
+  it("falls back to one slot for invalid values", () => {
+    expect(resolveLaneBudget("image", "openai", { image: { concurrency: 0 } }).concurrency).toBe(1);
+  });
+});
+
+describe("detectRateLimit", () => {
+  it("recognizes provider 429 results and parses Retry-After", () => {
+    expect(
+      detectRateLimit({ success: false, error: "TTS failed: too_many_concurrent_requests" })
+    ).toEqual({});
+    expect(
+      detectRateLimit({ success: false, error: "HTTP 429 Too Many Requests (Retry-After: 7)" })
+    ).toEqual({ retryAfterMs: 7000 });
+    expect(detectRateLimit(new Error("rate limit exceeded, retry after 250 ms"))).toEqual({
+      retryAfterMs: 250,
+    });
+  });
+
+  it("ignores successes, other failures and billing 429s", () => {
+    expect(detectRateLimit({ success: true })).toBeNull();
+    expect(detectRateLimit({ success: false, error: "HTTP 401 unauthorized" })).toBeNull();
+    expect(
+      detectRateLimit({ success: false, error: "429: Account balance not enough" })
+    ).toBeNull();
+    expect(
+      detectRateLimit({
+        success: false,
+        error: "429 insufficient_quota: You exceeded your current quota",
+      })
+    ).toBeNull();
+  });
+
+  it("only treats a standalone 402 as billing", () => {
+    expect(detectRateLimit({ success: false, error: "HTTP 402 Payment Required" })).toBeNull();
+    expect(
+      detectRateLimit({ success: false, error: "429 rate limited, retry after 4020ms" })
+    ).toEqual({ retryAfterMs: 4020 });
+    expect(detectRateLimit({ success: false, error: "job 840213: rate limit exceeded" })).toEqual({});
+  });
+});
+
+describe("isRetryableFailure", () => {
+  it("retries rate limits and transient server or network failures", () => {
+    expect(isRetryableFailure({ success: false, error: "HTTP 429 Too Many Requests" })).toBe(true);
+    expect(isRetryableFailure({ success: false, error: "HTTP 503 Service Unavailable" })).toBe(
+      true
+    );
+    expect(isRetryableFailure(new Error("fetch failed: ECONNRESET"))).toBe(true);
+    expect(isRetryableFailure({ success: false, error: "upstream", status: 502 })).toBe(true);
+  });
+
+  it("does not retry billing, auth or request errors", () => {
+    expect(isRetryableFailure({ success: false, error: "HTTP 402 Payment Required" })).toBe(false);
+    expect(isRetryableFailure({ success: false, error: "HTTP 401 unauthorized" })).toBe(false);
+    expect(isRetryableFailure({ success: false, error: "voice_not_found" })).toBe(false);
+    expect(isRetryableFailure({ success: true })).toBe(false);
+  });
+});
+
+describe("BuildScheduler", () => {
+  it("caps concurrency per lane without blocking other lanes", async () => {
+    const scheduler = new BuildScheduler({ budgets: { "video:kling": { concurrency: 2 } } });
+    const gate = deferred();
+    let inFlight = 0;
+    let peak = 0;
+    const videoJob = () =>
+      scheduler.run("video", "kling", async () => {
+        inFlight += 1;
+        peak = Math.max(peak, inFlight);
+        await gate.promise;
+        inFlight -= 1;
+      });
+
+    const videos = Array.from({ length: 5 }, videoJob);
+    // A different lane still runs while video is saturated.
+    await expect(scheduler.run("tts", "openai", async () => "ok")).resolves.toBe("ok");
+    gate.resolve();
+    await Promise.all(videos);
+
+    expect(peak).toBe(2);
+    const video = scheduler.stats().find((lane) => lane.lane === "video:kling");
+    expect(video).toMatchObject({ started: 5, peakInFlight: 2 });
+  });
+
+  it("starts the highest-priority waiter first", async () => {
+    const scheduler = new BuildScheduler({ budgets: { image: { concurrency: 1 } } });
+    const gate = deferred();
+    const order: string[] = [];
+    const blocker = scheduler.run("image", "openai", () => gate.promise);
+    const backdrop = scheduler.run("image", "openai", async () => {
+      order.push("backdrop");
+    });
+    const keyframe = scheduler.run(
+      "image",
+      "openai",
+      async () => {
+        order.push("keyframe");
+      },
+      { priority: 2 }
+    );
+    gate.resolve();
+    await Promise.all([blocker, backdrop, keyframe]);
+
+    expect(order).toEqual(["keyframe", "backdrop"]);
+  });
+
+  it("retries rate-limited calls and backs the lane off", async () => {
+    const scheduler = new BuildScheduler({
+      budgets: { "tts:elevenlabs": { concurrency: 4 } },
+      backoffMs: 1,
+    });
+    let calls = 0;
+    const result = await scheduler.run("tts", "elevenlabs", async () => {
+      calls += 1;
+      return calls === 1
+        ? { success: false, error: "429 too many requests, retry after 5 ms" }
+        : { success: true };
+    });
+
+    expect(result).toEqual({ success: true });
+    expect(calls).toBe(2);
+    expect(scheduler.stats()[0]).toMatchObject({ rateLimited: 1, concurrency: 2 });
+  });
+
+  it("returns the last limited result once retries are exhausted", async () => {
+    const scheduler = new BuildScheduler({ maxRetries: 1, backoffMs: 1 });
+    let calls = 0;
+    const result = await scheduler.run("music", "elevenlabs", async () => {
+      calls += 1;
+      return { success: false, error: "rate limited" };
+    });
+
+    expect(result).toEqual({ success: false, error: "rate limited" });
+    expect(calls).toBe(2);
+  });
+
+  describe("with the HTTP transport", () => {
+    afterEach(async () => {
+      vi.unstubAllGlobals();
+      await resetTransport();
+    });
+
+    it("owns rate-limit retries instead of stacking them on the transport's", async () => {
+      const fetchMock = vi.fn().mockResolvedValue({
+        ok: false,
+        status: 429,
+        headers: new Headers({ "retry-after": "0" }),
+      });
+      vi.stubGlobal("fetch", fetchMock);
+      const scheduler = new BuildScheduler({ maxRetries: 1, backoffMs: 1 });
+
+      const status = await scheduler.run("tts", "elevenlabs", async () => {
+        const response = await providerFetch("https://api.example.test/v1/speech", {
+          method: "POST",
+        });
+        return { success: false, status: response.status, error: `HTTP ${response.status}` };
+      });
+
+      expect(status).toMatchObject({ status: 429 });
+      // One request per scheduler attempt, none from the transport.
+      expect(fetchMock).toHaveBeenCalledTimes(2);
+    });
+  });
+});
@@ -0,0 +1,342 @@
+/**
+ * @module _shared/build-scheduler
+ *
+ * Provider-aware dispatch for `vibe build`'s asset fan-out. Every provider
+ * call runs in a lane keyed by `<kind>:<provider>` (e.g. `tts:elevenlabs`,
+ * `video:kling`), and each lane has its own concurrency cap and optional
+ * token-bucket rate. A 40-beat storyboard can therefore run 8 TTS requests
+ * at once while Kling still sees at most 3 submissions in flight.
+ *
+ * Lanes adapt to rate limits: a 429 / "too many requests" result pauses the
+ * lane for the provider's `Retry-After` (or an exponential backoff), halves
+ * its concurrency, and retries the call. Successes grow the cap back one slot
+ * at a time up to the configured budget. The scheduler is the only layer that
+ * retries rate limits: tasks run with the HTTP transport's 429 retries off,
+ * so a limited call is not retried both there and here.
+ *
+ * Waiting calls are started highest-priority first, so callers can order the
+ * asset DAG (character sheet → keyframe → video) and get the long-running
+ * video submissions out ahead of independent stills.
+ */
+
+import { withTransportOptions } from "@vibeframe/ai-providers";
+
+export type ScheduledKind = "tts" | "image" | "video" | "music" | "transcribe";
+
+export interface LaneBudget {
+  /** Maximum concurrent calls in the lane. */
+  concurrency: number;
+  /** Optional sustained start rate; bursts up to `concurrency`. */
+  ratePerMinute?: number;
+}
+
+/**
+ * `build.budgets` in `vibe.config.json`. Keys are a kind (`"tts"`) or a
+ * kind/provider pair (`"video:kling"`); the pair wins over the kind.
+ */
+export type BuildBudgets = Record<string, Partial<LaneBudget>>;
+
+/**
+ * Defaults when the project does not override a lane. ElevenLabs
+ * subscriptions allow 5 concurrent requests (overflow is a 429
+ * too_many_concurrent_requests), so its lane keeps one slot of headroom.
+ * Video providers get few slots because they burst-limit submissions; a
+ * lane that still hits 429 backs off on its own.
+ */
+export const DEFAULT_BUILD_BUDGETS: Readonly<Record<string, LaneBudget>> = {
+  tts: { concurrency: 8 },
+  "tts:elevenlabs": { concurrency: 4 },
+  "tts:kokoro": { concurrency: 2 },
+  image: { concurrency: 4 },
+  video: { concurrency: 3 },
+  music: { concurrency: 2 },
+  transcribe: { concurrency: 4 },
+};
+
+const DEFAULT_MAX_RETRIES = 2;
+const DEFAULT_BACKOFF_MS = 2000;
+const MAX_BACKOFF_MS = 60_000;
+
+/** Must match first: Kling returns 429 for "Account balance not enough". */
+const BILLING_PATTERN =
+  /\b402\b|insufficient[_ ]quota|exceeded your current quota|quota[_ ]exceeded|payment.*required|INSUFFICIENT_BALANCE|insufficient.*(credit|funds|balance)|balance.*(not.*enough|insufficient)|credits?.*exhausted/i;
+const RATE_LIMIT_PATTERN =
+  /\b429\b|rate.?limit|too.?many.?(concurrent.?)?requests|RESOURCE_EXHAUSTED/i;
+const RETRY_AFTER_PATTERN = /retry[-_ ]?after\D{0,12}(\d+(?:\.\d+)?)\s*(ms|milliseconds?)?/i;
+const TRANSIENT_PATTERN =
+  /\b50[0234]\b|service.?unavailable|overloaded|timed?.?out|ETIMEDOUT|ECONNRESET|ECONNREFUSED|EAI_AGAIN|socket hang up|fetch failed|network/i;
+
+export function resolveLaneBudget(
+  kind: ScheduledKind,
+  provider: string,
+  overrides: BuildBudgets = {}
+): LaneBudget {
+  const key = `${kind}:${provider}`;
+  const merged: Partial<LaneBudget> = {
+    ...DEFAULT_BUILD_BUDGETS[kind],
+    ...DEFAULT_BUILD_BUDGETS[key],
+    ...overrides[kind],
+    ...overrides[key],
+  };
+  const concurrency = Math.floor(Number(merged.concurrency));
+  const rate = Number(merged.ratePerMinute);
+  return {
+    concurrency: Number.isFinite(concurrency) && concurrency > 0 ? concurrency : 1,
+    ratePerMinute: Number.isFinite(rate) && rate > 0 ? rate : undefined,
+  };
+}
+
+export interface RateLimitSignal {
+  retryAfterMs?: number;
+}
+
+/**
+ * Classify a thrown error or a `{ success: false, error }` provider result as
+ * a rate limit. Billing failures that reuse HTTP 429 are not rate limits.
+ */
+export function detectRateLimit(value: unknown): RateLimitSignal | null {
+  let message: string | undefined;
+  let status: unknown;
+  if (value instanceof Error) {
+    message = value.message;
+    status = (value as { status?: unknown }).status;
+  } else if (value && typeof value === "object") {
+    const record = value as { success?: unknown; error?: unknown; status?: unknown };
+    if (record.success !== false) return null;
+    message = typeof record.error === "string" ? record.error : undefined;
+    status = record.status;
+  }
+  if (message === undefined && status !== 429) return null;
+  const text = message ?? "";
+  if (BILLING_PATTERN.test(text)) return null;
+  if (status !== 429 && !RATE_LIMIT_PATTERN.test(text)) return null;
+
+  const match = RETRY_AFTER_PATTERN.exec(text);
+  if (!match) return {};
+  const amount = Number.parseFloat(match[1]);
+  return { retryAfterMs: match[2] ? amount : amount * 1000 };
+}
+
+/**
+ * Whether a thrown error or a `{ success: false, error }` provider result is
+ * worth another request: rate limits and transient server or network
+ * failures. Billing, auth and request errors fail the same way every time.
+ */
+export function isRetryableFailure(value: unknown): boolean {
+  if (detectRateLimit(value)) return true;
+  let message: unknown;
+  let status: unknown;
+  if (value instanceof Error) {
+    message = value.message;
+    status = (value as { status?: unknown }).status;
+  } else if (value && typeof value === "object") {
+    const record = value as { success?: unknown; error?: unknown; status?: unknown };
+    if (record.success !== false) return false;
+    message = record.error;
+    status = record.status;
+  }
+  const text = typeof message === "string" ? message : "";
+  if (BILLING_PATTERN.test(text)) return false;
+  return (typeof status === "number" && status >= 500) || TRANSIENT_PATTERN.test(text);
+}
+
+export interface LaneStats {
+  lane: string;
+  budget: LaneBudget;
+  /** Current adaptive cap (≤ budget.concurrency). */
+  concurrency: number;
+  started: number;
+  rateLimited: number;
+  peakInFlight: number;
+}
+
+export interface BuildSchedulerOptions {
+  budgets?: BuildBudgets;
+  /** Rate-limit retries per call before the limited result is returned. */
+  maxRetries?: number;
+  /** First backoff when the provider gave no Retry-After; doubles per attempt. */
+  backoffMs?: number;
+}
+
+export interface ScheduleOptions {
+  /** Higher starts first among calls waiting in the same lane. */
+  priority?: number;
+}
+
+interface Waiter {
+  priority: number;
+  seq: number;
+  start: () => void;
+}
+
+class Lane {
+  readonly name: string;
+  readonly budget: LaneBudget;
+  limit: number;
+  inFlight = 0;
+  started = 0;
+  rateLimited = 0;
+  peakInFlight = 0;
+  private successStreak = 0;
+  private tokens: number;
+  private refilledAt = Date.now();
+  private pausedUntil = 0;
+  private readonly queue: Waiter[] = [];
+  private timer: ReturnType<typeof setTimeout> | null = null;
+  private seq = 0;
+
+  constructor(name: string, budget: LaneBudget) {
+    this.name = name;
+    this.budget = budget;
+    this.limit = budget.concurrency;
+    this.tokens = budget.concurrency;
+  }
+
+  acquire(priority: number): Promise<void> {
+    return new Promise((resolve) => {
+      this.queue.push({ priority, seq: this.seq++, start: resolve });
+      this.pump();
+    });
+  }
+
+  release(outcome: "ok" | "rate-limited", retryAfterMs?: number): void {
+    this.inFlight -= 1;
+    if (outcome === "rate-limited") {
+      this.rateLimited += 1;
+      this.successStreak = 0;
+      this.limit = Math.max(1, Math.floor(this.limit / 2));
+      if (retryAfterMs !== undefined) {
+        this.pausedUntil = Math.max(this.pausedUntil, Date.now() + retryAfterMs);
+      }
+    } else if (this.limit < this.budget.concurrency) {
+      this.successStreak += 1;
+      if (this.successStreak >= this.limit) {
+        this.limit += 1;
+        this.successStreak = 0;
+      }
+    }
+    this.pump();
+  }
+
+  private pump(): void {
+    while (this.queue.length > 0 && this.inFlight < this.limit) {
+      const waitMs = this.waitMs();
+      if (waitMs > 0) {
+        this.schedulePump(waitMs);
+        return;
+      }
+      if (this.budget.ratePerMinute) this.tokens -= 1;
+      const next = this.takeNext();
+      this.inFlight += 1;
+      this.started += 1;
+      this.peakInFlight = Math.max(this.peakInFlight, this.inFlight);
+      next.start();
+    }
+  }
+
+  private waitMs(): number {
+    const now = Date.now();
+    if (now < this.pausedUntil) return this.pausedUntil - now;
+    const rate = this.budget.ratePerMinute;
+    if (!rate) return 0;
+    const perMs = rate / 60_000;
+    this.tokens = Math.min(this.budget.concurrency, this.tokens + (now - this.refilledAt) * perMs);
+    this.refilledAt = now;
+    return this.tokens >= 1 ? 0 : Math.ceil((1 - this.tokens) / perMs);
+  }
+
+  private takeNext(): Waiter {
+    let best = 0;
+    for (let i = 1; i < this.queue.length; i += 1) {
+      const candidate = this.queue[i];
+      const current = this.queue[best];
+      if (
+        candidate.priority > current.priority ||
+        (candidate.priority === current.priority && candidate.seq < current.seq)
+      ) {
+        best = i;
+      }
+    }
+    return this.queue.splice(best, 1)[0];
+  }
+
+  private schedulePump(waitMs: number): void {
+    if (this.timer) return;
+    this.timer = setTimeout(() => {
+      this.timer = null;
+      this.pump();
+    }, waitMs);
+  }
+}
+
+export class BuildScheduler {
+  private readonly lanes = new Map<string, Lane>();
+  private readonly budgets: BuildBudgets;
+  private readonly maxRetries: number;
+  private readonly backoffMs: number;
+
+  constructor(opts: BuildSchedulerOptions = {}) {
+    this.budgets = opts.budgets ?? {};
+    this.maxRetries = opts.maxRetries ?? DEFAULT_MAX_RETRIES;
+    this.backoffMs = opts.backoffMs ?? DEFAULT_BACKOFF_MS;
+  }
+
+  /**
+   * Run `task` in the `<kind>:<provider>` lane. Rate-limited outcomes (thrown
+   * or returned as `{ success: false }`) are retried up to `maxRetries`
+   * times; the last outcome is passed through unchanged.
+   */
+  async run<T>(
+    kind: ScheduledKind,
+    provider: string,
+    task: () => Promise<T>,
+    opts: ScheduleOptions = {}
+  ): Promise<T> {
+    const lane = this.lane(kind, provider);
+    for (let attempt = 0; ; attempt += 1) {
+      await lane.acquire(opts.priority ?? 0);
+      let result: T;
+      try {
+        result = await withTransportOptions({ retryRateLimits: false }, task);
+      } catch (error) {
+        const signal = detectRateLimit(error);
+        this.settle(lane, signal, attempt);
+        if (!signal || attempt >= this.maxRetries) throw error;
+        continue;
+      }
+      const signal = detectRateLimit(result);
+      this.settle(lane, signal, attempt);
+      if (!signal || attempt >= this.maxRetries) return result;
+    }
+  }
+
+  stats(): LaneStats[] {
+    return [...this.lanes.values()].map((lane) => ({
+      lane: lane.name,
+      budget: lane.budget,
+      concurrency: lane.limit,
+      started: lane.started,
+      rateLimited: lane.rateLimited,
+      peakInFlight: lane.peakInFlight,
+    }));
+  }
+
+  private lane(kind: ScheduledKind, provider: string): Lane {
+    const name = `${kind}:${provider}`;
+    let lane = this.lanes.get(name);
+    if (!lane) {
+      lane = new Lane(name, resolveLaneBudget(kind, provider, this.budgets));
+      this.lanes.set(name, lane);
+    }
+    return lane;
+  }
+
+  private settle(lane: Lane, signal: RateLimitSignal | null, attempt: number): void {
+    if (!signal) {
+      lane.release("ok");
+      return;
+    }
+    const delay = signal.retryAfterMs ?? this.backoffMs * 2 ** attempt;
+    lane.release("rate-limited", Math.min(MAX_BACKOFF_MS, delay));
+  }
+}
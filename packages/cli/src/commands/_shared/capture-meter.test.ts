@@ -0,0 +1,36 @@
+import { describe, expect, it } from "vitest";
+
+import { createCaptureMeter } from "./capture-meter.js";
+
+describe("createCaptureMeter", () => {
+  it("charges time between callbacks to the stage that was running", () => {
+    let clock = 0;
+    const meter = createCaptureMeter(() => clock);
+
+    meter.observe(0, "preprocess");
+    clock = 400;
+    meter.observe(0, "capture");
+    clock = 900;
+    meter.observe(0, "capture");
+    clock = 2_000;
+    meter.observe(0, "encode");
+    clock = 2_300;
+    meter.end(0);
+    clock = 9_000;
+
+    expect(meter.stages()).toEqual({ preprocess: 400, capture: 1_600, encode: 300 });
+  });
+
+  it("sums concurrent jobs and closes stages still open", () => {
+    let clock = 0;
+    const meter = createCaptureMeter(() => clock);
+
+    meter.observe(0, "capture");
+    meter.observe(1, "capture");
+    clock = 1_000;
+    meter.observe(1, "encode");
+    clock = 1_500;
+
+    expect(meter.stages()).toEqual({ capture: 2_500, encode: 500 });
+  });
+});
@@ -0,0 +1,47 @@
+/**
+ * @module _shared/capture-meter
+ *
+ * Per-stage timing for producer render jobs. The producer reports progress
+ * as `(job, message)` callbacks with a `currentStage` name; the meter charges
+ * the time between two callbacks of the same job to the stage the first one
+ * named. Concurrent jobs (beat shards) are tracked separately and summed, so
+ * totals are job-time, not wall-clock time.
+ */
+
+export interface CaptureMeter {
+  /** Record a progress callback from job `job` that is now in `stage`. */
+  observe(job: number, stage: string): void;
+  /** Charge job `job`'s open stage up to now and stop tracking it. */
+  end(job: number): void;
+  /** Milliseconds per stage, rounded; closes stages still open. */
+  stages(): Record<string, number>;
+}
+
+export function createCaptureMeter(now: () => number = Date.now): CaptureMeter {
+  const totals = new Map<string, number>();
+  const open = new Map<number, { stage: string; since: number }>();
+
+  const close = (job: number, at: number) => {
+    const current = open.get(job);
+    if (!current) return;
+    totals.set(current.stage, (totals.get(current.stage) ?? 0) + (at - current.since));
+    open.delete(job);
+  };
+
+  return {
+    observe(job, stage) {
+      const at = now();
+      if (open.get(job)?.stage === stage) return;
+      close(job, at);
+      open.set(job, { stage, since: at });
+    },
+    end(job) {
+      close(job, now());
+    },
+    stages() {
+      const at = now();
+      for (const job of [...open.keys()]) close(job, at);
+      return Object.fromEntries([...totals].map(([stage, ms]) => [stage, Math.round(ms)]));
+    },
+  };
+}
@@ -0,0 +1,81 @@
+import { describe, expect, it } from "vitest";
+import { Command, Option } from "commander";
+import { buildSchema } from "../schema.js";
+import {
+  buildCommandManifest,
+  commandFromManifest,
+  describeCommand,
+  type CommandManifestNode,
+} from "./command-manifest.js";
+import { COMMAND_REGISTRY } from "./command-registry.js";
+import { applyTier, getCostTier } from "./cost-tier.js";
+
+function leaves(cmd: Command, path: string[] = []): Array<[string[], Command]> {
+  const here = [...path, cmd.name()];
+  return cmd.commands.length === 0 ? [[here, cmd]] : cmd.commands.flatMap((c) => leaves(c, here));
+}
+
+describe("commandFromManifest", () => {
+  it("round-trips arguments, options, aliases, hidden children and cost tiers", () => {
+    const parent = new Command("generate").description("Generate assets");
+    const video = new Command("video")
+      .alias("v")
+      .description("Generate a video")
+      .argument("<prompt>", "Text prompt")
+      .argument("[extra...]", "Extra words")
+      .option("-o, --output <path>", "Output file")
+      .option("-d, --duration <sec>", "Duration in seconds", "5")
+      .addOption(new Option("--provider <name>", "Provider").choices(["kling", "veo"]))
+      .addOption(new Option("--legacy", "Old flag").hideHelp())
+      .action(() => undefined);
+    applyTier(video, "high");
+    parent.addCommand(video);
+    parent.addCommand(new Command("old").description("Deprecated"), { hidden: true });
+
+    const node = describeCommand(parent);
+    const stub = commandFromManifest(node);
+
+    expect(describeCommand(stub)).toEqual(node);
+    expect(getCostTier(stub.commands[0])).toBe("high");
+    expect(buildSchema(stub.commands[0], "generate_video")).toEqual(
+      buildSchema(video, "generate_video")
+    );
+  });
+
+  it("keeps the registry's hidden flags on top-level entries", () => {
+    const hidden = COMMAND_REGISTRY.filter((entry) => entry.hidden).map((entry) => entry.name);
+    expect(hidden).toEqual([
+      "demo",
+      "project",
+      "scene",
+      "timeline",
+      "batch",
+      "walkthrough",
+      "media",
+    ]);
+  });
+});
+
+describe("buildCommandManifest", () => {
+  it("describes every registered command so stubs match the real tree", async () => {
+    const manifest = await buildCommandManifest();
+    expect(manifest.commands.map((node) => node.name)).toEqual(
+      COMMAND_REGISTRY.map((entry) => entry.name)
+    );
+
+    for (const [i, entry] of COMMAND_REGISTRY.entries()) {
+      const real = await entry.load();
+      const node: CommandManifestNode = manifest.commands[i];
+      const stub = commandFromManifest(node);
+      expect({ ...describeCommand(stub), hidden: entry.hidden }).toEqual({
+        ...describeCommand(real),
+        hidden: entry.hidden,
+      });
+      const realLeaves = leaves(real);
+      for (const [j, [path, stubLeaf]] of leaves(stub).entries()) {
+        const toolName = path.join("_");
+        expect(buildSchema(stubLeaf, toolName)).toEqual(buildSchema(realLeaves[j][1], toolName));
+      }
+    }
+  });
+});
@@ -0,0 +1,147 @@
+/**
+ * @module _shared/command-manifest
+ *
+ * Serialized shape of the `vibe` command tree, so the CLI can answer
+ * `vibe --help`, `vibe schema`, `vibe completion`, and `--describe` for
+ * commands whose implementation modules it never imports.
+ *
+ * `build.js` loads every {@link COMMAND_REGISTRY} entry once, writes the
+ * tree with {@link buildCommandManifest}, and inlines it into
+ * `dist/index.js`. At startup, `src/index.ts` turns each top-level entry back
+ * into an inert Commander stub with {@link commandFromManifest}: same names,
+ * descriptions, arguments, options, hidden flags, and cost tiers, but no
+ * action. The command argv targets is always the real module.
+ */
+
+import { Argument, Command, Option } from "commander";
+
+import { COMMAND_REGISTRY } from "./command-registry.js";
+import { applyTier, getCostTier, type CostTier } from "./cost-tier.js";
+
+export interface ArgumentManifest {
+  name: string;
+  description?: string;
+  required?: boolean;
+  variadic?: boolean;
+  defaultValue?: unknown;
+  choices?: string[];
+}
+
+export interface OptionManifest {
+  flags: string;
+  description?: string;
+  defaultValue?: unknown;
+  defaultValueDescription?: string;
+  choices?: string[];
+  hidden?: boolean;
+  mandatory?: boolean;
+}
+
+export interface CommandManifestNode {
+  name: string;
+  description?: string;
+  aliases?: string[];
+  hidden?: boolean;
+  costTier?: CostTier;
+  arguments?: ArgumentManifest[];
+  options?: OptionManifest[];
+  commands?: CommandManifestNode[];
+}
+
+export interface CommandManifest {
+  schemaVersion: "1";
+  /** Top-level commands in registry order. */
+  commands: CommandManifestNode[];
+}
+
+/** Commander keeps these on private fields. */
+interface CommanderInternals {
+  _hidden?: boolean;
+}
+
+/** Load every registered command and describe the whole tree. Build-time only. */
+export async function buildCommandManifest(): Promise<CommandManifest> {
+  const commands: CommandManifestNode[] = [];
+  for (const entry of COMMAND_REGISTRY) {
+    const node = describeCommand(await entry.load());
+    commands.push(stripEmpty({ ...node, hidden: entry.hidden || undefined }));
+  }
+  return { schemaVersion: "1", commands };
+}
+
+export function describeCommand(cmd: Command): CommandManifestNode {
+  return stripEmpty({
+    name: cmd.name(),
+    description: cmd.description() || undefined,
+    aliases: nonEmpty(cmd.aliases()),
+    hidden: (cmd as unknown as CommanderInternals)._hidden || undefined,
+    costTier: getCostTier(cmd),
+    arguments: nonEmpty(
+      cmd.registeredArguments.map((arg) =>
+        stripEmpty({
+          name: arg.name(),
+          description: arg.description || undefined,
+          required: arg.required || undefined,
+          variadic: arg.variadic || undefined,
+          defaultValue: arg.defaultValue,
+          choices: arg.argChoices,
+        })
+      )
+    ),
+    options: nonEmpty(
+      cmd.options.map((opt) =>
+        stripEmpty({
+          flags: opt.flags,
+          description: opt.description || undefined,
+          defaultValue: opt.defaultValue,
+          defaultValueDescription: opt.defaultValueDescription,
+          choices: opt.argChoices,
+          hidden: opt.hidden || undefined,
+          mandatory: opt.mandatory || undefined,
+        })
+      )
+    ),
+    commands: nonEmpty(cmd.commands.map(describeCommand)),
+  });
+}
+
+/**
+ * Rebuild an action-less Commander command from its manifest node. Hidden
+ * flags on children are applied here; the caller applies the top-level one
+ * through `addCommand`.
+ */
+export function commandFromManifest(node: CommandManifestNode): Command {
+  const cmd = new Command(node.name);
+  if (node.description) cmd.description(node.description);
+  for (const alias of node.aliases ?? []) cmd.alias(alias);
+  for (const arg of node.arguments ?? []) {
+    const name = `${arg.name}${arg.variadic ? "..." : ""}`;
+    const argument = new Argument(arg.required ? `<${name}>` : `[${name}]`, arg.description);
+    if (arg.defaultValue !== undefined) argument.default(arg.defaultValue);
+    if (arg.choices) argument.choices(arg.choices);
+    cmd.addArgument(argument);
+  }
+  for (const opt of node.options ?? []) {
+    const option = new Option(opt.flags, opt.description);
+    if (opt.defaultValue !== undefined) {
+      option.default(opt.defaultValue, opt.defaultValueDescription);
+    }
+    if (opt.choices) option.choices(opt.choices);
+    if (opt.hidden) option.hideHelp();
+    if (opt.mandatory) option.makeOptionMandatory();
+    cmd.addOption(option);
+  }
+  if (node.costTier) applyTier(cmd, node.costTier);
+  for (const child of node.commands ?? []) {
+    cmd.addCommand(commandFromManifest(child), { hidden: child.hidden });
+  }
+  return cmd;
+}
+
+function nonEmpty<T>(items: readonly T[]): T[] | undefined {
+  return items.length > 0 ? [...items] : undefined;
+}
+
+function stripEmpty<T extends object>(value: T): T {
+  return Object.fromEntries(Object.entries(value).filter(([, v]) => v !== undefined)) as T;
+}
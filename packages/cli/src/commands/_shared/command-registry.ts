@@ -0,0 +1,85 @@
+/**
+ * @module _shared/command-registry
+ *
+ * Every top-level `vibe` command, in `vibe --help` / `vibe schema --list`
+ * order, with a loader that imports its implementation module on demand.
+ * `src/index.ts` only loads the command argv dispatches to; the rest of
+ * the tree is rebuilt from the build-time command manifest
+ * (see command-manifest.ts), so `vibe --version` or `vibe status` no longer
+ * evaluate the provider SDKs behind `generate`, `edit`, or `agent`.
+ *
+ * Adding a top-level command means adding it here (plus help-groups.ts and
+ * product-surface.ts as before); the manifest is regenerated by
+ * `node build.js`.
+ */
+
+import type { Command } from "commander";
+
+export interface CommandRegistryEntry {
+  name: string;
+  /** Hidden from `vibe --help`; still in `vibe schema --list` and completion. */
+  hidden?: boolean;
+  load: () => Promise<Command>;
+}
+
+export const COMMAND_REGISTRY: readonly CommandRegistryEntry[] = [
+  // Main commands (visible in --help)
+  { name: "generate", load: async () => (await import("../generate.js")).generateCommand },
+  { name: "edit", load: async () => (await import("../edit-cmd.js")).editCommand },
+  { name: "inspect", load: async () => (await import("../inspect.js")).inspectCommand },
+  { name: "audio", load: async () => (await import("../audio.js")).audioCommand },
+  { name: "remix", load: async () => (await import("../remix.js")).remixCommand },
+  { name: "setup", load: async () => (await import("../setup.js")).setupCommand },
+  { name: "init", load: async () => (await import("../init.js")).initCommand },
+  { name: "storyboard", load: async () => (await import("../storyboard.js")).storyboardCommand },
+  { name: "design", load: async () => (await import("../design.js")).designCommand },
+  { name: "plan", load: async () => (await import("../plan.js")).planCommand },
+  { name: "build", load: async () => (await import("../build.js")).buildCommand },
+  { name: "render", load: async () => (await import("../render.js")).renderCommand },
+  { name: "preview", load: async () => (await import("../preview.js")).previewCommand },
+  { name: "assemble", load: async () => (await import("../assemble.js")).assembleCommand },
+  { name: "status", load: async () => (await import("../status.js")).statusCommand },
+  { name: "cache", load: async () => (await import("../cache.js")).cacheCommand },
+  { name: "doctor", load: async () => (await import("../doctor.js")).doctorCommand },
+  { name: "host", load: async () => (await import("../host.js")).hostCommand },
+  { name: "serve", load: async () => (await import("../serve.js")).serveCommand },
+  { name: "demo", hidden: true, load: async () => (await import("../demo.js")).demoCommand },
+  { name: "run", load: async () => (await import("../run.js")).runCommand },
+  { name: "agent", load: async () => (await import("../agent.js")).agentCommand },
+
+  // Workflow commands
+  //
+  // `project`, `scene`, `timeline` are hidden from `vibe --help` because
+  // their descriptions either self-deprecate ("Deprecated alias…") or
+  // nudge users toward `init`/`build`/`render` ("For project flow use
+  // `vibe init`…"). They still register, still show in
+  // `vibe schema --list`, and tab completion still finds them — they
+  // just don't take visual weight in the front-page Commands list.
+  {
+    name: "project",
+    hidden: true,
+    load: async () => (await import("../project.js")).projectCommand,
+  },
+  { name: "scene", hidden: true, load: async () => (await import("../scene.js")).sceneCommand },
+  {
+    name: "timeline",
+    hidden: true,
+    load: async () => (await import("../timeline.js")).timelineCommand,
+  },
+  { name: "detect", load: async () => (await import("../detect.js")).detectCommand },
+  { name: "batch", hidden: true, load: async () => (await import("../batch.js")).batchCommand },
+
+  // Agent integration commands
+  { name: "schema", load: async () => (await import("../schema.js")).schemaCommand },
+  { name: "context", load: async () => (await import("../context.js")).contextCommand },
+  { name: "guide", load: async () => (await import("../walkthrough.js")).guideCommand },
+  {
+    name: "walkthrough",
+    hidden: true,
+    load: async () => (await import("../walkthrough.js")).legacyGuideAliasCommand,
+  },
+  { name: "completion", load: async () => (await import("../completion.js")).completionCommand },
+
+  // Utility commands (less commonly used directly)
+  { name: "media", hidden: true, load: async () => (await import("../media.js")).mediaCommand },
+];
@@ -12,6 +12,7 @@ import { GeminiProvider, resolveGeminiTextModel } from "@vibeframe/ai-providers"
 import { getApiKey } from "../../../utils/api-key.js";
 import { getVideoDuration } from "../../../utils/audio.js";
 import { execSafe, commandExists } from "../../../utils/exec-safe.js";
+import { eventRanges, streamFfmpegEvents } from "../../../utils/ffmpeg-events.js";
 
 /** A detected silent segment within a media file. */
 export interface SilencePeriod {
@@ -45,6 +46,8 @@ export interface SilenceCutOptions {
   lowRes?: boolean;
   /** Override API key (Google for Gemini mode) */
   apiKey?: string;
+  /** FFmpeg mode: called with the detection decode position as it runs */
+  onProgress?: (progress: { timeSec: number; totalDuration: number }) => void;
 }
 
 /** Result from {@link executeSilenceCut}. */
@@ -72,46 +75,22 @@ async function detectSilencePeriods(
   videoPath: string,
   noiseThreshold: number,
   minDuration: number,
+  onProgress?: SilenceCutOptions["onProgress"],
 ): Promise<{ periods: SilencePeriod[]; totalDuration: number }> {
   const totalDuration = await getVideoDuration(videoPath);
 
-  const { stdout, stderr } = await execSafe(
-    "ffmpeg",
+  // Parsed while ffmpeg runs; only the ranges are kept, not the log.
+  const { events } = await streamFfmpegEvents(
     [
       "-i", videoPath,
+      "-vn",
       "-af", `silencedetect=noise=${noiseThreshold}dB:d=${minDuration}`,
       "-f", "null", "-",
     ],
-    { maxBuffer: 50 * 1024 * 1024 },
-  ).catch((err) => {
-    // ffmpeg writes filter output to stderr and exits non-zero with -f null
-    if (err.stdout !== undefined || err.stderr !== undefined) {
-      return { stdout: err.stdout || "", stderr: err.stderr || "" };
-    }
-    throw err;
-  });
-  const silenceOutput = stdout + stderr;
+    { onProgress: onProgress ? (timeSec) => onProgress({ timeSec, totalDuration }) : undefined },
+  );
 
-  const periods: SilencePeriod[] = [];
-  const startRegex = /silence_start: (\d+\.?\d*)/g;
-  const endRegex = /silence_end: (\d+\.?\d*) \| silence_duration: (\d+\.?\d*)/g;
-
-  const starts: number[] = [];
-  let match;
-  while ((match = startRegex.exec(silenceOutput)) !== null) {
-    starts.push(parseFloat(match[1]));
-  }
-
-  let i = 0;
-  while ((match = endRegex.exec(silenceOutput)) !== null) {
-    const end = parseFloat(match[1]);
-    const duration = parseFloat(match[2]);
-    const start = i < starts.length ? starts[i] : end - duration;
-    periods.push({ start, end, duration });
-    i++;
-  }
-
-  return { periods, totalDuration };
+  return { periods: eventRanges(events, "silence"), totalDuration };
 }
 
 /**
@@ -253,7 +232,7 @@ export async function executeSilenceCut(
           lowRes: options.lowRes,
           apiKey: options.apiKey,
         })
-      : await detectSilencePeriods(videoPath, noiseThreshold, minDuration);
+      : await detectSilencePeriods(videoPath, noiseThreshold, minDuration, options.onProgress);
     const silentDuration = periods.reduce((sum, p) => sum + p.duration, 0);
 
     if (analyzeOnly || periods.length === 0) {
@@ -0,0 +1,9 @@
+/**
+ * Build-time entry: prints the command manifest as JSON. `build.js` bundles
+ * and runs this once, then inlines the output into `dist/index.js`; it is
+ * never shipped.
+ */
+
+import { buildCommandManifest } from "./command-manifest.js";
+
+process.stdout.write(JSON.stringify(await buildCommandManifest()));
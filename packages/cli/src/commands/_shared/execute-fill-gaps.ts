@@ -18,7 +18,7 @@ import { Project, type ProjectFile } from "../../engine/index.js";
 import { getApiKey } from "../../utils/api-key.js";
 import { execSafe, ffprobeDuration } from "../../utils/exec-safe.js";
 import { resolveTimelineFile } from "../../utils/project-resolver.js";
-import { downloadVideo, formatTime } from "../ai-helpers.js";
+import { downloadVideoToFile, formatTime } from "../ai-helpers.js";
 
 export interface ExecuteFillGapsOptions {
   /** Timeline file or directory (resolved relative to cwd). */
@@ -493,8 +493,7 @@ export async function executeFillGaps(
       const videoPath = resolve(footageDir, videoFileName);
 
       onProgress("Downloading generated video...");
-      const videoBuffer = await downloadVideo(finalResult.videoUrl);
-      await writeFile(videoPath, videoBuffer);
+      await downloadVideoToFile(finalResult.videoUrl, videoPath);
 
       generatedDuration = finalResult.duration || parseInt(klingDuration);
       generatedVideos.push(videoPath);
@@ -568,8 +567,7 @@ export async function executeFillGaps(
           footageDir,
           `gap-fill-${gap.start.toFixed(2)}-${gap.end.toFixed(2)}-seg${segmentIndex}.mp4`,
         );
-        const segVideoBuffer = await downloadVideo(segFinalResult.videoUrl);
-        await writeFile(segVideoPath, segVideoBuffer);
+        await downloadVideoToFile(segFinalResult.videoUrl, segVideoPath);
 
         const concatListPath = resolve(footageDir, `concat-${gap.start.toFixed(2)}.txt`);
         const concatList =
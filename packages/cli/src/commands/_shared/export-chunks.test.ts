@@ -0,0 +1,66 @@
+import { describe, expect, it } from "vitest";
+
+import {
+  aggregateChunkProgress,
+  chunkEncoderThreads,
+  planExportChunks,
+  resolveExportJobs,
+} from "./export-chunks.js";
+
+const seconds = (d: number) => d;
+
+describe("planExportChunks", () => {
+  it("cuts at the segment boundaries closest to equal durations", () => {
+    const chunks = planExportChunks([12, 18, 22, 8, 33, 7, 20], seconds, 4);
+
+    expect(chunks.map((c) => c.segments)).toEqual([[12, 18], [22, 8], [33], [7, 20]]);
+    expect(chunks.map((c) => [c.start, c.duration])).toEqual([
+      [0, 30],
+      [30, 30],
+      [60, 33],
+      [93, 27],
+    ]);
+  });
+
+  it("keeps every segment in order, each chunk non-empty", () => {
+    const durations = Array.from({ length: 97 }, (_, i) => 3 + ((i * 7) % 11));
+    const chunks = planExportChunks(durations, seconds, 6);
+
+    expect(chunks).toHaveLength(6);
+    expect(chunks.every((c) => c.segments.length > 0)).toBe(true);
+    expect(chunks.flatMap((c) => c.segments)).toEqual(durations);
+    const total = durations.reduce((a, b) => a + b, 0);
+    for (const chunk of chunks) expect(Math.abs(chunk.duration - total / 6)).toBeLessThan(14);
+  });
+
+  it("returns fewer chunks than requested when they would be too short", () => {
+    expect(planExportChunks([8, 8, 8], seconds, 8)).toHaveLength(2);
+    expect(planExportChunks([60], seconds, 4)).toHaveLength(1);
+    expect(planExportChunks([4, 4], seconds, 4)).toHaveLength(1);
+  });
+});
+
+describe("resolveExportJobs", () => {
+  it("keeps the single pass by default and sizes 0 from cores", () => {
+    expect(resolveExportJobs(undefined, 16)).toBe(1);
+    expect(resolveExportJobs(3, 16)).toBe(3);
+    expect(resolveExportJobs(0, 16)).toBe(8);
+    expect(resolveExportJobs(0, 1)).toBe(1);
+    expect(chunkEncoderThreads(8, 16)).toBe(2);
+    expect(chunkEncoderThreads(4, 2)).toBe(1);
+  });
+});
+
+describe("aggregateChunkProgress", () => {
+  it("weights chunks by duration and only reports forward movement", () => {
+    const seen: number[] = [];
+    const update = aggregateChunkProgress([30, 10], (p) => seen.push(p));
+
+    update(0, 50); // 15 of 40s
+    update(1, 100); // 25 of 40s
+    update(1, 100);
+    update(0, 100);
+
+    expect(seen).toEqual([37, 62, 100]);
+  });
+});
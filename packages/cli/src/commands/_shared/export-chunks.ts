@@ -0,0 +1,113 @@
+/**
+ * @module _shared/export-chunks
+ *
+ * Chunked timeline export. A single-pass export encodes the whole output in
+ * one FFmpeg process, and x264 stops scaling well past a handful of threads
+ * (slice-based lookahead, one decode/filter thread for the whole graph).
+ * Here the timeline's video segments are split at clip or gap boundaries
+ * into time ranges of roughly equal length; each range is filtered and
+ * encoded by its own FFmpeg process with the same preset, the encoded
+ * chunks are joined with the concat demuxer (a stream copy), and the audio
+ * mix, encoded once over the full duration, is muxed on top — so chunk
+ * boundaries never produce an audible seam.
+ */
+
+import { availableParallelism } from "node:os";
+
+/** Chunks shorter than this are not worth an extra FFmpeg process. */
+export const MIN_CHUNK_SEC = 10;
+
+/** One time range of a chunked export. */
+export interface ExportChunk<T> {
+  segments: T[];
+  /** Position of the chunk's first segment on the timeline (seconds). */
+  start: number;
+  duration: number;
+}
+
+/**
+ * FFmpeg processes a chunked export runs at once. `1` (the default) keeps
+ * the single-pass export; `0` sizes from CPU cores, leaving every encoder
+ * at least two threads.
+ */
+export function resolveExportJobs(requested: number | undefined, cpuCount?: number): number {
+  if (requested === undefined) return 1;
+  if (requested > 0) return Math.floor(requested);
+  return Math.max(1, Math.floor((cpuCount ?? availableParallelism()) / 2));
+}
+
+/** Encoder threads per chunk, so `jobs` chunks together fill the machine. */
+export function chunkEncoderThreads(jobs: number, cpuCount?: number): number {
+  return Math.max(1, Math.floor((cpuCount ?? availableParallelism()) / jobs));
+}
+
+/**
+ * Split `segments` (in timeline order) into at most `count` contiguous
+ * chunks, cutting at the segment boundaries closest to equal durations.
+ * Fewer chunks come back when the timeline is too short for `count` chunks
+ * of `minChunkSec`; a single chunk means the export should not be split.
+ */
+export function planExportChunks<T>(
+  segments: T[],
+  durationOf: (segment: T) => number,
+  count: number,
+  minChunkSec: number = MIN_CHUNK_SEC
+): ExportChunk<T>[] {
+  const ends: number[] = [];
+  let total = 0;
+  for (const segment of segments) {
+    total += Math.max(0, durationOf(segment));
+    ends.push(total);
+  }
+  const chunkCount = Math.max(
+    1,
+    Math.min(Math.floor(count), segments.length, Math.floor(total / minChunkSec))
+  );
+
+  // Cut after segment `best` of each chunk but the last.
+  const cuts: number[] = [];
+  let from = 0;
+  for (let k = 1; k < chunkCount; k++) {
+    const ideal = (total * k) / chunkCount;
+    // Leave at least one segment for each chunk still to come.
+    const last = segments.length - 1 - (chunkCount - k);
+    let best = from;
+    while (best < last && ends[best + 1] <= ideal) best++;
+    if (best < last && Math.abs(ends[best + 1] - ideal) < Math.abs(ends[best] - ideal)) best++;
+    cuts.push(best + 1);
+    from = best + 1;
+  }
+  cuts.push(segments.length);
+
+  const chunks: ExportChunk<T>[] = [];
+  let begin = 0;
+  for (const end of cuts) {
+    const start = begin > 0 ? ends[begin - 1] : 0;
+    chunks.push({ segments: segments.slice(begin, end), start, duration: ends[end - 1] - start });
+    begin = end;
+  }
+  return chunks;
+}
+
+/**
+ * Fold per-chunk progress into one percentage over the whole export,
+ * weighting each chunk by its duration. `onProgress` fires only when the
+ * overall integer percentage moves.
+ */
+export function aggregateChunkProgress(
+  durations: number[],
+  onProgress: (percent: number) => void
+): (chunkIndex: number, percent: number) => void {
+  const total = durations.reduce((sum, d) => sum + d, 0);
+  const done = durations.map(() => 0);
+  let reported = -1;
+  return (chunkIndex, percent) => {
+    done[chunkIndex] = (Math.min(100, Math.max(0, percent)) / 100) * durations[chunkIndex];
+    const overall =
+      total > 0 ? Math.floor((done.reduce((sum, d) => sum + d, 0) / total) * 100) : 100;
+    if (overall > reported) {
+      reported = overall;
+      onProgress(overall);
+    }
+  };
+}
@@ -0,0 +1,224 @@
+import { describe, expect, it } from "vitest";
+import { mkdtempSync, rmSync } from "node:fs";
+import { tmpdir } from "node:os";
+import { join } from "node:path";
+
+import { commandExists, execSafe } from "../../utils/exec-safe.js";
+import {
+  buildPieceCopyArgs,
+  buildPieceEncodeArgs,
+  closedKeyframes,
+  matchedEncodeArgs,
+  planSmartRender,
+  runSmartRender,
+  sourceStreamFormat,
+  streamMismatch,
+  type CopyableSource,
+  type SmartVideoSegment,
+} from "./export-smart-render.js";
+
+const TARGET = { codec: "h264", width: 1280, height: 720, fps: 30 };
+const FORMAT = { profile: "Main", level: 31, pixFmt: "yuv420p", timescale: 15360 };
+
+function video(sourceStart: number, duration: number, filters: string[] = []): SmartVideoSegment {
+  return { kind: "video", sourceUrl: "/media/cam.mp4", sourceStart, duration, filters };
+}
+
+/** A 60s source with a keyframe every 2s. */
+function camera(): Map<string, CopyableSource> {
+  return new Map([
+    [
+      "/media/cam.mp4",
+      { keyframes: Array.from({ length: 30 }, (_, i) => i * 2), duration: 60, format: FORMAT },
+    ],
+  ]);
+}
+
+describe("planSmartRender", () => {
+  it("copies whole GOPs and re-encodes only the partial ones at the edges", () => {
+    const pieces = planSmartRender([video(3, 10)], camera(), 30);
+
+    expect(pieces.map((p) => [p.mode, p.duration])).toEqual([
+      ["encode", 1],
+      ["copy", 8],
+      ["encode", 1],
+    ]);
+    expect(pieces[1]).toMatchObject({ start: 4 });
+    expect(pieces[2]).toMatchObject({ offset: 9, reason: "after keyframe" });
+  });
+
+  it("copies a keyframe-aligned trim without any re-encode", () => {
+    const pieces = planSmartRender([video(4, 6)], camera(), 30);
+    expect(pieces).toEqual([{ mode: "copy", sourceUrl: "/media/cam.mp4", start: 4, duration: 6 }]);
+  });
+
+  it("copies through to the end of the source without a tail", () => {
+    const pieces = planSmartRender([video(50, 10)], camera(), 30);
+    expect(pieces).toEqual([{ mode: "copy", sourceUrl: "/media/cam.mp4", start: 50, duration: 10 }]);
+  });
+
+  it("re-encodes segments with effects, mismatched streams, stills and gaps whole", () => {
+    const pieces = planSmartRender(
+      [
+        video(0, 10, ["fade=t=in:st=0:d=1"]),
+        { ...video(0, 10), sourceUrl: "/media/phone.mov" },
+        { kind: "image", sourceUrl: "/media/logo.png", sourceStart: 0, duration: 3, filters: [] },
+        { kind: "black", sourceStart: 0, duration: 1.5, filters: [] },
+        video(5, 1.5),
+      ],
+      camera(),
+      30
+    );
+
+    expect(pieces.map((p) => (p.mode === "encode" ? p.reason : p.mode))).toEqual([
+      "effects",
+      "stream mismatch",
+      "image",
+      "black",
+      "no whole GOP",
+    ]);
+    expect(pieces.every((p) => p.mode === "encode" && p.offset === 0)).toBe(true);
+  });
+});
+
+describe("streamMismatch", () => {
+  const stream = {
+    codec_type: "video",
+    codec_name: "h264",
+    width: 1280,
+    height: 720,
+    pix_fmt: "yuv420p",
+    avg_frame_rate: "30/1",
+  };
+
+  it("accepts a stream that matches the target", () => {
+    expect(streamMismatch({ streams: [stream] }, TARGET)).toBeNull();
+  });
+
+  it("names the first parameter that differs", () => {
+    expect(streamMismatch({ streams: [{ ...stream, codec_name: "prores" }] }, TARGET)).toMatch(/codec/);
+    expect(streamMismatch({ streams: [{ ...stream, width: 1920, height: 1080 }] }, TARGET)).toMatch(/size/);
+    expect(streamMismatch({ streams: [{ ...stream, pix_fmt: "yuv422p10le" }] }, TARGET)).toMatch(/pixel/);
+    expect(streamMismatch({ streams: [{ ...stream, avg_frame_rate: "30000/1001" }] }, TARGET)).toMatch(/frame rate/);
+    expect(streamMismatch({ streams: [] }, TARGET)).toBe("no video stream");
+  });
+});
+
+describe("buildPieceCopyArgs", () => {
+  it("seeks just past the keyframe and stream-copies into MPEG-TS", () => {
+    const args = buildPieceCopyArgs(
+      { mode: "copy", sourceUrl: "/media/cam.mp4", start: 4, duration: 8 },
+      "/tmp/piece.ts"
+    );
+    expect(args.slice(args.indexOf("-ss"), args.indexOf("-ss") + 2)).toEqual(["-ss", "4.001000"]);
+    expect(args).toContain("copy");
+    expect(args.slice(-3)).toEqual(["-f", "mpegts", "/tmp/piece.ts"]);
+  });
+});
+
+describe("closedKeyframes", () => {
+  it("drops keyframes whose leading pictures present before them", () => {
+    // Decode order: closed GOP at 0, open GOP at 2 (B-frames at 1.9x), closed at 4.
+    const csv = [
+      ["0.000,K_", "0.100,__", "0.033,__"],
+      ["2.000,K_", "1.933,__", "1.967,__", "2.100,__"],
+      ["4.000,K_", "4.100,__"],
+    ];
+    expect(closedKeyframes(csv.flat().join("\n"))).toEqual([0, 4]);
+  });
+});
+
+describe("source-matched encodes", () => {
+  const stream = {
+    codec_type: "video",
+    codec_name: "h264",
+    profile: "Main",
+    level: 31,
+    pix_fmt: "yuv420p",
+    time_base: "1/15360",
+  };
+
+  it("reads the profile, level, pixel format and timescale from the probe", () => {
+    expect(sourceStreamFormat({ streams: [stream] })).toEqual(FORMAT);
+    expect(sourceStreamFormat({ streams: [{ ...stream, profile: undefined }] })).toBeNull();
+  });
+
+  it("encodes pieces to the source's profile, level and pixel format", () => {
+    const args = buildPieceEncodeArgs(
+      { mode: "encode", segment: video(3, 10), offset: 0, duration: 1, reason: "before keyframe" },
+      TARGET,
+      ["-c:v", "libx264", "-crf", "20"],
+      "/tmp/piece.ts",
+      FORMAT
+    );
+    const at = args.indexOf("-profile:v");
+    expect(args.slice(at, at + 6)).toEqual([
+      "-profile:v", "main", "-level:v", "3.1", "-pix_fmt", "yuv420p",
+    ]);
+    expect(args[args.indexOf("-vf") + 1]).toMatch(/format=yuv420p$/);
+    expect(matchedEncodeArgs("hevc", { ...FORMAT, level: 123 })).toEqual([
+      "-profile:v", "main", "-x265-params", "level-idc=4.1", "-pix_fmt", "yuv420p",
+    ]);
+  });
+
+  it("refuses profiles the encoder cannot reproduce", () => {
+    expect(matchedEncodeArgs("h264", { ...FORMAT, profile: "High 4:4:4 Predictive" })).toBeNull();
+    expect(matchedEncodeArgs("hevc", { ...FORMAT, profile: "Main 10" })).toBeNull();
+  });
+});
+
+describe("runSmartRender", () => {
+  const hasFfmpeg = commandExists("ffmpeg") && commandExists("ffprobe");
+
+  it.skipIf(!hasFfmpeg)("stays decodable across a copy → encode boundary", async () => {
+    const dir = mkdtempSync(join(tmpdir(), "vibe-smart-render-test-"));
+    try {
+      const source = join(dir, "source.mp4");
+      await execSafe("ffmpeg", [
+        "-y", "-v", "error",
+        "-f", "lavfi", "-i", "testsrc=size=320x180:rate=30:duration=4",
+        "-c:v", "libx264", "-profile:v", "main", "-pix_fmt", "yuv420p",
+        "-g", "30", "-keyint_min", "30", "-sc_threshold", "0",
+        source,
+      ]);
+      const { stdout: probe } = await execSafe("ffprobe", [
+        "-v", "error", "-show_streams", "-of", "json", source,
+      ]);
+      const format = sourceStreamFormat(JSON.parse(probe));
+      expect(format).not.toBeNull();
+
+      const output = join(dir, "out.mp4");
+      await runSmartRender({
+        pieces: [
+          { mode: "copy", sourceUrl: source, start: 0, duration: 2 },
+          {
+            mode: "encode",
+            segment: { kind: "video", sourceUrl: source, sourceStart: 2, duration: 1.5, filters: [] },
+            offset: 0,
+            duration: 1.5,
+            reason: "before keyframe",
+          },
+        ],
+        target: { codec: "h264", width: 320, height: 180, fps: 30 },
+        videoArgs: ["-c:v", "libx264", "-preset", "ultrafast"],
+        outputPath: output,
+        format: format!,
+      });
+
+      const { stdout: tag } = await execSafe("ffprobe", [
+        "-v", "error", "-select_streams", "v:0",
+        "-show_entries", "stream=codec_tag_string", "-of", "csv=p=0", output,
+      ]);
+      expect(tag.trim()).toBe("avc3");
+      const { stderr } = await execSafe("ffmpeg", ["-v", "error", "-i", output, "-f", "null", "-"]);
+      expect(stderr.trim()).toBe("");
+      const { stdout: frames } = await execSafe("ffprobe", [
+        "-v", "error", "-count_frames", "-select_streams", "v:0",
+        "-show_entries", "stream=nb_read_frames", "-of", "csv=p=0", output,
+      ]);
+      expect(Math.abs(Number(frames.trim()) - 105)).toBeLessThanOrEqual(2);
+    } finally {
+      rmSync(dir, { recursive: true, force: true });
+    }
+  });
+});
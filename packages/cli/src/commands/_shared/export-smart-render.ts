@@ -0,0 +1,516 @@
+/**
+ * @module _shared/export-smart-render
+ *
+ * Smart rendering for timeline export. A single-pass export scales, pads and
+ * re-encodes every clip through one `concat` filter graph, even footage that
+ * already matches the preset. Here each video segment of the timeline is
+ * planned on its own:
+ *
+ * - A segment is *copyable* when it is untouched source video (no fades, no
+ *   freeze-frame padding) whose stream already matches the target codec,
+ *   resolution, frame rate and pixel format.
+ * - A copyable trim is split at the source's closed-GOP keyframes: the whole
+ *   GOPs inside it are stream-copied, and only the partial GOPs at the head
+ *   and tail (and every dirty segment) are re-encoded. Keyframes whose GOP
+ *   is open (leading pictures reference the previous GOP) never start a copy.
+ * - Copied sources must share one profile, level and pixel format, and the
+ *   re-encoded pieces are encoded to that same profile, level and pixel
+ *   format, so the sample description written from the first piece is valid
+ *   for the whole stream. Sources whose format the encoder cannot reproduce
+ *   are re-encoded whole.
+ *
+ * Pieces are written as MPEG-TS (Annex B, parameter sets in-band), joined
+ * with the concat demuxer into the source's track timescale and muxed with
+ * the timeline's audio, which is mixed and encoded once on its own. Matching
+ * profile and level does not make the encoder's SPS/PPS identical to the
+ * source's, so when pieces come from more than one origin the track is
+ * tagged `avc3`/`hev1`: decoders then take parameter sets from the samples
+ * at each keyframe instead of trusting the first piece's sample description.
+ */
+
+import { mkdtemp, rm, writeFile } from "node:fs/promises";
+import { tmpdir } from "node:os";
+import { join } from "node:path";
+
+import { mapWithConcurrency } from "../../utils/concurrency.js";
+import { execSafe } from "../../utils/exec-safe.js";
+import { probeMedia, type MediaProbe } from "../../utils/media-probe.js";
+import { aggregateChunkProgress } from "./export-chunks.js";
+import { buildConcatList } from "./scene-render-shards.js";
+
+/** Stream parameters a copied segment must already have. */
+export interface SmartRenderTarget {
+  /** ffprobe codec name: `h264` or `hevc`. */
+  codec: string;
+  width: number;
+  height: number;
+  fps: number;
+}
+
+/** One video segment of the timeline, in playback order. */
+export interface SmartVideoSegment {
+  kind: "video" | "image" | "black";
+  sourceUrl?: string;
+  /** Trim start within the source, seconds (video only). */
+  sourceStart: number;
+  duration: number;
+  /**
+   * Filters the segment needs beyond scale/pad (fades, freeze-frame
+   * padding). Any filter makes the whole segment dirty.
+   */
+  filters: string[];
+}
+
+/** Coded format of a source stream that encoded pieces have to reproduce. */
+export interface SourceStreamFormat {
+  /** ffprobe profile name, e.g. `High`. */
+  profile: string;
+  /** ffprobe level: 10x the H.264 level, 30x the HEVC level. */
+  level: number;
+  pixFmt: string;
+  /** Denominator of the stream time base, used as the MP4 track timescale. */
+  timescale: number;
+}
+
+/** What the planner knows about a source that matches the target stream. */
+export interface CopyableSource {
+  /** Closed-GOP keyframe times covering the segment's trim, ascending. */
+  keyframes: number[];
+  /** Source duration, seconds; a trim that runs to the end needs no tail. */
+  duration: number;
+  format: SourceStreamFormat;
+}
+
+export type SmartRenderPiece =
+  | { mode: "copy"; sourceUrl: string; start: number; duration: number }
+  | {
+      mode: "encode";
+      segment: SmartVideoSegment;
+      /** Offset into the segment, seconds. */
+      offset: number;
+      duration: number;
+      reason: string;
+    };
+
+export interface SmartRenderReport {
+  pieces: number;
+  copiedPieces: number;
+  copiedSec: number;
+  encodedSec: number;
+  elapsedMs: number;
+  /**
+   * Wall-clock speedup over re-encoding the whole video, extrapolated from
+   * this run's own encode throughput. Absent when nothing was encoded.
+   */
+  speedup?: number;
+}
+
+/** ffmpeg encoder → the codec name ffprobe reports for its output. */
+const ENCODER_CODECS: Record<string, string> = {
+  libx264: "h264",
+  libx265: "hevc",
+};
+
+/** ffprobe profile name → encoder `-profile:v`, per target codec. */
+const ENCODER_PROFILES: Record<string, Record<string, string>> = {
+  h264: { "Constrained Baseline": "baseline", Baseline: "baseline", Main: "main", High: "high" },
+  hevc: { Main: "main" },
+};
+
+/** Encodes shorter than this hold no frame and are skipped. */
+const MIN_PIECE_SEC = 0.001;
+
+/** Target codec for a preset's `-c:v`, or null when it cannot be smart-rendered. */
+export function smartRenderCodec(encoder: string | undefined): string | null {
+  return (encoder && ENCODER_CODECS[encoder]) || null;
+}
+
+/** Parse an ffprobe rate such as `30000/1001`. */
+function parseRate(rate: string | undefined): number {
+  if (!rate) return 0;
+  const [num, den] = rate.split("/").map(Number);
+  return den ? num / den : num || 0;
+}
+
+/**
+ * Why the first video stream of `probe` cannot be stream-copied into the
+ * target, or null when it can.
+ */
+export function streamMismatch(probe: MediaProbe, target: SmartRenderTarget): string | null {
+  const stream = probe.streams?.find((s) => s.codec_type === "video");
+  if (!stream) return "no video stream";
+  if (stream.codec_name !== target.codec) return `codec ${stream.codec_name} ≠ ${target.codec}`;
+  if (stream.width !== target.width || stream.height !== target.height) {
+    return `size ${stream.width}x${stream.height} ≠ ${target.width}x${target.height}`;
+  }
+  if (stream.pix_fmt !== "yuv420p") return `pixel format ${stream.pix_fmt} ≠ yuv420p`;
+  const fps = parseRate(stream.avg_frame_rate) || parseRate(stream.r_frame_rate);
+  if (Math.abs(fps - target.fps) > 0.01) return `frame rate ${fps.toFixed(3)} ≠ ${target.fps}`;
+  return null;
+}
+
+/** Profile, level, pixel format and timescale of the first video stream, null when unknown. */
+export function sourceStreamFormat(probe: MediaProbe): SourceStreamFormat | null {
+  const stream = probe.streams?.find((s) => s.codec_type === "video");
+  const profile = typeof stream?.profile === "string" ? stream.profile : "";
+  const level = Number(stream?.level);
+  const timescale = Number(String(stream?.time_base ?? "").split("/")[1]);
+  if (!profile || !(level > 0) || !stream?.pix_fmt || !(timescale > 0)) return null;
+  return { profile, level, pixFmt: stream.pix_fmt, timescale };
+}
+
+/**
+ * Encoder args that reproduce `format` for `codec`, or null when the encoder
+ * cannot produce that profile (the source is then not copyable).
+ */
+export function matchedEncodeArgs(codec: string, format: SourceStreamFormat): string[] | null {
+  const profile = ENCODER_PROFILES[codec]?.[format.profile];
+  if (!profile) return null;
+  const level =
+    codec === "hevc"
+      ? ["-x265-params", `level-idc=${(format.level / 30).toFixed(1)}`]
+      : ["-level:v", String(format.level / 10)];
+  return ["-profile:v", profile, ...level, "-pix_fmt", format.pixFmt];
+}
+
+function sameFormat(a: SourceStreamFormat, b: SourceStreamFormat): boolean {
+  return (
+    a.profile === b.profile &&
+    a.level === b.level &&
+    a.pixFmt === b.pixFmt &&
+    a.timescale === b.timescale
+  );
+}
+
+/** Frame rate of the first video stream, 0 when unknown. */
+export function probeFrameRate(probe: MediaProbe): number {
+  const stream = probe.streams?.find((s) => s.codec_type === "video");
+  return parseRate(stream?.avg_frame_rate) || parseRate(stream?.r_frame_rate);
+}
+
+/**
+ * Plan the pieces for `segments`. `copyable` holds the sources whose stream
+ * matches the target; everything else is re-encoded whole.
+ */
+export function planSmartRender(
+  segments: SmartVideoSegment[],
+  copyable: Map<string, CopyableSource>,
+  fps: number
+): SmartRenderPiece[] {
+  const pieces: SmartRenderPiece[] = [];
+  const slack = 0.5 / fps;
+  const encode = (segment: SmartVideoSegment, offset: number, duration: number, reason: string) => {
+    if (duration > MIN_PIECE_SEC) pieces.push({ mode: "encode", segment, offset, duration, reason });
+  };
+
+  for (const segment of segments) {
+    const source = segment.sourceUrl ? copyable.get(segment.sourceUrl) : undefined;
+    if (segment.kind !== "video") {
+      encode(segment, 0, segment.duration, segment.kind);
+      continue;
+    }
+    if (segment.filters.length > 0) {
+      encode(segment, 0, segment.duration, "effects");
+      continue;
+    }
+    if (!source) {
+      encode(segment, 0, segment.duration, "stream mismatch");
+      continue;
+    }
+
+    const start = segment.sourceStart;
+    const end = start + segment.duration;
+    // Copy from the first keyframe at or after the trim start...
+    const first = source.keyframes.find((k) => k >= start - slack);
+    // ...up to the last keyframe before the trim end (or the end of the source).
+    const runsToEnd = end >= source.duration - slack;
+    const last = runsToEnd ? end : [...source.keyframes].reverse().find((k) => k <= end + slack);
+    if (first === undefined || last === undefined || last - first < slack * 2) {
+      encode(segment, 0, segment.duration, "no whole GOP");
+      continue;
+    }
+
+    // Heads and tails under half a frame hold no frame of their own.
+    const head = first - start;
+    if (head > slack) encode(segment, 0, head, "before keyframe");
+    pieces.push({
+      mode: "copy",
+      sourceUrl: segment.sourceUrl!,
+      start: first,
+      duration: Math.min(last, end) - first,
+    });
+    const tail = end - last;
+    if (tail > slack) encode(segment, segment.duration - tail, tail, "after keyframe");
+  }
+  return pieces;
+}
+
+/**
+ * Closed-GOP keyframe times from ffprobe `packet=pts_time,flags` CSV, which
+ * lists packets in decode order. A keyframe followed (before the next
+ * keyframe) by a packet that presents earlier than it has leading pictures
+ * referencing the previous GOP, so copying cannot start there.
+ */
+export function closedKeyframes(csv: string): number[] {
+  const keyframes: number[] = [];
+  let current: number | null = null;
+  let open = false;
+  const settle = () => {
+    if (current !== null && !open) keyframes.push(current);
+  };
+  for (const line of csv.split("\n")) {
+    const [pts, flags] = line.trim().split(",");
+    if (!pts || pts === "N/A") continue;
+    const time = Number(pts);
+    if (flags?.includes("K")) {
+      settle();
+      current = time;
+      open = false;
+    } else if (current !== null && time < current) {
+      open = true;
+    }
+  }
+  settle();
+  return keyframes.sort((a, b) => a - b);
+}
+
+/** Closed-GOP keyframe times of the first video stream within [start, end], demux only. */
+export async function probeKeyframes(url: string, start: number, end: number): Promise<number[]> {
+  const { stdout } = await execSafe("ffprobe", [
+    "-v", "error",
+    "-select_streams", "v:0",
+    "-read_intervals", `${Math.max(0, start - 1)}%${end + 1}`,
+    "-show_entries", "packet=pts_time,flags",
+    "-of", "csv=p=0",
+    url,
+  ]);
+  return closedKeyframes(stdout);
+}
+
+/**
+ * Encoder args for one re-encoded piece: the export's scale/pad chain at the
+ * target size and rate, plus the segment's own filters when the piece is the
+ * whole segment (segments with filters are never split). With `format`, the
+ * piece is encoded to the copied sources' profile, level and pixel format.
+ */
+export function buildPieceEncodeArgs(
+  piece: Extract<SmartRenderPiece, { mode: "encode" }>,
+  target: SmartRenderTarget,
+  videoArgs: string[],
+  outputPath: string,
+  format?: SourceStreamFormat
+): string[] {
+  const { segment } = piece;
+  const { width, height, fps } = target;
+  const input =
+    segment.kind === "black"
+      ? ["-f", "lavfi", "-i", `color=c=black:s=${width}x${height}:r=${fps}`]
+      : segment.kind === "image"
+        ? ["-loop", "1", "-i", segment.sourceUrl!]
+        : ["-ss", String(segment.sourceStart + piece.offset), "-i", segment.sourceUrl!];
+  const filters = [
+    `scale=${width}:${height}:force_original_aspect_ratio=decrease`,
+    `pad=${width}:${height}:(ow-iw)/2:(oh-ih)/2`,
+    "setsar=1",
+    `fps=${fps}`,
+    ...segment.filters,
+    `format=${format?.pixFmt ?? "yuv420p"}`,
+  ];
+  const matched = format ? matchedEncodeArgs(target.codec, format) : null;
+  if (format && !matched) throw new Error(`Cannot encode ${target.codec} ${format.profile}`);
+  return [
+    "-y", "-v", "error",
+    ...input,
+    "-t", piece.duration.toFixed(6),
+    "-map", "0:v:0", "-an",
+    "-vf", filters.join(","),
+    ...videoArgs,
+    ...(matched ?? []),
+    "-f", "mpegts",
+    outputPath,
+  ];
+}
+
+/** Args to stream-copy whole GOPs `[start, start + duration)` of a source. */
+export function buildPieceCopyArgs(
+  piece: Extract<SmartRenderPiece, { mode: "copy" }>,
+  outputPath: string
+): string[] {
+  return [
+    "-y", "-v", "error",
+    // Seek a hair past the keyframe so rounding in ffprobe's pts_time never
+    // lands the demuxer on the previous GOP.
+    "-ss", (piece.start + 0.001).toFixed(6),
+    "-i", piece.sourceUrl,
+    "-t", piece.duration.toFixed(6),
+    "-map", "0:v:0", "-an",
+    "-c", "copy",
+    "-f", "mpegts",
+    outputPath,
+  ];
+}
+
+/**
+ * Look up which segment sources can be copied and where their closed-GOP
+ * keyframes are. Only sources sharing the first copyable source's format,
+ * and whose format the encoder can reproduce, qualify. Probes are cached
+ * (`media-probe`); keyframe scans read only the packets around each trim.
+ */
+export async function resolveCopyableSources(
+  segments: SmartVideoSegment[],
+  target: SmartRenderTarget
+): Promise<Map<string, CopyableSource>> {
+  const copyable = new Map<string, CopyableSource>();
+  for (const segment of segments) {
+    if (segment.kind !== "video" || segment.filters.length > 0 || !segment.sourceUrl) continue;
+    const probe = await probeMedia(segment.sourceUrl);
+    if (streamMismatch(probe, target)) continue;
+    const format = sourceStreamFormat(probe);
+    if (!format || !matchedEncodeArgs(target.codec, format)) continue;
+    const shared = copyable.values().next().value?.format;
+    if (shared && !sameFormat(shared, format)) continue;
+    const keyframes = await probeKeyframes(
+      segment.sourceUrl,
+      segment.sourceStart,
+      segment.sourceStart + segment.duration
+    );
+    const known = copyable.get(segment.sourceUrl);
+    copyable.set(segment.sourceUrl, {
+      keyframes: [...new Set([...(known?.keyframes ?? []), ...keyframes])].sort((a, b) => a - b),
+      duration: Number(probe.format?.duration ?? Infinity),
+      format,
+    });
+  }
+  return copyable;
+}
+
+/**
+ * Render `pieces`, join them and mux `audioPath` (already encoded) into
+ * `outputPath`. Up to `jobs` pieces render at once (default 1); encoded
+ * pieces match `format`, the copied sources' format. `onProgress` gets the
+ * share of the video duration rendered so far. Returns the report,
+ * including the speedup estimate.
+ */
+export async function runSmartRender(opts: {
+  pieces: SmartRenderPiece[];
+  target: SmartRenderTarget;
+  videoArgs: string[];
+  audioPath?: string;
+  outputPath: string;
+  overwrite?: boolean;
+  startedAt?: number;
+  jobs?: number;
+  format?: SourceStreamFormat;
+  onProgress?: (percent: number) => void;
+}): Promise<SmartRenderReport> {
+  const startedAt = opts.startedAt ?? Date.now();
+  const dir = await mkdtemp(join(tmpdir(), "vibe-smart-render-"));
+  let encodeMs = 0;
+  let encodedSec = 0;
+  let copiedSec = 0;
+  const progress = aggregateChunkProgress(
+    opts.pieces.map((p) => p.duration),
+    opts.onProgress ?? (() => {})
+  );
+  try {
+    const files = await mapWithConcurrency(opts.pieces, opts.jobs ?? 1, async (piece, i) => {
+      const file = join(dir, `piece-${String(i).padStart(5, "0")}.ts`);
+      if (piece.mode === "copy") {
+        await execSafe("ffmpeg", buildPieceCopyArgs(piece, file));
+        copiedSec += piece.duration;
+      } else {
+        const encodeStart = Date.now();
+        await execSafe(
+          "ffmpeg",
+          buildPieceEncodeArgs(piece, opts.target, opts.videoArgs, file, opts.format)
+        );
+        encodeMs += Date.now() - encodeStart;
+        encodedSec += piece.duration;
+      }
+      progress(i, 100);
+      return file;
+    });
+
+    const origins = new Set(
+      opts.pieces.map((p) => (p.mode === "copy" ? p.sourceUrl : "encoder"))
+    );
+    await joinVideoPieces({
+      files,
+      listPath: join(dir, "pieces.txt"),
+      codec: opts.target.codec,
+      audioPath: opts.audioPath,
+      outputPath: opts.outputPath,
+      overwrite: opts.overwrite,
+      timescale: opts.format?.timescale,
+      inBandParameterSets: origins.size > 1,
+    });
+  } finally {
+    await rm(dir, { recursive: true, force: true });
+  }
+
+  const elapsedMs = Date.now() - startedAt;
+  const report: SmartRenderReport = {
+    pieces: opts.pieces.length,
+    copiedPieces: opts.pieces.filter((p) => p.mode === "copy").length,
+    copiedSec: round(copiedSec),
+    encodedSec: round(encodedSec),
+    elapsedMs,
+  };
+  if (encodedSec > 0 && encodeMs > 0 && elapsedMs > 0) {
+    const fullEncodeMs = (encodeMs / encodedSec) * (copiedSec + encodedSec);
+    report.speedup = Math.round((fullEncodeMs / elapsedMs) * 10) / 10;
+  }
+  return report;
+}
+
+/**
+ * Join video pieces with the concat demuxer (a stream copy, written via the
+ * list at `listPath`) and mux `audioPath` (already encoded) into
+ * `outputPath`. `codec` is the stream's codec name (`hevc` gets the `hvc1`
+ * tag players expect in MP4/MOV); `timescale` sets the video track's
+ * timescale. With `inBandParameterSets`, pieces carry their own SPS/PPS and
+ * the track is tagged `avc3`/`hev1` so decoders read them from the samples.
+ * Shared with chunked export.
+ */
+export async function joinVideoPieces(opts: {
+  files: string[];
+  listPath: string;
+  codec?: string | null;
+  audioPath?: string;
+  outputPath: string;
+  overwrite?: boolean;
+  timescale?: number;
+  inBandParameterSets?: boolean;
+}): Promise<void> {
+  await writeFile(opts.listPath, buildConcatList(opts.files), "utf-8");
+  await execSafe("ffmpeg", [
+    opts.overwrite ? "-y" : "-n",
+    "-v", "error",
+    "-f", "concat", "-safe", "0", "-i", opts.listPath,
+    ...(opts.audioPath ? ["-i", opts.audioPath, "-map", "0:v", "-map", "1:a"] : ["-map", "0:v"]),
+    "-c", "copy",
+    ...videoTag(opts.codec, opts.inBandParameterSets),
+    ...(opts.timescale ? ["-video_track_timescale", String(opts.timescale)] : []),
+    "-movflags", "+faststart",
+    opts.outputPath,
+  ]);
+}
+
+/** One-line summary for the export message. */
+export function formatSmartRenderReport(report: SmartRenderReport): string {
+  const total = report.copiedSec + report.encodedSec;
+  const share = total > 0 ? Math.round((report.copiedSec / total) * 100) : 0;
+  const speedup = report.speedup ? `, ~${report.speedup}x faster than a full re-encode` : "";
+  return `smart render: ${share}% of video stream-copied (${report.copiedPieces}/${report.pieces} pieces)${speedup}`;
+}
+
+/** `-tag:v` for the joined track: `avc3`/`hev1` when parameter sets stay in-band. */
+function videoTag(codec: string | null | undefined, inBand?: boolean): string[] {
+  if (codec === "h264") return inBand ? ["-tag:v", "avc3"] : [];
+  if (codec === "hevc") return ["-tag:v", inBand ? "hev1" : "hvc1"];
+  return [];
+}
+
+function round(sec: number): number {
+  return Math.round(sec * 1000) / 1000;
+}
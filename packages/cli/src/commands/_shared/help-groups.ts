@@ -53,6 +53,7 @@ export const COMMAND_GROUPS: ReadonlyArray<{
       "design",
       "status",
       "inspect",
+      "cache",
     ],
   },
   {
@@ -65,6 +66,7 @@ export const COMMAND_GROUPS: ReadonlyArray<{
       "setup",
       "doctor",
       "host",
+      "serve",
       "schema",
       "context",
       "guide",
@@ -0,0 +1,111 @@
+import { afterEach, beforeEach, describe, expect, it } from "vitest";
+import { existsSync } from "node:fs";
+import { mkdtemp, readFile, rm, unlink, writeFile } from "node:fs/promises";
+import { tmpdir } from "node:os";
+import { join } from "node:path";
+import { JOB_ARCHIVE_FILE, JOB_JOURNAL_FILE } from "./job-journal.js";
+import {
+  createAndWriteJobRecord,
+  jobsDir,
+  listJobRecords,
+  writeJobRecord,
+  type JobRecord,
+} from "./status-jobs.js";
+
+let dir: string;
+
+beforeEach(async () => {
+  dir = await mkdtemp(join(tmpdir(), "vibe-job-journal-"));
+});
+
+afterEach(async () => {
+  await rm(dir, { recursive: true, force: true });
+});
+
+function writeJob(id: string, extra: Partial<Parameters<typeof createAndWriteJobRecord>[0]> = {}) {
+  return createAndWriteJobRecord({
+    id,
+    jobType: "generate-video",
+    provider: "kling",
+    providerTaskId: `task-${id}`,
+    projectDir: dir,
+    command: "generate video --no-wait",
+    status: "running",
+    ...extra,
+  });
+}
+
+async function journalLines(): Promise<number> {
+  const raw = await readFile(join(jobsDir(dir), JOB_JOURNAL_FILE), "utf-8").catch(() => "");
+  return raw.split("\n").filter(Boolean).length;
+}
+
+describe("job journal", () => {
+  it("answers status, type and beat queries from the index", async () => {
+    await writeJob("job_a", { beatId: "hook" });
+    await writeJob("job_b", { beatId: "hook", status: "completed" });
+    await writeJob("job_c", { jobType: "generate-music", provider: "replicate", beatId: "outro" });
+
+    expect((await listJobRecords(dir)).map((job) => job.id).sort()).toEqual([
+      "job_a",
+      "job_b",
+      "job_c",
+    ]);
+    const active = await listJobRecords(dir, { status: ["queued", "running"] });
+    expect(active.map((job) => job.id).sort()).toEqual(["job_a", "job_c"]);
+    const hookVideos = await listJobRecords(dir, {
+      jobType: "generate-video",
+      beatId: "hook",
+      status: "running",
+    });
+    expect(hookVideos.map((job) => job.id)).toEqual(["job_a"]);
+  });
+
+  it("adopts job files the journal never saw and drops deleted ones", async () => {
+    const kept = await writeJob("job_kept");
+    await writeJob("job_gone");
+    await unlink(join(jobsDir(dir), "job_gone.json"));
+    const foreign: JobRecord = { ...kept, id: "job_foreign", status: "completed" };
+    await writeFile(join(jobsDir(dir), "job_foreign.json"), JSON.stringify(foreign), "utf-8");
+
+    const ids = (await listJobRecords(dir)).map((job) => job.id).sort();
+
+    expect(ids).toEqual(["job_foreign", "job_kept"]);
+  });
+
+  it("re-reads active jobs from their files so a missed append is not reported stale", async () => {
+    const record = await writeJob("job_crash");
+    await listJobRecords(dir);
+    // Simulate a writer that renamed the job file but died before appending.
+    const done: JobRecord = { ...record, status: "completed", updatedAt: new Date().toISOString() };
+    await writeFile(join(jobsDir(dir), "job_crash.json"), JSON.stringify(done), "utf-8");
+
+    const [listed] = await listJobRecords(dir);
+
+    expect(listed.status).toBe("completed");
+  });
+
+  it("compacts the journal and archives settled jobs", async () => {
+    const running = await writeJob("job_running");
+    const settled = await writeJob("job_settled");
+    for (let i = 0; i < 150; i++) {
+      await writeJobRecord({ ...running, progress: i % 100 });
+      await writeJobRecord({ ...settled, progress: i % 100 });
+    }
+    await writeJobRecord({ ...settled, status: "completed" });
+    expect(await journalLines()).toBeGreaterThan(256);
+
+    const records = await listJobRecords(dir);
+
+    expect(records.map((job) => job.id).sort()).toEqual(["job_running", "job_settled"]);
+    expect(await journalLines()).toBe(1);
+    const archive = await readFile(join(jobsDir(dir), JOB_ARCHIVE_FILE), "utf-8");
+    expect(JSON.parse(archive.trim())).toMatchObject({ id: "job_settled", status: "completed" });
+    expect(existsSync(join(jobsDir(dir), "job_settled.json"))).toBe(true);
+
+    await writeJobRecord({ ...settled, status: "failed", error: "re-run" });
+    expect((await listJobRecords(dir, { status: "failed" })).map((job) => job.id)).toEqual([
+      "job_settled",
+    ]);
+  });
+});
@@ -0,0 +1,329 @@
+/**
+ * @module _shared/job-journal
+ *
+ * Indexed view of `.vibeframe/jobs`. Each `<id>.json` record stays the
+ * crash-safe source of truth that `readJobRecord` opens directly, but every
+ * write is also appended to `journal.jsonl`, so listing jobs reads one file
+ * instead of parsing thousands. Compaction folds the journal down to the
+ * active jobs and moves settled ones into `archive.jsonl`, a segment that
+ * only changes on compaction. Long-lived processes (the MCP server polling
+ * `status_job`) keep both in memory and only read journal bytes appended
+ * since their last poll.
+ *
+ * The journal is an index, never the authority: job files it has not seen
+ * are adopted on the next load, entries whose file is gone are dropped, and
+ * active jobs are re-read from their files, so a writer that crashed between
+ * rename and append (or an older CLI that never appends) is not reported
+ * stale.
+ */
+
+import { randomUUID } from "node:crypto";
+import { appendFile, open, readdir, readFile, rename, rm, stat, writeFile } from "node:fs/promises";
+import { join } from "node:path";
+
+export const JOB_JOURNAL_FILE = "journal.jsonl";
+export const JOB_ARCHIVE_FILE = "archive.jsonl";
+const LOCK_FILE = "journal.lock";
+const STALE_LOCK_MS = 30_000;
+/** Journals shorter than this are never compacted. */
+const MIN_COMPACT_LINES = 256;
+
+/** The fields the index needs; job records carry many more. */
+export interface JournalRecord {
+  id: string;
+  status: string;
+  jobType: string;
+  beatId?: string;
+  updatedAt: string;
+}
+
+export interface JobIndexQuery {
+  status?: readonly string[];
+  jobType?: readonly string[];
+  beatId?: string;
+}
+
+/** Records by id, with secondary indexes by status, job type and beat. */
+export class JobIndex<R extends JournalRecord> {
+  private readonly records = new Map<string, R>();
+  private readonly byStatus = new Map<string, Set<string>>();
+  private readonly byType = new Map<string, Set<string>>();
+  private readonly byBeat = new Map<string, Set<string>>();
+
+  get size(): number {
+    return this.records.size;
+  }
+
+  get(id: string): R | undefined {
+    return this.records.get(id);
+  }
+
+  keys(): IterableIterator<string> {
+    return this.records.keys();
+  }
+
+  set(id: string, record: R): void {
+    this.delete(id);
+    this.records.set(id, record);
+    addTo(this.byStatus, record.status, id);
+    addTo(this.byType, record.jobType, id);
+    if (record.beatId) addTo(this.byBeat, record.beatId, id);
+  }
+
+  delete(id: string): void {
+    const record = this.records.get(id);
+    if (!record) return;
+    this.records.delete(id);
+    this.byStatus.get(record.status)?.delete(id);
+    this.byType.get(record.jobType)?.delete(id);
+    if (record.beatId) this.byBeat.get(record.beatId)?.delete(id);
+  }
+
+  /** Records matching every given filter; all records for an empty query. */
+  query(q: JobIndexQuery = {}): R[] {
+    const candidates: Set<string>[] = [];
+    if (q.status) candidates.push(union(this.byStatus, q.status));
+    if (q.jobType) candidates.push(union(this.byType, q.jobType));
+    if (q.beatId !== undefined) candidates.push(this.byBeat.get(q.beatId) ?? new Set());
+    if (candidates.length === 0) return [...this.records.values()];
+    candidates.sort((a, b) => a.size - b.size);
+    const [smallest, ...rest] = candidates;
+    const out: R[] = [];
+    for (const id of smallest) {
+      if (rest.every((set) => set.has(id))) out.push(this.records.get(id) as R);
+    }
+    return out;
+  }
+}
+
+interface JournalState {
+  archiveKey: string | null;
+  archive: Map<string, JournalRecord>;
+  journalIno: number | null;
+  journalOffset: number;
+  journalLines: number;
+  journal: Map<string, JournalRecord>;
+}
+
+const states = new Map<string, JournalState>();
+
+/** Append `record` to the journal. Failures are swallowed; the next load reconciles. */
+export async function appendJobJournal(dir: string, record: JournalRecord): Promise<void> {
+  try {
+    await appendFile(join(dir, JOB_JOURNAL_FILE), JSON.stringify(record) + "\n", "utf-8");
+  } catch {
+    // The job file is already in place; loadJobIndex adopts or re-reads it.
+  }
+}
+
+/**
+ * Build the index for the jobs directory `dir`. `parse` turns one raw JSON
+ * record (a job file or a journal line) into a record, or null to skip it.
+ */
+export async function loadJobIndex<R extends JournalRecord>(
+  dir: string,
+  parse: (raw: string) => R | null
+): Promise<JobIndex<R>> {
+  const state = states.get(dir) ?? emptyState();
+  states.set(dir, state);
+  await refreshArchive(dir, state, parse);
+  await readJournalTail(dir, state, parse);
+
+  const index = new JobIndex<R>();
+  for (const [id, record] of state.archive) index.set(id, record as R);
+  for (const [id, record] of state.journal) index.set(id, record as R);
+
+  // Reconcile with the directory. Names only: no job file is opened unless
+  // the journal has never seen it or it is still active.
+  const files = new Set(
+    (await readdir(dir))
+      .filter((name) => name.endsWith(".json"))
+      .map((name) => name.slice(0, -".json".length))
+  );
+  for (const id of [...index.keys()]) if (!files.has(id)) index.delete(id);
+  const repaired: R[] = [];
+  for (const id of files) {
+    const known = index.get(id);
+    if (known && !isActive(known.status)) continue;
+    const record = await readJobFile(dir, id, parse);
+    if (!record) {
+      index.delete(id);
+      continue;
+    }
+    if (!known || JSON.stringify(known) !== JSON.stringify(record)) repaired.push(record);
+    index.set(id, record);
+  }
+  if (repaired.length > 0) {
+    try {
+      const lines = repaired.map((record) => JSON.stringify(record) + "\n").join("");
+      await appendFile(join(dir, JOB_JOURNAL_FILE), lines, "utf-8");
+    } catch {
+      // Read-only checkout or full disk: the index above is still correct.
+    }
+  }
+
+  if (state.journalLines + repaired.length > Math.max(MIN_COMPACT_LINES, 2 * index.size)) {
+    await compactJobJournal(dir, index);
+  }
+  return index;
+}
+
+/**
+ * Rewrite the journal as the active jobs in `index` and the archive as the
+ * settled ones. Skipped when another process holds the compaction lock.
+ */
+export async function compactJobJournal(
+  dir: string,
+  index: JobIndex<JournalRecord>
+): Promise<boolean> {
+  const lockPath = join(dir, LOCK_FILE);
+  if (!(await acquireLock(lockPath))) return false;
+  try {
+    const archived: string[] = [];
+    const active: string[] = [];
+    for (const record of index.query()) {
+      (isActive(record.status) ? active : archived).push(JSON.stringify(record) + "\n");
+    }
+    // Archive first: until the journal is swapped its lines still override
+    // the archive, so a crash between the two renames loses nothing.
+    await writeAtomic(join(dir, JOB_ARCHIVE_FILE), archived.join(""));
+    await writeAtomic(join(dir, JOB_JOURNAL_FILE), active.join(""));
+    states.delete(dir);
+    return true;
+  } finally {
+    await rm(lockPath, { force: true });
+  }
+}
+
+function emptyState(): JournalState {
+  return {
+    archiveKey: null,
+    archive: new Map(),
+    journalIno: null,
+    journalOffset: 0,
+    journalLines: 0,
+    journal: new Map(),
+  };
+}
+
+async function refreshArchive<R extends JournalRecord>(
+  dir: string,
+  state: JournalState,
+  parse: (raw: string) => R | null
+): Promise<void> {
+  const path = join(dir, JOB_ARCHIVE_FILE);
+  const stats = await stat(path).catch(() => null);
+  const key = stats ? `${stats.ino}:${stats.size}:${stats.mtimeMs}` : null;
+  if (key === state.archiveKey) return;
+  state.archiveKey = key;
+  state.archive = new Map();
+  if (!stats) return;
+  for (const record of parseLines(await readFile(path, "utf-8"), parse)) {
+    state.archive.set(record.id, record);
+  }
+}
+
+/** Read journal bytes appended since the last load; restart after a compaction. */
+async function readJournalTail<R extends JournalRecord>(
+  dir: string,
+  state: JournalState,
+  parse: (raw: string) => R | null
+): Promise<void> {
+  const path = join(dir, JOB_JOURNAL_FILE);
+  const stats = await stat(path).catch(() => null);
+  if (!stats || stats.ino !== state.journalIno || stats.size < state.journalOffset) {
+    state.journalIno = stats?.ino ?? null;
+    state.journalOffset = 0;
+    state.journalLines = 0;
+    state.journal = new Map();
+  }
+  if (!stats || stats.size === state.journalOffset) return;
+
+  const handle = await open(path, "r");
+  try {
+    const length = stats.size - state.journalOffset;
+    const buffer = Buffer.alloc(length);
+    const { bytesRead } = await handle.read(buffer, 0, length, state.journalOffset);
+    // Stop at the last complete line; a concurrent append may be mid-write.
+    const end = buffer.subarray(0, bytesRead).lastIndexOf(0x0a) + 1;
+    if (end === 0) return;
+    const text = buffer.subarray(0, end).toString("utf-8");
+    state.journalOffset += end;
+    for (const record of parseLines(text, parse)) {
+      state.journal.set(record.id, record);
+      state.journalLines += 1;
+    }
+  } finally {
+    await handle.close();
+  }
+}
+
+function parseLines<R extends JournalRecord>(text: string, parse: (raw: string) => R | null): R[] {
+  const records: R[] = [];
+  for (const line of text.split("\n")) {
+    if (!line.trim()) continue;
+    try {
+      const record = parse(line);
+      if (record) records.push(record);
+    } catch {
+      // A torn line from a crashed writer; the job file still has the data.
+    }
+  }
+  return records;
+}
+
+async function readJobFile<R extends JournalRecord>(
+  dir: string,
+  id: string,
+  parse: (raw: string) => R | null
+): Promise<R | null> {
+  try {
+    return parse(await readFile(join(dir, `${id}.json`), "utf-8"));
+  } catch {
+    // Ignore malformed job files; status project should stay useful.
+    return null;
+  }
+}
+
+async function acquireLock(lockPath: string): Promise<boolean> {
+  for (let attempt = 0; attempt < 2; attempt++) {
+    try {
+      const handle = await open(lockPath, "wx");
+      await handle.close();
+      return true;
+    } catch (error) {
+      if ((error as NodeJS.ErrnoException).code !== "EEXIST") return false;
+      const stats = await stat(lockPath).catch(() => null);
+      if (!stats || Date.now() - stats.mtimeMs < STALE_LOCK_MS) return false;
+      // Left behind by a process that died mid-compaction.
+      await rm(lockPath, { force: true });
+    }
+  }
+  return false;
+}
+
+async function writeAtomic(path: string, content: string): Promise<void> {
+  const tmp = `${path}.${randomUUID()}.tmp`;
+  await writeFile(tmp, content, "utf-8");
+  await rename(tmp, path);
+}
+
+function isActive(status: string): boolean {
+  return status === "queued" || status === "running";
+}
+
+function addTo(map: Map<string, Set<string>>, key: string, id: string): void {
+  let set = map.get(key);
+  if (!set) {
+    set = new Set();
+    map.set(key, set);
+  }
+  set.add(id);
+}
+
+function union(map: Map<string, Set<string>>, keys: readonly string[]): Set<string> {
+  if (keys.length === 1) return map.get(keys[0]) ?? new Set();
+  const out = new Set<string>();
+  for (const key of keys) for (const id of map.get(key) ?? []) out.add(id);
+  return out;
+}
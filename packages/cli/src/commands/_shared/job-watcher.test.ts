@@ -0,0 +1,137 @@
+import { describe, expect, it } from "vitest";
+import { createJobRecord, makeJobStatusResult, type JobRecord } from "./status-jobs.js";
+import {
+  MAX_POLL_INTERVAL_MS,
+  MIN_POLL_INTERVAL_MS,
+  nextPollDelayMs,
+  watchJobs,
+} from "./job-watcher.js";
+
+const NOW = Date.parse("2026-05-01T12:00:00.000Z");
+
+function job(id: string, provider = "kling", extra: Partial<JobRecord> = {}): JobRecord {
+  return {
+    ...createJobRecord({
+      id,
+      jobType: provider === "replicate" ? "generate-music" : "generate-video",
+      status: "running",
+      provider,
+      providerTaskId: `task-${id}`,
+      projectDir: "/tmp/project",
+      command: "generate video --no-wait",
+    }),
+    ...extra,
+  };
+}
+
+function ago(ms: number): string {
+  return new Date(NOW - ms).toISOString();
+}
+
+describe("nextPollDelayMs", () => {
+  it("polls halfway to the provider's typical duration before progress is known", () => {
+    expect(nextPollDelayMs({ provider: "kling", createdAt: ago(60_000) }, NOW)).toBe(30_000);
+    expect(nextPollDelayMs({ provider: "grok", createdAt: ago(40_000) }, NOW)).toBe(10_000);
+  });
+
+  it("extrapolates from provider progress", () => {
+    // 80% done after 40s → ~10s left → poll in 5s.
+    expect(nextPollDelayMs({ provider: "kling", createdAt: ago(40_000), progress: 80 }, NOW)).toBe(
+      5_000
+    );
+  });
+
+  it("clamps near completion and backs off once a job overruns", () => {
+    expect(nextPollDelayMs({ provider: "grok", createdAt: ago(59_000) }, NOW)).toBe(
+      MIN_POLL_INTERVAL_MS
+    );
+    expect(nextPollDelayMs({ provider: "grok", createdAt: ago(80_000) }, NOW)).toBe(5_000);
+    expect(nextPollDelayMs({ provider: "grok", createdAt: ago(600_000) }, NOW)).toBe(
+      MAX_POLL_INTERVAL_MS
+    );
+  });
+});
+
+describe("watchJobs", () => {
+  it("refreshes jobs concurrently within each provider lane", async () => {
+    const inFlight = new Map<string, number>();
+    const peak = new Map<string, number>();
+    const records = [
+      ...Array.from({ length: 5 }, (_, i) => job(`kling-${i}`, "kling")),
+      ...Array.from({ length: 3 }, (_, i) => job(`grok-${i}`, "grok")),
+    ];
+
+    const results = await watchJobs(
+      records,
+      async (record) => {
+        const now = (inFlight.get(record.provider) ?? 0) + 1;
+        inFlight.set(record.provider, now);
+        peak.set(record.provider, Math.max(peak.get(record.provider) ?? 0, now));
+        await new Promise((resolve) => setTimeout(resolve, 5));
+        inFlight.set(record.provider, now - 1);
+        return makeJobStatusResult(record, { refreshed: true, live: { supported: true } });
+      },
+      { budgets: { "video:kling": { concurrency: 2 } } }
+    );
+
+    expect(results.map((result) => result.id)).toEqual(records.map((record) => record.id));
+    expect(peak.get("kling")).toBe(2);
+    expect(peak.get("grok")).toBe(3);
+  });
+
+  it("re-polls waiting jobs with the latest record until they settle", async () => {
+    const delays: number[] = [];
+    const seen: Array<number | undefined> = [];
+    const record = job("video-1", "grok", { createdAt: new Date().toISOString() });
+
+    const [result] = await watchJobs(
+      [record],
+      async (current) => {
+        seen.push(current.progress);
+        const progress = (current.progress ?? 0) + 50;
+        const next: JobRecord = {
+          ...current,
+          progress,
+          status: progress >= 100 ? "completed" : "running",
+        };
+        return makeJobStatusResult(next, { refreshed: true, live: { supported: true } });
+      },
+      { wait: true, sleep: async (ms) => void delays.push(ms) }
+    );
+
+    expect(result.status).toBe("completed");
+    expect(seen).toEqual([undefined, 50]);
+    expect(delays).toHaveLength(1);
+  });
+
+  it("stops watching a job whose refresh fails", async () => {
+    let calls = 0;
+    const [result] = await watchJobs(
+      [job("video-2")],
+      async (record) => {
+        calls += 1;
+        return makeJobStatusResult(record, {
+          refreshed: false,
+          live: { supported: true, error: "network down" },
+          warnings: ["network down"],
+        });
+      },
+      { wait: true, sleep: async () => undefined }
+    );
+
+    expect(calls).toBe(1);
+    expect(result.warnings).toEqual(["network down"]);
+  });
+
+  it("gives up with a warning once the wait budget is spent", async () => {
+    const [result] = await watchJobs(
+      [job("video-3", "grok", { createdAt: new Date().toISOString() })],
+      async (record) =>
+        makeJobStatusResult(record, { refreshed: true, live: { supported: true } }),
+      { wait: true, timeoutMs: 1_000, sleep: async () => undefined }
+    );
+
+    expect(result.status).toBe("running");
+    expect(result.warnings[0]).toMatch(/still running/);
+  });
+});
@@ -0,0 +1,144 @@
+/**
+ * @module _shared/job-watcher
+ *
+ * Concurrent refresh for async provider jobs. `vibe status project --refresh`
+ * used to await one provider status call per active job, and `--wait` sat in
+ * each provider's fixed sleep loop (3s Grok/Kling, 5s Veo/Runway). The
+ * watcher instead refreshes every job at once through {@link BuildScheduler}
+ * lanes (`video:kling`, `music:replicate`, …), so each provider still sees a
+ * bounded number of status calls in flight and a 429 backs its lane off.
+ *
+ * Waiting jobs are re-polled on an adaptive schedule: the next poll lands
+ * halfway to the job's estimated finish, estimated from provider progress
+ * when it reports any and from the provider's typical duration otherwise.
+ * Jobs that overrun the estimate back off toward {@link MAX_POLL_INTERVAL_MS}.
+ */
+
+import { BuildScheduler, type BuildBudgets, type ScheduledKind } from "./build-scheduler.js";
+import type { JobRecord, JobStatusResult } from "./status-jobs.js";
+
+export interface ProviderPollProfile {
+  /** Typical submit-to-result wall time; seeds polling before progress is known. */
+  expectedMs: number;
+  /** How long `--wait` keeps polling before giving up. */
+  maxWaitMs: number;
+}
+
+/** Timings mirror each provider's own `waitForCompletion` defaults. */
+export const PROVIDER_POLL_PROFILES: Readonly<Record<string, ProviderPollProfile>> = {
+  grok: { expectedMs: 60_000, maxWaitMs: 300_000 },
+  kling: { expectedMs: 120_000, maxWaitMs: 600_000 },
+  runway: { expectedMs: 90_000, maxWaitMs: 300_000 },
+  veo: { expectedMs: 90_000, maxWaitMs: 300_000 },
+  replicate: { expectedMs: 60_000, maxWaitMs: 600_000 },
+};
+
+const DEFAULT_POLL_PROFILE: ProviderPollProfile = { expectedMs: 90_000, maxWaitMs: 300_000 };
+
+export const MIN_POLL_INTERVAL_MS = 2_000;
+export const MAX_POLL_INTERVAL_MS = 30_000;
+
+/**
+ * Status calls are cheap next to submissions, so the watcher's lanes are
+ * wider than `vibe build`'s. Overridable per kind or kind/provider pair.
+ */
+export const DEFAULT_STATUS_BUDGETS: BuildBudgets = {
+  video: { concurrency: 6 },
+  music: { concurrency: 4 },
+};
+
+export function pollProfile(provider: string): ProviderPollProfile {
+  return PROVIDER_POLL_PROFILES[provider] ?? DEFAULT_POLL_PROFILE;
+}
+
+/**
+ * Delay before the next status poll of `record`, clamped to
+ * [{@link MIN_POLL_INTERVAL_MS}, {@link MAX_POLL_INTERVAL_MS}].
+ */
+export function nextPollDelayMs(
+  record: Pick<JobRecord, "provider" | "createdAt" | "progress">,
+  now = Date.now()
+): number {
+  const elapsed = Math.max(0, now - Date.parse(record.createdAt) || 0);
+  const progress = record.progress;
+  let delay: number;
+  if (typeof progress === "number" && progress > 0 && progress < 100) {
+    // Linear extrapolation from the provider's own progress figure.
+    delay = (elapsed * (100 - progress)) / progress / 2;
+  } else {
+    const remaining = pollProfile(record.provider).expectedMs - elapsed;
+    // Past the estimate, back off in proportion to how late the job is.
+    delay = remaining > 0 ? remaining / 2 : -remaining / 4;
+  }
+  return Math.round(Math.min(MAX_POLL_INTERVAL_MS, Math.max(MIN_POLL_INTERVAL_MS, delay)));
+}
+
+export interface WatchJobsOptions {
+  /** Keep polling each job until it settles; otherwise refresh each job once. */
+  wait?: boolean;
+  /** Overrides every provider's `maxWaitMs`. */
+  timeoutMs?: number;
+  budgets?: BuildBudgets;
+  /** Called after every status call, in completion order. */
+  onResult?: (result: JobStatusResult) => void;
+  /** Injectable for tests. */
+  sleep?: (ms: number) => Promise<void>;
+}
+
+/**
+ * Refresh `records` concurrently and resolve with their final results in
+ * input order. `refresh` performs one status call (and, on completion, the
+ * download/cache/metadata work) for one job. Each poll is handed the record
+ * returned by the previous one. A poll that fails to refresh ends that job's
+ * watch, so an unreachable provider surfaces its error instead of spinning.
+ */
+export async function watchJobs(
+  records: readonly JobRecord[],
+  refresh: (record: JobRecord) => Promise<JobStatusResult>,
+  opts: WatchJobsOptions = {}
+): Promise<JobStatusResult[]> {
+  const scheduler = new BuildScheduler({
+    budgets: { ...DEFAULT_STATUS_BUDGETS, ...opts.budgets },
+  });
+  const sleep = opts.sleep ?? defaultSleep;
+
+  return Promise.all(
+    records.map(async (record) => {
+      const kind = laneKind(record);
+      const deadline = Date.now() + (opts.timeoutMs ?? pollProfile(record.provider).maxWaitMs);
+      const poll = async (current: JobRecord) => {
+        const result = await scheduler.run(kind, record.provider, () => refresh(current));
+        opts.onResult?.(result);
+        return result;
+      };
+
+      let result = await poll(record);
+      while (opts.wait && result.refreshed && isActive(result.job)) {
+        const delay = nextPollDelayMs(result.job);
+        if (Date.now() + delay > deadline) {
+          result.warnings.push(
+            `Job ${record.id} is still ${result.job.status} after ` +
+              `${Math.round((Date.now() - Date.parse(record.createdAt)) / 1000)}s; ` +
+              `check again with: ${result.retryWith[0]}`
+          );
+          break;
+        }
+        await sleep(delay);
+        result = await poll(result.job);
+      }
+      return result;
+    })
+  );
+}
+
+function laneKind(record: JobRecord): ScheduledKind {
+  return record.jobType === "generate-music" ? "music" : "video";
+}
+
+function isActive(record: JobRecord): boolean {
+  return record.status === "queued" || record.status === "running";
+}
+
+function defaultSleep(ms: number): Promise<void> {
+  return new Promise((resolve) => setTimeout(resolve, ms));
+}
@@ -0,0 +1,164 @@
+import { describe, expect, it, vi } from "vitest";
+
+import { BuildScheduler } from "./build-scheduler.js";
+import { batchCutPoints, NarrationBatcher, type AudioSlicer } from "./narration-batch.js";
+import type { TtsResolution } from "./tts-resolve.js";
+
+/** One character per second, so cut points are easy to read. */
+function alignmentFor(text: string) {
+  const characters = [...text];
+  return {
+    characters,
+    startTimes: characters.map((_, i) => i),
+    endTimes: characters.map((_, i) => i + 1),
+  };
+}
+
+function fakeResolution(
+  opts: { timed?: boolean; batchError?: string; alignment?: typeof alignmentFor } = {}
+) {
+  const call = vi.fn(async (text: string) => ({
+    success: true,
+    audioBuffer: Buffer.from(`single:${text}`),
+    characterCount: text.length,
+  }));
+  const callWithTimestamps = vi.fn(async (text: string) =>
+    opts.batchError
+      ? { success: false, error: opts.batchError }
+      : {
+          success: true,
+          audioBuffer: Buffer.from(text),
+          characterCount: text.length,
+          alignment: (opts.alignment ?? alignmentFor)(text),
+        }
+  );
+  const resolution: TtsResolution = {
+    provider: "elevenlabs",
+    audioExtension: "mp3",
+    call,
+    ...(opts.timed === false ? {} : { callWithTimestamps }),
+  };
+  return { resolution, call, callWithTimestamps };
+}
+
+const slice: AudioSlicer = async (audio, _ext, start, end) =>
+  Buffer.from(`${audio.toString()}@${start.toFixed(2)}-${end?.toFixed(2) ?? "end"}`);
+
+function batcher(slicer: AudioSlicer = slice) {
+  return new NarrationBatcher({
+    scheduler: new BuildScheduler({ maxRetries: 0 }),
+    slice: slicer,
+    canSlice: () => true,
+  });
+}
+
+describe("NarrationBatcher", () => {
+  it("synthesizes an identical cue once for every beat that reads it", async () => {
+    const { resolution, call } = fakeResolution({ timed: false });
+    const narration = batcher();
+    const [a, b] = await Promise.all([
+      narration.synthesize(resolution, "Welcome back.", "rachel"),
+      narration.synthesize(resolution, "Welcome back.", "rachel"),
+    ]);
+    expect(a.audioBuffer).toEqual(b.audioBuffer);
+    expect(call).toHaveBeenCalledTimes(1);
+    expect([a.characterCount, b.characterCount]).toEqual(["Welcome back.".length, 0]);
+    expect(narration.stats()).toEqual({
+      requests: 2,
+      deduped: 1,
+      providerCalls: 1,
+      batchedCues: 0,
+    });
+  });
+
+  it("sends short cues as one timed request and slices them back apart", async () => {
+    const { resolution, call, callWithTimestamps } = fakeResolution();
+    const narration = batcher();
+    const results = await Promise.all(
+      ["One.", "Two.", "Three."].map((cue) => narration.synthesize(resolution, cue))
+    );
+    expect(callWithTimestamps).toHaveBeenCalledTimes(1);
+    expect(callWithTimestamps.mock.calls[0][0]).toBe("One.\n\nTwo.\n\nThree.");
+    expect(call).not.toHaveBeenCalled();
+    expect(results.map((result) => result.audioBuffer?.toString().split("@")[1])).toEqual([
+      "0.00-5.00",
+      "5.00-11.00",
+      "11.00-end",
+    ]);
+    expect(narration.stats()).toMatchObject({ providerCalls: 1, batchedCues: 3 });
+  });
+
+  it("falls back to one call per cue when the batched request fails retryably", async () => {
+    const { resolution, call, callWithTimestamps } = fakeResolution({
+      batchError: "HTTP 503 Service Unavailable",
+    });
+    const narration = batcher();
+    const results = await Promise.all(
+      ["One.", "Two."].map((cue) => narration.synthesize(resolution, cue))
+    );
+    expect(callWithTimestamps).toHaveBeenCalledTimes(1);
+    expect(call).toHaveBeenCalledTimes(2);
+    expect(results.map((result) => result.audioBuffer?.toString())).toEqual([
+      "single:One.",
+      "single:Two.",
+    ]);
+  });
+
+  it("fails every cue without per-cue calls when the batch fails for good", async () => {
+    const { resolution, call } = fakeResolution({ batchError: "HTTP 402 Payment Required" });
+    const narration = batcher();
+    const results = await Promise.all(
+      ["One.", "Two."].map((cue) => narration.synthesize(resolution, cue))
+    );
+    expect(call).not.toHaveBeenCalled();
+    expect(results).toEqual([
+      { success: false, error: "HTTP 402 Payment Required" },
+      { success: false, error: "HTTP 402 Payment Required" },
+    ]);
+  });
+
+  it("does not re-bill cues when a paid batch cannot be split", async () => {
+    const { resolution, call } = fakeResolution({
+      alignment: (text) => alignmentFor(text.replace(/\n\n/g, "  ")),
+    });
+    const narration = batcher();
+    const results = await Promise.all(
+      ["One.", "Two."].map((cue) => narration.synthesize(resolution, cue))
+    );
+    expect(call).not.toHaveBeenCalled();
+    expect(results.map((result) => result.success)).toEqual([false, false]);
+    expect(results[1].error).toMatch(/could not be split/);
+    expect(narration.stats()).toMatchObject({ providerCalls: 1, batchedCues: 0 });
+  });
+
+  it("retries a failed slice from the same audio", async () => {
+    const { resolution, call, callWithTimestamps } = fakeResolution();
+    let failures = 1;
+    const flaky: AudioSlicer = async (...args) => {
+      if (failures-- > 0) throw new Error("ffmpeg exited 1");
+      return slice(...args);
+    };
+    const narration = batcher(flaky);
+    const results = await Promise.all(
+      ["One.", "Two."].map((cue) => narration.synthesize(resolution, cue))
+    );
+    expect(callWithTimestamps).toHaveBeenCalledTimes(1);
+    expect(call).not.toHaveBeenCalled();
+    expect(results.every((result) => result.success)).toBe(true);
+    expect(narration.stats()).toMatchObject({ providerCalls: 1, batchedCues: 2 });
+  });
+});
+
+describe("batchCutPoints", () => {
+  it("cuts at the middle of the pause between cues", () => {
+    const cues = ["Hi.", "Bye."];
+    expect(batchCutPoints(cues, alignmentFor("Hi.\n\nBye."))).toEqual([
+      [0, 4],
+      [4, undefined],
+    ]);
+  });
+
+  it("refuses alignments that do not match the joined text", () => {
+    expect(batchCutPoints(["Hi.", "Bye."], alignmentFor("Hi. Bye."))).toBeNull();
+  });
+});
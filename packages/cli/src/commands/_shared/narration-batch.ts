@@ -0,0 +1,308 @@
+/**
+ * @module _shared/narration-batch
+ *
+ * Narration synthesis for `vibe build`, deduplicated and batched across
+ * beats. Every beat's narration goes through {@link NarrationBatcher}:
+ *
+ *   - Identical (cue, provider, voice) requests share one provider call, no
+ *     matter which beats ask for them.
+ *   - Short cues for a provider that returns character timings (ElevenLabs
+ *     `with-timestamps`) are collected for a few milliseconds and sent as one
+ *     request. The audio is cut back into per-cue clips at the midpoint of
+ *     the pause between cues, using the returned alignment.
+ *   - Every provider call runs in the build scheduler's `tts:<provider>`
+ *     lane, so batching never exceeds the provider's concurrency budget.
+ *
+ * A batch that fails retryably (rate limit, transient server or network
+ * error) falls back to one call per cue. A batch that fails for good
+ * (billing, auth) fails every cue in it rather than firing one more doomed
+ * request per cue. A batch that succeeded was paid for: if its audio cannot
+ * be cut apart, each slice is retried once from the same audio and the cues
+ * that still cannot be cut fail, instead of being billed a second time.
+ */
+
+import { mkdtemp, readFile, rm, writeFile } from "node:fs/promises";
+import { tmpdir } from "node:os";
+import { join } from "node:path";
+
+import { execSafe } from "../../utils/exec-safe.js";
+import { isRetryableFailure, type BuildScheduler } from "./build-scheduler.js";
+import { ffmpegToolsAvailable } from "./ffmpeg-gate.js";
+import type { TtsCallResult, TtsResolution } from "./tts-resolve.js";
+
+/** Cut `[startSec, endSec)` out of an encoded audio buffer. `endSec` undefined = to the end. */
+export type AudioSlicer = (
+  audio: Buffer,
+  ext: "mp3" | "wav",
+  startSec: number,
+  endSec: number | undefined
+) => Promise<Buffer>;
+
+export interface NarrationBatcherOptions {
+  scheduler: BuildScheduler;
+  /** Scheduler priority for narration calls. */
+  priority?: number;
+  /** Cues longer than this are always synthesized on their own. */
+  shortCueChars?: number;
+  /** Upper bound on the joined text of one batched request. */
+  maxBatchChars?: number;
+  /** How long the first short cue waits for others to join its batch. */
+  windowMs?: number;
+  slice?: AudioSlicer;
+  /** Batching needs ffmpeg to slice; defaults to the shared ffmpeg gate. */
+  canSlice?: () => boolean;
+}
+
+export interface NarrationBatchStats {
+  /** `synthesize` calls. */
+  requests: number;
+  /** Requests answered by another beat's identical cue. */
+  deduped: number;
+  /** Requests that actually reached a provider. */
+  providerCalls: number;
+  /** Cues delivered as slices of a multi-cue request. */
+  batchedCues: number;
+}
+
+/** Paragraph break between batched cues: gives the voice a natural pause to cut in. */
+const BATCH_SEPARATOR = "\n\n";
+const DEFAULT_SHORT_CUE_CHARS = 240;
+const DEFAULT_MAX_BATCH_CHARS = 1200;
+const DEFAULT_WINDOW_MS = 25;
+/** Attempts at cutting one cue out of a paid batch before the cue fails. */
+const SLICE_ATTEMPTS = 2;
+
+interface PendingCue {
+  cue: string;
+  resolve: (result: TtsCallResult) => void;
+  reject: (error: unknown) => void;
+}
+
+interface PendingBatch {
+  resolution: TtsResolution;
+  voice?: string;
+  cues: PendingCue[];
+  chars: number;
+  timer: ReturnType<typeof setTimeout>;
+}
+
+export class NarrationBatcher {
+  private readonly results = new Map<string, Promise<TtsCallResult>>();
+  private readonly pending = new Map<string, PendingBatch>();
+  private readonly counters: NarrationBatchStats = {
+    requests: 0,
+    deduped: 0,
+    providerCalls: 0,
+    batchedCues: 0,
+  };
+
+  constructor(private readonly opts: NarrationBatcherOptions) {}
+
+  /** Synthesize `cue`, sharing the call with any identical request in this build. */
+  synthesize(resolution: TtsResolution, cue: string, voice?: string): Promise<TtsCallResult> {
+    this.counters.requests += 1;
+    const key = JSON.stringify([resolution.provider, voice ?? null, cue]);
+    const existing = this.results.get(key);
+    if (existing) {
+      this.counters.deduped += 1;
+      // Same audio, but only the first request was billed for its characters.
+      return existing.then((result) =>
+        result.characterCount === undefined ? result : { ...result, characterCount: 0 }
+      );
+    }
+    const result = this.canBatch(resolution, cue)
+      ? this.enqueue(resolution, cue, voice)
+      : this.callOne(resolution, cue, voice);
+    this.results.set(key, result);
+    return result;
+  }
+
+  stats(): NarrationBatchStats {
+    return { ...this.counters };
+  }
+
+  private canBatch(resolution: TtsResolution, cue: string): boolean {
+    return (
+      resolution.callWithTimestamps !== undefined &&
+      cue.length <= (this.opts.shortCueChars ?? DEFAULT_SHORT_CUE_CHARS) &&
+      (this.opts.canSlice ?? ffmpegToolsAvailable)()
+    );
+  }
+
+  private enqueue(resolution: TtsResolution, cue: string, voice?: string): Promise<TtsCallResult> {
+    const groupKey = JSON.stringify([resolution.provider, voice ?? null]);
+    const maxChars = this.opts.maxBatchChars ?? DEFAULT_MAX_BATCH_CHARS;
+    let batch = this.pending.get(groupKey);
+    if (batch && batch.chars + BATCH_SEPARATOR.length + cue.length > maxChars) {
+      this.flush(groupKey);
+      batch = undefined;
+    }
+    if (!batch) {
+      batch = {
+        resolution,
+        voice,
+        cues: [],
+        chars: 0,
+        timer: setTimeout(() => this.flush(groupKey), this.opts.windowMs ?? DEFAULT_WINDOW_MS),
+      };
+      this.pending.set(groupKey, batch);
+    }
+    batch.chars += (batch.cues.length > 0 ? BATCH_SEPARATOR.length : 0) + cue.length;
+    const target = batch;
+    return new Promise((resolve, reject) => target.cues.push({ cue, resolve, reject }));
+  }
+
+  private flush(groupKey: string): void {
+    const batch = this.pending.get(groupKey);
+    if (!batch) return;
+    this.pending.delete(groupKey);
+    clearTimeout(batch.timer);
+    // Settling twice is a no-op, so this only reaches cues still waiting.
+    this.runBatch(batch).catch((error) => batch.cues.forEach((item) => item.reject(error)));
+  }
+
+  private async runBatch(batch: PendingBatch): Promise<void> {
+    const { resolution, voice, cues } = batch;
+    if (cues.length === 1) {
+      cues[0].resolve(await this.callOne(resolution, cues[0].cue, voice));
+      return;
+    }
+    const slices = await this.callBatched(batch);
+    if (slices) {
+      this.counters.batchedCues += slices.filter((result) => result.success).length;
+      cues.forEach((item, index) => item.resolve(slices[index]));
+      return;
+    }
+    await Promise.all(
+      cues.map(async (item) => item.resolve(await this.callOne(resolution, item.cue, voice)))
+    );
+  }
+
+  /**
+   * One request for every cue in the batch, sliced back apart. `null` = the
+   * request failed retryably; fall back to one call per cue. Failed results
+   * come back for cues the batch cannot deliver; non-retryable errors throw.
+   */
+  private async callBatched(batch: PendingBatch): Promise<TtsCallResult[] | null> {
+    const { resolution, voice, cues } = batch;
+    const timed = resolution.callWithTimestamps;
+    if (!timed) return null;
+    const text = cues.map((item) => item.cue).join(BATCH_SEPARATOR);
+    this.counters.providerCalls += 1;
+    let result: Awaited<ReturnType<typeof timed>>;
+    try {
+      result = await this.opts.scheduler.run(
+        "tts",
+        resolution.provider,
+        () => timed(text, { voice }),
+        { priority: this.opts.priority }
+      );
+    } catch (error) {
+      if (isRetryableFailure(error)) return null;
+      throw error;
+    }
+    if (!result.success) {
+      if (isRetryableFailure(result)) return null;
+      return cues.map(() => ({ success: false, error: result.error }));
+    }
+
+    const perCueChars = cues.map((item) => item.cue.length);
+    const cuts =
+      result.audioBuffer && result.alignment
+        ? batchCutPoints(cues.map((item) => item.cue), result.alignment)
+        : null;
+    if (!cuts) {
+      return perCueChars.map((characterCount) => ({
+        success: false,
+        error: "Batched narration could not be split: alignment does not match the text",
+        characterCount,
+      }));
+    }
+    const slice = this.opts.slice ?? sliceAudioWithFfmpeg;
+    const audio = result.audioBuffer!;
+    return Promise.all(
+      cuts.map(async ([start, end], index): Promise<TtsCallResult> => {
+        let lastError: unknown;
+        for (let attempt = 0; attempt < SLICE_ATTEMPTS; attempt++) {
+          try {
+            const audioBuffer = await slice(audio, resolution.audioExtension, start, end);
+            return { success: true, audioBuffer, characterCount: perCueChars[index] };
+          } catch (error) {
+            lastError = error;
+          }
+        }
+        const reason = lastError instanceof Error ? lastError.message : String(lastError);
+        return {
+          success: false,
+          error: `Could not cut cue out of batched narration: ${reason}`,
+          characterCount: perCueChars[index],
+        };
+      })
+    );
+  }
+
+  private callOne(resolution: TtsResolution, cue: string, voice?: string): Promise<TtsCallResult> {
+    this.counters.providerCalls += 1;
+    return this.opts.scheduler.run(
+      "tts",
+      resolution.provider,
+      () => resolution.call(cue, { voice }),
+      { priority: this.opts.priority }
+    );
+  }
+}
+
+/**
+ * Where to cut a batched clip: each cue runs from the midpoint of the pause
+ * before it to the midpoint of the pause after it (the first starts at 0,
+ * the last runs to the end). Returns `null` when the alignment does not
+ * cover the joined text character for character.
+ */
+export function batchCutPoints(
+  cues: string[],
+  alignment: { characters: string[]; startTimes: number[]; endTimes: number[] }
+): Array<[number, number | undefined]> | null {
+  const text = cues.join(BATCH_SEPARATOR);
+  if (
+    alignment.characters.join("") !== text ||
+    alignment.startTimes.length !== text.length ||
+    alignment.endTimes.length !== text.length
+  ) {
+    return null;
+  }
+  const spans: Array<[number, number]> = [];
+  let offset = 0;
+  for (const cue of cues) {
+    spans.push([alignment.startTimes[offset], alignment.endTimes[offset + cue.length - 1]]);
+    offset += cue.length + BATCH_SEPARATOR.length;
+  }
+  return spans.map(([, end], index): [number, number | undefined] => {
+    const start = index === 0 ? 0 : (spans[index - 1][1] + spans[index][0]) / 2;
+    const next = spans[index + 1];
+    return [start, next ? (end + next[0]) / 2 : undefined];
+  });
+}
+
+const sliceAudioWithFfmpeg: AudioSlicer = async (audio, ext, startSec, endSec) => {
+  const dir = await mkdtemp(join(tmpdir(), "vibe-narration-slice-"));
+  try {
+    const input = join(dir, `batch.${ext}`);
+    const output = join(dir, `slice.${ext}`);
+    await writeFile(input, audio);
+    await execSafe("ffmpeg", [
+      "-y",
+      "-v",
+      "error",
+      "-i",
+      input,
+      "-ss",
+      startSec.toFixed(3),
+      ...(endSec !== undefined ? ["-to", endSec.toFixed(3)] : []),
+      ...(ext === "mp3" ? ["-c:a", "libmp3lame", "-q:a", "2"] : ["-c:a", "pcm_s16le"]),
+      output,
+    ]);
+    return await readFile(output);
+  } finally {
+    await rm(dir, { recursive: true, force: true });
+  }
+};
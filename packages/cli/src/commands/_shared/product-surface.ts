@@ -98,6 +98,18 @@ const EXPLICIT_COMMAND_METADATA: Record<string, ProductSurfaceMetadata> = {
   "status.job": { surface: "public" },
   "status.project": { surface: "public" },
 
+  "serve.start": {
+    surface: "agent",
+    note: "Warm daemon that piped `vibe` calls are forwarded to.",
+  },
+  "serve.status": { surface: "agent" },
+  "serve.stop": { surface: "agent" },
+
+  "cache.gc": {
+    surface: "advanced",
+    note: "Disk maintenance for the content-addressed asset cache.",
+  },
+
   "scene.list-styles": { surface: "public" },
   "scene.lint": { surface: "agent" },
   "scene.repair": { surface: "agent" },
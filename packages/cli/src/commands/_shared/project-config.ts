@@ -3,6 +3,7 @@ import { readFile } from "node:fs/promises";
 import { resolve } from "node:path";
 import { parse as parseYaml } from "yaml";
 
+import type { BuildBudgets } from "./build-scheduler.js";
 import type { SceneAspect, SceneKind, VibeProjectConfig as LegacyVibeProjectConfig } from "./scene-project.js";
 
 export const VIBE_CONFIG_FILENAME = "vibe.config.json";
@@ -40,6 +41,12 @@ export interface VibeProjectConfigV1 {
     maxCostUsd: number | null;
     imageQuality: "standard" | "hd";
     imageSize: "1024x1024" | "1536x1024" | "1024x1536";
+    /**
+     * Per-lane provider budgets for the asset fan-out, keyed by kind
+     * (`"tts"`) or kind:provider (`"video:kling"`). Unset lanes use
+     * `DEFAULT_BUILD_BUDGETS`.
+     */
+    budgets?: BuildBudgets;
   };
   composition: {
     engine: CompositionEngine;
@@ -47,6 +54,8 @@ export interface VibeProjectConfigV1 {
     compositionsDir: string;
     assetsDir: string;
     rendersDir: string;
+    /** Size bound for `.vibeframe/cache/render/` in MB. Default 2048. */
+    renderCacheMaxMb?: number;
   };
 }
 
@@ -0,0 +1,107 @@
+import { describe, expect, it, beforeEach, afterEach } from "vitest";
+import { existsSync, mkdtempSync, rmSync } from "node:fs";
+import { mkdir, utimes, writeFile } from "node:fs/promises";
+import { tmpdir } from "node:os";
+import { join } from "node:path";
+
+import {
+  evictRenderCache,
+  readRenderCacheEntry,
+  renderCacheDescriptor,
+  renderCacheStats,
+  writeRenderCacheEntry,
+} from "./render-cache.js";
+
+const SETTINGS = { fps: 30, quality: "standard", format: "mp4", silent: false };
+
+describe("render cache", () => {
+  let dir: string;
+  beforeEach(async () => {
+    dir = mkdtempSync(join(tmpdir(), "vibe-render-cache-"));
+    await mkdir(join(dir, "compositions"), { recursive: true });
+    await mkdir(join(dir, "assets"), { recursive: true });
+    await writeFile(
+      join(dir, "index.html"),
+      '<div id="root"><div class="clip" data-composition-src="compositions/scene-intro.html"></div>' +
+        '<audio src="assets/narration-intro.wav"></audio></div>'
+    );
+    await writeFile(
+      join(dir, "compositions", "scene-intro.html"),
+      '<style>.bg { background: url("assets/backdrop-intro.png"); }</style>'
+    );
+    await writeFile(join(dir, "assets", "narration-intro.wav"), "audio");
+    await writeFile(join(dir, "assets", "backdrop-intro.png"), "image");
+    await writeFile(join(dir, "build-report.json"), "{}");
+  });
+  afterEach(() => rmSync(dir, { recursive: true, force: true }));
+
+  const describeRender = (settings: Record<string, unknown> = SETTINGS) =>
+    renderCacheDescriptor({ projectDir: dir, root: "index.html", settings });
+
+  it("keys on sub-compositions, nested assets and settings, not on metadata", async () => {
+    const first = await describeRender();
+    expect(first.path).toBe(`.vibeframe/cache/render/render-${first.key}.mp4`);
+
+    await writeFile(join(dir, "build-report.json"), '{"beats":[]}');
+    expect((await describeRender()).key).toBe(first.key);
+
+    expect((await describeRender({ ...SETTINGS, quality: "high" })).key).not.toBe(first.key);
+
+    await writeFile(join(dir, "assets", "backdrop-intro.png"), "image v2");
+    expect((await describeRender()).key).not.toBe(first.key);
+  });
+
+  it("returns a stored render on the next lookup and counts hits and misses", async () => {
+    const descriptor = await describeRender();
+    expect(await readRenderCacheEntry(dir, descriptor)).toBeNull();
+
+    const output = join(dir, "out.mp4");
+    await writeFile(output, "video");
+    await writeRenderCacheEntry({
+      projectDir: dir,
+      descriptor,
+      sourcePath: output,
+      entry: { root: "index.html", totalFrames: 150, audioCount: 1, audioMuxApplied: true },
+    });
+
+    expect(await readRenderCacheEntry(dir, descriptor)).toMatchObject({
+      key: descriptor.key,
+      totalFrames: 150,
+      audioCount: 1,
+    });
+    expect(await renderCacheStats(dir)).toMatchObject({
+      renders: 1,
+      segments: 0,
+      hits: 1,
+      misses: 1,
+    });
+  });
+
+  it("evicts least-recently-used renders and segments past the size bound", async () => {
+    const cacheDir = join(dir, ".vibeframe", "cache", "render");
+    await mkdir(join(cacheDir, "segments"), { recursive: true });
+    const files = {
+      old: join(cacheDir, "render-old.mp4"),
+      oldMeta: join(cacheDir, "render-old.json"),
+      segment: join(cacheDir, "segments", "seg.mp4"),
+      fresh: join(cacheDir, "render-fresh.mp4"),
+    };
+    await writeFile(files.old, "x".repeat(100));
+    await writeFile(files.oldMeta, "{}");
+    await writeFile(files.segment, "x".repeat(100));
+    await writeFile(files.fresh, "x".repeat(100));
+    await utimes(files.old, 1_000, 1_000);
+    await utimes(files.oldMeta, 1_000, 1_000);
+    await utimes(files.segment, 2_000, 2_000);
+
+    expect(await evictRenderCache(dir, 250)).toBe(1);
+    expect(existsSync(files.old)).toBe(false);
+    expect(existsSync(files.oldMeta)).toBe(false);
+    expect(existsSync(files.segment)).toBe(true);
+
+    expect(await evictRenderCache(dir, 150)).toBe(1);
+    expect(existsSync(files.segment)).toBe(false);
+    expect(existsSync(files.fresh)).toBe(true);
+    expect(await renderCacheStats(dir, 150)).toMatchObject({ renders: 1, evictions: 2 });
+  });
+});
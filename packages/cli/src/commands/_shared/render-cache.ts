@@ -0,0 +1,337 @@
+/**
+ * @module _shared/render-cache
+ *
+ * Incremental render cache under `.vibeframe/cache/render/`. A finished
+ * render is stored under a digest of everything that can change its pixels
+ * or audio: the entry HTML, every sub-composition and asset it references
+ * (by content, followed recursively through HTML/CSS), and the render
+ * settings. Re-rendering an unchanged project copies the cached file to the
+ * output path instead of launching Chrome — edits to `build-report.json` or
+ * other metadata no longer cost a full capture.
+ *
+ * Beat segments from sharded renders (`scene-render-shards.ts`) live in the
+ * `segments/` subdirectory and share the same size bound: when the cache
+ * grows past it, least-recently-used entries are evicted first. Hit/miss and
+ * eviction counters are kept in `stats.json` for `vibe render --cache-stats`.
+ */
+
+import { createHash } from "node:crypto";
+import { createReadStream, existsSync } from "node:fs";
+import {
+  copyFile,
+  mkdir,
+  readdir,
+  readFile,
+  rename,
+  rm,
+  stat,
+  utimes,
+  writeFile,
+} from "node:fs/promises";
+import { dirname, isAbsolute, join, relative, resolve } from "node:path";
+
+export const RENDER_CACHE_SUBDIR = join(".vibeframe", "cache", "render");
+
+/** Default size bound for renders + segments together. */
+export const DEFAULT_RENDER_CACHE_MAX_BYTES = 2 * 1024 ** 3;
+
+/** `composition.renderCacheMaxMb` from the project config, or the default. */
+export function renderCacheMaxBytes(maxMb: number | undefined): number {
+  return typeof maxMb === "number" && Number.isFinite(maxMb) && maxMb >= 0
+    ? maxMb * 1024 * 1024
+    : DEFAULT_RENDER_CACHE_MAX_BYTES;
+}
+
+const STATS_FILENAME = "stats.json";
+const VIDEO_EXT_RE = /\.(mp4|webm|mov)$/i;
+
+export interface RenderCacheDescriptor {
+  key: string;
+  /** Project-relative cached video. */
+  path: string;
+  /** Project-relative metadata sidecar. */
+  metaPath: string;
+  ext: string;
+}
+
+/** What a cache hit needs to rebuild the render result without capturing. */
+export interface RenderCacheEntry {
+  version: 1;
+  key: string;
+  root: string;
+  totalFrames?: number;
+  audioCount: number;
+  audioMuxApplied: boolean;
+  audioMuxWarning?: string;
+  createdAt: string;
+}
+
+export interface RenderCacheStats {
+  dir: string;
+  renders: number;
+  segments: number;
+  bytes: number;
+  maxBytes: number;
+  hits: number;
+  misses: number;
+  evictions: number;
+}
+
+interface RenderCacheCounters {
+  hits: number;
+  misses: number;
+  evictions: number;
+}
+
+/**
+ * Cache descriptor for rendering `root` with `settings`, in the
+ * `cacheAssetDescriptor` style: sha256 over a JSON description of the inputs.
+ */
+export async function renderCacheDescriptor(opts: {
+  projectDir: string;
+  root: string;
+  settings: Record<string, unknown>;
+}): Promise<RenderCacheDescriptor> {
+  const files = await hashReferencedFiles(opts.projectDir, opts.root);
+  const ext = String(opts.settings.format ?? "mp4");
+  const key = createHash("sha256")
+    .update(JSON.stringify({ kind: "render", root: opts.root, ...opts.settings, files }))
+    .digest("hex");
+  return {
+    key,
+    ext,
+    path: `.vibeframe/cache/render/render-${key}.${ext}`,
+    metaPath: `.vibeframe/cache/render/render-${key}.json`,
+  };
+}
+
+/**
+ * Content digests for `entry` and every local file it references through
+ * `src`/`href`/`data-composition-src`/`poster` attributes or CSS `url()`,
+ * followed recursively through HTML and CSS. Paths are project-relative so a
+ * moved project keeps its cache; unresolved references hash as `missing`.
+ */
+export async function hashReferencedFiles(
+  projectDir: string,
+  entry: string
+): Promise<Array<[string, string]>> {
+  const digests = new Map<string, string>();
+  const pending = [resolve(projectDir, entry)];
+  while (pending.length > 0) {
+    const file = pending.pop() as string;
+    if (digests.has(file)) continue;
+    if (!existsSync(file) || !(await stat(file)).isFile()) {
+      digests.set(file, "missing");
+      continue;
+    }
+    digests.set(file, await hashFile(file));
+    if (!/\.(html?|css)$/i.test(file)) continue;
+    const text = await readFile(file, "utf-8");
+    for (const match of text.matchAll(ASSET_REF_RE_GLOBAL)) {
+      const ref = (match[1] ?? match[3] ?? "").split(/[?#]/)[0];
+      const local = resolveLocalRef(projectDir, dirname(file), ref);
+      if (local) pending.push(local);
+    }
+  }
+  return [...digests.entries()]
+    .map(([file, digest]): [string, string] => [relative(projectDir, file), digest])
+    .sort(([a], [b]) => a.localeCompare(b));
+}
+
+/**
+ * Look up a cached render. On a hit the entry is touched so LRU eviction
+ * keeps it, and the hit is counted; a miss is counted too.
+ */
+export async function readRenderCacheEntry(
+  projectDir: string,
+  descriptor: RenderCacheDescriptor
+): Promise<RenderCacheEntry | null> {
+  const videoPath = join(projectDir, descriptor.path);
+  const metaPath = join(projectDir, descriptor.metaPath);
+  let entry: RenderCacheEntry | null = null;
+  try {
+    const parsed = JSON.parse(await readFile(metaPath, "utf-8")) as RenderCacheEntry;
+    if (parsed.version === 1 && parsed.key === descriptor.key && existsSync(videoPath)) {
+      entry = parsed;
+      const now = new Date();
+      await Promise.all([utimes(videoPath, now, now), utimes(metaPath, now, now)]);
+    }
+  } catch {
+    entry = null;
+  }
+  await bumpCounters(projectDir, entry ? { hits: 1 } : { misses: 1 });
+  return entry;
+}
+
+/**
+ * Store a finished render, then evict least-recently-used entries until the
+ * cache fits `maxBytes`. Copies via a temp file + rename so a crash never
+ * leaves a truncated video under a valid key.
+ */
+export async function writeRenderCacheEntry(opts: {
+  projectDir: string;
+  descriptor: RenderCacheDescriptor;
+  sourcePath: string;
+  entry: Omit<RenderCacheEntry, "version" | "key" | "createdAt">;
+  maxBytes?: number;
+}): Promise<void> {
+  const videoPath = join(opts.projectDir, opts.descriptor.path);
+  const metaPath = join(opts.projectDir, opts.descriptor.metaPath);
+  await mkdir(dirname(videoPath), { recursive: true });
+  const tmpVideo = `${videoPath}.tmp-${process.pid}`;
+  await copyFile(opts.sourcePath, tmpVideo);
+  await rename(tmpVideo, videoPath);
+  const entry: RenderCacheEntry = {
+    version: 1,
+    key: opts.descriptor.key,
+    ...opts.entry,
+    createdAt: new Date().toISOString(),
+  };
+  const tmpMeta = `${metaPath}.tmp-${process.pid}`;
+  await writeFile(tmpMeta, JSON.stringify(entry, null, 2) + "\n", "utf-8");
+  await rename(tmpMeta, metaPath);
+  await evictRenderCache(opts.projectDir, opts.maxBytes ?? DEFAULT_RENDER_CACHE_MAX_BYTES);
+}
+
+/** Mark a reused segment as recently used. */
+export async function touchRenderCacheFile(path: string): Promise<void> {
+  const now = new Date();
+  await utimes(path, now, now).catch(() => undefined);
+}
+
+/**
+ * Delete least-recently-used renders and segments until the cache holds at
+ * most `maxBytes`. A render and its sidecar are evicted together. Returns the
+ * number of entries removed.
+ */
+export async function evictRenderCache(projectDir: string, maxBytes: number): Promise<number> {
+  const entries = await listCacheEntries(projectDir);
+  let total = entries.reduce((sum, entry) => sum + entry.bytes, 0);
+  if (total <= maxBytes) return 0;
+  entries.sort((a, b) => a.usedAt - b.usedAt);
+  let evicted = 0;
+  for (const entry of entries) {
+    if (total <= maxBytes) break;
+    await Promise.all(entry.files.map((file) => rm(file, { force: true })));
+    total -= entry.bytes;
+    evicted += 1;
+  }
+  await bumpCounters(projectDir, { evictions: evicted });
+  return evicted;
+}
+
+export async function renderCacheStats(
+  projectDir: string,
+  maxBytes = DEFAULT_RENDER_CACHE_MAX_BYTES
+): Promise<RenderCacheStats> {
+  const entries = await listCacheEntries(projectDir);
+  const counters = await readCounters(projectDir);
+  return {
+    dir: join(projectDir, RENDER_CACHE_SUBDIR),
+    renders: entries.filter((entry) => entry.kind === "render").length,
+    segments: entries.filter((entry) => entry.kind === "segment").length,
+    bytes: entries.reduce((sum, entry) => sum + entry.bytes, 0),
+    maxBytes,
+    ...counters,
+  };
+}
+
+interface CacheEntryFiles {
+  kind: "render" | "segment";
+  files: string[];
+  bytes: number;
+  usedAt: number;
+}
+
+async function listCacheEntries(projectDir: string): Promise<CacheEntryFiles[]> {
+  const root = join(projectDir, RENDER_CACHE_SUBDIR);
+  const entries: CacheEntryFiles[] = [];
+  const collect = async (dir: string, kind: CacheEntryFiles["kind"]) => {
+    let names: string[];
+    try {
+      names = await readdir(dir);
+    } catch {
+      return;
+    }
+    for (const name of names) {
+      // Temp and partial files belong to an in-flight render.
+      if (!VIDEO_EXT_RE.test(name) || name.includes(".partial")) continue;
+      const video = join(dir, name);
+      const files = [video];
+      const sidecar = kind === "render" ? video.replace(VIDEO_EXT_RE, ".json") : undefined;
+      if (sidecar && existsSync(sidecar)) files.push(sidecar);
+      let bytes = 0;
+      let usedAt = 0;
+      for (const file of files) {
+        const info = await stat(file).catch(() => null);
+        if (!info) continue;
+        bytes += info.size;
+        usedAt = Math.max(usedAt, info.mtimeMs);
+      }
+      entries.push({ kind, files, bytes, usedAt });
+    }
+  };
+  await collect(root, "render");
+  await collect(join(root, "segments"), "segment");
+  return entries;
+}
+
+async function readCounters(projectDir: string): Promise<RenderCacheCounters> {
+  try {
+    const parsed = JSON.parse(
+      await readFile(join(projectDir, RENDER_CACHE_SUBDIR, STATS_FILENAME), "utf-8")
+    ) as Partial<RenderCacheCounters>;
+    return {
+      hits: Number(parsed.hits) || 0,
+      misses: Number(parsed.misses) || 0,
+      evictions: Number(parsed.evictions) || 0,
+    };
+  } catch {
+    return { hits: 0, misses: 0, evictions: 0 };
+  }
+}
+
+/** Best-effort: counters are diagnostics and never fail a render. */
+async function bumpCounters(
+  projectDir: string,
+  delta: Partial<RenderCacheCounters>
+): Promise<void> {
+  try {
+    const counters = await readCounters(projectDir);
+    const next: RenderCacheCounters = {
+      hits: counters.hits + (delta.hits ?? 0),
+      misses: counters.misses + (delta.misses ?? 0),
+      evictions: counters.evictions + (delta.evictions ?? 0),
+    };
+    const path = join(projectDir, RENDER_CACHE_SUBDIR, STATS_FILENAME);
+    await mkdir(dirname(path), { recursive: true });
+    const tmp = `${path}.tmp-${process.pid}`;
+    await writeFile(tmp, JSON.stringify(next) + "\n", "utf-8");
+    await rename(tmp, path);
+  } catch {
+    // ignore
+  }
+}
+
+const ASSET_REF_RE_GLOBAL =
+  /(?:\b(?:src|href|data-composition-src|poster)="([^"]+)"|url\((['"]?)([^'")]+)\2\))/gi;
+
+/** Project-relative first (how scene HTML references assets), then file-relative. */
+function resolveLocalRef(projectDir: string, fromDir: string, ref: string): string | undefined {
+  if (!ref || /^[a-z][a-z0-9+.-]*:/i.test(ref) || ref.startsWith("//")) return undefined;
+  if (isAbsolute(ref)) return ref;
+  const fromProject = resolve(projectDir, ref);
+  if (existsSync(fromProject)) return fromProject;
+  const fromFile = resolve(fromDir, ref);
+  return existsSync(fromFile) ? fromFile : undefined;
+}
+
+function hashFile(file: string): Promise<string> {
+  return new Promise((resolvePromise, reject) => {
+    const hash = createHash("sha256");
+    createReadStream(file)
+      .on("data", (chunk) => hash.update(chunk))
+      .on("error", reject)
+      .on("end", () => resolvePromise(hash.digest("hex")));
+  });
+}
@@ -6,6 +6,7 @@ import { join, resolve } from "node:path";
 import {
   aiReviewSeverity,
   blackFrameIssueForRange,
+  buildRenderScanArgs,
   durationDriftIssue,
   inspectRender,
   mapAiReviewFeedbackToIssues,
@@ -15,6 +16,7 @@ import {
   previewInspectRender,
   renderExpectsAudio,
   resolveRenderVideoPath,
+  scanRenderMedia,
   scoreRenderReview,
   staticFrameIssueForRange,
 } from "./render-inspect.js";
@@ -64,6 +66,41 @@ describe("render inspect parsers", () => {
     ]);
   });
 
+  it("parses interleaved fused-scan output per detector", () => {
+    const out = [
+      "[Parsed_blackdetect_0 @ 0x1] black_start:0 black_end:1.5 black_duration:1.5",
+      "frame=  120 fps=0.0 q=-0.0 size=N/A time=00:00:04.00\r[freezedetect @ 0x2] lavfi.freezedetect.freeze_start: 2",
+      "[silencedetect @ 0x3] silence_start: 1",
+      "[freezedetect @ 0x2] lavfi.freezedetect.freeze_end: 5",
+      "[silencedetect @ 0x3] silence_end: 4 | silence_duration: 3",
+    ].join("\n");
+
+    expect(parseBlackdetectOutput(out)).toEqual([{ start: 0, end: 1.5, duration: 1.5 }]);
+    expect(parseFreezedetectOutput(out)).toEqual([{ start: 2, end: 5, duration: 3 }]);
+    expect(parseSilencedetectOutput(out)).toEqual([{ start: 1, end: 4, duration: 3 }]);
+  });
+
+  it("builds one fused decode with split video/audio chains", () => {
+    const args = buildRenderScanArgs("/tmp/render.mp4", { audio: true });
+    const graph = args[args.indexOf("-filter_complex") + 1];
+
+    expect(args.filter((arg) => arg === "-i")).toHaveLength(1);
+    expect(graph).toBe(
+      "[0:v:0]blackdetect=d=1:pic_th=0.98,freezedetect=n=-60dB:d=2[scanv];" +
+        "[0:a:0]silencedetect=noise=-35dB:d=2[scana]"
+    );
+    expect(args.slice(-2)).toEqual(["null", "-"]);
+    expect(buildRenderScanArgs("/tmp/render.mp4").join(" ")).not.toContain("silencedetect");
+  });
+
+  it("downscales and decimates before detection in draft scan mode", () => {
+    const args = buildRenderScanArgs("/tmp/render.mp4", { mode: "draft" });
+    const graph = args[args.indexOf("-filter_complex") + 1];
+
+    expect(args).toContain("-skip_loop_filter");
+    expect(graph.startsWith("[0:v:0]framestep=3,scale=iw/4:-2,blackdetect=")).toBe(true);
+  });
+
   it("maps static frame ranges to beat-level host-agent issues", () => {
     const issue = staticFrameIssueForRange(
       { start: 0.25, end: 4.5, duration: 4.25 },
@@ -366,6 +403,49 @@ describe("render expected-audio detection", () => {
   });
 });
 
+describe("render inspect fused scan", () => {
+  const hasVideoTools = commandExists("ffmpeg") && commandExists("ffprobe");
+
+  it.skipIf(!hasVideoTools)("matches the one-decode-per-detector results", async () => {
+    const dir = await makeTmp();
+    const videoPath = resolve(dir, "qa.mp4");
+    await execSafe("ffmpeg", [
+      "-hide_banner",
+      "-y",
+      "-f",
+      "lavfi",
+      "-i",
+      "color=c=black:s=64x64:d=2",
+      "-f",
+      "lavfi",
+      "-i",
+      "color=c=red:s=64x64:d=3",
+      "-f",
+      "lavfi",
+      "-i",
+      "anullsrc=r=48000:cl=mono",
+      "-filter_complex",
+      "[0:v][1:v]concat=n=2:v=1:a=0[v]",
+      "-map",
+      "[v]",
+      "-map",
+      "2:a",
+      "-t",
+      "5",
+      "-pix_fmt",
+      "yuv420p",
+      videoPath,
+    ]);
+
+    const fused = await scanRenderMedia(videoPath, { audio: true });
+    const split = await scanRenderMedia(videoPath, { audio: true, fused: false });
+
+    expect(fused).toEqual(split);
+    expect(fused.blackFrames.length).toBeGreaterThan(0);
+    expect(fused.silences.length).toBeGreaterThan(0);
+  });
+});
+
 describe("render inspect no-audio warnings", () => {
   const hasVideoTools = commandExists("ffmpeg") && commandExists("ffprobe");
 
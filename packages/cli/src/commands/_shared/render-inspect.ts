@@ -4,7 +4,9 @@ import { basename, isAbsolute, join, relative, resolve } from "node:path";
 
 import { executeReview, type ReviewResult } from "../ai-review.js";
 import type { VideoReviewFeedback } from "../ai-edit.js";
-import { commandExists, execSafe } from "../../utils/exec-safe.js";
+import { commandExists } from "../../utils/exec-safe.js";
+import { eventRanges, parseFfmpegEvents, streamFfmpegEvents } from "../../utils/ffmpeg-events.js";
+import { probeMedia } from "../../utils/media-probe.js";
 import { readProjectConfig } from "./project-config.js";
 import { parseStoryboard } from "./storyboard-parse.js";
 import {
@@ -48,6 +50,10 @@ export interface RenderInspectOptions {
   writeReport?: boolean;
   ai?: boolean;
   model?: RenderInspectModel;
+  /** Scan a downscaled, decimated copy of the render (faster, draft QA only). */
+  draftScan?: boolean;
+  /** Called while the QA decode runs with the current decode position. */
+  onScanProgress?: (progress: { timeSec: number; durationSec?: number }) => void;
 }
 
 export interface RenderInspectDryRunResult {
@@ -66,6 +72,7 @@ export interface RenderInspectDryRunResult {
     cheap: true;
     ai: boolean;
     model: RenderInspectModel;
+    draftScan: boolean;
   };
   checks: {
     renderFound: boolean;
@@ -107,6 +114,7 @@ export interface RenderInspectResult {
     expectedAspect?: string;
     hasAudio?: boolean;
     expectedAudio?: boolean;
+    scanMode?: RenderScanMode;
     blackFrames: TimeRange[];
     staticFrames: TimeRange[];
     silences: TimeRange[];
@@ -116,18 +124,26 @@ export interface RenderInspectResult {
   reportPath?: string;
 }
 
-interface FfprobeStream {
-  codec_type?: string;
-  width?: number;
-  height?: number;
+export type RenderScanMode = "full" | "draft";
+
+export interface RenderScanOptions {
+  /**
+   * Include the silencedetect chain. `undefined` means the audio layout is
+   * unknown (ffprobe failed), so silence runs as its own tolerant pass.
+   */
+  audio?: boolean;
+  /** Analyze a downscaled, decimated copy of the video stream. */
+  mode?: RenderScanMode;
+  /** Run one decode per detector instead of the fused pass (benchmarks). */
+  fused?: boolean;
+  /** Called with the decode position (seconds) while the scan runs. */
+  onProgress?: (timeSec: number) => void;
 }
 
-interface FfprobeInfo {
-  streams?: FfprobeStream[];
-  format?: {
-    duration?: string;
-    size?: string;
-  };
+export interface RenderScanResult {
+  blackFrames: TimeRange[];
+  staticFrames: TimeRange[];
+  silences: TimeRange[];
 }
 
 const VIDEO_EXTENSIONS = new Set([".mp4", ".mov", ".webm", ".m4v"]);
@@ -138,6 +154,8 @@ const STATIC_FRAME_ERROR_MIN_DURATION_SEC = 3;
 const LONG_SILENCE_MIN_DURATION_SEC = 2;
 const DURATION_DRIFT_MIN_SEC = 1.25;
 const DURATION_DRIFT_RATIO = 0.08;
+const DRAFT_SCAN_SCALE_DIVISOR = 4;
+const DRAFT_SCAN_FRAME_STEP = 3;
 const AI_CATEGORY_LABELS = {
   pacing: "Pacing",
   color: "Color",
@@ -147,72 +165,84 @@ const AI_CATEGORY_LABELS = {
 } as const;
 
 export function parseBlackdetectOutput(output: string): TimeRange[] {
-  const ranges: TimeRange[] = [];
-  const regex =
-    /black_start:(-?\d+(?:\.\d+)?)\s+black_end:(-?\d+(?:\.\d+)?)\s+black_duration:(-?\d+(?:\.\d+)?)/g;
-  let match: RegExpExecArray | null;
-  while ((match = regex.exec(output)) !== null) {
-    ranges.push({
-      start: Number.parseFloat(match[1]),
-      end: Number.parseFloat(match[2]),
-      duration: Number.parseFloat(match[3]),
-    });
-  }
-  return ranges;
+  return eventRanges(parseFfmpegEvents(output), "black");
 }
 
 export function parseSilencedetectOutput(output: string): TimeRange[] {
-  const starts: number[] = [];
-  const ranges: TimeRange[] = [];
-  const startRegex = /silence_start:\s*(-?\d+(?:\.\d+)?)/g;
-  const endRegex = /silence_end:\s*(-?\d+(?:\.\d+)?)\s+\|\s+silence_duration:\s*(-?\d+(?:\.\d+)?)/g;
-  let match: RegExpExecArray | null;
-  while ((match = startRegex.exec(output)) !== null) {
-    starts.push(Number.parseFloat(match[1]));
-  }
-  let index = 0;
-  while ((match = endRegex.exec(output)) !== null) {
-    if (index >= starts.length) continue;
-    ranges.push({
-      start: starts[index],
-      end: Number.parseFloat(match[1]),
-      duration: Number.parseFloat(match[2]),
-    });
-    index++;
-  }
-  return ranges;
+  return eventRanges(parseFfmpegEvents(output), "silence");
 }
 
 export function parseFreezedetectOutput(output: string): TimeRange[] {
-  const ranges: TimeRange[] = [];
-  let start: number | undefined;
-  let duration: number | undefined;
-  const regex = /lavfi\.freezedetect\.freeze_(start|duration|end):\s*(-?\d+(?:\.\d+)?)/g;
-  let match: RegExpExecArray | null;
-  while ((match = regex.exec(output)) !== null) {
-    const key = match[1];
-    const value = Number.parseFloat(match[2]);
-    if (key === "start") {
-      start = value;
-      duration = undefined;
-      continue;
-    }
-    if (key === "duration") {
-      duration = value;
-      continue;
-    }
-    if (key === "end" && start !== undefined) {
-      const end = value;
-      ranges.push({
-        start,
-        end,
-        duration: duration ?? Number((end - start).toFixed(3)),
-      });
-      start = undefined;
-      duration = undefined;
-    }
+  return eventRanges(parseFfmpegEvents(output), "freeze");
+}
+
+/**
+ * Build the single-decode ffmpeg invocation for cheap render QA: the video
+ * stream runs blackdetect and freezedetect back to back (both pass frames
+ * through untouched) and, when requested, the audio stream runs
+ * silencedetect in a parallel chain. Draft mode decimates and downscales
+ * before detection and skips the decoder loop filter.
+ */
+export function buildRenderScanArgs(
+  input: string,
+  opts: { audio?: boolean; mode?: RenderScanMode } = {}
+): string[] {
+  const draft = opts.mode === "draft";
+  const videoChain = [
+    ...(draft ? draftScanFilters() : []),
+    blackdetectFilter(),
+    freezedetectFilter(),
+  ].join(",");
+  const graph = [`[0:v:0]${videoChain}[scanv]`];
+  const maps = ["-map", "[scanv]"];
+  if (opts.audio) {
+    graph.push(`[0:a:0]${silencedetectFilter()}[scana]`);
+    maps.push("-map", "[scana]");
   }
-  return ranges;
+  return [
+    "-hide_banner",
+    ...(draft ? ["-skip_loop_filter", "all"] : []),
+    "-i",
+    input,
+    "-filter_complex",
+    graph.join(";"),
+    ...maps,
+    "-f",
+    "null",
+    "-",
+  ];
+}
+
+/**
+ * Run black-frame, static-frame, and silence detection over a render.
+ * The default path decodes the file once and parses events while ffmpeg
+ * runs; `fused: false` keeps the one-decode-per-detector path for
+ * benchmarking.
+ */
+export async function scanRenderMedia(
+  videoPath: string,
+  opts: RenderScanOptions = {}
+): Promise<RenderScanResult> {
+  const mode = opts.mode ?? "full";
+  if (opts.fused === false) {
+    return {
+      blackFrames: await detectBlackFrames(videoPath, mode),
+      staticFrames: await detectStaticFrames(videoPath, mode),
+      silences: opts.audio === false ? [] : await detectLongSilences(videoPath),
+    };
+  }
+
+  const [scan, separateSilences] = await Promise.all([
+    streamFfmpegEvents(buildRenderScanArgs(videoPath, { audio: opts.audio === true, mode }), {
+      onProgress: opts.onProgress,
+    }),
+    opts.audio === undefined ? detectLongSilences(videoPath) : Promise.resolve(undefined),
+  ]);
+  return {
+    blackFrames: eventRanges(scan.events, "black"),
+    staticFrames: eventRanges(scan.events, "freeze"),
+    silences: separateSilences ?? eventRanges(scan.events, "silence"),
+  };
 }
 
 export function staticFrameIssueForRange(
@@ -329,6 +359,7 @@ export async function previewInspectRender(
       cheap: true,
       ai: opts.ai === true,
       model: opts.model ?? DEFAULT_AI_MODEL,
+      draftScan: opts.draftScan === true,
     },
     checks: {
       renderFound: videoPath !== null,
@@ -484,7 +515,7 @@ export async function inspectRender(opts: RenderInspectOptions): Promise<RenderI
     });
   } else {
     try {
-      const probe = await ffprobe(videoPath);
+      const probe = await probeMedia(videoPath);
       const videoStream = probe.streams?.find((stream) => stream.codec_type === "video");
       const audioStream = probe.streams?.find((stream) => stream.codec_type === "audio");
       const durationSec = parseOptionalNumber(probe.format?.duration);
@@ -575,8 +606,19 @@ export async function inspectRender(opts: RenderInspectOptions): Promise<RenderI
   }
 
   if (commandExists("ffmpeg")) {
+    // One decode feeds every detector; each check still reports its own
+    // skip issue if the shared scan fails.
+    checks.scanMode = opts.draftScan ? "draft" : "full";
+    const durationSec = checks.durationSec;
+    const scan = scanRenderMedia(videoPath, {
+      audio: checks.hasAudio,
+      mode: checks.scanMode,
+      onProgress: opts.onScanProgress
+        ? (timeSec) => opts.onScanProgress?.({ timeSec, durationSec })
+        : undefined,
+    });
     try {
-      checks.blackFrames = await detectBlackFrames(videoPath);
+      checks.blackFrames = (await scan).blackFrames;
       for (const range of checks.blackFrames) {
         const beat = beatForRange(range, beatTimings);
         issues.push(blackFrameIssueForRange(range, beatTimings, videoPath));
@@ -603,7 +645,7 @@ export async function inspectRender(opts: RenderInspectOptions): Promise<RenderI
     }
 
     try {
-      checks.staticFrames = await detectStaticFrames(videoPath);
+      checks.staticFrames = (await scan).staticFrames;
       for (const range of checks.staticFrames) {
         const beat = beatForRange(range, beatTimings);
         issues.push(staticFrameIssueForRange(range, beatTimings, videoPath));
@@ -630,7 +672,7 @@ export async function inspectRender(opts: RenderInspectOptions): Promise<RenderI
 
     if (checks.hasAudio !== false) {
       try {
-        checks.silences = await detectLongSilences(videoPath);
+        checks.silences = (await scan).silences;
         for (const range of checks.silences) {
           const beat = beatForRange(range, beatTimings);
           const audioCoverageRatio =
@@ -1147,57 +1189,62 @@ function durationDriftRange(durationSec: number, expectedDurationSec: number): T
   };
 }
 
-async function ffprobe(videoPath: string): Promise<FfprobeInfo> {
-  const { stdout } = await execSafe("ffprobe", [
-    "-v",
-    "error",
-    "-print_format",
-    "json",
-    "-show_format",
-    "-show_streams",
-    videoPath,
-  ]);
-  return JSON.parse(stdout) as FfprobeInfo;
+function blackdetectFilter(): string {
+  return `blackdetect=d=${BLACK_FRAME_MIN_DURATION_SEC}:pic_th=0.98`;
 }
 
-async function detectBlackFrames(videoPath: string): Promise<TimeRange[]> {
-  const output = await ffmpegNull(videoPath, [
-    "-vf",
-    `blackdetect=d=${BLACK_FRAME_MIN_DURATION_SEC}:pic_th=0.98`,
-    "-an",
-  ]);
-  return parseBlackdetectOutput(output);
+function freezedetectFilter(): string {
+  return `freezedetect=n=-60dB:d=${STATIC_FRAME_MIN_DURATION_SEC}`;
 }
 
-async function detectLongSilences(videoPath: string): Promise<TimeRange[]> {
-  const output = await ffmpegNull(videoPath, [
-    "-af",
-    `silencedetect=noise=-35dB:d=${LONG_SILENCE_MIN_DURATION_SEC}`,
-  ]);
-  return parseSilencedetectOutput(output);
+function silencedetectFilter(): string {
+  return `silencedetect=noise=-35dB:d=${LONG_SILENCE_MIN_DURATION_SEC}`;
+}
+
+function draftScanFilters(): string[] {
+  // framestep keeps source timestamps, so detected ranges stay in render time.
+  return [`framestep=${DRAFT_SCAN_FRAME_STEP}`, `scale=iw/${DRAFT_SCAN_SCALE_DIVISOR}:-2`];
 }
 
-async function detectStaticFrames(videoPath: string): Promise<TimeRange[]> {
-  const output = await ffmpegNull(videoPath, [
+function videoScanArgs(videoPath: string, filter: string, mode: RenderScanMode): string[] {
+  const draft = mode === "draft";
+  return [
+    "-hide_banner",
+    ...(draft ? ["-skip_loop_filter", "all"] : []),
+    "-i",
+    videoPath,
     "-vf",
-    `freezedetect=n=-60dB:d=${STATIC_FRAME_MIN_DURATION_SEC}`,
+    [...(draft ? draftScanFilters() : []), filter].join(","),
     "-an",
+    "-f",
+    "null",
+    "-",
+  ];
+}
+
+async function detectBlackFrames(videoPath: string, mode: RenderScanMode): Promise<TimeRange[]> {
+  const { events } = await streamFfmpegEvents(videoScanArgs(videoPath, blackdetectFilter(), mode));
+  return eventRanges(events, "black");
+}
+
+async function detectLongSilences(videoPath: string): Promise<TimeRange[]> {
+  const { events } = await streamFfmpegEvents([
+    "-hide_banner",
+    "-i",
+    videoPath,
+    "-af",
+    silencedetectFilter(),
+    "-vn",
+    "-f",
+    "null",
+    "-",
   ]);
-  return parseFreezedetectOutput(output);
+  return eventRanges(events, "silence");
 }
 
-async function ffmpegNull(input: string, filterArgs: string[]): Promise<string> {
-  const { stdout, stderr } = await execSafe(
-    "ffmpeg",
-    ["-hide_banner", "-i", input, ...filterArgs, "-f", "null", "-"],
-    { maxBuffer: 50 * 1024 * 1024 }
-  ).catch((err: NodeJS.ErrnoException & { stdout?: string; stderr?: string }) => {
-    if (err.stdout !== undefined || err.stderr !== undefined) {
-      return { stdout: err.stdout || "", stderr: err.stderr || "" };
-    }
-    throw err;
-  });
-  return stdout + stderr;
+async function detectStaticFrames(videoPath: string, mode: RenderScanMode): Promise<TimeRange[]> {
+  const { events } = await streamFfmpegEvents(videoScanArgs(videoPath, freezedetectFilter(), mode));
+  return eventRanges(events, "freeze");
 }
 
 function parseOptionalNumber(value: unknown): number | undefined {
@@ -5,11 +5,27 @@
  * budget or starting Chrome.
  */
 import { describe, expect, it, beforeEach, afterEach, vi } from "vitest";
-import { existsSync, mkdirSync, mkdtempSync, writeFileSync, readFileSync, rmSync } from "node:fs";
+import {
+  existsSync,
+  mkdirSync,
+  mkdtempSync,
+  readdirSync,
+  readFileSync,
+  rmSync,
+  writeFileSync,
+} from "node:fs";
+import { writeFile } from "node:fs/promises";
 import { tmpdir } from "node:os";
 import { join } from "node:path";
 
-import { executeSceneBuild, isLikenessRejection, type BuildReport } from "./scene-build.js";
+import {
+  executeSceneBuild,
+  isLikenessRejection,
+  type BuildReport,
+  type SceneBuildProgressEvent,
+} from "./scene-build.js";
+import { blobStoreDir } from "./blob-store.js";
+import { musicCacheDescriptor } from "./build-cache.js";
 import { __setFfmpegToolsForTests } from "./ffmpeg-gate.js";
 import { buildEmptyRootHtml } from "./scene-project.js";
 
@@ -517,6 +533,97 @@ describe("executeSceneBuild", () => {
     }
   });
 
+  it("starts a beat's transcript while its backdrop is still generating", async () => {
+    // The backdrop only resolves once a transcript has started, so a build
+    // that waited for every asset before transcribing would never finish.
+    let transcriptStarted!: () => void;
+    const started = new Promise<void>((resolve) => (transcriptStarted = resolve));
+    vi.mocked(transcribeNarrationWords).mockClear();
+    vi.mocked(transcribeNarrationWords).mockImplementation(async () => {
+      transcriptStarted();
+      return [{ text: "Hi", start: 0, end: 0.5 }];
+    });
+    vi.mocked(OpenAIImageProvider).mockImplementation(
+      () =>
+        ({
+          initialize: vi.fn().mockResolvedValue(undefined),
+          generateImage: vi.fn(async () => {
+            await started;
+            return {
+              success: true,
+              images: [{ base64: Buffer.from([5, 6, 7, 8]).toString("base64") }],
+            };
+          }),
+        }) as unknown as InstanceType<typeof OpenAIImageProvider>
+    );
+    const events: SceneBuildProgressEvent[] = [];
+    try {
+      const r = await executeSceneBuild({
+        projectDir,
+        stage: "all",
+        onProgress: (e) => events.push(e),
+      });
+      expect(r.stageReports?.transcript.status).toBe("done");
+      const index = (type: string, stage: string) =>
+        events.findIndex(
+          (e) =>
+            e.type === type &&
+            (e as { beatId?: string }).beatId === "hook" &&
+            (e as { stage?: string }).stage === stage
+        );
+      expect(index("beat-stage-start", "transcript")).toBeGreaterThan(-1);
+      expect(index("beat-stage-start", "transcript")).toBeLessThan(
+        index("beat-stage-done", "backdrop")
+      );
+      const overlap = events.find((e) => e.type === "pipeline-overlap");
+      expect(overlap).toMatchObject({ type: "pipeline-overlap" });
+    } finally {
+      vi.mocked(transcribeNarrationWords).mockReset();
+      vi.mocked(transcribeNarrationWords).mockResolvedValue([]);
+    }
+  });
+
+  it("does not transcribe narration that lands after another beat failed", async () => {
+    writeFileSync(
+      join(projectDir, "STORYBOARD.md"),
+      `# Failing beat
+
+## Beat hook — Hook
+
+\`\`\`yaml
+narration: "Type a YAML."
+backdrop: "../outside.png"
+\`\`\`
+
+## Beat close — Close
+
+\`\`\`yaml
+narration: "VibeFrame."
+\`\`\`
+`
+    );
+    // The close beat's narration settles well after the hook beat has failed.
+    vi.mocked(resolveTtsProvider).mockResolvedValue({
+      provider: "kokoro",
+      audioExtension: "wav",
+      call: vi.fn(async (text: string) => {
+        if (text.includes("VibeFrame")) await new Promise((r) => setTimeout(r, 100));
+        return { success: true, audioBuffer: Buffer.from([1, 2, 3, 4]) };
+      }),
+    });
+    vi.mocked(transcribeNarrationWords).mockClear();
+    vi.mocked(transcribeNarrationWords).mockResolvedValue([{ text: "Hi", start: 0, end: 0.5 }]);
+    try {
+      const r = await executeSceneBuild({ projectDir, stage: "all" });
+      expect(r.phase).toBe("failed");
+      const transcribed = vi.mocked(transcribeNarrationWords).mock.calls.map(([path]) => path);
+      expect(transcribed.some((path) => path.includes("close"))).toBe(false);
+      expect(existsSync(join(projectDir, "assets", "transcript-close.json"))).toBe(false);
+    } finally {
+      vi.mocked(transcribeNarrationWords).mockResolvedValue([]);
+    }
+  });
+
 
   it("uses referenced narration and backdrop assets without provider calls", async () => {
     mkdirSync(join(projectDir, "assets"), { recursive: true });
@@ -994,6 +1101,55 @@ music: "Minimal confident pulse."
   });
 });
 
+describe("regenerating a stored asset", () => {
+  it("leaves the old blob and cache entry intact when music is rewritten in place", async () => {
+    const storyboard = (cue: string) => `# Music
+
+## Beat hook — Hook
+
+\`\`\`yaml
+duration: 4
+music: "${cue}"
+\`\`\`
+`;
+    // Like the ElevenLabs path, write straight to the requested output path.
+    vi.mocked(executeMusic).mockImplementation(async (opts) => {
+      await writeFile(opts.output!, `music:${opts.prompt}`);
+      return { success: true, outputPath: opts.output, provider: "elevenlabs", duration: 4 };
+    });
+    const blobContents = () => {
+      const contents: string[] = [];
+      const walk = (dir: string) => {
+        for (const entry of readdirSync(dir, { withFileTypes: true })) {
+          const path = join(dir, entry.name);
+          if (entry.isDirectory()) walk(path);
+          else if (/^[0-9a-f]{64}$/.test(entry.name)) contents.push(readFileSync(path, "utf-8"));
+        }
+      };
+      walk(blobStoreDir(projectDir));
+      return contents.sort();
+    };
+
+    writeFileSync(join(projectDir, "STORYBOARD.md"), storyboard("Warm pulse"));
+    await executeSceneBuild({ projectDir, stage: "assets", musicProvider: "elevenlabs" });
+    const firstCache = join(
+      projectDir,
+      musicCacheDescriptor({ beatId: "hook", cue: "Warm pulse", provider: "elevenlabs", duration: 4 })
+        .path
+    );
+    expect(blobContents()).toEqual(["music:Warm pulse"]);
+
+    writeFileSync(join(projectDir, "STORYBOARD.md"), storyboard("Cold drone"));
+    await executeSceneBuild({ projectDir, stage: "assets", musicProvider: "elevenlabs" });
+
+    expect(readFileSync(join(projectDir, "assets", "music-hook.mp3"), "utf-8")).toBe(
+      "music:Cold drone"
+    );
+    expect(blobContents()).toEqual(["music:Cold drone", "music:Warm pulse"]);
+    expect(readFileSync(firstCache, "utf-8")).toBe("music:Warm pulse");
+  });
+});
+
 describe("beat-scoped report preservation", () => {
   it("a failed --beat run does not shrink build-report.json to that beat", async () => {
     // Full build first: both beats succeed and the report records them.
@@ -20,7 +20,7 @@
  */
 
 import { existsSync, readFileSync } from "node:fs";
-import { copyFile, mkdir, readFile, rm, writeFile } from "node:fs/promises";
+import { mkdir, readFile, rm, writeFile } from "node:fs/promises";
 import { dirname, join, resolve } from "node:path";
 
 import { config as loadDotenv } from "dotenv";
@@ -36,7 +36,7 @@ import {
 
 import { getAudioDuration } from "../../utils/audio.js";
 import { ffmpegToolsAvailable } from "./ffmpeg-gate.js";
-import { mapWithConcurrency } from "../../utils/concurrency.js";
+import { pruneProbeCache } from "../../utils/media-probe.js";
 import { composeAiVideo } from "./compose-aivideo.js";
 import { executeFootageAssemble, type FootageAssembleReport } from "./footage-assemble.js";
 import {
@@ -87,6 +87,7 @@ import {
   imageRatioForSize,
   musicCacheDescriptor,
   narrationCacheDescriptor,
+  narrationContentCacheDescriptor,
   normalizeMusicDuration,
   normalizeVideoDuration,
   videoCacheDescriptor,
@@ -98,10 +99,18 @@ import {
   writeAssetMetadata,
   type AssetFreshness,
 } from "./build-asset-metadata.js";
+import { restoreAsset, storeAssetBuffer, storeAssetFile } from "./blob-store.js";
 import { augmentBackdropPrompt } from "./build-backdrop-prompt.js";
 import { executeVideoGenerate } from "../ai-video.js";
 import { executeMusic } from "../generate/music.js";
 import { createAndWriteJobRecord, type JobRecord } from "./status-jobs.js";
+import { BuildScheduler } from "./build-scheduler.js";
+import { NarrationBatcher, type NarrationBatchStats } from "./narration-batch.js";
+import {
+  BeatStageTracker,
+  type BeatPipelineEvent,
+  type BeatPipelineStage,
+} from "./build-pipeline.js";
 import { executeSceneRepair, type SceneRepairResult } from "./scene-repair.js";
 import { resolveTtsProvider, TtsKeyMissingError, type TtsProviderName } from "./tts-resolve.js";
 import { resolveSceneBuildMode, type SceneBuildMode } from "./scene-build-mode.js";
@@ -111,13 +120,15 @@ export { resolveSceneBuildMode, type SceneBuildMode } from "./scene-build-mode.j
 export type BuildImageProvider = "openai" | "gemini" | "grok";
 
 /**
- * Cap on concurrent per-beat primitive dispatch. ElevenLabs subscriptions
- * allow 5 concurrent requests; a 6+ beat build firing all narrations at once
- * hits 429 too_many_concurrent_requests and fails the assets stage. 4 leaves
- * headroom for other ElevenLabs traffic while keeping image/video dispatch
- * effectively parallel.
+ * Scheduler priorities along the asset DAG. Character sheets gate keyframes,
+ * keyframes gate video, and video jobs run longest, so that chain starts
+ * ahead of narration and the independent stills (backdrop) and music.
+ * Per-provider concurrency lives in `build-scheduler.ts`.
  */
-const BEAT_PRIMITIVES_CONCURRENCY = 4;
+const PRIORITY_CHARACTER = 3;
+const PRIORITY_VIDEO = 3;
+const PRIORITY_KEYFRAME = 2;
+const PRIORITY_NARRATION = 1;
 
 // ── Public types ─────────────────────────────────────────────────────────
 
@@ -130,6 +141,7 @@ export type SceneBuildProgressEvent =
   | { type: "narration-generated"; beatId: string; path: string; provider: string }
   | { type: "narration-failed"; beatId: string; error: string }
   | { type: "narration-skipped"; beatId: string; reason: string }
+  | ({ type: "narration-batch" } & NarrationBatchStats)
   | { type: "transcript-generated"; beatId: string; path: string; wordCount: number }
   | { type: "transcript-cached"; beatId: string; path: string }
   | { type: "transcript-skipped"; beatId: string; reason: string }
@@ -153,7 +165,8 @@ export type SceneBuildProgressEvent =
   | { type: "music-failed"; beatId: string; error: string }
   | { type: "music-skipped"; beatId: string; reason: string }
   | { type: "render-start" }
-  | { type: "render-done"; outputPath: string };
+  | { type: "render-done"; outputPath: string }
+  | BeatPipelineEvent;
 
 export type PrimitiveStatus =
   | "generated"
@@ -488,7 +501,14 @@ export async function executeSceneBuild(opts: SceneBuildOptions): Promise<SceneB
   });
   warnings.push(...buildPlan.warnings);
   retryWith.push(...buildPlan.retryWith);
+  const scheduler = new BuildScheduler({ budgets: buildPlan.config.config.build.budgets });
+  const narrationBatcher = new NarrationBatcher({ scheduler, priority: PRIORITY_NARRATION });
+  const tracker = new BeatStageTracker(onProgress);
+  // Transcripts started per beat during the asset fan-out (see below).
+  const pipelinedTranscripts = new Map<string, Promise<TranscriptStatus>>();
   const finishBuildResult = async (result: SceneBuildResult) => {
+    // Early exits must not leave pipelined transcripts writing after return.
+    await Promise.allSettled(pipelinedTranscripts.values());
     const withResolution: SceneBuildResult = {
       providerResolution: buildPlan.providerResolution,
       ...result,
@@ -678,14 +698,17 @@ export async function executeSceneBuild(opts: SceneBuildOptions): Promise<SceneB
     // both reference-to-video (dispatchVideo) and keyframe edits
     // (dispatchKeyframe) can use them. Needed whenever video OR keyframe runs —
     // only skip when both are skipped.
+    // Only beats that reference a character wait for the sheets; everything
+    // else starts immediately and the scheduler bounds each provider.
     const characterPaths = new Map<string, string>();
+    let charactersReady: Promise<void> = Promise.resolve();
     if (!(skipVideoAssets && skipKeyframe)) {
       const referenced = new Set<string>();
       for (const beat of activeBeats) {
         for (const name of beatCharacterNames(beat.cues)) referenced.add(name);
       }
       if (referenced.size > 0) {
-        const charResult = await buildCharacters(
+        charactersReady = buildCharacters(
           resolveCharacters(parsed.frontmatter).filter((c) => referenced.has(c.name)),
           {
             projectDir,
@@ -695,18 +718,31 @@ export async function executeSceneBuild(opts: SceneBuildOptions): Promise<SceneB
             imageModel: opts.imageModel,
             force: opts.force ?? false,
             onProgress,
+            scheduler,
           }
-        );
-        for (const [name, path] of charResult.paths) characterPaths.set(name, path);
-        characterCostUsd = charResult.costUsd;
-        warnings.push(...charResult.failures);
+        ).then((charResult) => {
+          for (const [name, path] of charResult.paths) characterPaths.set(name, path);
+          characterCostUsd = charResult.costUsd;
+          warnings.push(...charResult.failures);
+        });
       }
     }
 
-    const primitiveResults = await mapWithConcurrency(
-      activeBeats,
-      BEAT_PRIMITIVES_CONCURRENCY,
-      (beat) =>
+    // With the transcript stage selected, each beat transcribes as soon as
+    // its own narration lands instead of after every beat's video. A beat
+    // that fails or leaves a job pending ends the build before the
+    // transcript stage, so transcripts not yet sent are cancelled unbilled.
+    const transcriptAbort = new AbortController();
+    const transcriptCtx: TranscriptDispatchContext = {
+      projectDir,
+      force: opts.force ?? false,
+      onProgress,
+      scheduler,
+      signal: transcriptAbort.signal,
+    };
+    const pipelineTranscripts = shouldRunStage(selectedStage, "transcript") && !skipTranscript;
+    const primitiveResults = await Promise.all(
+      activeBeats.map((beat) =>
         buildBeatPrimitives(beat, {
           projectDir,
           ttsProvider,
@@ -725,17 +761,37 @@ export async function executeSceneBuild(opts: SceneBuildOptions): Promise<SceneB
           force: opts.force ?? false,
           onProgress,
           characterPaths,
+          charactersReady,
+          scheduler,
+          narrationBatcher,
+          tracker,
+          onNarrationReady: pipelineTranscripts
+            ? (narration) => {
+                const task = tracker.track(beat.id, "transcript", () =>
+                  dispatchTranscript(
+                    beat,
+                    narration.path,
+                    narration.status === "generated",
+                    transcriptCtx
+                  )
+                );
+                task.catch(() => undefined); // awaited by the transcript stage
+                pipelinedTranscripts.set(beat.id, task);
+              }
+            : undefined,
+        }).then((result) => {
+          if (result.jobs.length > 0 || beatAssetFailed(result.outcome)) transcriptAbort.abort();
+          return result;
         })
+      )
     );
+    await charactersReady;
+    warnings.push(...schedulerWarnings(scheduler));
+    const narrationStats = narrationBatcher.stats();
+    if (narrationStats.requests > 0) onProgress({ type: "narration-batch", ...narrationStats });
     beatOutcomes = primitiveResults.map((result) => result.outcome);
     pendingJobs = primitiveResults.flatMap((result) => result.jobs);
-    const assetFailed = beatOutcomes.some(
-      (beat) =>
-        beat.narrationStatus === "failed" ||
-        beat.backdropStatus === "failed" ||
-        beat.videoStatus === "failed" ||
-        beat.musicStatus === "failed"
-    );
+    const assetFailed = beatOutcomes.some(beatAssetFailed);
     stageReports.assets.status = assetFailed
       ? "failed"
       : pendingJobs.length > 0
@@ -826,11 +882,13 @@ export async function executeSceneBuild(opts: SceneBuildOptions): Promise<SceneB
   // (fresh asset run OR `collectExistingBeatOutcomes` on disk), so this works
   // standalone via `--stage transcript`.
   if (shouldRunStage(selectedStage, "transcript") && !skipTranscript) {
-    const { statuses } = await runTranscriptStage(activeBeats, beatOutcomes, {
-      projectDir,
-      force: opts.force ?? false,
-      onProgress,
-    });
+    const { statuses } = await runTranscriptStage(
+      activeBeats,
+      beatOutcomes,
+      { projectDir, force: opts.force ?? false, onProgress, scheduler },
+      pipelinedTranscripts
+    );
+    if (pipelinedTranscripts.size > 0) tracker.summarize();
     const produced = statuses.some((s) => s === "generated" || s === "cached");
     stageReports.transcript.status = produced ? "done" : "skipped";
   } else {
@@ -1032,6 +1090,9 @@ export async function executeSceneBuild(opts: SceneBuildOptions): Promise<SceneB
       projectDir,
       beats: rootSyncBeatsFromOutcomes(parsed.beats, allOutcomes),
     });
+    // Sync has probed every beat's audio; drop probe entries for media that
+    // was regenerated or removed so the cache tracks the current project.
+    await pruneProbeCache(projectDir).catch(() => 0);
     stageReports.sync.status = "done";
     beatOutcomes = mergeBeatOutcomes(allOutcomes, beatOutcomes);
   } else {
@@ -1229,6 +1290,14 @@ interface BeatDispatchContext {
   onProgress: (e: SceneBuildProgressEvent) => void;
   /** name → relative path of generated/supplied character reference images. */
   characterPaths?: Map<string, string>;
+  /** Settles once `characterPaths` is filled; beats with characters wait on it. */
+  charactersReady?: Promise<void>;
+  scheduler: BuildScheduler;
+  /** Dedupes identical cues across beats and batches short ones per provider. */
+  narrationBatcher: NarrationBatcher;
+  tracker: BeatStageTracker;
+  /** Called as soon as this beat's narration settles, before its other assets. */
+  onNarrationReady?: (narration: PrimitiveOutcome) => void;
 }
 
 interface BeatPrimitiveResult {
@@ -1236,30 +1305,57 @@ interface BeatPrimitiveResult {
   jobs: JobRecord[];
 }
 
+/** Whether any of the beat's asset steps failed. */
+function beatAssetFailed(beat: BeatBuildOutcome): boolean {
+  return (
+    beat.narrationStatus === "failed" ||
+    beat.backdropStatus === "failed" ||
+    beat.videoStatus === "failed" ||
+    beat.musicStatus === "failed"
+  );
+}
+
 async function buildBeatPrimitives(
   beat: Beat,
   ctx: BeatDispatchContext
 ): Promise<BeatPrimitiveResult> {
   // Keyframe is generated first as a first-class asset: the video step animates
   // it (image-to-video), and `--skip-video` lets the keyframe storyboard be
-  // reviewed before any paid video is dispatched.
-  const keyframe = ctx.skipKeyframe
-    ? await skipped("keyframe", beat.id, "--skip-keyframe", ctx)
-    : await dispatchKeyframe(beat, ctx);
-  const [narration, backdrop, video, music] = await Promise.all([
-    ctx.skipNarration
-      ? skipped("narration", beat.id, "--skip-narration", ctx)
-      : dispatchNarration(beat, ctx),
-    ctx.skipBackdrop
-      ? skipped("backdrop", beat.id, "--skip-backdrop", ctx)
-      : dispatchBackdrop(beat, ctx),
-    ctx.skipVideo
-      ? skipped("video", beat.id, "--skip-video", ctx)
-      : dispatchVideo(beat, ctx, keyframe),
-    ctx.skipMusic ? skipped("music", beat.id, "--skip-music", ctx) : dispatchMusic(beat, ctx),
+  // reviewed before any paid video is dispatched. The chain waits for the
+  // character sheets only when this beat references one.
+  const track = <T>(stage: BeatPipelineStage, task: () => Promise<T>) =>
+    ctx.tracker.track(beat.id, stage, task);
+  const visual = track("visual", async () => {
+    if (beatCharacterNames(beat.cues).length > 0) await ctx.charactersReady;
+    const keyframe = ctx.skipKeyframe
+      ? await skipped("keyframe", beat.id, "--skip-keyframe", ctx)
+      : await dispatchKeyframe(beat, ctx);
+    const video = ctx.skipVideo
+      ? await skipped("video", beat.id, "--skip-video", ctx)
+      : await dispatchVideo(beat, ctx, keyframe);
+    return { keyframe, video };
+  });
+  const [{ keyframe, video }, narration, backdrop, music] = await Promise.all([
+    visual,
+    track("narration", async () => {
+      const outcome = ctx.skipNarration
+        ? await skipped("narration", beat.id, "--skip-narration", ctx)
+        : await dispatchNarration(beat, ctx);
+      ctx.onNarrationReady?.(outcome);
+      return outcome;
+    }),
+    track("backdrop", () =>
+      ctx.skipBackdrop
+        ? skipped("backdrop", beat.id, "--skip-backdrop", ctx)
+        : dispatchBackdrop(beat, ctx)
+    ),
+    track("music", () =>
+      ctx.skipMusic ? skipped("music", beat.id, "--skip-music", ctx) : dispatchMusic(beat, ctx)
+    ),
   ]);
-  // Word-level transcript runs as its own stage (`--stage transcript`) after
-  // the asset fan-out — see `runTranscriptStage` in `executeSceneBuild`.
+  // Word-level transcript is started from `onNarrationReady` when the build
+  // includes that stage, or runs on its own via `--stage transcript` — see
+  // `runTranscriptStage` in `executeSceneBuild`.
   return {
     outcome: {
       beatId: beat.id,
@@ -1451,6 +1547,13 @@ async function dispatchNarration(beat: Beat, ctx: BeatDispatchContext): Promise<
     ext: resolution.audioExtension,
   });
   const cacheAbs = join(ctx.projectDir, cache.path);
+  const shared = narrationContentCacheDescriptor({
+    cue: text,
+    provider: resolution.provider,
+    voice,
+    ext: resolution.audioExtension,
+  });
+  const sharedAbs = join(ctx.projectDir, shared.path);
   const rel = `assets/narration-${beat.id}.${resolution.audioExtension}`;
   const abs = join(ctx.projectDir, rel);
   if (
@@ -1478,9 +1581,11 @@ async function dispatchNarration(beat: Beat, ctx: BeatDispatchContext): Promise<
       freshness: "fresh",
     };
   }
-  if (existsSync(cacheAbs) && !ctx.force) {
-    await mkdir(dirname(abs), { recursive: true });
-    await copyFile(cacheAbs, abs);
+  // This beat's own cache entry, or the same cue synthesized for another beat.
+  const cachedAbs = ctx.force ? undefined : [cacheAbs, sharedAbs].find((p) => existsSync(p));
+  if (cachedAbs) {
+    const targets = cachedAbs === cacheAbs ? [abs] : [abs, cacheAbs];
+    await restoreAsset(ctx.projectDir, cachedAbs, targets);
     await writeAssetMetadata({
       projectDir: ctx.projectDir,
       kind: "narration",
@@ -1505,15 +1610,14 @@ async function dispatchNarration(beat: Beat, ctx: BeatDispatchContext): Promise<
     };
   }
 
-  const result = await resolution.call(text, { voice });
+  const result = await ctx.narrationBatcher.synthesize(resolution, text, voice);
   if (!result.success || !result.audioBuffer) {
     const error = result.error ?? "unknown TTS failure";
     ctx.onProgress({ type: "narration-failed", beatId: beat.id, error });
     return { status: "failed", error };
   }
 
-  await mkdir(dirname(abs), { recursive: true });
-  await writeFile(abs, result.audioBuffer);
+  await storeAssetBuffer(ctx.projectDir, result.audioBuffer, [abs, cacheAbs, sharedAbs]);
   // Remove stale narration of the OTHER extension so a TTS-provider switch
   // (e.g. kokoro .wav → openai .mp3) doesn't leave a file that shadows this one
   // in the root composition and keeps the old voice in the render.
@@ -1521,8 +1625,6 @@ async function dispatchNarration(beat: Beat, ctx: BeatDispatchContext): Promise<
     const sibling = join(ctx.projectDir, `assets/narration-${beat.id}.${otherExt}`);
     if (sibling !== abs && existsSync(sibling)) await rm(sibling, { force: true });
   }
-  await mkdir(dirname(cacheAbs), { recursive: true });
-  await writeFile(cacheAbs, result.audioBuffer);
   await writeAssetMetadata({
     projectDir: ctx.projectDir,
     kind: "narration",
@@ -1560,6 +1662,9 @@ interface TranscriptDispatchContext {
   projectDir: string;
   force: boolean;
   onProgress: (e: SceneBuildProgressEvent) => void;
+  scheduler: BuildScheduler;
+  /** Aborted when the build will stop before the transcript stage. */
+  signal?: AbortSignal;
 }
 
 /**
@@ -1584,7 +1689,7 @@ async function dispatchTranscript(
   narrationFresh: boolean,
   ctx: TranscriptDispatchContext
 ): Promise<TranscriptStatus> {
-  if (!narrationPath) return "skipped";
+  if (!narrationPath || ctx.signal?.aborted) return "skipped";
 
   const relPath = beatTranscriptRelPath(beat.id);
   const abs = join(ctx.projectDir, relPath);
@@ -1603,7 +1708,14 @@ async function dispatchTranscript(
     return "skipped";
   }
 
-  const words = await transcribeNarrationWords(join(ctx.projectDir, narrationPath), { apiKey });
+  // Checked again once the scheduler admits the call: it may have queued
+  // behind other transcripts while the build failed.
+  const words = await ctx.scheduler.run("transcribe", "openai", async () =>
+    ctx.signal?.aborted
+      ? null
+      : transcribeNarrationWords(join(ctx.projectDir, narrationPath), { apiKey })
+  );
+  if (words === null) return "skipped";
   if (words.length === 0) {
     ctx.onProgress({
       type: "transcript-skipped",
@@ -1637,24 +1749,30 @@ async function dispatchTranscript(
  * Run the transcript stage across all active beats. Resolves each beat's
  * narration audio path + freshness from its build outcome (which is populated
  * either by a fresh asset run or {@link collectExistingBeatOutcomes} on disk),
- * then transcribes concurrently. Best-effort: aggregates statuses for the stage
- * report but never throws.
+ * then transcribes concurrently. Beats already started by the pipelined asset
+ * fan-out (`started`) reuse that run. Best-effort: aggregates statuses for the
+ * stage report but never throws.
  */
 async function runTranscriptStage(
   beats: Beat[],
   outcomes: BeatBuildOutcome[],
-  ctx: TranscriptDispatchContext
+  ctx: TranscriptDispatchContext,
+  started: ReadonlyMap<string, Promise<TranscriptStatus>> = new Map()
 ): Promise<{ statuses: TranscriptStatus[] }> {
   const byId = new Map(outcomes.map((o) => [o.beatId, o]));
-  const statuses = await mapWithConcurrency(beats, BEAT_PRIMITIVES_CONCURRENCY, (beat) => {
-    const outcome = byId.get(beat.id);
-    return dispatchTranscript(
-      beat,
-      outcome?.narrationPath,
-      outcome?.narrationStatus === "generated",
-      ctx
-    );
-  });
+  const statuses = await Promise.all(
+    beats.map((beat) => {
+      const pipelined = started.get(beat.id);
+      if (pipelined) return pipelined;
+      const outcome = byId.get(beat.id);
+      return dispatchTranscript(
+        beat,
+        outcome?.narrationPath,
+        outcome?.narrationStatus === "generated",
+        ctx
+      );
+    })
+  );
   return { statuses };
 }
 
@@ -1688,46 +1806,74 @@ function characterSheetPrompt(name: string, description: string): string {
  */
 async function buildCharacters(
   characters: ResolvedCharacter[],
-  ctx: ImageGenContext & { force: boolean; onProgress: (e: SceneBuildProgressEvent) => void }
+  ctx: ImageGenContext & {
+    force: boolean;
+    onProgress: (e: SceneBuildProgressEvent) => void;
+    scheduler: BuildScheduler;
+  }
 ): Promise<CharacterBuildResult> {
   const paths = new Map<string, string>();
   const failures: string[] = [];
   let costUsd = 0;
   const size = ctx.imageSize ?? "1536x1024";
 
-  for (const character of characters) {
-    // Bring-your-own image: reference it directly when present.
-    if (character.imagePath) {
-      if (existsSync(join(ctx.projectDir, character.imagePath))) {
-        paths.set(character.name, character.imagePath);
-        ctx.onProgress({ type: "character-cached", name: character.name, path: character.imagePath });
-      } else {
-        const error = `character "${character.name}" image not found: ${character.imagePath}`;
-        failures.push(error);
-        ctx.onProgress({ type: "character-failed", name: character.name, error });
+  // Sheets are independent of each other; the image lane bounds concurrency.
+  await Promise.all(
+    characters.map(async (character) => {
+      // Bring-your-own image: reference it directly when present.
+      if (character.imagePath) {
+        if (existsSync(join(ctx.projectDir, character.imagePath))) {
+          paths.set(character.name, character.imagePath);
+          ctx.onProgress({
+            type: "character-cached",
+            name: character.name,
+            path: character.imagePath,
+          });
+        } else {
+          const error = `character "${character.name}" image not found: ${character.imagePath}`;
+          failures.push(error);
+          ctx.onProgress({ type: "character-failed", name: character.name, error });
+        }
+        return;
       }
-      continue;
-    }
-    if (!character.prompt) continue;
-
-    const prompt = characterSheetPrompt(character.name, character.prompt);
-    const rel = `assets/character-${character.name}.png`;
-    const abs = join(ctx.projectDir, rel);
-    const metadataOptions = { quality: ctx.imageQuality, size };
-    const cache = characterCacheDescriptor({
-      name: character.name,
-      cue: prompt,
-      provider: ctx.imageProvider,
-      quality: ctx.imageQuality,
-      size,
-      model: ctx.imageModel,
-    });
+      if (!character.prompt) return;
+
+      const prompt = characterSheetPrompt(character.name, character.prompt);
+      const rel = `assets/character-${character.name}.png`;
+      const abs = join(ctx.projectDir, rel);
+      const metadataOptions = { quality: ctx.imageQuality, size };
+      const cache = characterCacheDescriptor({
+        name: character.name,
+        cue: prompt,
+        provider: ctx.imageProvider,
+        quality: ctx.imageQuality,
+        size,
+        model: ctx.imageModel,
+      });
 
-    if (existsSync(abs) && !ctx.force) {
-      const metadata = readAssetMetadata(ctx.projectDir, "character", character.name);
-      if (
-        !metadata ||
-        isFreshCanonicalAsset({
+      if (existsSync(abs) && !ctx.force) {
+        const metadata = readAssetMetadata(ctx.projectDir, "character", character.name);
+        if (
+          !metadata ||
+          isFreshCanonicalAsset({
+            projectDir: ctx.projectDir,
+            kind: "character",
+            beatId: character.name,
+            cue: prompt,
+            provider: ctx.imageProvider,
+            options: metadataOptions,
+            cacheKey: cache.key,
+          })
+        ) {
+          paths.set(character.name, rel);
+          ctx.onProgress({ type: "character-cached", name: character.name, path: rel });
+          return;
+        }
+      }
+      const cacheAbs = join(ctx.projectDir, cache.path);
+      if (existsSync(cacheAbs) && !ctx.force) {
+        await restoreAsset(ctx.projectDir, cacheAbs, [abs]);
+        await writeAssetMetadata({
           projectDir: ctx.projectDir,
           kind: "character",
           beatId: character.name,
@@ -1735,17 +1881,37 @@ async function buildCharacters(
           provider: ctx.imageProvider,
           options: metadataOptions,
           cacheKey: cache.key,
-        })
-      ) {
+          canonicalPath: rel,
+          cachePath: cache.path,
+        });
         paths.set(character.name, rel);
         ctx.onProgress({ type: "character-cached", name: character.name, path: rel });
-        continue;
+        return;
       }
-    }
-    const cacheAbs = join(ctx.projectDir, cache.path);
-    if (existsSync(cacheAbs) && !ctx.force) {
-      await mkdir(dirname(abs), { recursive: true });
-      await copyFile(cacheAbs, abs);
+
+      const generated = await ctx.scheduler.run(
+        "image",
+        ctx.imageProvider,
+        () =>
+          generateBackdropImage(
+            prompt,
+            {
+              projectDir: ctx.projectDir,
+              imageProvider: ctx.imageProvider,
+              imageSize: size,
+              imageQuality: ctx.imageQuality,
+              imageModel: ctx.imageModel,
+            },
+            imageRatioForSize(size)
+          ),
+        { priority: PRIORITY_CHARACTER }
+      );
+      if (!generated.success) {
+        failures.push(`character "${character.name}": ${generated.error}`);
+        ctx.onProgress({ type: "character-failed", name: character.name, error: generated.error });
+        return;
+      }
+      await storeAssetBuffer(ctx.projectDir, generated.buffer, [abs, cacheAbs]);
       await writeAssetMetadata({
         projectDir: ctx.projectDir,
         kind: "character",
@@ -1757,51 +1923,16 @@ async function buildCharacters(
         canonicalPath: rel,
         cachePath: cache.path,
       });
+      costUsd += backdropCostUsd(ctx.imageQuality);
       paths.set(character.name, rel);
-      ctx.onProgress({ type: "character-cached", name: character.name, path: rel });
-      continue;
-    }
-
-    const generated = await generateBackdropImage(
-      prompt,
-      {
-        projectDir: ctx.projectDir,
-        imageProvider: ctx.imageProvider,
-        imageSize: size,
-        imageQuality: ctx.imageQuality,
-        imageModel: ctx.imageModel,
-      },
-      imageRatioForSize(size)
-    );
-    if (!generated.success) {
-      failures.push(`character "${character.name}": ${generated.error}`);
-      ctx.onProgress({ type: "character-failed", name: character.name, error: generated.error });
-      continue;
-    }
-    await mkdir(dirname(abs), { recursive: true });
-    await writeFile(abs, generated.buffer);
-    await mkdir(dirname(cacheAbs), { recursive: true });
-    await writeFile(cacheAbs, generated.buffer);
-    await writeAssetMetadata({
-      projectDir: ctx.projectDir,
-      kind: "character",
-      beatId: character.name,
-      cue: prompt,
-      provider: ctx.imageProvider,
-      options: metadataOptions,
-      cacheKey: cache.key,
-      canonicalPath: rel,
-      cachePath: cache.path,
-    });
-    costUsd += backdropCostUsd(ctx.imageQuality);
-    paths.set(character.name, rel);
-    ctx.onProgress({
-      type: "character-generated",
-      name: character.name,
-      path: rel,
-      provider: ctx.imageProvider,
-    });
-  }
+      ctx.onProgress({
+        type: "character-generated",
+        name: character.name,
+        path: rel,
+        provider: ctx.imageProvider,
+      });
+    })
+  );
 
   return { paths, costUsd: Number(costUsd.toFixed(2)), failures };
 }
@@ -1857,8 +1988,7 @@ async function dispatchBackdrop(beat: Beat, ctx: BeatDispatchContext): Promise<P
   }
   const cacheAbs = join(ctx.projectDir, cache.path);
   if (existsSync(cacheAbs) && !ctx.force) {
-    await mkdir(dirname(abs), { recursive: true });
-    await copyFile(cacheAbs, abs);
+    await restoreAsset(ctx.projectDir, cacheAbs, [abs]);
     await writeAssetMetadata({
       projectDir: ctx.projectDir,
       kind: "backdrop",
@@ -1882,18 +2012,16 @@ async function dispatchBackdrop(beat: Beat, ctx: BeatDispatchContext): Promise<P
     };
   }
 
-  const generated = await generateBackdropImage(prompt, ctx, ratio);
+  const generated = await ctx.scheduler.run("image", ctx.imageProvider, () =>
+    generateBackdropImage(prompt, ctx, ratio)
+  );
   if (!generated.success) {
     const error = generated.error;
     ctx.onProgress({ type: "backdrop-failed", beatId: beat.id, error });
     return { status: "failed", error };
   }
 
-  await mkdir(dirname(abs), { recursive: true });
-  const buffer = generated.buffer;
-  await writeFile(abs, buffer);
-  await mkdir(dirname(cacheAbs), { recursive: true });
-  await writeFile(cacheAbs, buffer);
+  await storeAssetBuffer(ctx.projectDir, generated.buffer, [abs, cacheAbs]);
   await writeAssetMetadata({
     projectDir: ctx.projectDir,
     kind: "backdrop",
@@ -2084,8 +2212,7 @@ async function ensureKeyframe(
   }
   const cacheAbs = join(ctx.projectDir, cache.path);
   if (existsSync(cacheAbs) && !ctx.force) {
-    await mkdir(dirname(abs), { recursive: true });
-    await copyFile(cacheAbs, abs);
+    await restoreAsset(ctx.projectDir, cacheAbs, [abs]);
     await writeAssetMetadata({
       projectDir: ctx.projectDir,
       kind: "keyframe",
@@ -2117,16 +2244,19 @@ async function ensureKeyframe(
   // a character reference to edit from.
   const identityLock =
     "Keep the EXACT same person and face as the reference image(s): identical facial features (eyes, nose shape, jawline), skin tone and complexion, hairstyle, hair color, and wardrobe. Do not restyle or change the face. Change only the scene, pose, framing, and lighting. ";
-  const generated =
-    sheetBuffers.length > 0
-      ? await editKeyframeImage(`${identityLock}${keyframeCue}`, sheetBuffers, imgCtx, ratio)
-      : await generateBackdropImage(keyframeCue, imgCtx, ratio);
+  const generated = await ctx.scheduler.run(
+    "image",
+    ctx.imageProvider,
+    () =>
+      sheetBuffers.length > 0
+        ? editKeyframeImage(`${identityLock}${keyframeCue}`, sheetBuffers, imgCtx, ratio)
+        : generateBackdropImage(keyframeCue, imgCtx, ratio),
+    // Skip-video keyframes are review stills; otherwise they gate a video job.
+    { priority: ctx.skipVideo ? 0 : PRIORITY_KEYFRAME }
+  );
   if (!generated.success) return { status: "failed", error: generated.error };
 
-  await mkdir(dirname(abs), { recursive: true });
-  await writeFile(abs, generated.buffer);
-  await mkdir(dirname(cacheAbs), { recursive: true });
-  await writeFile(cacheAbs, generated.buffer);
+  await storeAssetBuffer(ctx.projectDir, generated.buffer, [abs, cacheAbs]);
   await writeAssetMetadata({
     projectDir: ctx.projectDir,
     kind: "keyframe",
@@ -2263,8 +2393,7 @@ async function dispatchVideo(
   }
   const cacheAbs = join(ctx.projectDir, cache.path);
   if (existsSync(cacheAbs) && !ctx.force) {
-    await mkdir(dirname(abs), { recursive: true });
-    await copyFile(cacheAbs, abs);
+    await restoreAsset(ctx.projectDir, cacheAbs, [abs]);
     await writeAssetMetadata({
       projectDir: ctx.projectDir,
       kind: "video",
@@ -2307,27 +2436,33 @@ async function dispatchVideo(
 
   loadSceneBuildEnv(ctx.projectDir);
   const generateWith = (provider: BuildVideoProvider, apiKey: string | undefined) =>
-    executeVideoGenerate({
-      prompt,
+    ctx.scheduler.run(
+      "video",
       provider,
-      duration: normalizeVideoDuration(beat.duration),
-      ratio: "16:9",
-      output: abs,
-      wait: false,
-      // Keyframe mode → single init frame (image-to-video); otherwise character
-      // reference-to-video.
-      image: keyframeImageAbs,
-      refImages: keyframeImageAbs
-        ? undefined
-        : characterRefsAbs.length > 0
-          ? characterRefsAbs
-          : undefined,
-      // Build clips are always muted in the composition (a separate narration/music
-      // track carries audio), so the model's generated audio is never used. Disable
-      // it: it's wasted, and Seedance's audio moderation can spuriously fail a beat.
-      generateAudio: false,
-      apiKey,
-    });
+      () =>
+        executeVideoGenerate({
+          prompt,
+          provider,
+          duration: normalizeVideoDuration(beat.duration),
+          ratio: "16:9",
+          output: abs,
+          wait: false,
+          // Keyframe mode → single init frame (image-to-video); otherwise character
+          // reference-to-video.
+          image: keyframeImageAbs,
+          refImages: keyframeImageAbs
+            ? undefined
+            : characterRefsAbs.length > 0
+              ? characterRefsAbs
+              : undefined,
+          // Build clips are always muted in the composition (a separate narration/music
+          // track carries audio), so the model's generated audio is never used. Disable
+          // it: it's wasted, and Seedance's audio moderation can spuriously fail a beat.
+          generateAudio: false,
+          apiKey,
+        }),
+      { priority: PRIORITY_VIDEO }
+    );
   let activeProvider = requestedProvider;
   let result = await generateWith(
     activeProvider,
@@ -2363,8 +2498,7 @@ async function dispatchVideo(
   }
 
   if (result.status === "completed" && existsSync(abs)) {
-    await mkdir(dirname(cacheAbs), { recursive: true });
-    await copyFile(abs, cacheAbs);
+    await storeAssetFile(ctx.projectDir, abs, [cacheAbs]);
     await writeAssetMetadata({
       projectDir: ctx.projectDir,
       kind: "video",
@@ -2472,8 +2606,7 @@ async function dispatchMusic(beat: Beat, ctx: BeatDispatchContext): Promise<Prim
   }
   const cacheAbs = join(ctx.projectDir, cache.path);
   if (existsSync(cacheAbs) && !ctx.force) {
-    await mkdir(dirname(abs), { recursive: true });
-    await copyFile(cacheAbs, abs);
+    await restoreAsset(ctx.projectDir, cacheAbs, [abs]);
     await writeAssetMetadata({
       projectDir: ctx.projectDir,
       kind: "music",
@@ -2497,14 +2630,19 @@ async function dispatchMusic(beat: Beat, ctx: BeatDispatchContext): Promise<Prim
     };
   }
 
+  // The stale canonical file may be linked to a stored blob; unlink it so a
+  // provider that writes its output in place cannot write into the blob.
+  await rm(abs, { force: true });
   loadSceneBuildEnv(ctx.projectDir);
-  const result = await executeMusic({
-    prompt,
-    provider: ctx.musicProvider,
-    duration,
-    output: abs,
-    wait: ctx.musicProvider === "replicate" ? false : true,
-  });
+  const result = await ctx.scheduler.run("music", ctx.musicProvider, () =>
+    executeMusic({
+      prompt,
+      provider: ctx.musicProvider,
+      duration,
+      output: abs,
+      wait: ctx.musicProvider === "replicate" ? false : true,
+    })
+  );
   if (!result.success) {
     const error = result.error ?? "music generation failed";
     ctx.onProgress({ type: "music-failed", beatId: beat.id, error });
@@ -2556,8 +2694,7 @@ async function dispatchMusic(beat: Beat, ctx: BeatDispatchContext): Promise<Prim
     return { status: "failed", error };
   }
 
-  await mkdir(dirname(cacheAbs), { recursive: true });
-  await copyFile(abs, cacheAbs);
+  await storeAssetFile(ctx.projectDir, abs, [cacheAbs]);
   await writeAssetMetadata({
     projectDir: ctx.projectDir,
     kind: "music",
@@ -2760,6 +2897,19 @@ function sceneRepairWarnings(repair: BuildSceneRepairSummary): string[] {
   return [`Scene repair left ${count} warning/info issue(s) after ${stage} stage.`];
 }
 
+/** Surface lanes that were throttled so the user can lower `build.budgets`. */
+function schedulerWarnings(scheduler: BuildScheduler): string[] {
+  return scheduler
+    .stats()
+    .filter((lane) => lane.rateLimited > 0)
+    .map(
+      (lane) =>
+        `${lane.lane} was rate limited ${lane.rateLimited} time(s); concurrency backed off to ` +
+        `${lane.concurrency}/${lane.budget.concurrency}. Set build.budgets["${lane.lane}"] in ` +
+        `vibe.config.json to start lower.`
+    );
+}
+
 function unique(items: Array<string | undefined | null>): string[] {
   return [
     ...new Set(items.filter((item): item is string => typeof item === "string" && item.length > 0)),
@@ -0,0 +1,180 @@
+import { describe, expect, it, beforeEach, afterEach } from "vitest";
+import { mkdtempSync, rmSync } from "node:fs";
+import { mkdir, writeFile } from "node:fs/promises";
+import { tmpdir } from "node:os";
+import { join } from "node:path";
+
+import { commandExists, execSafe, ffprobeDuration } from "../../utils/exec-safe.js";
+import {
+  beatSegmentFrames,
+  buildConcatList,
+  concatRenderSegments,
+  planRenderShards,
+  renderSegmentKey,
+  resolveShardConcurrency,
+} from "./scene-render-shards.js";
+
+function rootHtml(clips: string, extra = ""): string {
+  return `<!doctype html>
+<html><body>
+    <div id="root" data-composition-id="main" data-start="0" data-duration="7.2" data-width="1920" data-height="1080">
+${extra}      <!-- vibe-scene-build: clip refs (auto-generated; safe to re-run) -->
+${clips}
+      <audio id="narration-intro" src="assets/narration-intro.wav" data-start="0" data-duration="3.47" data-track-index="2"></audio>
+      <!-- /vibe-scene-build -->
+    </div>
+    <script>
+      window.__timelines = window.__timelines || {};
+      window.__timelines["main"] = gsap.timeline({ paused: true });
+    </script>
+</body></html>`;
+}
+
+const clip = (id: string, start: number, duration: number) =>
+  `      <div class="clip" data-composition-id="scene-${id}" data-composition-src="compositions/scene-${id}.html" data-start="${start}" data-duration="${duration}" data-track-index="0"></div>`;
+
+describe("planRenderShards", () => {
+  it("splits contiguous beats on frame boundaries", () => {
+    const html = rootHtml([clip("intro", 0, 3.47), clip("outro", 3.47, 3.73)].join("\n"));
+    const shards = planRenderShards(html, 30);
+    expect(shards).toEqual([
+      {
+        beatId: "intro",
+        compositionId: "scene-intro",
+        compositionPath: "compositions/scene-intro.html",
+        startFrame: 0,
+        frames: 104,
+      },
+      {
+        beatId: "outro",
+        compositionId: "scene-outro",
+        compositionPath: "compositions/scene-outro.html",
+        startFrame: 104,
+        frames: 112,
+      },
+    ]);
+    // Same frame total as a single pass over 7.2s.
+    expect(shards!.reduce((sum, shard) => sum + shard.frames, 0)).toBe(216);
+  });
+
+  it("refuses roots that are not a plain beat sequence", () => {
+    const beats = [clip("intro", 0, 3), clip("outro", 3, 3)].join("\n");
+    expect(planRenderShards(rootHtml(clip("intro", 0, 3)), 30)).toBeNull();
+    const gap = [clip("a", 0, 3), clip("b", 3.5, 3)].join("\n");
+    expect(planRenderShards(rootHtml(gap), 30)).toBeNull();
+    const bgVideo = `      <video id="bg-video" src="assets/bg.mp4" data-start="0" data-duration="6"></video>\n`;
+    expect(planRenderShards(rootHtml(beats, bgVideo), 30)).toBeNull();
+    const tween = '{ paused: true });\n      window.__timelines["main"].to("#root", { opacity: 0 }, 5);';
+    expect(planRenderShards(rootHtml(beats).replace("{ paused: true });", tween), 30)).toBeNull();
+    expect(planRenderShards('<div id="root"></div>', 30)).toBeNull();
+  });
+});
+
+describe("resolveShardConcurrency", () => {
+  it("budgets half the cores per capture worker, capped by shard count", () => {
+    expect(resolveShardConcurrency({ shardCount: 40, cpuCount: 16 })).toBe(8);
+    expect(resolveShardConcurrency({ shardCount: 40, cpuCount: 16, workersPerShard: 4 })).toBe(2);
+    expect(resolveShardConcurrency({ shardCount: 3, cpuCount: 16 })).toBe(3);
+    expect(resolveShardConcurrency({ shardCount: 40, cpuCount: 1 })).toBe(1);
+    expect(resolveShardConcurrency({ requested: 5, shardCount: 40, cpuCount: 2 })).toBe(5);
+  });
+});
+
+describe("buildConcatList", () => {
+  it("quotes paths for the concat demuxer", () => {
+    expect(buildConcatList(["/tmp/a.mp4", "/tmp/it's.mp4"])).toBe(
+      "file '/tmp/a.mp4'\nfile '/tmp/it'\\''s.mp4'\n"
+    );
+  });
+});
+
+describe("beatSegmentFrames", () => {
+  it("uses the shard's snapped frame count for beats off the frame grid", () => {
+    // outro starts at frame 103.5 → 104 and ends at 216; alone, 3.75s rounds to 113.
+    const html = rootHtml([clip("intro", 0, 3.45), clip("outro", 3.45, 3.75)].join("\n"));
+    const outro = planRenderShards(html, 30)!.find((shard) => shard.beatId === "outro")!;
+
+    expect(outro.frames).toBe(112);
+    expect(beatSegmentFrames(html, "outro", 3.75, 30)).toBe(112);
+  });
+
+  it("falls back to the beat's own duration without a shardable root", () => {
+    expect(beatSegmentFrames(null, "outro", 3.75, 30)).toBe(113);
+    expect(beatSegmentFrames(rootHtml(clip("intro", 0, 3)), "intro", 3, 30)).toBe(90);
+  });
+});
+
+describe("renderSegmentKey", () => {
+  let dir: string;
+  beforeEach(async () => {
+    dir = mkdtempSync(join(tmpdir(), "vibe-shards-"));
+    await mkdir(join(dir, "compositions"), { recursive: true });
+    await mkdir(join(dir, "assets"), { recursive: true });
+    await writeFile(
+      join(dir, "compositions", "scene-intro.html"),
+      '<div><img src="assets/backdrop-intro.png"><a href="https://example.com"></a></div>'
+    );
+    await writeFile(join(dir, "assets", "backdrop-intro.png"), "v1");
+  });
+  afterEach(() => rmSync(dir, { recursive: true, force: true }));
+
+  const key = () =>
+    renderSegmentKey({
+      projectDir: dir,
+      shardHtml: "<root>",
+      compositionPath: "compositions/scene-intro.html",
+      settings: { fps: 30, quality: "standard", format: "mp4" },
+    });
+
+  it("is stable until the composition or a referenced asset changes", async () => {
+    const first = await key();
+    expect(await key()).toBe(first);
+
+    await writeFile(join(dir, "assets", "backdrop-intro.png"), "v2");
+    const second = await key();
+    expect(second).not.toBe(first);
+
+    await writeFile(
+      join(dir, "compositions", "scene-intro.html"),
+      '<div class="x"><img src="assets/backdrop-intro.png"></div>'
+    );
+    expect(await key()).not.toBe(second);
+  });
+});
+
+describe("concatRenderSegments", () => {
+  const hasFfmpeg = commandExists("ffmpeg") && commandExists("ffprobe");
+  let dir: string;
+  beforeEach(() => {
+    dir = mkdtempSync(join(tmpdir(), "vibe-concat-"));
+  });
+  afterEach(() => rmSync(dir, { recursive: true, force: true }));
+
+  it.skipIf(!hasFfmpeg)("joins segments without re-encoding", async () => {
+    const segments = [join(dir, "a.mp4"), join(dir, "b.mp4")];
+    for (const segment of segments) {
+      await execSafe("ffmpeg", [
+        "-y",
+        "-v",
+        "error",
+        "-f",
+        "lavfi",
+        "-i",
+        "testsrc=size=64x36:rate=30:duration=1",
+        "-c:v",
+        "libx264",
+        "-pix_fmt",
+        "yuv420p",
+        segment,
+      ]);
+    }
+    const outputPath = join(dir, "out.mp4");
+    await concatRenderSegments({
+      segments,
+      outputPath,
+      format: "mp4",
+      listPath: join(dir, "list.txt"),
+    });
+    expect(await ffprobeDuration(outputPath)).toBeCloseTo(2, 1);
+  });
+});
@@ -0,0 +1,228 @@
+/**
+ * @module _shared/scene-render-shards
+ *
+ * Beat-sharded rendering for `executeSceneRender`. A synced root lays its
+ * beats end to end in the managed `<!-- vibe-scene-build -->` block, so each
+ * beat can be captured by its own producer job (and Chrome) in parallel and
+ * the segments joined with FFmpeg's concat demuxer — a stream copy, no
+ * re-encode. Audio is still muxed once over the stitched result.
+ *
+ * Shard windows are snapped to frame boundaries (`round(start * fps)`), so the
+ * concatenated frame count matches a single-pass render of the same root and
+ * the narration mux stays in sync across 40+ beats.
+ *
+ * Segments are cached under `.vibeframe/cache/render/segments/`, keyed on the
+ * shard root, the beat composition HTML, and the content hash of every asset
+ * it references. Re-rendering after editing one beat re-captures only that
+ * beat, and `vibe render --beat` captures through the same cache, so a beat
+ * previewed in a repair loop is reused by the next full render (and vice
+ * versa). Segments share the render cache's LRU size bound (`render-cache.ts`).
+ */
+
+import { createHash } from "node:crypto";
+import { mkdir, writeFile } from "node:fs/promises";
+import { availableParallelism } from "node:os";
+import { dirname, join } from "node:path";
+
+import { execSafe } from "../../utils/exec-safe.js";
+import { hashReferencedFiles, RENDER_CACHE_SUBDIR } from "./render-cache.js";
+import type { RenderFormat } from "./scene-render.js";
+
+export const RENDER_SEGMENT_CACHE_SUBDIR = join(RENDER_CACHE_SUBDIR, "segments");
+
+/** Bump when the segment key inputs or the shard root shape change. */
+const SEGMENT_KEY_VERSION = 1;
+
+export interface RenderShard {
+  beatId: string;
+  compositionId: string;
+  /** Project-relative composition file the shard root mounts. */
+  compositionPath: string;
+  /** First frame of the shard on the full timeline. */
+  startFrame: number;
+  frames: number;
+}
+
+/**
+ * Split a root composition into one shard per beat clip. Returns `null` when
+ * the root cannot be sharded losslessly: no managed block, fewer than two
+ * clips, gaps or overlaps between clips, timed elements outside the managed
+ * block (e.g. a full-length `bg-video` layer), or a root timeline that
+ * animates anything. Audio elements are ignored — they are muxed afterwards.
+ */
+export function planRenderShards(rootHtml: string, fps: number): RenderShard[] | null {
+  const blocks = rootHtml.match(MANAGED_BLOCK_RE_GLOBAL) ?? [];
+  if (blocks.length !== 1) return null;
+  const outside = rootHtml.replace(blocks[0], "");
+  if (hasTimedNonAudioElement(outside) || ROOT_TWEEN_RE.test(outside)) return null;
+  if (hasTimedNonAudioElement(blocks[0].replace(CLIP_TAG_RE_GLOBAL, ""))) return null;
+
+  const clips = [...blocks[0].matchAll(CLIP_TAG_RE_GLOBAL)].map((match) => {
+    const tag = match[0];
+    return {
+      compositionId: attr(tag, "data-composition-id"),
+      compositionPath: attr(tag, "data-composition-src"),
+      start: Number.parseFloat(attr(tag, "data-start") ?? ""),
+      duration: Number.parseFloat(attr(tag, "data-duration") ?? ""),
+    };
+  });
+  if (clips.length < 2) return null;
+  clips.sort((a, b) => a.start - b.start);
+
+  const tolerance = 0.5 / fps;
+  const shards: RenderShard[] = [];
+  let cursor = 0;
+  for (const clip of clips) {
+    if (!clip.compositionId?.startsWith("scene-") || !clip.compositionPath) return null;
+    if (!Number.isFinite(clip.start) || !Number.isFinite(clip.duration) || clip.duration <= 0) {
+      return null;
+    }
+    if (Math.abs(clip.start - cursor) > tolerance) return null;
+    const { startFrame, frames } = snappedFrameSpan(clip.start, clip.duration, fps);
+    if (frames <= 0) return null;
+    shards.push({
+      beatId: clip.compositionId.slice("scene-".length),
+      compositionId: clip.compositionId,
+      compositionPath: clip.compositionPath,
+      startFrame,
+      frames,
+    });
+    cursor = clip.start + clip.duration;
+  }
+  return shards;
+}
+
+/**
+ * Frames a clip spans on the full timeline, with both ends snapped to frame
+ * boundaries. `round(duration * fps)` alone can differ by one for clips that
+ * do not start on a frame, and the frame count is part of the segment key.
+ */
+export function snappedFrameSpan(
+  start: number,
+  duration: number,
+  fps: number
+): { startFrame: number; frames: number } {
+  const startFrame = Math.round(start * fps);
+  return { startFrame, frames: Math.round((start + duration) * fps) - startFrame };
+}
+
+/**
+ * Frame count for a beat captured on its own (`--beat`): its shard's, when
+ * the root composition shards and contains the beat, so the preview and the
+ * next sharded full render share one segment. Otherwise the beat's duration
+ * from the build report, starting at frame 0.
+ */
+export function beatSegmentFrames(
+  rootHtml: string | null,
+  beatId: string,
+  durationSec: number,
+  fps: number
+): number {
+  const shard = rootHtml ? planRenderShards(rootHtml, fps)?.find((s) => s.beatId === beatId) : undefined;
+  return shard?.frames ?? Math.max(1, snappedFrameSpan(0, durationSec, fps).frames);
+}
+
+/**
+ * How many shards render at once. Each shard runs its own Chrome plus an
+ * encoder, so the default budget is half the available cores, further divided
+ * by the capture workers each job already uses.
+ */
+export function resolveShardConcurrency(opts: {
+  requested?: number;
+  shardCount: number;
+  workersPerShard?: number;
+  cpuCount?: number;
+}): number {
+  const cpus = opts.cpuCount ?? availableParallelism();
+  const workers = Math.max(1, opts.workersPerShard ?? 1);
+  const budget =
+    opts.requested && opts.requested > 0
+      ? Math.floor(opts.requested)
+      : Math.floor(cpus / 2 / workers);
+  return Math.max(1, Math.min(opts.shardCount, budget));
+}
+
+/**
+ * Content key for one shard's segment. Covers the synthesized shard root,
+ * the render settings, and the bytes of the beat composition plus every
+ * local file it (or a nested composition) references.
+ */
+export async function renderSegmentKey(opts: {
+  projectDir: string;
+  shardHtml: string;
+  compositionPath: string;
+  settings: Record<string, unknown>;
+}): Promise<string> {
+  const hash = createHash("sha256");
+  hash.update(JSON.stringify({ version: SEGMENT_KEY_VERSION, settings: opts.settings }));
+  hash.update("\0");
+  hash.update(opts.shardHtml);
+  for (const [file, digest] of await hashReferencedFiles(opts.projectDir, opts.compositionPath)) {
+    hash.update(`\0${file}\0${digest}`);
+  }
+  return hash.digest("hex").slice(0, 32);
+}
+
+export function renderSegmentPath(
+  projectDir: string,
+  key: string,
+  format: RenderFormat
+): string {
+  return join(projectDir, RENDER_SEGMENT_CACHE_SUBDIR, `${key}.${format}`);
+}
+
+/**
+ * Join rendered segments with the concat demuxer (`-c copy`). Every segment
+ * comes from the same producer config, so codec parameters match and no
+ * re-encode is needed.
+ */
+export async function concatRenderSegments(opts: {
+  segments: string[];
+  outputPath: string;
+  format: RenderFormat;
+  listPath: string;
+}): Promise<void> {
+  await mkdir(dirname(opts.listPath), { recursive: true });
+  await writeFile(opts.listPath, buildConcatList(opts.segments), "utf-8");
+  await execSafe("ffmpeg", [
+    "-y",
+    "-v",
+    "error",
+    "-f",
+    "concat",
+    "-safe",
+    "0",
+    "-i",
+    opts.listPath,
+    "-c",
+    "copy",
+    ...(opts.format === "webm" ? [] : ["-movflags", "+faststart"]),
+    opts.outputPath,
+  ]);
+}
+
+/** Concat-demuxer list body; single quotes are escaped the way ffmpeg expects. */
+export function buildConcatList(segments: string[]): string {
+  return segments.map((path) => `file '${path.replace(/'/g, "'\\''")}'\n`).join("");
+}
+
+const MANAGED_BLOCK_RE_GLOBAL = /<!-- vibe-scene-build: clip refs.*?<!-- \/vibe-scene-build -->/gs;
+const CLIP_TAG_RE_GLOBAL = /<div\b[^>]*\bdata-composition-src="[^"]*"[^>]*>(?:\s*<\/div>)?/gi;
+const TIMED_TAG_RE_GLOBAL = /<([a-z][a-z0-9-]*)\b[^>]*\sdata-start="[^"]*"[^>]*>/gi;
+/** Any tween on the root timeline means the root itself animates across beats. */
+const ROOT_TWEEN_RE = /__timelines\[[^\]]+\]\s*\.\s*(?:to|from|fromTo|set|add|call)\s*\(/;
+
+function hasTimedNonAudioElement(html: string): boolean {
+  for (const match of html.matchAll(TIMED_TAG_RE_GLOBAL)) {
+    const tag = match[1].toLowerCase();
+    if (tag === "audio") continue;
+    // The root element itself carries data-start="0" and the total duration.
+    if (/\sid="root"/.test(match[0])) continue;
+    return true;
+  }
+  return false;
+}
+
+function attr(tag: string, name: string): string | undefined {
+  return tag.match(new RegExp(`\\s${name}="([^"]*)"`))?.[1];
+}
@@ -4,6 +4,7 @@ import { existsSync } from "node:fs";
 import { tmpdir } from "node:os";
 import { join, resolve } from "node:path";
 import {
+  beatSegmentKey,
   buildMediaOpenCommand,
   buildRenderConfig,
   defaultOutputPath,
@@ -11,6 +12,7 @@ import {
   prepareBeatRenderRoot,
   qualityToCrf,
 } from "./scene-render.js";
+import { beatSegmentFrames, planRenderShards } from "./scene-render-shards.js";
 import { __setFfmpegToolsForTests } from "./ffmpeg-gate.js";
 import { scaffoldSceneProject } from "./scene-project.js";
 import { emitSceneHtml, insertClipIntoRoot } from "./scene-html-emit.js";
@@ -233,6 +235,41 @@ describe("prepareBeatRenderRoot", () => {
 // These tests exercise the validation surface (project dir, root file, Chrome
 // preflight) WITHOUT requiring Chrome to be installed.
 
+// ── beatSegmentKey ─────────────────────────────────────────────────────────
+
+describe("beatSegmentKey", () => {
+  it("gives a --beat capture the same segment key as its shard", async () => {
+    const dir = await makeTmp();
+    await mkdir(resolve(dir, "compositions"), { recursive: true });
+    await writeFile(resolve(dir, "compositions", "scene-outro.html"), validCompositionHtml("outro", 3.75), "utf-8");
+    const clip = (id: string, start: number, duration: number) =>
+      `<div class="clip" data-composition-id="scene-${id}" data-composition-src="compositions/scene-${id}.html" data-start="${start}" data-duration="${duration}" data-track-index="0"></div>`;
+    const rootHtml = `<div id="root" data-composition-id="main" data-start="0" data-duration="7.2">
+<!-- vibe-scene-build: clip refs (auto-generated; safe to re-run) -->
+${clip("intro", 0, 3.45)}
+${clip("outro", 3.45, 3.75)}
+<!-- /vibe-scene-build -->
+</div>`;
+    const config = buildRenderConfig({});
+    const key = (frames: number) =>
+      beatSegmentKey({
+        projectDir: dir,
+        beatId: "outro",
+        compositionPath: "compositions/scene-outro.html",
+        frames,
+        aspect: "16:9",
+        config,
+      });
+
+    const shard = planRenderShards(rootHtml, config.fps)!.find((s) => s.beatId === "outro")!;
+    const beatFrames = beatSegmentFrames(rootHtml, "outro", 3.75, config.fps);
+
+    expect(beatFrames).not.toBe(Math.round(3.75 * config.fps));
+    expect(await key(beatFrames)).toBe(await key(shard.frames));
+    await rm(dir, { recursive: true, force: true });
+  });
+});
+
 describe("executeSceneRender — validation", () => {
   // CI runners have no ffmpeg; these tests exercise the validation surface
   // downstream of the FFMPEG_MISSING gate.
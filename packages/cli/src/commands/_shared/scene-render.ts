@@ -14,8 +14,9 @@
  */
 
 import { execFile } from "node:child_process";
+import { randomUUID } from "node:crypto";
 import { existsSync } from "node:fs";
-import { mkdir, readFile, stat, writeFile } from "node:fs/promises";
+import { copyFile, mkdir, readFile, rename, rm, stat, writeFile } from "node:fs/promises";
 import { resolve, relative, dirname, basename, join, isAbsolute } from "node:path";
 import { promisify } from "node:util";
 import {
@@ -23,8 +24,10 @@ import {
   executeRenderJob,
   type RenderConfigInput,
 } from "@hyperframes/producer";
-import { preflightChrome } from "../../pipeline/renderers/chrome.js";
+import { preflightChrome, resolveCaptureWorkers } from "../../pipeline/renderers/chrome.js";
+import { mapWithConcurrency } from "../../utils/concurrency.js";
 import { withStdoutOnStderr } from "../../utils/stdout-guard.js";
+import { createCaptureMeter, type CaptureMeter } from "./capture-meter.js";
 import { ffmpegToolsAvailable } from "./ffmpeg-gate.js";
 import { createProjectRootSyncPlan, loadProjectRootSyncBeats } from "./root-sync.js";
 import { createSubCompDurationSyncPlans } from "./sub-comp-duration-sync.js";
@@ -33,6 +36,22 @@ import { rootExists } from "./scene-lint.js";
 import { executeSceneAssemble } from "./scene-assemble.js";
 import { readProjectConfig } from "./project-config.js";
 import { aspectToDims, type SceneAspect } from "./scene-project.js";
+import {
+  readRenderCacheEntry,
+  renderCacheDescriptor,
+  renderCacheMaxBytes,
+  touchRenderCacheFile,
+  writeRenderCacheEntry,
+} from "./render-cache.js";
+import {
+  beatSegmentFrames,
+  concatRenderSegments,
+  planRenderShards,
+  renderSegmentKey,
+  renderSegmentPath,
+  resolveShardConcurrency,
+  type RenderShard,
+} from "./scene-render-shards.js";
 
 export type RenderFps = 24 | 30 | 60;
 export type RenderQuality = "draft" | "standard" | "high";
@@ -54,9 +73,21 @@ export interface SceneRenderOptions {
   fps?: RenderFps;
   quality?: RenderQuality;
   format?: RenderFormat;
-  /** Hyperframes capture worker count. Default 1 (the existing backend's
-   *  default — auto-worker mode times out on small comps). */
+  /**
+   * Capture workers per producer job. `0`/omitted sizes from CPU cores, free
+   * memory and the job's frame count (`resolveCaptureWorkers`); the
+   * producer's own auto mode is never used — it times out on small comps.
+   */
   workers?: number;
+  /**
+   * Render each beat as its own producer job, this many at a time (`0` picks
+   * a budget from the CPU count), and join the segments without re-encoding.
+   * Unchanged beats reuse their cached segment. Ignored for `beatId` renders
+   * and roots that cannot be split per beat; omit for a single-pass render.
+   */
+  shards?: number;
+  /** Always capture, ignoring (and not updating) `.vibeframe/cache/render/`. */
+  noCache?: boolean;
   /** Open the rendered media in the OS default app after a successful render. */
   openAfterRender?: boolean;
   /** Reveal the rendered media in Finder/file manager after a successful render. */
@@ -96,6 +127,17 @@ export interface SceneRenderResult {
   audioMuxApplied?: boolean;
   /** Non-fatal warning from the audio mux pass — caller may surface to the user. */
   audioMuxWarning?: string;
+  /** True when the output was copied from the render cache without capturing. */
+  cacheHit?: boolean;
+  /**
+   * True when a beat render reused that beat's captured segment (from an
+   * earlier beat render or sharded full render) instead of launching Chrome.
+   */
+  segmentReused?: boolean;
+  /** Set when the render ran beat-sharded. */
+  shards?: SceneRenderShardStats;
+  /** Set when frames were captured (absent on a render-cache hit). */
+  capture?: SceneRenderCaptureStats;
   reportPath?: string;
   /**
    * True when the pre-render drift guard found narration-synced durations
@@ -109,12 +151,49 @@ export interface SceneRenderResult {
   retryWith?: string[];
 }
 
+export interface SceneRenderShardStats {
+  total: number;
+  /** Shards captured by this run. */
+  rendered: number;
+  /** Shards whose cached segment was reused unchanged. */
+  reused: number;
+  /** Shard jobs allowed to run at once. */
+  concurrency: number;
+}
+
+export interface SceneRenderCaptureStats {
+  /** Capture workers per producer job, after auto-sizing. */
+  workers: number;
+  /** Producer jobs that captured at the same time (beat shards; else 1). */
+  jobs: number;
+  /** Wall-clock time of the capture phase, excluding the audio pass. */
+  captureMs: number;
+  /** Frames captured per second of `captureMs`; absent when every frame was reused. */
+  framesPerSec?: number;
+  /** Time in each producer stage, summed across concurrent jobs. */
+  stageMs: Record<string, number>;
+}
+
 export interface MediaOpenCommand {
   command: string;
   args: string[];
   display: string;
 }
 
+/**
+ * One-line summary of capture stats for human output, e.g.
+ * `4 workers · 58.2 frames/s (capture 9.8s, encode 2.1s)`.
+ */
+export function formatCaptureStats(stats: SceneRenderCaptureStats): string {
+  const workers = `${stats.workers} worker${stats.workers === 1 ? "" : "s"}`;
+  const jobs = stats.jobs > 1 ? ` × ${stats.jobs} jobs` : "";
+  const rate = stats.framesPerSec !== undefined ? ` · ${stats.framesPerSec} frames/s` : "";
+  const stages = Object.entries(stats.stageMs)
+    .map(([stage, ms]) => `${stage} ${(ms / 1000).toFixed(1)}s`)
+    .join(", ");
+  return `${workers}${jobs}${rate}${stages ? ` (${stages})` : ""}`;
+}
+
 /** Map a quality preset to an x264 CRF (lower = higher quality). */
 export function qualityToCrf(quality: RenderQuality = "standard"): number {
   return quality === "draft" ? 28 : quality === "high" ? 18 : 23;
@@ -282,7 +361,12 @@ export async function executeSceneRender(opts: SceneRenderOptions = {}): Promise
   }
 
   let root = opts.root ?? projectConfig.config.composition.entry;
+  let beatSegment:
+    | { beatId: string; compositionPath: string; durationSec: number; fullRootHtml: string | null }
+    | undefined;
   if (opts.beatId) {
+    // The full root decides the beat's shard frames (see beatSegmentFrames).
+    const fullRootHtml = await readFile(resolve(projectDir, root), "utf-8").catch(() => null);
     const prepared = await prepareBeatRenderRoot({
       projectDir,
       beatId: opts.beatId,
@@ -300,6 +384,12 @@ export async function executeSceneRender(opts: SceneRenderOptions = {}): Promise
       };
     }
     root = prepared.root;
+    beatSegment = {
+      beatId: opts.beatId,
+      compositionPath: prepared.compositionPath!,
+      durationSec: prepared.durationSec!,
+      fullRootHtml,
+    };
   }
   if (!(await rootExists(projectDir, root))) {
     return {
@@ -310,25 +400,6 @@ export async function executeSceneRender(opts: SceneRenderOptions = {}): Promise
       error: `Root composition not found: ${resolve(projectDir, root)}. Run \`vibe build ${projectDir}\` once to create the render scaffold, or scaffold it up front with \`vibe init <dir> --profile full\`.`,
     };
   }
-  const chrome = await preflightChrome();
-  if (!chrome.ok) {
-    return {
-      success: false,
-      kind: "render",
-      beat: opts.beatId ?? null,
-      root,
-      error: chrome.reason,
-    };
-  }
-
-  // -- Resolve output path -----------------------------------------------
-  const projectName = projectConfig.config.name;
-  const outputPath = opts.output
-    ? resolve(projectDir, opts.output)
-    : defaultOutputPath({ projectDir, projectName, format: opts.format, beatId: opts.beatId });
-  await mkdir(dirname(outputPath), { recursive: true });
-
-  // -- Execute render ----------------------------------------------------
   const config = buildRenderConfig({
     fps: opts.fps,
     quality: opts.quality,
@@ -336,56 +407,202 @@ export async function executeSceneRender(opts: SceneRenderOptions = {}): Promise
     workers: opts.workers,
     entryFile: root,
   });
-  const job = createRenderJob(config);
-  const start = Date.now();
 
-  try {
-    await withStdoutOnStderr(() =>
-      executeRenderJob(
-        job,
+  // -- Render cache --------------------------------------------------------
+  // Keyed on the root, everything it references (by content), and the
+  // settings that change the output. `workers`/`shards` only change speed.
+  const cache = opts.noCache
+    ? null
+    : await renderCacheDescriptor({
         projectDir,
-        outputPath,
-        // Producer reports progress on a 0-100 scale while this callback's
-        // contract (and the audio-mux phase below) is 0..1 — normalise here so
-        // every consumer (CLI spinner, MCP progress, job records) sees 0..1.
-        (j, msg) =>
-          opts.onProgress?.(j.progress > 1 ? j.progress / 100 : j.progress, j.currentStage ?? msg),
-        opts.signal,
-      )
-    );
-  } catch (err) {
-    return {
-      success: false,
-      kind: "render",
-      beat: opts.beatId ?? null,
-      root,
-      error: err instanceof Error ? err.message : String(err),
-    };
+        root,
+        settings: {
+          fps: config.fps,
+          quality: config.quality,
+          format: config.format,
+          crf: config.crf,
+          silent: Boolean(opts.silent),
+        },
+      }).catch(() => null);
+  const cached = cache ? await readRenderCacheEntry(projectDir, cache) : null;
+
+  if (!cached) {
+    const chrome = await preflightChrome();
+    if (!chrome.ok) {
+      return {
+        success: false,
+        kind: "render",
+        beat: opts.beatId ?? null,
+        root,
+        error: chrome.reason,
+      };
+    }
   }
 
-  // -- Audio assemble pass (post-producer) -------------------------------
-  // The producer emits silent video — sub-composition <audio> elements are not
-  // captured. The assemble stage scans the project and lays them onto the video
-  // in one ffmpeg pass (-c:v copy, no re-encode). `--silent` defers this to a
-  // standalone `vibe assemble` run.
+  // -- Resolve output path -----------------------------------------------
+  const projectName = projectConfig.config.name;
+  const outputPath = opts.output
+    ? resolve(projectDir, opts.output)
+    : defaultOutputPath({ projectDir, projectName, format: opts.format, beatId: opts.beatId });
+  await mkdir(dirname(outputPath), { recursive: true });
+
+  const start = Date.now();
+  let framesRendered: number | undefined;
+  let totalFrames: number | undefined;
+  let shardStats: SceneRenderShardStats | undefined;
+  let segmentReused: boolean | undefined;
+  let captureStats: SceneRenderCaptureStats | undefined;
   let audioCount = 0;
   let audioMuxApplied = false;
   let audioMuxWarning: string | undefined;
-  if (!opts.silent) {
-    const videoDuration =
-      job.totalFrames && config.fps ? job.totalFrames / config.fps : undefined;
-    const assembled = await executeSceneAssemble({
-      projectDir,
-      root,
-      videoPath: outputPath,
-      format: config.format ?? "mp4",
-      videoDuration,
-      // Map the assemble's internal 0..1 onto the render's 0.95..0.99 tail.
-      onProgress: (pct, stage) => opts.onProgress?.(0.95 + pct * 0.04, stage),
-    });
-    audioCount = assembled.audioCount;
-    audioMuxApplied = assembled.audioMuxApplied;
-    audioMuxWarning = assembled.audioMuxWarning;
+
+  if (cached && cache) {
+    await copyFile(join(projectDir, cache.path), outputPath);
+    framesRendered = 0;
+    totalFrames = cached.totalFrames;
+    audioCount = cached.audioCount;
+    audioMuxApplied = cached.audioMuxApplied;
+    audioMuxWarning = cached.audioMuxWarning;
+    opts.onProgress?.(1, "Reused cached render");
+  } else {
+    // -- Execute render --------------------------------------------------
+    const rootHtml = opts.beatId ? "" : await readFile(resolve(projectDir, root), "utf-8");
+    const shardPlan =
+      opts.shards !== undefined && !opts.beatId ? planRenderShards(rootHtml, config.fps) : null;
+    const meter = createCaptureMeter();
+    const captureStart = Date.now();
+    let jobs = 1;
+    try {
+      if (shardPlan) {
+        jobs = resolveShardConcurrency({
+          requested: opts.shards,
+          shardCount: shardPlan.length,
+          workersPerShard: opts.workers || 1,
+        });
+        const sharded = await renderBeatShards({
+          projectDir,
+          shards: shardPlan,
+          aspect: projectConfig.config.aspect,
+          config,
+          outputPath,
+          concurrency: jobs,
+          workers: opts.workers,
+          noCache: opts.noCache,
+          meter,
+          signal: opts.signal,
+          onProgress: opts.onProgress,
+        });
+        ({ framesRendered, totalFrames } = sharded);
+        shardStats = sharded.stats;
+        config.workers = sharded.workers;
+      } else if (beatSegment && !opts.noCache) {
+        // Capture the silent beat through the segment cache the sharded path
+        // uses; the narration is laid on by the audio pass below either way.
+        const frames = beatSegmentFrames(
+          beatSegment.fullRootHtml,
+          beatSegment.beatId,
+          beatSegment.durationSec,
+          config.fps
+        );
+        config.workers = resolveCaptureWorkers({ requested: opts.workers, frames });
+        const segment = await withStdoutOnStderr(() =>
+          captureBeatSegment({
+            projectDir,
+            beatId: beatSegment.beatId,
+            compositionPath: beatSegment.compositionPath,
+            frames,
+            aspect: projectConfig.config.aspect,
+            config,
+            meter,
+            signal: opts.signal,
+            onProgress: opts.onProgress,
+          })
+        );
+        await copyFile(segment.path, outputPath);
+        framesRendered = segment.framesRendered;
+        totalFrames = frames;
+        segmentReused = segment.reused;
+      } else {
+        const durationSec = beatSegment?.durationSec ?? rootDurationSec(rootHtml);
+        config.workers = resolveCaptureWorkers({
+          requested: opts.workers,
+          frames: durationSec ? Math.round(durationSec * config.fps) : undefined,
+        });
+        const job = createRenderJob(config);
+        await withStdoutOnStderr(() =>
+          executeRenderJob(
+            job,
+            projectDir,
+            outputPath,
+            // Producer reports progress on a 0-100 scale while this callback's
+            // contract (and the audio-mux phase below) is 0..1 — normalise here so
+            // every consumer (CLI spinner, MCP progress, job records) sees 0..1.
+            (j, msg) => {
+              meter.observe(0, j.currentStage ?? "render");
+              opts.onProgress?.(
+                j.progress > 1 ? j.progress / 100 : j.progress,
+                j.currentStage ?? msg
+              );
+            },
+            opts.signal,
+          )
+        );
+        meter.end(0);
+        framesRendered = job.framesRendered;
+        totalFrames = job.totalFrames;
+      }
+    } catch (err) {
+      return {
+        success: false,
+        kind: "render",
+        beat: opts.beatId ?? null,
+        root,
+        error: err instanceof Error ? err.message : String(err),
+      };
+    }
+
+    const captureMs = Date.now() - captureStart;
+    captureStats = {
+      workers: config.workers ?? 1,
+      jobs,
+      captureMs,
+      ...(framesRendered && captureMs > 0
+        ? { framesPerSec: Math.round((framesRendered / captureMs) * 10_000) / 10 }
+        : {}),
+      stageMs: meter.stages(),
+    };
+
+    // -- Audio assemble pass (post-producer) -----------------------------
+    // The producer emits silent video — sub-composition <audio> elements are not
+    // captured. The assemble stage scans the project and lays them onto the video
+    // in one ffmpeg pass (-c:v copy, no re-encode). `--silent` defers this to a
+    // standalone `vibe assemble` run.
+    if (!opts.silent) {
+      const videoDuration = totalFrames && config.fps ? totalFrames / config.fps : undefined;
+      const assembled = await executeSceneAssemble({
+        projectDir,
+        root,
+        videoPath: outputPath,
+        format: config.format ?? "mp4",
+        videoDuration,
+        // Map the assemble's internal 0..1 onto the render's 0.95..0.99 tail.
+        onProgress: (pct, stage) => opts.onProgress?.(0.95 + pct * 0.04, stage),
+      });
+      audioCount = assembled.audioCount;
+      audioMuxApplied = assembled.audioMuxApplied;
+      audioMuxWarning = assembled.audioMuxWarning;
+    }
+
+    // A failed cache write only costs the next render its shortcut.
+    if (cache) {
+      await writeRenderCacheEntry({
+        projectDir,
+        descriptor: cache,
+        sourcePath: outputPath,
+        entry: { root, totalFrames, audioCount, audioMuxApplied, audioMuxWarning },
+        maxBytes: renderCacheMaxBytes(projectConfig.config.composition.renderCacheMaxMb),
+      }).catch(() => undefined);
+    }
   }
 
   const result: SceneRenderResult = {
@@ -398,14 +615,18 @@ export async function executeSceneRender(opts: SceneRenderOptions = {}): Promise
     openCommand: buildMediaOpenCommand("open", outputPath).display,
     revealCommand: buildMediaOpenCommand("reveal", outputPath).display,
     durationMs: Date.now() - start,
-    framesRendered: job.framesRendered,
-    totalFrames: job.totalFrames,
+    framesRendered,
+    totalFrames,
     fps: config.fps,
     quality: config.quality,
     format: config.format,
     audioCount,
     audioMuxApplied,
     audioMuxWarning,
+    ...(cached ? { cacheHit: true } : {}),
+    ...(segmentReused ? { segmentReused } : {}),
+    ...(shardStats ? { shards: shardStats } : {}),
+    ...(captureStats ? { capture: captureStats } : {}),
     ...(autoSyncApplied ? { autoSyncApplied } : {}),
     ...(autoSyncWarning ? { autoSyncWarning } : {}),
   };
@@ -437,6 +658,221 @@ export async function executeSceneRender(opts: SceneRenderOptions = {}): Promise
   return result;
 }
 
+/**
+ * Capture each shard into the segment cache (skipping segments that already
+ * exist for the same key), then concat them into `outputPath`. The first
+ * shard to fail aborts the captures still running. Progress is
+ * frame-weighted across shards and mapped onto 0..0.9; the join takes the
+ * rest up to where the audio pass starts.
+ */
+async function renderBeatShards(opts: {
+  projectDir: string;
+  shards: RenderShard[];
+  aspect: SceneAspect;
+  config: ReturnType<typeof buildRenderConfig>;
+  outputPath: string;
+  concurrency: number;
+  /** Requested workers per shard; `0`/omitted sizes each shard on its own. */
+  workers?: number;
+  noCache?: boolean;
+  meter?: CaptureMeter;
+  signal?: AbortSignal;
+  onProgress?: (pct: number, stage: string) => void;
+}): Promise<{
+  framesRendered: number;
+  totalFrames: number;
+  /** Largest per-shard worker count used. */
+  workers: number;
+  stats: SceneRenderShardStats;
+}> {
+  const { projectDir, config } = opts;
+  const totalFrames = opts.shards.reduce((sum, shard) => sum + shard.frames, 0);
+  const captured = opts.shards.map(() => 0);
+  const report = (stage: string) => {
+    const done = captured.reduce((sum, frames) => sum + frames, 0);
+    opts.onProgress?.((0.9 * done) / totalFrames, stage);
+  };
+  let framesRendered = 0;
+  let reused = 0;
+  let workers = 1;
+  // Linked to the caller's signal, and also aborted by the first failed shard.
+  const abort = new AbortController();
+  const forwardAbort = () => abort.abort(opts.signal?.reason);
+  if (opts.signal?.aborted) forwardAbort();
+  else opts.signal?.addEventListener("abort", forwardAbort, { once: true });
+
+  // One stdout guard around all shards: nested guards restore out of order.
+  const segments = await withStdoutOnStderr(() =>
+    mapWithConcurrency(opts.shards, opts.concurrency, async (shard, index) => {
+      // Each shard is sized on its own frames; siblings split the machine.
+      const shardWorkers = resolveCaptureWorkers({
+        requested: opts.workers,
+        jobs: opts.concurrency,
+        frames: shard.frames,
+      });
+      workers = Math.max(workers, shardWorkers);
+      const segment = await captureBeatSegment({
+        projectDir,
+        beatId: shard.beatId,
+        compositionPath: shard.compositionPath,
+        frames: shard.frames,
+        aspect: opts.aspect,
+        config: { ...config, workers: shardWorkers },
+        noCache: opts.noCache,
+        meter: opts.meter,
+        job: index,
+        signal: abort.signal,
+        onProgress: (pct, stage) => {
+          captured[index] = pct * shard.frames;
+          report(stage);
+        },
+      }).catch((error: unknown) => {
+        abort.abort(error);
+        throw error;
+      });
+      if (segment.reused) reused += 1;
+      framesRendered += segment.framesRendered;
+      captured[index] = shard.frames;
+      return segment.path;
+    })
+  ).finally(() => opts.signal?.removeEventListener("abort", forwardAbort));
+
+  opts.onProgress?.(0.9, "Joining segments");
+  await concatRenderSegments({
+    segments,
+    outputPath: opts.outputPath,
+    format: config.format,
+    listPath: join(projectDir, ".vibeframe", "tmp", "render-concat.txt"),
+  });
+  return {
+    framesRendered,
+    totalFrames,
+    workers,
+    stats: {
+      total: opts.shards.length,
+      rendered: opts.shards.length - reused,
+      reused,
+      concurrency: opts.concurrency,
+    },
+  };
+}
+
+/**
+ * Segment cache key for one beat's silent capture. `--beat` renders and
+ * sharded full renders both key through here, so they agree as long as they
+ * pass the same frame count.
+ */
+export function beatSegmentKey(opts: {
+  projectDir: string;
+  beatId: string;
+  compositionPath: string;
+  frames: number;
+  aspect: SceneAspect;
+  config: ReturnType<typeof buildRenderConfig>;
+}): Promise<string> {
+  const { config } = opts;
+  return renderSegmentKey({
+    projectDir: opts.projectDir,
+    shardHtml: beatShardRootHtml(opts),
+    compositionPath: opts.compositionPath,
+    settings: {
+      fps: config.fps,
+      quality: config.quality,
+      format: config.format,
+      crf: config.crf,
+    },
+  });
+}
+
+function beatShardRootHtml(opts: {
+  beatId: string;
+  compositionPath: string;
+  frames: number;
+  aspect: SceneAspect;
+  config: ReturnType<typeof buildRenderConfig>;
+}): string {
+  return buildBeatRenderRootHtml({
+    aspect: opts.aspect,
+    beatId: opts.beatId,
+    compositionPath: opts.compositionPath,
+    durationSec: opts.frames / opts.config.fps,
+  });
+}
+
+/**
+ * Capture one beat's silent video, reusing its cached segment when one
+ * exists. The shard root depends only on the beat (composition, frame count,
+ * aspect), so `--beat` renders and sharded full renders share segments: a
+ * beat previewed during a repair loop is not captured again by the next full
+ * render, and re-previewing an unchanged beat never starts Chrome. With
+ * `noCache` the segment is captured to `.vibeframe/tmp/` instead.
+ */
+async function captureBeatSegment(opts: {
+  projectDir: string;
+  beatId: string;
+  compositionPath: string;
+  frames: number;
+  aspect: SceneAspect;
+  config: ReturnType<typeof buildRenderConfig>;
+  noCache?: boolean;
+  meter?: CaptureMeter;
+  /** Meter key when several captures run at once. */
+  job?: number;
+  signal?: AbortSignal;
+  onProgress?: (pct: number, stage: string) => void;
+}): Promise<{ path: string; reused: boolean; framesRendered: number }> {
+  const { projectDir, config } = opts;
+  const html = beatShardRootHtml(opts);
+  const root = `.vibeframe/tmp/render-shard-${sanitizeFileSegment(opts.beatId)}.html`;
+  let segment = join(projectDir, `${root.slice(0, -".html".length)}.${config.format}`);
+  if (!opts.noCache) {
+    const key = await beatSegmentKey(opts);
+    segment = renderSegmentPath(projectDir, key, config.format);
+    if (existsSync(segment)) {
+      await touchRenderCacheFile(segment);
+      opts.onProgress?.(1, `Reused segment for ${opts.beatId}`);
+      return { path: segment, reused: true, framesRendered: 0 };
+    }
+  }
+
+  await mkdir(dirname(join(projectDir, root)), { recursive: true });
+  await writeFile(join(projectDir, root), html, "utf-8");
+  await mkdir(dirname(segment), { recursive: true });
+  // Unique per capture: two renders of the same key must not share a file.
+  const partial =
+    `${segment.slice(0, -config.format.length - 1)}.partial-${process.pid}-` +
+    `${randomUUID().slice(0, 8)}.${config.format}`;
+  const job = createRenderJob({ ...config, entryFile: root });
+  try {
+    await executeRenderJob(
+      job,
+      projectDir,
+      partial,
+      (j, msg) => {
+        opts.meter?.observe(opts.job ?? 0, j.currentStage ?? "render");
+        opts.onProgress?.(
+          j.progress > 1 ? j.progress / 100 : j.progress,
+          `${opts.beatId}: ${j.currentStage ?? msg}`
+        );
+      },
+      opts.signal
+    );
+    opts.meter?.end(opts.job ?? 0);
+    await rename(partial, segment);
+  } catch (error) {
+    await rm(partial, { force: true });
+    throw error;
+  }
+  return { path: segment, reused: false, framesRendered: job.framesRendered ?? opts.frames };
+}
+
+/** Total duration the root composition declares on its `id="root"` element. */
+function rootDurationSec(html: string): number | undefined {
+  const tag = html.match(/<[a-z][a-z0-9-]*\b[^>]*\sid="root"[^>]*>/i)?.[0];
+  const duration = Number.parseFloat(tag?.match(/\sdata-duration="([^"]*)"/)?.[1] ?? "");
+  return Number.isFinite(duration) && duration > 0 ? duration : undefined;
+}
+
 async function runMediaOpenAction(action: RenderOpenAction, filePath: string): Promise<void> {
   const cmd = buildMediaOpenCommand(action, filePath);
   await execFileAsync(cmd.command, cmd.args);
@@ -695,6 +1131,8 @@ async function writeRenderReport(
           audioCount: result.audioCount,
           audioMuxApplied: result.audioMuxApplied,
           audioMuxWarning: result.audioMuxWarning,
+          cacheHit: result.cacheHit,
+          shards: result.shards,
           updatedAt: new Date().toISOString(),
         },
         null,
@@ -0,0 +1,137 @@
+import { afterEach, beforeEach, describe, expect, it } from "vitest";
+import { mkdtemp, rm, writeFile } from "node:fs/promises";
+import { tmpdir } from "node:os";
+import { join } from "node:path";
+import { PassThrough } from "node:stream";
+import { startServeDaemon, type ServeDaemon } from "./serve-daemon.js";
+import { forwardToServe, requestServe } from "./serve-protocol.js";
+
+// Stands in for the `vibe` bin: reports ready, takes one request, echoes it
+// (or, given a `-` operand, copies stdin to stdout).
+const FAKE_RUNNER = `
+process.once("message", (request) => {
+  process.disconnect();
+  process.chdir(request.cwd);
+  if (request.argv.includes("-")) {
+    process.stdin.pipe(process.stdout);
+    return;
+  }
+  process.stdout.write(JSON.stringify({ argv: request.argv, cwd: process.cwd(), tag: request.env.SERVE_TEST_TAG }));
+  process.stderr.write("warning: from runner\\n");
+  process.exitCode = request.argv.includes("--fail") ? 3 : 0;
+});
+process.send({ type: "ready" });
+`;
+
+let dir: string;
+let daemon: ServeDaemon | undefined;
+
+beforeEach(async () => {
+  dir = await mkdtemp(join(tmpdir(), "vibe-serve-"));
+  await writeFile(join(dir, "runner.mjs"), FAKE_RUNNER, "utf-8");
+});
+
+afterEach(async () => {
+  await daemon?.close();
+  daemon = undefined;
+  delete process.env.SERVE_TEST_TAG;
+  await rm(dir, { recursive: true, force: true });
+});
+
+function start(version = "1.0.0"): Promise<ServeDaemon> {
+  return startServeDaemon({
+    socketPath: join(dir, "serve.sock"),
+    version,
+    runnerScript: join(dir, "runner.mjs"),
+    runnerExecArgv: [],
+  });
+}
+
+async function forward(argv: string[], version = "1.0.0", input = "") {
+  const stdin = new PassThrough();
+  stdin.end(input);
+  const stdout = new PassThrough();
+  const stderr = new PassThrough();
+  const out: Buffer[] = [];
+  const err: Buffer[] = [];
+  stdout.on("data", (chunk: Buffer) => out.push(chunk));
+  stderr.on("data", (chunk: Buffer) => err.push(chunk));
+  const code = await forwardToServe(argv, {
+    version,
+    socketPath: join(dir, "serve.sock"),
+    stdin,
+    stdout,
+    stderr,
+  });
+  return { code, stdout: Buffer.concat(out).toString(), stderr: Buffer.concat(err).toString() };
+}
+
+describe("vibe serve", () => {
+  it("runs forwarded calls with the caller's argv, cwd and env and relays output", async () => {
+    daemon = await start();
+    process.env.SERVE_TEST_TAG = "from-client";
+
+    const first = await forward(["status", "project", "--json"]);
+    const second = await forward(["render", "--fail"]);
+
+    expect(first.code).toBe(0);
+    expect(JSON.parse(first.stdout)).toEqual({
+      argv: ["status", "project", "--json"],
+      cwd: process.cwd(),
+      tag: "from-client",
+    });
+    expect(first.stderr).toBe("warning: from runner\n");
+    expect(second.code).toBe(3);
+    expect(daemon.stats().requests).toBe(2);
+  });
+
+  it("pipes the caller's stdin to the runner", async () => {
+    daemon = await start();
+    const scene = "<section>".repeat(20_000);
+
+    const result = await forward(["scene", "submit", "--file", "-"], "1.0.0", scene);
+
+    expect(result.code).toBe(0);
+    expect(result.stdout).toBe(scene);
+  });
+
+  it("falls back in-process when no daemon is listening", async () => {
+    const result = await forward(["--version"]);
+
+    expect(result.code).toBeNull();
+    expect(result.stdout).toBe("");
+  });
+
+  it("falls back when import-time environment differs from the daemon's", async () => {
+    daemon = await start();
+    const home = process.env.HOME;
+    process.env.HOME = join(dir, "other-home");
+    try {
+      expect((await forward(["--version"])).code).toBeNull();
+    } finally {
+      process.env.HOME = home;
+    }
+  });
+
+  it("answers status pings and shuts down on version mismatch or stop", async () => {
+    daemon = await start("1.0.0");
+    const pong = await requestServe({ type: "ping" }, join(dir, "serve.sock"));
+    expect(pong).toMatchObject({ type: "pong", version: "1.0.0", requests: 0 });
+
+    expect((await forward(["--version"], "2.0.0")).code).toBeNull();
+    await daemon.closed;
+    expect(await requestServe({ type: "ping" }, join(dir, "serve.sock"))).toBeNull();
+
+    daemon = await start("1.0.0");
+    expect(await requestServe({ type: "stop" }, join(dir, "serve.sock"))).toEqual({
+      type: "stopping",
+    });
+    await daemon.closed;
+  });
+
+  it("refuses to start a second daemon on the same socket", async () => {
+    daemon = await start();
+
+    await expect(start()).rejects.toThrow(/already running/);
+  });
+});
@@ -0,0 +1,291 @@
+/**
+ * @module _shared/serve-daemon
+ *
+ * The `vibe serve` daemon. Each request is executed by a standby runner: a
+ * `vibe` process forked ahead of time that has already booted Node and
+ * evaluated every command module (see `adoptServeRequest`). On a request
+ * the runner takes the caller's argv, cwd and environment, reads the
+ * caller's stdin as relayed over the socket and runs the normal CLI path,
+ * so output and exit codes match an in-process run; a fresh standby is
+ * forked to replace it straight away. Runners are detached from the
+ * daemon's terminal, so `/dev/tty` prompts never reach it.
+ *
+ * Runners are single-use on purpose. Command modules hold Commander state
+ * that is not safe to re-parse, and a per-request process means nothing
+ * (parsed storyboards, API keys, cwd) leaks from one project's request into
+ * the next. What stays warm is everything that does not depend on the
+ * request: the Node runtime and the module graph. Standbys are recycled
+ * when the CLI's own files change on disk, so a rebuild or upgrade is
+ * picked up without restarting the daemon.
+ */
+
+import { fork, type ChildProcess } from "node:child_process";
+import { watch, type FSWatcher } from "node:fs";
+import { chmod, mkdir, rm } from "node:fs/promises";
+import { createServer, connect, type Server, type Socket } from "node:net";
+import { constants } from "node:os";
+import { dirname } from "node:path";
+
+import {
+  SERVE_PROTOCOL_VERSION,
+  SERVE_RUNNER_ENV,
+  importTimeEnvKey,
+  readFrames,
+  writeFrame,
+  type ServeInputFrame,
+  type ServeRequest,
+  type ServeRunRequest,
+  type ServeStats,
+} from "./serve-protocol.js";
+
+/** Debounce for file-change recycling; a rebuild touches many files at once. */
+const RECYCLE_DEBOUNCE_MS = 250;
+
+export interface ServeDaemonOptions {
+  socketPath: string;
+  version: string;
+  /** Script each runner executes: the `vibe` bin. */
+  runnerScript: string;
+  /** Node flags for runners (e.g. the tsx loader when running from source). */
+  runnerExecArgv?: string[];
+  /** Standby runners to keep ready. */
+  warm?: number;
+  /** Shut down after this long without requests. 0 disables. */
+  idleTimeoutMs?: number;
+  /** Directories whose changes recycle standby runners. */
+  watchPaths?: string[];
+  log?: (message: string) => void;
+}
+
+export interface ServeDaemon {
+  stats(): ServeStats;
+  close(): Promise<void>;
+  /** Settles once the daemon has shut down (stop request, idle timeout, close()). */
+  closed: Promise<void>;
+}
+
+interface Runner {
+  child: ChildProcess;
+  ready: Promise<boolean>;
+}
+
+/**
+ * Listen on `socketPath` and serve requests until stopped. Rejects when
+ * another daemon is already listening there.
+ */
+export async function startServeDaemon(opts: ServeDaemonOptions): Promise<ServeDaemon> {
+  const warm = Math.max(1, opts.warm ?? 1);
+  const log = opts.log ?? (() => undefined);
+  const envKey = importTimeEnvKey(process.env);
+  const startedAt = new Date().toISOString();
+  const standby: Runner[] = [];
+  const active = new Set<ChildProcess>();
+  const watchers: FSWatcher[] = [];
+  let requests = 0;
+  let closing = false;
+  let idleTimer: NodeJS.Timeout | undefined;
+  let recycleTimer: NodeJS.Timeout | undefined;
+  let resolveClosed!: () => void;
+  const closed = new Promise<void>((resolvePromise) => (resolveClosed = resolvePromise));
+
+  function spawnRunner(): Runner {
+    const child = fork(opts.runnerScript, [], {
+      execArgv: opts.runnerExecArgv ?? process.execArgv,
+      env: { ...process.env, [SERVE_RUNNER_ENV]: "1" },
+      stdio: ["pipe", "pipe", "pipe", "ipc"],
+      // A new session has no controlling terminal, like the callers it
+      // serves. Windows would open a console window instead.
+      detached: process.platform !== "win32",
+    });
+    const ready = new Promise<boolean>((resolvePromise) => {
+      child.once("message", () => resolvePromise(true));
+      child.once("exit", () => resolvePromise(false));
+      child.once("error", () => resolvePromise(false));
+    });
+    return { child, ready };
+  }
+
+  function fillStandby(): void {
+    while (!closing && standby.length < warm) standby.push(spawnRunner());
+  }
+
+  async function acquireRunner(): Promise<ChildProcess> {
+    const runner = standby.shift() ?? spawnRunner();
+    fillStandby();
+    if (await runner.ready) return runner.child;
+    // A standby that died while waiting (killed, out of memory): fork another.
+    const retry = spawnRunner();
+    if (await retry.ready) return retry.child;
+    throw new Error("serve runner failed to start");
+  }
+
+  function recycleStandby(): void {
+    for (const runner of standby.splice(0)) runner.child.kill();
+    fillStandby();
+    log("CLI files changed; standby runners recycled");
+  }
+
+  function resetIdleTimer(): void {
+    clearTimeout(idleTimer);
+    if (!opts.idleTimeoutMs || active.size > 0) return;
+    idleTimer = setTimeout(() => {
+      log("idle timeout reached; shutting down");
+      void close();
+    }, opts.idleTimeoutMs);
+    idleTimer.unref();
+  }
+
+  function stats(): ServeStats {
+    return {
+      pid: process.pid,
+      version: opts.version,
+      socketPath: opts.socketPath,
+      startedAt,
+      requests,
+      active: active.size,
+      standby: standby.length,
+    };
+  }
+
+  async function handleRun(
+    socket: Socket,
+    request: ServeRunRequest,
+    onInput: (handler: (frame: ServeInputFrame) => void) => void
+  ): Promise<void> {
+    if (request.protocol !== SERVE_PROTOCOL_VERSION || request.version !== opts.version) {
+      writeFrame(socket, { type: "fallback", reason: "version mismatch" });
+      socket.end();
+      // The CLI was upgraded under a running daemon; clients will keep
+      // falling back until it is replaced, so step aside.
+      log(`client is vibe ${request.version}, daemon is ${opts.version}; shutting down`);
+      void close();
+      return;
+    }
+    if (importTimeEnvKey(request.env) !== envKey) {
+      writeFrame(socket, { type: "fallback", reason: "environment differs from the daemon's" });
+      socket.end();
+      return;
+    }
+
+    let child: ChildProcess;
+    try {
+      child = await acquireRunner();
+    } catch (error) {
+      writeFrame(socket, { type: "fallback", reason: (error as Error).message });
+      socket.end();
+      return;
+    }
+    requests += 1;
+    active.add(child);
+    clearTimeout(idleTimer);
+    // The command may exit without reading all of its input.
+    child.stdin?.on("error", () => undefined);
+    onInput((frame) => {
+      if (frame.type === "stdin") child.stdin?.write(Buffer.from(frame.data, "base64"));
+      else child.stdin?.end();
+    });
+    writeFrame(socket, { type: "accepted" });
+
+    child.stdout?.on("data", (chunk: Buffer) => {
+      writeFrame(socket, { type: "stdout", data: chunk.toString("base64") });
+    });
+    child.stderr?.on("data", (chunk: Buffer) => {
+      writeFrame(socket, { type: "stderr", data: chunk.toString("base64") });
+    });
+    // `close` fires after the child's stdio has drained, so no output
+    // frame can trail the exit frame.
+    child.once("close", (code, signal) => {
+      active.delete(child);
+      const exitCode = code ?? 128 + (signal ? constants.signals[signal] : 0);
+      writeFrame(socket, { type: "exit", code: exitCode });
+      socket.end();
+      resetIdleTimer();
+    });
+    // Client went away (Ctrl-C, host timeout): stop the command too.
+    socket.once("close", () => {
+      if (child.exitCode === null && child.signalCode === null) child.kill("SIGTERM");
+    });
+    child.send(request);
+  }
+
+  const server: Server = createServer((socket) => {
+    socket.on("error", () => undefined);
+    let handled = false;
+    let input: ((frame: ServeInputFrame) => void) | undefined;
+    readFrames<ServeRequest>(socket, (request) => {
+      if (handled) {
+        if (request.type === "stdin" || request.type === "stdin-end") input?.(request);
+        return;
+      }
+      handled = true;
+      if (request.type === "ping") {
+        writeFrame(socket, { type: "pong", ...stats() });
+        socket.end();
+      } else if (request.type === "stop") {
+        writeFrame(socket, { type: "stopping" });
+        socket.end();
+        void close();
+      } else if (request.type === "run") {
+        void handleRun(socket, request, (handler) => (input = handler));
+      }
+    });
+  });
+
+  async function close(): Promise<void> {
+    if (closing) return closed;
+    closing = true;
+    clearTimeout(idleTimer);
+    clearTimeout(recycleTimer);
+    for (const watcher of watchers) watcher.close();
+    for (const runner of standby.splice(0)) runner.child.kill();
+    await new Promise<void>((resolvePromise) => server.close(() => resolvePromise()));
+    if (process.platform !== "win32") await rm(opts.socketPath, { force: true });
+    resolveClosed();
+  }
+
+  if (process.platform !== "win32") {
+    await mkdir(dirname(opts.socketPath), { recursive: true, mode: 0o700 });
+    if (await isListening(opts.socketPath)) {
+      throw new Error(`vibe serve is already running on ${opts.socketPath}`);
+    }
+    // Left behind by a daemon that was killed without cleaning up.
+    await rm(opts.socketPath, { force: true });
+  }
+  await new Promise<void>((resolvePromise, reject) => {
+    server.once("error", reject);
+    server.listen(opts.socketPath, () => {
+      server.off("error", reject);
+      resolvePromise();
+    });
+  });
+  if (process.platform !== "win32") await chmod(opts.socketPath, 0o600);
+
+  for (const path of opts.watchPaths ?? []) {
+    try {
+      const watcher = watch(path, { recursive: true }, () => {
+        clearTimeout(recycleTimer);
+        recycleTimer = setTimeout(recycleStandby, RECYCLE_DEBOUNCE_MS);
+      });
+      watcher.on("error", () => undefined);
+      watchers.push(watcher);
+    } catch {
+      // Recursive watch is unavailable on some platforms; the version
+      // handshake still retires the daemon after an upgrade.
+    }
+  }
+
+  fillStandby();
+  resetIdleTimer();
+  return { stats, close, closed };
+}
+
+function isListening(socketPath: string): Promise<boolean> {
+  return new Promise((resolvePromise) => {
+    const socket = connect(socketPath);
+    socket.once("connect", () => {
+      socket.destroy();
+      resolvePromise(true);
+    });
+    socket.once("error", () => resolvePromise(false));
+  });
+}
@@ -0,0 +1,260 @@
+/**
+ * @module _shared/serve-protocol
+ *
+ * Wire format and client side of `vibe serve`, the opt-in warm daemon for
+ * agent hosts that shell out to `vibe ... --json` many times a session.
+ *
+ * The daemon listens on a local Unix socket (a named pipe on Windows) and
+ * keeps standby runners: `vibe` processes that booted Node and evaluated
+ * every command module ahead of time, then wait for one request over IPC.
+ * The `vibe` bin forwards eligible invocations to it, streams its stdin to
+ * the runner and relays the runner's stdout, stderr and exit code byte for
+ * byte; when no daemon answers, it runs the command in-process exactly as
+ * before.
+ *
+ * This module is imported on every `vibe` start, so it uses node builtins
+ * only. The daemon itself lives in serve-daemon.ts.
+ */
+
+import { connect, type Socket } from "node:net";
+import { homedir, userInfo } from "node:os";
+import { join, resolve } from "node:path";
+import type { Readable, Writable } from "node:stream";
+
+/** Bumped when frames change shape; mismatched clients fall back in-process. */
+export const SERVE_PROTOCOL_VERSION = 2;
+
+/** Set on runner processes the daemon forks. */
+export const SERVE_RUNNER_ENV = "VIBE_SERVE_RUNNER";
+
+/**
+ * Environment read while modules evaluate (config dirs, colour support),
+ * which a request cannot change in an already-warm runner. Requests whose
+ * values differ from the daemon's run in-process instead.
+ */
+export const IMPORT_TIME_ENV = [
+  "HOME",
+  "USERPROFILE",
+  "VIBEFRAME_CONFIG_HOME",
+  "VIBEFRAME_DATA_HOME",
+  "VIBEFRAME_CACHE_HOME",
+  "XDG_DATA_HOME",
+  "FORCE_COLOR",
+  "NO_COLOR",
+  "NODE_OPTIONS",
+] as const;
+
+/** How long the client waits for the daemon to accept before running in-process. */
+const ACCEPT_TIMEOUT_MS = 2_000;
+
+export interface ServeRunRequest {
+  type: "run";
+  protocol: number;
+  version: string;
+  argv: string[];
+  cwd: string;
+  env: Record<string, string>;
+}
+
+/** Caller stdin, sent after the run is accepted; `stdin-end` is EOF. */
+export type ServeInputFrame = { type: "stdin"; data: string } | { type: "stdin-end" };
+
+export type ServeRequest = ServeRunRequest | ServeInputFrame | { type: "ping" } | { type: "stop" };
+
+export interface ServeStats {
+  pid: number;
+  version: string;
+  socketPath: string;
+  startedAt: string;
+  requests: number;
+  active: number;
+  standby: number;
+}
+
+export type ServeFrame =
+  | { type: "accepted" }
+  | { type: "stdout" | "stderr"; data: string }
+  | { type: "exit"; code: number }
+  | { type: "fallback"; reason: string }
+  | ({ type: "pong" } & ServeStats)
+  | { type: "stopping" };
+
+/**
+ * Socket the daemon listens on: `VIBE_SERVE_SOCKET`, else `serve.sock` in
+ * the user config dir (same resolution as `USER_CONFIG_DIR`, inlined to
+ * keep this module free of the config loader).
+ */
+export function serveSocketPath(env: NodeJS.ProcessEnv = process.env): string {
+  const override = env.VIBE_SERVE_SOCKET?.trim();
+  if (override) return resolve(override);
+  if (process.platform === "win32") return `\\\\.\\pipe\\vibeframe-serve-${userInfo().username}`;
+  const configHome = env.VIBEFRAME_CONFIG_HOME?.trim();
+  return join(configHome ? resolve(configHome) : resolve(homedir(), ".vibeframe"), "serve.sock");
+}
+
+export function importTimeEnvKey(env: NodeJS.ProcessEnv): string {
+  return JSON.stringify(IMPORT_TIME_ENV.map((name) => env[name] ?? null));
+}
+
+/**
+ * Whether this invocation may be forwarded. Only fully non-interactive
+ * runs qualify (agent hosts pipe all three streams), whether or not the
+ * host was itself launched from a terminal: a runner's stdio are pipes and
+ * it has no controlling terminal, so it takes the same non-interactive
+ * paths the piped caller asked for. `vibe serve` itself never forwards.
+ */
+export function shouldForwardToServe(argv: readonly string[]): boolean {
+  if (process.env[SERVE_RUNNER_ENV] === "1" || process.env.VIBE_NO_SERVE === "1") return false;
+  if (process.stdin.isTTY || process.stdout.isTTY || process.stderr.isTTY) return false;
+  return argv.length > 0 && argv[0] !== "serve";
+}
+
+export function writeFrame(socket: Socket, frame: ServeFrame | ServeRequest): void {
+  socket.write(JSON.stringify(frame) + "\n");
+}
+
+/** Call `onFrame` for each newline-delimited JSON frame read from `socket`. */
+export function readFrames<T>(socket: Socket, onFrame: (frame: T) => void): void {
+  let buffer = "";
+  socket.setEncoding("utf-8");
+  socket.on("data", (chunk: string) => {
+    buffer += chunk;
+    let newline: number;
+    while ((newline = buffer.indexOf("\n")) !== -1) {
+      const line = buffer.slice(0, newline);
+      buffer = buffer.slice(newline + 1);
+      if (line.trim()) onFrame(JSON.parse(line) as T);
+    }
+  });
+}
+
+export interface ForwardOptions {
+  version: string;
+  socketPath?: string;
+  stdin?: Readable;
+  stdout?: Writable;
+  stderr?: Writable;
+}
+
+/**
+ * Run `argv` on the serve daemon, streaming `stdin` to it once the run is
+ * accepted and relaying its output to `stdout`/`stderr`. Resolves with the
+ * exit code once everything is written, or `null` when no daemon accepted
+ * the request and the caller should run in-process (stdin is untouched).
+ */
+export function forwardToServe(argv: string[], opts: ForwardOptions): Promise<number | null> {
+  const stdin = opts.stdin ?? process.stdin;
+  const stdout = opts.stdout ?? process.stdout;
+  const stderr = opts.stderr ?? process.stderr;
+  const env: Record<string, string> = {};
+  for (const [name, value] of Object.entries(process.env)) {
+    if (value !== undefined) env[name] = value;
+  }
+  const request: ServeRunRequest = {
+    type: "run",
+    protocol: SERVE_PROTOCOL_VERSION,
+    version: opts.version,
+    argv,
+    cwd: process.cwd(),
+    env,
+  };
+
+  return new Promise((resolvePromise) => {
+    const socket = connect(opts.socketPath ?? serveSocketPath());
+    let accepted = false;
+    let settled = false;
+    const onInput = (chunk: Buffer | string) => {
+      writeFrame(socket, { type: "stdin", data: Buffer.from(chunk).toString("base64") });
+    };
+    const onInputEnd = () => writeFrame(socket, { type: "stdin-end" });
+    const settle = (code: number | null) => {
+      if (settled) return;
+      settled = true;
+      clearTimeout(acceptTimer);
+      stdin.off("data", onInput);
+      stdin.off("end", onInputEnd);
+      stdin.pause();
+      socket.destroy();
+      if (code === null) {
+        resolvePromise(null);
+        return;
+      }
+      // Pipes flush asynchronously; let the relayed bytes drain first.
+      stdout.write("", () => stderr.write("", () => resolvePromise(code)));
+    };
+    const acceptTimer = setTimeout(() => settle(null), ACCEPT_TIMEOUT_MS);
+
+    socket.once("connect", () => writeFrame(socket, request));
+    readFrames<ServeFrame>(socket, (frame) => {
+      if (frame.type === "accepted") {
+        accepted = true;
+        clearTimeout(acceptTimer);
+        stdin.on("data", onInput);
+        stdin.once("end", onInputEnd);
+      } else if (frame.type === "stdout") {
+        stdout.write(Buffer.from(frame.data, "base64"));
+      } else if (frame.type === "stderr") {
+        stderr.write(Buffer.from(frame.data, "base64"));
+      } else if (frame.type === "exit") {
+        settle(frame.code);
+      } else if (frame.type === "fallback" && !accepted) {
+        settle(null);
+      }
+    });
+    socket.on("error", () => undefined);
+    socket.once("close", () => {
+      if (!accepted) {
+        settle(null);
+        return;
+      }
+      // The runner may already have written output, so re-running the
+      // command in-process could repeat side effects. Report and fail.
+      if (!settled) stderr.write("vibe serve: connection to the daemon was lost\n");
+      settle(1);
+    });
+  });
+}
+
+/**
+ * Send a control request (`ping`, `stop`) and resolve with the daemon's
+ * reply, or `null` when no daemon is listening.
+ */
+export function requestServe(
+  request: { type: "ping" } | { type: "stop" },
+  socketPath = serveSocketPath()
+): Promise<ServeFrame | null> {
+  return new Promise((resolvePromise) => {
+    const socket = connect(socketPath);
+    let reply: ServeFrame | null = null;
+    const timer = setTimeout(() => socket.destroy(), ACCEPT_TIMEOUT_MS);
+    socket.once("connect", () => writeFrame(socket, request));
+    readFrames<ServeFrame>(socket, (frame) => {
+      reply = frame;
+      socket.end();
+    });
+    socket.on("error", () => undefined);
+    socket.once("close", () => {
+      clearTimeout(timer);
+      resolvePromise(reply);
+    });
+  });
+}
+
+/**
+ * Runner side: announce readiness to the daemon, wait for one request, and
+ * take on its argv, cwd and environment. The IPC channel is released so the
+ * process exits on its own when the command finishes.
+ */
+export function adoptServeRequest(): Promise<void> {
+  return new Promise((resolvePromise) => {
+    process.once("message", (request: ServeRunRequest) => {
+      process.disconnect?.();
+      process.chdir(request.cwd);
+      for (const name of Object.keys(process.env)) delete process.env[name];
+      Object.assign(process.env, request.env);
+      process.argv = [process.argv[0], process.argv[1], ...request.argv];
+      resolvePromise();
+    });
+    process.send?.({ type: "ready" });
+  });
+}
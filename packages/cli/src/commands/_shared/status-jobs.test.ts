@@ -448,13 +448,7 @@ describe("status job records", () => {
       status: "completed",
       audioUrl: "https://example.test/music.mp3",
     });
-    vi.stubGlobal(
-      "fetch",
-      vi.fn().mockResolvedValue({
-        ok: true,
-        arrayBuffer: async () => new Uint8Array([7, 8, 9]).buffer,
-      })
-    );
+    vi.stubGlobal("fetch", vi.fn().mockResolvedValue(new Response(new Uint8Array([7, 8, 9]))));
 
     const result = await refreshJobRecord(record);
 
@@ -525,13 +519,7 @@ describe("status job records", () => {
       status: "completed",
       audioUrl: "https://example.test/music.mp3",
     });
-    vi.stubGlobal(
-      "fetch",
-      vi.fn().mockResolvedValue({
-        ok: true,
-        arrayBuffer: async () => new Uint8Array([4, 5, 6]).buffer,
-      })
-    );
+    vi.stubGlobal("fetch", vi.fn().mockResolvedValue(new Response(new Uint8Array([4, 5, 6]))));
 
     const status = await inspectProjectStatus(dir, { refresh: true });
 
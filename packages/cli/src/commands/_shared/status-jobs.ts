@@ -1,12 +1,16 @@
 import { createHash, randomUUID } from "node:crypto";
 import { existsSync, statSync } from "node:fs";
-import { copyFile, mkdir, readFile, readdir, rename, stat, writeFile } from "node:fs/promises";
+import { mkdir, readFile, rename, stat, writeFile } from "node:fs/promises";
 import { dirname, join, parse, relative, resolve } from "node:path";
 
+import { downloadToFile } from "../../utils/download.js";
 import { executeVideoStatus } from "../ai-video.js";
 import { executeMusicStatus } from "../generate/music-status.js";
 import type { BuildAssetKind } from "./build-cache.js";
+import { storeAssetFile } from "./blob-store.js";
 import { writeAssetMetadata } from "./build-asset-metadata.js";
+import { appendJobJournal, loadJobIndex } from "./job-journal.js";
+import { watchJobs } from "./job-watcher.js";
 import type { ReviewAction, ReviewActionCostTier, ReviewFixOwner } from "./review-report.js";
 import { normalizeReviewActions, reviewActionsFromRetryWith } from "./review-report.js";
 import { parseStoryboard } from "./storyboard-parse.js";
@@ -113,6 +117,12 @@ export interface CreateJobRecordOptions {
   message?: string;
 }
 
+export interface JobRecordQuery {
+  status?: JobStatus | JobStatus[];
+  jobType?: JobType | JobType[];
+  beatId?: string;
+}
+
 export interface RefreshJobOptions {
   wait?: boolean;
   output?: string;
@@ -340,8 +350,10 @@ export async function writeJobRecord(record: JobRecord): Promise<void> {
   // Unique tmp name: overlapping writes for the same job (e.g. heartbeat vs
   // completion) must not steal each other's tmp file between write and rename.
   const tmp = `${path}.${randomUUID()}.tmp`;
-  await writeFile(tmp, JSON.stringify(stripUndefined(record), null, 2) + "\n", "utf-8");
+  const stored = stripUndefined(record);
+  await writeFile(tmp, JSON.stringify(stored, null, 2) + "\n", "utf-8");
   await rename(tmp, path);
+  await appendJobJournal(dir, stored);
 }
 
 export async function readJobRecord(jobId: string, projectDir?: string): Promise<JobRecord | null> {
@@ -352,20 +364,23 @@ export async function readJobRecord(jobId: string, projectDir?: string): Promise
   return parseJobRecord(await readFile(path, "utf-8"));
 }
 
-export async function listJobRecords(projectDir: string): Promise<JobRecord[]> {
+/**
+ * Job records for a project, newest first, optionally narrowed by `query`.
+ * Served from the `.vibeframe/jobs` journal index (see job-journal.ts), so a
+ * status poll does not re-parse every record the project has ever written.
+ */
+export async function listJobRecords(
+  projectDir: string,
+  query: JobRecordQuery = {}
+): Promise<JobRecord[]> {
   const dir = jobsDir(projectDir);
   if (!existsSync(dir)) return [];
-  const entries = await readdir(dir, { withFileTypes: true });
-  const records: JobRecord[] = [];
-  for (const entry of entries) {
-    if (!entry.isFile() || !entry.name.endsWith(".json")) continue;
-    try {
-      const parsed = parseJobRecord(await readFile(join(dir, entry.name), "utf-8"));
-      if (parsed) records.push(parsed);
-    } catch {
-      // Ignore malformed job files; status project should stay useful.
-    }
-  }
+  const index = await loadJobIndex(dir, parseJobRecord);
+  const records = index.query({
+    status: query.status === undefined ? undefined : [query.status].flat(),
+    jobType: query.jobType === undefined ? undefined : [query.jobType].flat(),
+    beatId: query.beatId,
+  });
   return records.sort((a, b) => b.updatedAt.localeCompare(a.updatedAt));
 }
 
@@ -377,6 +392,14 @@ export async function refreshJobRecord(
   if (isLocalJob(record)) {
     return refreshLocalJobRecord(record, opts);
   }
+  if (opts.wait && liveSupport(record).supported) {
+    const [result] = await watchJobs(
+      [record],
+      (current) => refreshJobRecord(current, { ...opts, wait: false }),
+      { wait: true }
+    );
+    return result;
+  }
   const live = liveSupport(record);
   if (!live.supported) {
     warnings.push(
@@ -398,7 +421,6 @@ export async function refreshJobRecord(
         taskId: record.providerTaskId,
         provider: record.provider as "grok" | "runway" | "kling" | "veo",
         taskType: record.providerTaskType as "text2video" | "image2video" | undefined,
-        wait: opts.wait,
         output,
       });
       if (!result.success) throw new Error(result.error ?? "Video status check failed");
@@ -412,20 +434,18 @@ export async function refreshJobRecord(
       await maybeCacheOutput(updated);
       await maybeWriteCompletedAssetMetadata(updated);
     } else if (record.jobType === "generate-music") {
-      const result = await refreshMusicStatus(record.providerTaskId, opts.wait);
+      const result = await executeMusicStatus({ taskId: record.providerTaskId });
       if (!result.success) throw new Error(result.error ?? "Music status check failed");
-      let outputPath: string | undefined;
       const output = resolveRefreshOutput(record, opts);
-      if (output && result.audioUrl) {
-        outputPath = await downloadUrl(result.audioUrl, output);
-      }
+      const download =
+        output && result.audioUrl ? await downloadToFile(result.audioUrl, output) : undefined;
       updated = updateRecordFromProvider(record, {
         status: result.status,
         resultUrl: result.audioUrl,
-        outputPath,
+        outputPath: download?.path,
         error: result.error,
       });
-      await maybeCacheOutput(updated);
+      await maybeCacheOutput(updated, download?.sha256);
       await maybeWriteCompletedAssetMetadata(updated);
     }
     if (opts.write !== false) await writeJobRecord(updated);
@@ -508,17 +528,16 @@ export async function inspectProjectStatus(
   const warnings: string[] = [];
   let records = await listJobRecords(project);
   if (opts.refresh) {
-    const refreshed: JobRecord[] = [];
-    for (const record of records) {
-      if (!isActiveStatus(record.status)) {
-        refreshed.push(record);
-        continue;
-      }
-      const result = await refreshJobRecord(record, { write: true });
-      warnings.push(...result.warnings);
-      refreshed.push(result.job);
-    }
-    records = refreshed.sort((a, b) => b.updatedAt.localeCompare(a.updatedAt));
+    const results = await watchJobs(
+      await listJobRecords(project, { status: ["queued", "running"] }),
+      (record) => refreshJobRecord(record, { write: true })
+    );
+    const refreshed = new Map(results.map((result) => [result.job.id, result.job]));
+    for (const result of results) warnings.push(...result.warnings);
+    records = records
+      .map((record) => refreshed.get(record.id) ?? record)
+      .sort((a, b) => b.updatedAt.localeCompare(a.updatedAt));
+    // One report write for the whole refresh, however many jobs completed.
     await refreshBuildReportFromJobs(project, records);
   }
 
@@ -753,38 +772,10 @@ function liveSupport(record: JobRecord): { supported: boolean; error?: string }
   return { supported: false };
 }
 
-async function refreshMusicStatus(
-  taskId: string,
-  wait?: boolean
-): Promise<{
-  success: boolean;
-  status?: string;
-  audioUrl?: string;
-  error?: string;
-}> {
-  let result = await executeMusicStatus({ taskId });
-  if (!wait) return result;
-  for (let i = 0; i < 120 && result.success && result.status === "processing"; i++) {
-    await sleep(5000);
-    result = await executeMusicStatus({ taskId });
-  }
-  return result;
-}
-
-async function downloadUrl(url: string, outputPath: string): Promise<string> {
-  const response = await fetch(url);
-  if (!response.ok) throw new Error(`Download failed: HTTP ${response.status}`);
-  const buffer = Buffer.from(await response.arrayBuffer());
-  await mkdir(dirname(outputPath), { recursive: true });
-  await writeFile(outputPath, buffer);
-  return outputPath;
-}
-
-async function maybeCacheOutput(record: JobRecord): Promise<void> {
+async function maybeCacheOutput(record: JobRecord, sha256?: string): Promise<void> {
   if (record.status !== "completed" || !record.outputPath || !record.cachePath) return;
   try {
-    await mkdir(dirname(record.cachePath), { recursive: true });
-    await copyFile(record.outputPath, record.cachePath);
+    await storeAssetFile(record.projectDir, record.outputPath, [record.cachePath], sha256);
   } catch {
     // Cache writes should not hide provider status refresh success.
   }
@@ -828,6 +819,7 @@ async function refreshBuildReportFromJobs(projectDir: string, records: JobRecord
   const reportPath = join(projectDir, "build-report.json");
   const report = await readJson(reportPath);
   if (!report || !Array.isArray(report.beats)) return;
+  const before = JSON.stringify(stripUndefined(report));
 
   let changed = false;
   const jobs = Array.isArray(report.jobs) ? report.jobs : [];
@@ -886,9 +878,13 @@ async function refreshBuildReportFromJobs(projectDir: string, records: JobRecord
     }
   }
 
-  if (!changed) return;
+  if (!changed || JSON.stringify(stripUndefined(report)) === before) return;
   try {
-    await writeFile(reportPath, JSON.stringify(stripUndefined(report), null, 2) + "\n", "utf-8");
+    // Write-then-rename, as in writeJobRecord: `vibe status` and the build
+    // itself read this file while a refresh may be rewriting it.
+    const tmp = `${reportPath}.${randomUUID()}.tmp`;
+    await writeFile(tmp, JSON.stringify(stripUndefined(report), null, 2) + "\n", "utf-8");
+    await rename(tmp, reportPath);
   } catch {
     // Status should still be useful if build-report refresh fails.
   }
@@ -1396,7 +1392,3 @@ function unique(items: Array<string | undefined>): string[] {
     ...new Set(items.filter((item): item is string => typeof item === "string" && item.length > 0)),
   ];
 }
-
-function sleep(ms: number): Promise<void> {
-  return new Promise((resolve) => setTimeout(resolve, ms));
-}
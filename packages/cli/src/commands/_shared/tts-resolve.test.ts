@@ -15,6 +15,7 @@ const mocks = vi.hoisted(() => {
     openAiInitialize: vi.fn(),
     kokoroTextToSpeech: vi.fn(),
     kokoroInitialize: vi.fn(),
+    getKokoroWorkerPool: vi.fn(),
     getConfiguredApiKey: vi.fn(),
     getApiKey: vi.fn(),
   };
@@ -33,6 +34,7 @@ vi.mock("@vibeframe/ai-providers", () => ({
     initialize = mocks.kokoroInitialize;
     textToSpeech = mocks.kokoroTextToSpeech;
   },
+  getKokoroWorkerPool: () => mocks.getKokoroWorkerPool(),
 }));
 
 vi.mock("../../utils/api-key.js", () => ({
@@ -47,6 +49,7 @@ const {
   openAiInitialize,
   kokoroTextToSpeech,
   kokoroInitialize,
+  getKokoroWorkerPool,
   getConfiguredApiKey,
   getApiKey,
 } = mocks;
@@ -84,6 +87,7 @@ describe("resolveTtsProvider", () => {
     openAiInitialize.mockReset();
     kokoroTextToSpeech.mockReset();
     kokoroInitialize.mockReset();
+    getKokoroWorkerPool.mockReset().mockReturnValue(null);
     getConfiguredApiKey.mockReset();
     getApiKey.mockReset();
   });
@@ -245,6 +249,23 @@ describe("resolveTtsProvider", () => {
         onProgress,
       });
     });
+
+    it("routes Kokoro through the worker pool when one is available", async () => {
+      const synthesize = vi
+        .fn()
+        .mockResolvedValue({ success: true, audioBuffer: Buffer.from("z") });
+      getKokoroWorkerPool.mockReturnValue({ synthesize });
+
+      const r = await resolveTtsProvider("kokoro");
+      await r.call("Hello.", { voice: "af_heart" });
+
+      expect(synthesize).toHaveBeenCalledWith("Hello.", {
+        voice: "af_heart",
+        speed: undefined,
+        onProgress: undefined,
+      });
+      expect(kokoroTextToSpeech).not.toHaveBeenCalled();
+    });
   });
 });
 
@@ -19,7 +19,12 @@
  * `{ success, audioBuffer, error?, characterCount? }` result.
  */
 
-import { ElevenLabsProvider, KokoroProvider, OpenAiTtsProvider } from "@vibeframe/ai-providers";
+import {
+  ElevenLabsProvider,
+  getKokoroWorkerPool,
+  KokoroProvider,
+  OpenAiTtsProvider,
+} from "@vibeframe/ai-providers";
 import type { KokoroLoadEvent } from "@vibeframe/ai-providers";
 import { getApiKey, getConfiguredApiKey } from "../../utils/api-key.js";
 
@@ -54,6 +59,23 @@ export interface TtsCallResult {
 /** Synthesise speech from text. Provider-specific implementation lives behind this. */
 export type TtsCallable = (text: string, options?: TtsCallOptions) => Promise<TtsCallResult>;
 
+/** Per-character timings, in seconds from the start of the returned audio. */
+export interface TtsAlignment {
+  characters: string[];
+  startTimes: number[];
+  endTimes: number[];
+}
+
+export interface TtsTimedCallResult extends TtsCallResult {
+  alignment?: TtsAlignment;
+}
+
+/** Synthesise speech and return where each input character lands in the audio. */
+export type TtsTimedCallable = (
+  text: string,
+  options?: TtsCallOptions,
+) => Promise<TtsTimedCallResult>;
+
 export interface TtsResolution {
   /** Concrete provider chosen. */
   provider: ResolvedTtsProvider;
@@ -61,6 +83,12 @@ export interface TtsResolution {
   audioExtension: "mp3" | "wav";
   /** Synthesise text → audio buffer. */
   call: TtsCallable;
+  /**
+   * Same as {@link call} plus character timings. Only providers that return
+   * alignment (ElevenLabs) set it; narration batching needs it to cut one
+   * request's audio back into per-beat files.
+   */
+  callWithTimestamps?: TtsTimedCallable;
 }
 
 /**
@@ -110,7 +138,12 @@ async function buildElevenLabs(): Promise<TtsResolution> {
       voiceId: opts?.voice,
       speed: opts?.speed,
     });
-  return { provider: "elevenlabs", audioExtension: "mp3", call };
+  const callWithTimestamps: TtsTimedCallable = async (text, opts) =>
+    provider.textToSpeechWithTimestamps(text, {
+      voiceId: opts?.voice,
+      speed: opts?.speed,
+    });
+  return { provider: "elevenlabs", audioExtension: "mp3", call, callWithTimestamps };
 }
 
 async function buildOpenAi(): Promise<TtsResolution> {
@@ -133,12 +166,15 @@ async function buildKokoro(): Promise<TtsResolution> {
   // No-op initialize — Kokoro doesn't take a config but we keep parity with
   // the AIProvider lifecycle for future audit checks.
   await provider.initialize({});
-  const call: TtsCallable = async (text, opts) =>
-    provider.textToSpeech(text, {
-      voice: opts?.voice,
-      speed: opts?.speed,
-      onProgress: opts?.onProgress,
-    });
+  // Worker pool when available: concurrent beats synthesize on separate
+  // cores and the model load stays off the main thread. Otherwise (pool
+  // disabled via VIBE_KOKORO_WORKERS=0, or no worker entry in this build)
+  // synthesis runs in-process as before.
+  const pool = getKokoroWorkerPool();
+  const call: TtsCallable = async (text, opts) => {
+    const options = { voice: opts?.voice, speed: opts?.speed, onProgress: opts?.onProgress };
+    return pool ? pool.synthesize(text, options) : provider.textToSpeech(text, options);
+  };
   return { provider: "kokoro", audioExtension: "wav", call };
 }
 
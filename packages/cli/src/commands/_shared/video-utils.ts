@@ -12,7 +12,7 @@ import chalk from "chalk";
 import type { KlingProvider, RunwayProvider } from "@vibeframe/ai-providers";
 import { getVideoDuration, extendVideoNaturally } from "../../utils/audio.js";
 import { execSafe } from "../../utils/exec-safe.js";
-import { downloadVideo } from "../ai-helpers.js";
+import { downloadVideoToFile } from "../ai-helpers.js";
 
 /** A single scene segment from the Claude-generated storyboard. */
 export interface StoryboardSegment {
@@ -140,8 +140,7 @@ export async function extendVideoToTarget(
             outputDir,
             `${basename(videoPath, ".mp4")}-kling-ext.mp4`,
           );
-          const buffer = await downloadVideo(waitResult.videoUrl);
-          await writeFile(extendedVideoPath, buffer);
+          await downloadVideoToFile(waitResult.videoUrl, extendedVideoPath);
 
           // Concatenate original + extension
           const concatPath = resolve(
@@ -127,6 +127,11 @@ No API key needed (FFmpeg only). Use --use-gemini for smart detection (requires
         model: options.model,
         lowRes: options.lowRes,
         apiKey: options.apiKey,
+        onProgress: ({ timeSec, totalDuration }) => {
+          const pct =
+            totalDuration > 0 ? Math.min(100, Math.round((timeSec / totalDuration) * 100)) : 0;
+          spinner.text = `Detecting silence... ${pct}%`;
+        },
       });
 
       if (!result.success) {
@@ -8,6 +8,7 @@
 import type { EditSuggestion } from "@vibeframe/ai-providers";
 import type { EffectType } from "@vibeframe/core/timeline";
 import { Project } from "../engine/index.js";
+import { downloadToFile, type DownloadOptions, type DownloadResult } from "../utils/download.js";
 
 /**
  * Minimal shape required by {@link applySuggestion}. Accepts the canonical
@@ -17,22 +18,33 @@ import { Project } from "../engine/index.js";
 export type ApplicableSuggestion = Pick<EditSuggestion, "type" | "clipIds" | "params">;
 
 /**
- * Download a video from URL, handling Veo/Google API authentication.
- * Uses x-goog-api-key header (not query param) for Google API URLs.
+ * Download a generated video straight to `outputPath`, handling Veo/Google
+ * API authentication (x-goog-api-key header, not query param). The body is
+ * streamed to disk with an atomic rename and resumed via HTTP Range if the
+ * connection drops; see {@link downloadToFile}.
  *
  * @param url - Video URL to download
+ * @param outputPath - Destination file (parent directories are created)
  * @param apiKey - Google API key (caller should resolve from env/config)
  */
-export async function downloadVideo(url: string, apiKey?: string): Promise<Buffer> {
+export async function downloadVideoToFile(
+  url: string,
+  outputPath: string,
+  apiKey?: string,
+  opts: DownloadOptions = {}
+): Promise<DownloadResult> {
+  return downloadToFile(url, outputPath, {
+    ...opts,
+    headers: { ...opts.headers, ...videoDownloadHeaders(url, apiKey) },
+  });
+}
+
+function videoDownloadHeaders(url: string, apiKey?: string): Record<string, string> {
   const headers: Record<string, string> = {};
   if (url.includes("generativelanguage.googleapis.com") && apiKey) {
     headers["x-goog-api-key"] = apiKey;
   }
-  const response = await fetch(url, { headers, redirect: "follow" });
-  if (!response.ok) {
-    throw new Error(`Download failed (${response.status}): ${response.statusText}`);
-  }
-  return Buffer.from(await response.arrayBuffer());
+  return headers;
 }
 
 /** Format a duration in seconds to m:ss.s display format */
@@ -13,7 +13,7 @@
  * @see MODELS.md for AI model configuration
  */
 
-import { readFile, writeFile } from "node:fs/promises";
+import { readFile } from "node:fs/promises";
 import { resolve } from "node:path";
 import {
   FalProvider,
@@ -25,7 +25,7 @@ import {
   type MediaReference,
 } from "@vibeframe/ai-providers";
 import { resolveUploadHost } from "../utils/upload-host.js";
-import { downloadVideo } from "./ai-helpers.js";
+import { downloadVideoToFile } from "./ai-helpers.js";
 import { getConfiguredApiKey } from "../utils/api-key.js";
 
 // ============================================================================
@@ -164,9 +164,8 @@ export async function executeVideoGenerate(
 
       let outputPath: string | undefined;
       if (output && result.videoUrl) {
-        const buffer = await downloadVideo(result.videoUrl, key);
         outputPath = resolve(process.cwd(), output);
-        await writeFile(outputPath, buffer);
+        await downloadVideoToFile(result.videoUrl, outputPath, key);
       }
 
       return {
@@ -200,9 +199,8 @@ export async function executeVideoGenerate(
 
       let outputPath: string | undefined;
       if (output && finalResult.videoUrl) {
-        const buffer = await downloadVideo(finalResult.videoUrl, key);
         outputPath = resolve(process.cwd(), output);
-        await writeFile(outputPath, buffer);
+        await downloadVideoToFile(finalResult.videoUrl, outputPath, key);
       }
 
       return {
@@ -250,9 +248,8 @@ export async function executeVideoGenerate(
 
       let outputPath: string | undefined;
       if (output && finalResult.videoUrl) {
-        const buffer = await downloadVideo(finalResult.videoUrl, key);
         outputPath = resolve(process.cwd(), output);
-        await writeFile(outputPath, buffer);
+        await downloadVideoToFile(finalResult.videoUrl, outputPath, key);
       }
 
       return {
@@ -299,9 +296,8 @@ export async function executeVideoGenerate(
 
       let outputPath: string | undefined;
       if (output && finalResult.videoUrl) {
-        const buffer = await downloadVideo(finalResult.videoUrl, key);
         outputPath = resolve(process.cwd(), output);
-        await writeFile(outputPath, buffer);
+        await downloadVideoToFile(finalResult.videoUrl, outputPath, key);
       }
 
       return {
@@ -334,9 +330,8 @@ export async function executeVideoGenerate(
 
       let outputPath: string | undefined;
       if (output && finalResult.videoUrl) {
-        const buffer = await downloadVideo(finalResult.videoUrl, key);
         outputPath = resolve(process.cwd(), output);
-        await writeFile(outputPath, buffer);
+        await downloadVideoToFile(finalResult.videoUrl, outputPath, key);
       }
 
       return {
@@ -362,9 +357,8 @@ export async function executeVideoGenerate(
       }
       let outputPath: string | undefined;
       if (output) {
-        const buffer = await downloadVideo(result.videoUrl, key);
         outputPath = resolve(process.cwd(), output);
-        await writeFile(outputPath, buffer);
+        await downloadVideoToFile(result.videoUrl, outputPath, key);
       }
       return {
         success: true,
@@ -496,9 +490,8 @@ export async function executeVideoStatus(options: VideoStatusOptions): Promise<V
 
       let outputPath: string | undefined;
       if (output && result.videoUrl) {
-        const buffer = await downloadVideo(result.videoUrl);
         outputPath = resolve(process.cwd(), output);
-        await writeFile(outputPath, buffer);
+        await downloadVideoToFile(result.videoUrl, outputPath);
       }
 
       return {
@@ -527,9 +520,8 @@ export async function executeVideoStatus(options: VideoStatusOptions): Promise<V
 
       let outputPath: string | undefined;
       if (output && result.videoUrl) {
-        const buffer = await downloadVideo(result.videoUrl, key);
         outputPath = resolve(process.cwd(), output);
-        await writeFile(outputPath, buffer);
+        await downloadVideoToFile(result.videoUrl, outputPath, key);
       }
 
       return {
@@ -557,9 +549,8 @@ export async function executeVideoStatus(options: VideoStatusOptions): Promise<V
 
       let outputPath: string | undefined;
       if (output && result.videoUrl) {
-        const buffer = await downloadVideo(result.videoUrl, key);
         outputPath = resolve(process.cwd(), output);
-        await writeFile(outputPath, buffer);
+        await downloadVideoToFile(result.videoUrl, outputPath, key);
       }
 
       return {
@@ -588,9 +579,8 @@ export async function executeVideoStatus(options: VideoStatusOptions): Promise<V
 
       let outputPath: string | undefined;
       if (output && result.videoUrl) {
-        const buffer = await downloadVideo(result.videoUrl, key);
         outputPath = resolve(process.cwd(), output);
-        await writeFile(outputPath, buffer);
+        await downloadVideoToFile(result.videoUrl, outputPath, key);
       }
 
       return {
@@ -711,9 +701,8 @@ export async function executeVideoExtend(options: VideoExtendOptions): Promise<V
 
       let outputPath: string | undefined;
       if (output && finalResult.videoUrl) {
-        const buffer = await downloadVideo(finalResult.videoUrl, key);
         outputPath = resolve(process.cwd(), output);
-        await writeFile(outputPath, buffer);
+        await downloadVideoToFile(finalResult.videoUrl, outputPath, key);
       }
 
       return {
@@ -756,9 +745,8 @@ export async function executeVideoExtend(options: VideoExtendOptions): Promise<V
 
       let outputPath: string | undefined;
       if (output && finalResult.videoUrl) {
-        const buffer = await downloadVideo(finalResult.videoUrl, key);
         outputPath = resolve(process.cwd(), output);
-        await writeFile(outputPath, buffer);
+        await downloadVideoToFile(finalResult.videoUrl, outputPath, key);
       }
 
       return {
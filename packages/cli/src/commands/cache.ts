@@ -0,0 +1,54 @@
+import { Command } from "commander";
+import chalk from "chalk";
+import { resolve } from "node:path";
+
+import { applyTier } from "./_shared/cost-tier.js";
+import { collectBlobGarbage, type BlobGcResult } from "./_shared/blob-store.js";
+import { exitWithError, generalError, isJsonMode, isQuietMode, outputSuccess } from "./output.js";
+
+export const cacheCommand = new Command("cache")
+  .description("Manage the project's local asset cache")
+  .addHelpText("after", `
+Examples:
+  $ vibe cache gc my-video --dry-run
+  $ vibe cache gc my-video --json
+`);
+
+cacheCommand
+  .command("gc")
+  .description("Delete cached asset blobs no build report or asset metadata references")
+  .argument("[project-dir]", "VibeFrame project directory", ".")
+  .option("--dry-run", "Report what would be removed without deleting anything")
+  .action(async (projectDirArg: string, options) => {
+    const startedAt = Date.now();
+    try {
+      const result = await collectBlobGarbage(resolve(projectDirArg), {
+        dryRun: options.dryRun === true,
+      });
+      if (isJsonMode() || isQuietMode()) {
+        outputSuccess({
+          command: "cache gc",
+          startedAt,
+          dryRun: result.dryRun,
+          data: result as unknown as Record<string, unknown>,
+        });
+        return;
+      }
+      printGcResult(result);
+    } catch (error) {
+      exitWithError(generalError(error instanceof Error ? error.message : String(error)));
+    }
+  });
+applyTier(cacheCommand.commands[cacheCommand.commands.length - 1], "free");
+
+function printGcResult(result: BlobGcResult): void {
+  const mb = (bytes: number) => `${(bytes / 1024 / 1024).toFixed(1)} MB`;
+  console.log();
+  console.log(chalk.bold.cyan(result.dryRun ? "Asset cache GC (dry run)" : "Asset cache GC"));
+  console.log(chalk.dim("-".repeat(60)));
+  console.log(`  Blobs:     ${result.blobs}`);
+  console.log(`  Kept:      ${result.kept}`);
+  console.log(`  ${(result.dryRun ? "To remove:" : "Removed:").padEnd(11)}${result.removed}`);
+  console.log(`  Freed:     ${chalk.bold(mb(result.freedBytes))}`);
+  for (const entry of result.removedCacheEntries) console.log(chalk.dim(`    ${entry}`));
+}
@@ -3,7 +3,9 @@ import { readFile, writeFile } from "node:fs/promises";
 import { resolve, basename } from "node:path";
 import chalk from "chalk";
 import { Project, type ProjectFile } from "../engine/index.js";
-import { execSafe, commandExists, ffprobeDuration } from "../utils/exec-safe.js";
+import { commandExists, ffprobeDuration } from "../utils/exec-safe.js";
+import { type BeatTrack, trackBeatsInFile } from "../utils/beat-track.js";
+import { eventRanges, streamFfmpegEvents } from "../utils/ffmpeg-events.js";
 import { exitWithError, generalError, outputSuccess, spinner as createSpinner } from "./output.js";
 import { validateOutputPath } from "./validate.js";
 import { applyTiers } from "./_shared/cost-tier.js";
@@ -14,12 +16,18 @@ export interface DetectScenesOptions {
   videoPath: string;
   threshold?: number;
   outputPath?: string;
+  /** Stop decoding once this many scene cuts have been found. */
+  limit?: number;
+  /** Called with the decode position (seconds) while ffmpeg runs. */
+  onProgress?: (timeSec: number) => void;
 }
 
 export interface DetectScenesResult {
   success: boolean;
   scenes?: { index: number; startTime: number; endTime: number; duration: number }[];
   totalDuration?: number;
+  /** True when `limit` stopped the scan before the end of the video. */
+  truncated?: boolean;
   error?: string;
 }
 
@@ -28,23 +36,37 @@ export interface DetectSilenceOptions {
   noise?: string;
   duration?: string;
   outputPath?: string;
+  /** Stop decoding once this many silences have been found. */
+  limit?: number;
+  /** Called with the decode position (seconds) while ffmpeg runs. */
+  onProgress?: (timeSec: number) => void;
 }
 
 export interface DetectSilenceResult {
   success: boolean;
   silences?: { start: number; end: number; duration: number }[];
+  /** True when `limit` stopped the scan before the end of the media. */
+  truncated?: boolean;
   error?: string;
 }
 
 export interface DetectBeatsOptions {
   audioPath: string;
   outputPath?: string;
+  /** Called with the decode position (seconds) while ffmpeg runs. */
+  onProgress?: (timeSec: number) => void;
 }
 
 export interface DetectBeatsResult {
   success: boolean;
   beats?: number[];
   beatCount?: number;
+  /** Bar starts, assuming 4/4. */
+  downbeats?: number[];
+  /** Estimated tempo in BPM. */
+  tempo?: number;
+  /** 0-1 pulse strength; 0 when the 120 BPM grid fallback was used. */
+  confidence?: number;
   error?: string;
 }
 
@@ -60,24 +82,7 @@ export async function executeDetectScenes(options: DetectScenesOptions): Promise
     const absPath = resolve(process.cwd(), options.videoPath);
     const threshold = options.threshold ?? 0.3;
 
-    const { stdout: sceneStdout, stderr: sceneStderr } = await execSafe("ffmpeg", [
-      "-i", absPath,
-      "-filter:v", `select='gt(scene,${threshold})',showinfo`,
-      "-f", "null", "-",
-    ], { maxBuffer: 50 * 1024 * 1024 }).catch((err: NodeJS.ErrnoException & { stdout?: string; stderr?: string }) => {
-      if (err.stdout !== undefined || err.stderr !== undefined) {
-        return { stdout: err.stdout || "", stderr: err.stderr || "" };
-      }
-      throw err;
-    });
-    const output = sceneStdout + sceneStderr;
-
-    const scenes: { timestamp: number; score: number }[] = [{ timestamp: 0, score: 1 }];
-    const regex = /pts_time:(\d+\.?\d*)/g;
-    let match;
-    while ((match = regex.exec(output)) !== null) {
-      scenes.push({ timestamp: parseFloat(match[1]), score: threshold });
-    }
+    const { scenes, stopped } = await scanSceneCuts(absPath, threshold, options);
 
     const totalDuration = await ffprobeDuration(absPath);
 
@@ -93,7 +98,7 @@ export async function executeDetectScenes(options: DetectScenesOptions): Promise
       await writeFile(outputPath, JSON.stringify({ source: absPath, totalDuration, threshold, scenes: result }, null, 2), "utf-8");
     }
 
-    return { success: true, scenes: result, totalDuration };
+    return { success: true, scenes: result, totalDuration, ...(stopped ? { truncated: true } : {}) };
   } catch (error) {
     return { success: false, error: `Scene detection failed: ${error instanceof Error ? error.message : String(error)}` };
   }
@@ -112,48 +117,22 @@ export async function executeDetectSilence(options: DetectSilenceOptions): Promi
     const noise = options.noise ?? "-30";
     const duration = options.duration ?? "0.5";
 
-    const { stdout: silStdout, stderr: silStderr } = await execSafe("ffmpeg", [
-      "-i", absPath,
-      "-af", `silencedetect=noise=${noise}dB:d=${duration}`,
-      "-f", "null", "-",
-    ], { maxBuffer: 50 * 1024 * 1024 }).catch((err: NodeJS.ErrnoException & { stdout?: string; stderr?: string }) => {
-      if (err.stdout !== undefined || err.stderr !== undefined) {
-        return { stdout: err.stdout || "", stderr: err.stderr || "" };
-      }
-      throw err;
-    });
-    const output = silStdout + silStderr;
-
-    const silences: { start: number; end: number; duration: number }[] = [];
-    const startRegex = /silence_start: (\d+\.?\d*)/g;
-    const endRegex = /silence_end: (\d+\.?\d*) \| silence_duration: (\d+\.?\d*)/g;
-
-    const starts: number[] = [];
-    let match;
-    while ((match = startRegex.exec(output)) !== null) {
-      starts.push(parseFloat(match[1]));
-    }
-    let i = 0;
-    while ((match = endRegex.exec(output)) !== null) {
-      if (i < starts.length) {
-        silences.push({ start: starts[i], end: parseFloat(match[1]), duration: parseFloat(match[2]) });
-        i++;
-      }
-    }
+    const { silences, stopped } = await scanSilences(absPath, noise, duration, options);
 
     if (options.outputPath) {
       const outputPath = resolve(process.cwd(), options.outputPath);
       await writeFile(outputPath, JSON.stringify({ source: absPath, silences }, null, 2), "utf-8");
     }
 
-    return { success: true, silences };
+    return { success: true, silences, ...(stopped ? { truncated: true } : {}) };
   } catch (error) {
     return { success: false, error: `Silence detection failed: ${error instanceof Error ? error.message : String(error)}` };
   }
 }
 
 /**
- * Detect beats in audio using FFmpeg ebur128 loudness analysis.
+ * Detect beats in audio: onset strength from decoded PCM, autocorrelation
+ * tempo, dynamic-programming beat tracking (see `utils/beat-track`).
  */
 export async function executeDetectBeats(options: DetectBeatsOptions): Promise<DetectBeatsResult> {
   try {
@@ -162,52 +141,91 @@ export async function executeDetectBeats(options: DetectBeatsOptions): Promise<D
     }
 
     const absPath = resolve(process.cwd(), options.audioPath);
-
-    const { stdout: beatStdout, stderr: beatStderr } = await execSafe("ffmpeg", [
-      "-i", absPath,
-      "-af", "aresample=16000,ebur128=peak=true",
-      "-f", "null", "-",
-    ], { maxBuffer: 50 * 1024 * 1024 }).catch((err: NodeJS.ErrnoException & { stdout?: string; stderr?: string }) => {
-      if (err.stdout !== undefined || err.stderr !== undefined) {
-        return { stdout: err.stdout || "", stderr: err.stderr || "" };
-      }
-      throw err;
-    });
-    const beatOutput = beatStdout + beatStderr;
-
-    const beats: number[] = [];
-    const peakRegex = /t:\s*(\d+\.?\d*)\s+M:\s*-?\d+\.?\d*\s+S:\s*-?\d+\.?\d*\s+I:\s*-?\d+\.?\d*\s+LUFS\s+LRA:\s*\d+\.?\d*\s+LU\s+FTPK:\s*(-?\d+\.?\d*)/g;
-    let match;
-    let lastBeatTime = -0.5;
-
-    while ((match = peakRegex.exec(beatOutput)) !== null) {
-      const time = parseFloat(match[1]);
-      const peak = parseFloat(match[2]);
-      if (peak > -10 && time - lastBeatTime > 0.3) {
-        beats.push(time);
-        lastBeatTime = time;
-      }
-    }
-
-    if (beats.length === 0) {
-      const totalDuration = await ffprobeDuration(absPath);
-      const beatInterval = 60 / 120;
-      for (let t = 0; t < totalDuration; t += beatInterval) {
-        beats.push(t);
-      }
-    }
+    const track = await scanBeats(absPath, options);
 
     if (options.outputPath) {
       const outputPath = resolve(process.cwd(), options.outputPath);
-      await writeFile(outputPath, JSON.stringify({ source: absPath, beatCount: beats.length, beats }, null, 2), "utf-8");
+      await writeFile(outputPath, JSON.stringify(beatsJson(absPath, track), null, 2), "utf-8");
     }
 
-    return { success: true, beats, beatCount: beats.length };
+    return { success: true, ...track, beatCount: track.beats.length };
   } catch (error) {
     return { success: false, error: `Beat detection failed: ${error instanceof Error ? error.message : String(error)}` };
   }
 }
 
+/**
+ * Track beats from a streamed PCM decode. Audio with no detectable pulse
+ * falls back to a 120 BPM grid over the whole duration.
+ */
+async function scanBeats(
+  absPath: string,
+  opts: { onProgress?: (timeSec: number) => void },
+): Promise<BeatTrack> {
+  const { duration, ...track } = await trackBeatsInFile(absPath, { onProgress: opts.onProgress });
+  if (track.beats.length > 0) return track;
+
+  const totalDuration = duration > 0 ? duration : await ffprobeDuration(absPath);
+  const beats: number[] = [];
+  for (let t = 0; t < totalDuration; t += 60 / 120) beats.push(t);
+  return { beats, downbeats: beats.filter((_, i) => i % 4 === 0), tempo: 120, confidence: 0 };
+}
+
+function beatsJson(source: string, track: BeatTrack) {
+  return {
+    source,
+    tempo: track.tempo,
+    confidence: track.confidence,
+    beatCount: track.beats.length,
+    beats: track.beats,
+    downbeats: track.downbeats,
+  };
+}
+
+/**
+ * Stream scene cuts from a select+showinfo decode. Scene 0 always starts at
+ * t=0; `limit` counts detected cuts and stops ffmpeg once reached.
+ */
+async function scanSceneCuts(
+  absPath: string,
+  threshold: number,
+  opts: { limit?: number; onProgress?: (timeSec: number) => void },
+): Promise<{ scenes: { timestamp: number; score: number }[]; stopped: boolean }> {
+  const { events, stopped } = await streamFfmpegEvents([
+    "-i", absPath,
+    "-an",
+    "-filter:v", `select='gt(scene,${threshold})',showinfo`,
+    "-f", "null", "-",
+  ], {
+    onProgress: opts.onProgress,
+    stopWhen: opts.limit ? (_event, seen) => seen.length >= (opts.limit ?? 0) : undefined,
+  });
+  const scenes = [{ timestamp: 0, score: 1 }];
+  for (const event of events) {
+    if (event.type === "scene") scenes.push({ timestamp: event.time, score: threshold });
+  }
+  return { scenes, stopped };
+}
+
+/** Stream silencedetect ranges; `limit` stops ffmpeg once reached. */
+async function scanSilences(
+  absPath: string,
+  noise: string,
+  duration: string,
+  opts: { limit?: number; onProgress?: (timeSec: number) => void },
+): Promise<{ silences: { start: number; end: number; duration: number }[]; stopped: boolean }> {
+  const { events, stopped } = await streamFfmpegEvents([
+    "-i", absPath,
+    "-vn",
+    "-af", `silencedetect=noise=${noise}dB:d=${duration}`,
+    "-f", "null", "-",
+  ], {
+    onProgress: opts.onProgress,
+    stopWhen: opts.limit ? (_event, seen) => seen.length >= (opts.limit ?? 0) : undefined,
+  });
+  return { silences: eventRanges(events, "silence"), stopped };
+}
+
 export const detectCommand = new Command("detect")
   .description("Auto-detect scenes, beats, and silences in media");
 
@@ -221,6 +239,7 @@ detectCommand
   .option("--threshold <value>", "Scene change threshold (0-1)", "0.3")
   .option("-o, --output <path>", "Output JSON file with timestamps")
   .option("--project <path>", "Add scenes as clips to project")
+  .option("--limit <n>", "Stop after this many scene cuts (faster on long videos)")
   .option("--dry-run", "Preview parameters without executing")
   .action(async (videoPath: string, options) => {
     const startedAt = Date.now();
@@ -242,6 +261,7 @@ detectCommand
               threshold: options.threshold,
               output: options.output || null,
               project: options.project || null,
+              limit: options.limit ? parseInt(options.limit, 10) : null,
             },
           },
         });
@@ -257,39 +277,21 @@ detectCommand
       const absPath = resolve(process.cwd(), videoPath);
       const threshold = parseFloat(options.threshold);
 
-      // Use FFmpeg to detect scene changes
-      spinner.text = "Analyzing video...";
+      // Get video duration up front so the scan can report progress
+      const totalDuration = await ffprobeDuration(absPath);
 
-      const { stdout: sceneStdout, stderr: sceneStderr } = await execSafe("ffmpeg", [
-        "-i", absPath,
-        "-filter:v", `select='gt(scene,${threshold})',showinfo`,
-        "-f", "null", "-",
-      ], { maxBuffer: 50 * 1024 * 1024 }).catch((err) => {
-        // ffmpeg writes filter output to stderr and exits non-zero with -f null
-        if (err.stdout !== undefined || err.stderr !== undefined) {
-          return { stdout: err.stdout || "", stderr: err.stderr || "" };
-        }
-        throw err;
+      // Use FFmpeg to detect scene changes; cuts are parsed as ffmpeg logs them
+      spinner.text = "Analyzing video...";
+      const { scenes, stopped } = await scanSceneCuts(absPath, threshold, {
+        limit: options.limit ? parseInt(options.limit, 10) : undefined,
+        onProgress: (timeSec) => {
+          spinner.text = `Analyzing video... ${progressPercent(timeSec, totalDuration)}`;
+        },
       });
-      const output = sceneStdout + sceneStderr;
-
-      // Parse scene change timestamps from showinfo output
-      const scenes: { timestamp: number; score: number }[] = [];
-      const regex = /pts_time:(\d+\.?\d*)/g;
-      let match;
-
-      // Always start with 0
-      scenes.push({ timestamp: 0, score: 1 });
-
-      while ((match = regex.exec(output)) !== null) {
-        const timestamp = parseFloat(match[1]);
-        scenes.push({ timestamp, score: threshold });
-      }
-
-      // Get video duration
-      const totalDuration = await ffprobeDuration(absPath);
 
-      spinner.succeed(chalk.green(`Detected ${scenes.length} scenes`));
+      spinner.succeed(
+        chalk.green(`Detected ${scenes.length} scenes${stopped ? " (stopped at --limit)" : ""}`)
+      );
 
       console.log();
       console.log(chalk.bold.cyan("Scene Timestamps"));
@@ -378,6 +380,7 @@ detectCommand
   .option("--noise <dB>", "Noise threshold in dB", "-30")
   .option("-d, --duration <sec>", "Minimum silence duration", "0.5")
   .option("-o, --output <path>", "Output JSON file with timestamps")
+  .option("--limit <n>", "Stop after this many silence periods (faster on long media)")
   .option("--dry-run", "Preview parameters without executing")
   .action(async (mediaPath: string, options) => {
     const startedAt = Date.now();
@@ -399,6 +402,7 @@ detectCommand
               noise: options.noise,
               duration: options.duration,
               output: options.output || null,
+              limit: options.limit ? parseInt(options.limit, 10) : null,
             },
           },
         });
@@ -409,43 +413,19 @@ detectCommand
       const noise = options.noise;
       const duration = options.duration;
 
-      const { stdout: silStdout, stderr: silStderr } = await execSafe("ffmpeg", [
-        "-i", absPath,
-        "-af", `silencedetect=noise=${noise}dB:d=${duration}`,
-        "-f", "null", "-",
-      ], { maxBuffer: 50 * 1024 * 1024 }).catch((err) => {
-        if (err.stdout !== undefined || err.stderr !== undefined) {
-          return { stdout: err.stdout || "", stderr: err.stderr || "" };
-        }
-        throw err;
+      const totalDuration = await ffprobeDuration(absPath).catch(() => undefined);
+      const { silences, stopped } = await scanSilences(absPath, noise, duration, {
+        limit: options.limit ? parseInt(options.limit, 10) : undefined,
+        onProgress: (timeSec) => {
+          spinner.text = `Detecting silence... ${progressPercent(timeSec, totalDuration)}`;
+        },
       });
-      const output = silStdout + silStderr;
-
-      // Parse silence periods
-      const silences: { start: number; end: number; duration: number }[] = [];
-      const startRegex = /silence_start: (\d+\.?\d*)/g;
-      const endRegex = /silence_end: (\d+\.?\d*) \| silence_duration: (\d+\.?\d*)/g;
-
-      const starts: number[] = [];
-      let match;
-
-      while ((match = startRegex.exec(output)) !== null) {
-        starts.push(parseFloat(match[1]));
-      }
-
-      let i = 0;
-      while ((match = endRegex.exec(output)) !== null) {
-        if (i < starts.length) {
-          silences.push({
-            start: starts[i],
-            end: parseFloat(match[1]),
-            duration: parseFloat(match[2]),
-          });
-          i++;
-        }
-      }
 
-      spinner.succeed(chalk.green(`Detected ${silences.length} silence periods`));
+      spinner.succeed(
+        chalk.green(
+          `Detected ${silences.length} silence periods${stopped ? " (stopped at --limit)" : ""}`
+        )
+      );
 
       console.log();
       console.log(chalk.bold.cyan("Silence Periods"));
@@ -508,57 +488,29 @@ detectCommand
         return;
       }
 
-      const absPath = resolve(process.cwd(), audioPath);
-
-      // Use FFmpeg's ebur128 filter for loudness analysis
-      // This gives us a rough approximation of beat positions
-      const { stdout: beatStdout, stderr: beatStderr } = await execSafe("ffmpeg", [
-        "-i", absPath,
-        "-af", "aresample=16000,ebur128=peak=true",
-        "-f", "null", "-",
-      ], { maxBuffer: 50 * 1024 * 1024 }).catch((err) => {
-        if (err.stdout !== undefined || err.stderr !== undefined) {
-          return { stdout: err.stdout || "", stderr: err.stderr || "" };
-        }
-        throw err;
-      });
-      const beatOutput = beatStdout + beatStderr;
-
-      // Extract peak moments as approximate beats
-      const beats: number[] = [];
-      const peakRegex = /t:\s*(\d+\.?\d*)\s+M:\s*-?\d+\.?\d*\s+S:\s*-?\d+\.?\d*\s+I:\s*-?\d+\.?\d*\s+LUFS\s+LRA:\s*\d+\.?\d*\s+LU\s+FTPK:\s*(-?\d+\.?\d*)/g;
-
-      let match;
-      let lastBeatTime = -0.5;
-
-      while ((match = peakRegex.exec(beatOutput)) !== null) {
-        const time = parseFloat(match[1]);
-        const peak = parseFloat(match[2]);
-
-        // Consider it a beat if peak is high and enough time has passed
-        if (peak > -10 && time - lastBeatTime > 0.3) {
-          beats.push(time);
-          lastBeatTime = time;
-        }
+      if (!commandExists("ffmpeg")) {
+        spinner.fail("FFmpeg not found");
+        exitWithError(generalError("FFmpeg not found", "Install with: brew install ffmpeg (macOS) or apt install ffmpeg (Linux)"));
       }
 
-      // Fallback: if no beats detected, use simple interval-based detection
-      if (beats.length === 0) {
-        spinner.text = "Using interval-based detection...";
-
-        // Get duration
-        const totalDuration = await ffprobeDuration(absPath);
-
-        // Estimate BPM from audio length (rough approximation)
-        const estimatedBPM = 120;
-        const beatInterval = 60 / estimatedBPM;
+      const absPath = resolve(process.cwd(), audioPath);
+      const totalDuration = await ffprobeDuration(absPath).catch(() => undefined);
 
-        for (let t = 0; t < totalDuration; t += beatInterval) {
-          beats.push(t);
-        }
-      }
+      spinner.text = "Analyzing audio...";
+      const track = await scanBeats(absPath, {
+        onProgress: (timeSec) => {
+          spinner.text = `Analyzing audio... ${progressPercent(timeSec, totalDuration)}`;
+        },
+      });
+      const { beats } = track;
 
-      spinner.succeed(chalk.green(`Detected ${beats.length} beats`));
+      spinner.succeed(
+        chalk.green(
+          track.confidence > 0
+            ? `Detected ${beats.length} beats at ${track.tempo} BPM (confidence ${track.confidence})`
+            : `No clear pulse; using a ${beats.length}-beat 120 BPM grid`
+        )
+      );
 
       console.log();
       console.log(chalk.bold.cyan("Beat Timestamps"));
@@ -566,8 +518,10 @@ detectCommand
 
       // Show first 20 beats
       const displayBeats = beats.slice(0, 20);
+      const downbeats = new Set(track.downbeats);
       for (let i = 0; i < displayBeats.length; i++) {
-        console.log(`${chalk.yellow(`[${i + 1}]`)} ${formatTimestamp(displayBeats[i])}`);
+        const bar = downbeats.has(displayBeats[i]) ? chalk.dim(" (downbeat)") : "";
+        console.log(`${chalk.yellow(`[${i + 1}]`)} ${formatTimestamp(displayBeats[i])}${bar}`);
       }
 
       if (beats.length > 20) {
@@ -577,11 +531,7 @@ detectCommand
 
       if (options.output) {
         const outputPath = resolve(process.cwd(), options.output);
-        await writeFile(
-          outputPath,
-          JSON.stringify({ source: absPath, beatCount: beats.length, beats }, null, 2),
-          "utf-8"
-        );
+        await writeFile(outputPath, JSON.stringify(beatsJson(absPath, track), null, 2), "utf-8");
         console.log(chalk.green(`Saved to: ${outputPath}`));
       }
     } catch (error) {
@@ -598,6 +548,11 @@ applyTiers(detectCommand, {
   "beats": "free",
 });
 
+function progressPercent(timeSec: number, totalSec: number | undefined): string {
+  if (!totalSec || totalSec <= 0) return formatTimestamp(timeSec);
+  return `${Math.min(100, Math.round((timeSec / totalSec) * 100))}%`;
+}
+
 function formatTimestamp(seconds: number): string {
   const mins = Math.floor(seconds / 60);
   const secs = (seconds % 60).toFixed(2);
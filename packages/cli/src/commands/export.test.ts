@@ -2,6 +2,11 @@ import { describe, expect, it } from "vitest";
 
 import {
   applyCustomOverrides,
+  buildFFmpegArgs,
+  buildRenditionArgs,
+  indexTimeline,
+  renditionCanvas,
+  useFilterScript,
   validateOverrides,
   type PresetSettings,
 } from "./export.js";
@@ -124,3 +129,117 @@ describe("applyCustomOverrides", () => {
     expect(JSON.stringify(base)).toBe(snapshot);
   });
 });
+
+type Timeline = Parameters<typeof indexTimeline>;
+
+/** Two video clips with a 1s gap on one track, plus two narration tracks. */
+function makeTimeline(): Timeline {
+  const sources = [
+    { id: "cam", name: "cam", type: "video", url: "/m/cam.mp4", duration: 60 },
+    { id: "vo", name: "vo", type: "audio", url: "/m/vo.mp3", duration: 60 },
+  ];
+  const clip = (id: string, sourceId: string, trackId: string, startTime: number, offset: number) => ({
+    id,
+    sourceId,
+    trackId,
+    startTime,
+    duration: 2,
+    sourceStartOffset: offset,
+    sourceEndOffset: offset + 2,
+    effects: [],
+  });
+  const clips = [
+    clip("b", "cam", "video-1", 3, 10),
+    clip("vo-2", "vo", "audio-2", 1, 0),
+    clip("a", "cam", "video-1", 0, 0),
+    clip("vo-1", "vo", "audio-1", 0, 0),
+  ];
+  return [clips, sources] as unknown as Timeline;
+}
+
+describe("indexTimeline", () => {
+  it("sorts clips per kind and groups the audio mix by track", () => {
+    const index = indexTimeline(...makeTimeline());
+    expect(index.videoClips.map((c) => c.id)).toEqual(["a", "b"]);
+    expect(index.audioTracks.map((track) => track.map((c) => c.id))).toEqual([["vo-1"], ["vo-2"]]);
+    expect(index.usedSources.map((s) => s.id)).toEqual(["cam", "vo"]);
+  });
+});
+
+describe("buildFFmpegArgs", () => {
+  it("fills a gap by extending the next clip back into its source", () => {
+    const args = buildFFmpegArgs(indexTimeline(...makeTimeline()), makeBase(), "/out.mp4", {});
+    const graph = args[args.indexOf("-filter_complex") + 1];
+    expect(args.filter((a) => a === "-i")).toHaveLength(2);
+    expect(graph).toContain("[0:v]trim=start=9:end=10");
+    expect(graph).toContain("concat=n=3:v=1:a=0[outv]");
+    expect(graph).toContain("amix=inputs=2");
+  });
+
+  it("builds only the audio mix in audio-only mode", () => {
+    const args = buildFFmpegArgs(indexTimeline(...makeTimeline()), makeBase(), "/out.m4a", {
+      audioOnly: true,
+    });
+    expect(args).not.toContain("[outv]");
+    expect(args.slice(-6)).toEqual(["-vn", "-c:a", "aac", "-b:a", "192k", "/out.m4a"]);
+  });
+});
+
+describe("buildRenditionArgs", () => {
+  const settings = (resolution: string, crf = "23"): PresetSettings => ({
+    ...makeBase(),
+    resolution,
+    ffmpegArgs: ["-c:v", "libx264", "-crf", crf, "-c:a", "aac"],
+  });
+
+  it("composes once and splits into a scale/crop chain per rendition", () => {
+    const args = buildRenditionArgs(indexTimeline(...makeTimeline()), [
+      { outputPath: "/out/wide.mp4", format: "mp4", settings: settings("1920x1080", "18") },
+      { outputPath: "/out/vertical.mp4", format: "mp4", settings: settings("720x1280") },
+      { outputPath: "/out/square.mp4", format: "mp4", settings: settings("360x360", "28") },
+    ], {});
+    const graph = args[args.indexOf("-filter_complex") + 1];
+
+    expect(args.filter((a) => a === "-i")).toHaveLength(2);
+    expect(graph).toContain("scale=1920:1080:force_original_aspect_ratio=decrease");
+    expect(graph).toContain("[outv]split=3[outv0][outv1][outv2]");
+    expect(graph).toContain("[outa]asplit=3[outa0][outa1][outa2]");
+    expect(graph).toContain("[outv0]copy[rv0]");
+    expect(graph).toContain("[outv1]scale=720:1280:force_original_aspect_ratio=increase,crop=720:1280,setsar=1[rv1]");
+    expect(args.slice(args.indexOf("[rv2]") - 1)).toEqual([
+      "-map", "[rv2]", "-map", "[outa2]", "-c:v", "libx264", "-crf", "28", "-c:a", "aac", "/out/square.mp4",
+    ]);
+  });
+
+  it("shares one encoder between identical renditions through tee", () => {
+    const args = buildRenditionArgs(indexTimeline(...makeTimeline()), [
+      { outputPath: "/out/a.mp4", format: "mp4", settings: settings("1280x720") },
+      { outputPath: "/out/a|b.mov", format: "mov", settings: settings("1280x720") },
+    ], { overwrite: true });
+    const graph = args[args.indexOf("-filter_complex") + 1];
+
+    expect(graph).not.toContain("split");
+    expect(graph).toContain("[outv]copy[rv0]");
+    expect(args.slice(-3)).toEqual(["-f", "tee", "[f=mp4]/out/a.mp4|[f=mov]/out/a\\|b.mov"]);
+  });
+});
+
+describe("renditionCanvas", () => {
+  it("keeps the main frame shape at the largest rendition's pixel count", () => {
+    expect(renditionCanvas(["1920x1080", "720x1280", "360x360"])).toBe("1920x1080");
+    expect(renditionCanvas(["1280x720", "1080x1920"])).toBe("1920x1080");
+  });
+});
+
+describe("useFilterScript", () => {
+  it("keeps small graphs inline", () => {
+    expect(useFilterScript(["-filter_complex", "[0:v]copy[outv]", "/out.mp4"], "/tmp/g.txt")).toBeNull();
+  });
+
+  it("moves large graphs to a script file", () => {
+    const graph = "[0:v]null[v];".repeat(2000);
+    const result = useFilterScript(["-i", "in.mp4", "-filter_complex", graph, "/out.mp4"], "/tmp/g.txt");
+    expect(result?.graph).toBe(graph);
+    expect(result?.args).toEqual(["-i", "in.mp4", "-filter_complex_script", "/tmp/g.txt", "/out.mp4"]);
+  });
+});
@@ -1,9 +1,31 @@
-import { readFile, access } from "node:fs/promises";
-import { resolve } from "node:path";
+import { readFile, writeFile, access, mkdtemp, rm } from "node:fs/promises";
+import { tmpdir } from "node:os";
+import { join, resolve } from "node:path";
 import { spawn } from "node:child_process";
+import { randomUUID } from "node:crypto";
 import { Project, type ProjectFile } from "../engine/index.js";
 import { execSafe, ffprobeDuration } from "../utils/exec-safe.js";
+import { probeHasAudio, probeMedia, probeMediaBatch } from "../utils/media-probe.js";
+import { mapWithConcurrency } from "../utils/concurrency.js";
 import { resolveTimelineFile } from "../utils/project-resolver.js";
+import {
+  aggregateChunkProgress,
+  chunkEncoderThreads,
+  planExportChunks,
+  resolveExportJobs,
+  type ExportChunk,
+} from "./_shared/export-chunks.js";
+import {
+  formatSmartRenderReport,
+  joinVideoPieces,
+  planSmartRender,
+  probeFrameRate,
+  resolveCopyableSources,
+  runSmartRender,
+  smartRenderCodec,
+  type SmartRenderReport,
+  type SmartVideoSegment,
+} from "./_shared/export-smart-render.js";
 
 /**
  * Get the duration of a media file using ffprobe
@@ -30,10 +52,7 @@ export async function getMediaDuration(
  */
 export async function checkHasAudio(filePath: string): Promise<boolean> {
   try {
-    const { stdout } = await execSafe("ffprobe", [
-      "-v", "error", "-select_streams", "a", "-show_entries", "stream=codec_type", "-of", "default=noprint_wrappers=1:nokey=1", filePath,
-    ]);
-    return stdout.trim().length > 0;
+    return probeHasAudio(await probeMedia(filePath));
   } catch {
     return false;
   }
@@ -46,6 +65,28 @@ export interface ExportResult {
   success: boolean;
   message: string;
   outputPath?: string;
+  /** Present when smart render stream-copied part of the video. */
+  smartRender?: SmartRenderReport;
+  /** Why smart render failed, when the export fell back to re-encoding everything. */
+  smartRenderFallback?: string;
+  /** Present when the video was encoded in parallel chunks. */
+  chunked?: ChunkedExportReport;
+  /** Every file written, main output first, when `renditions` was given. */
+  renditions?: RenditionOutput[];
+}
+
+/** One file written by a multi-rendition export. */
+export interface RenditionOutput {
+  outputPath: string;
+  format: string;
+  resolution: string;
+}
+
+/** How a chunked export ran (see `_shared/export-chunks`). */
+export interface ChunkedExportReport {
+  chunks: number;
+  jobs: number;
+  elapsedMs: number;
 }
 
 /**
@@ -67,6 +108,42 @@ export interface ExportOptions {
   fps?: number;
   resolution?: string;
   codec?: "h264" | "h265" | "vp9";
+  /**
+   * Stream-copy untouched footage that already matches the preset instead
+   * of re-encoding it (default: true). MP4/MOV with H.264/H.265 only.
+   */
+  smartRender?: boolean;
+  /**
+   * FFmpeg processes to encode with at once (default: 1, a single pass).
+   * Above 1 the video is split at clip boundaries into that many chunks
+   * encoded in parallel; smart render pieces also render concurrently.
+   * `0` sizes from CPU cores.
+   */
+  jobs?: number;
+  /** Encode progress over the whole export, 0-100. */
+  onProgress?: (percent: number) => void;
+  /**
+   * Further outputs written by the same FFmpeg process as the main one: the
+   * timeline is decoded and composed once, then split into a scale/crop
+   * chain and encoder per rendition. Smart render and chunking do not apply.
+   */
+  renditions?: ExportRendition[];
+}
+
+/**
+ * An extra output of a multi-rendition export. `preset`, `format`, `fps`
+ * and `codec` default to the export's own; the frame shape to the
+ * project's. Other shapes are centre-cropped from the composed timeline.
+ */
+export interface ExportRendition {
+  outputPath: string;
+  preset?: "draft" | "standard" | "high" | "ultra";
+  aspectRatio?: "16:9" | "9:16" | "1:1";
+  format?: "mp4" | "webm" | "mov";
+  bitrate?: string;
+  fps?: number;
+  resolution?: string;
+  codec?: VideoCodec;
 }
 
 export type VideoCodec = "h264" | "h265" | "vp9";
@@ -114,12 +191,25 @@ export async function runExport(
   outputPath: string,
   options: ExportOptions = {}
 ): Promise<ExportResult> {
-  const { preset = "standard", format = "mp4", overwrite = false, gapFill = "extend", bitrate, fps, resolution, codec } = options;
+  const { preset = "standard", format = "mp4", overwrite = false, gapFill = "extend", bitrate, fps, resolution, codec, smartRender = true, onProgress } = options;
 
   const overrideError = validateOverrides({ bitrate, fps, resolution, codec });
   if (overrideError) {
     return { success: false, message: overrideError };
   }
+  if (options.jobs !== undefined && (!Number.isInteger(options.jobs) || options.jobs < 0)) {
+    return { success: false, message: `Invalid --jobs "${options.jobs}". Use a positive integer, or 0 to size from CPU cores.` };
+  }
+  const jobs = resolveExportJobs(options.jobs);
+  for (const rendition of options.renditions ?? []) {
+    const renditionError = validateOverrides(rendition);
+    if (renditionError) {
+      return { success: false, message: `Rendition ${rendition.outputPath}: ${renditionError}` };
+    }
+  }
+  if (options.renditions?.length && format === "gif") {
+    return { success: false, message: "Renditions cannot be combined with GIF output" };
+  }
 
   try {
     // Check if FFmpeg is installed
@@ -153,46 +243,121 @@ export async function runExport(
     const basePresetSettings = getPresetSettings(preset, summary.aspectRatio);
     const presetSettings = applyCustomOverrides(basePresetSettings, { bitrate, fps, resolution, codec });
 
-    // Get clips sorted by start time
-    const clips = project.getClips().sort((a, b) => a.startTime - b.startTime);
-    const sources = project.getSources();
+    // Index the timeline once: sources by id, clips sorted per kind and track
+    const timeline = indexTimeline(project.getClips(), project.getSources());
 
     // Verify source files exist, check audio streams, and measure actual durations
     const sourceAudioMap = new Map<string, boolean>();
     const sourceActualDurationMap = new Map<string, number>();
-    for (const clip of clips) {
-      const source = sources.find((s) => s.id === clip.sourceId);
-      if (source) {
+    // Warm the probe cache in one concurrent pass; the per-source duration and
+    // audio checks below are then answered without spawning ffprobe.
+    await probeMediaBatch(
+      [...timeline.sourceById.values()].filter((s) => s.type !== "image").map((s) => s.url)
+    );
+    for (const source of timeline.usedSources) {
+      try {
+        await access(source.url);
         try {
-          await access(source.url);
-          if (!sourceActualDurationMap.has(source.id)) {
-            try {
-              const dur = await getMediaDuration(source.url, source.type as "video" | "audio" | "image");
-              if (dur > 0) sourceActualDurationMap.set(source.id, dur);
-            } catch { /* fall back to metadata */ }
-          }
-          if (source.type === "video" && !sourceAudioMap.has(source.id)) {
-            sourceAudioMap.set(source.id, await checkHasAudio(source.url));
-          }
-        } catch {
+          const dur = await getMediaDuration(source.url, source.type as "video" | "audio" | "image");
+          if (dur > 0) sourceActualDurationMap.set(source.id, dur);
+        } catch { /* fall back to metadata */ }
+        if (source.type === "video") {
+          sourceAudioMap.set(source.id, await checkHasAudio(source.url));
+        }
+      } catch {
+        return {
+          success: false,
+          message: `Source file not found: ${source.url}`,
+        };
+      }
+    }
+
+    // Multi-rendition export: compose once, encode every output in one process
+    if (options.renditions?.length) {
+      const targets: RenditionTarget[] = [
+        { outputPath: finalOutputPath, format, settings: presetSettings },
+        ...options.renditions.map((r) => ({
+          outputPath: resolve(process.cwd(), r.outputPath),
+          format: r.format ?? format,
+          settings: applyCustomOverrides(getPresetSettings(r.preset ?? preset, r.aspectRatio ?? summary.aspectRatio), {
+            bitrate: r.bitrate,
+            fps: r.fps ?? fps,
+            resolution: r.resolution,
+            codec: r.codec ?? codec,
+          }),
+        })),
+      ];
+      const paths = new Set(targets.map((t) => t.outputPath));
+      if (paths.size < targets.length) {
+        return { success: false, message: "Each rendition needs its own output path" };
+      }
+      // The tee muxer never asks before replacing a file, so check up front
+      if (!overwrite) {
+        for (const path of paths) {
+          const exists = await access(path).then(() => true, () => false);
+          if (exists) return { success: false, message: `Output exists: ${path} (pass overwrite to replace it)` };
+        }
+      }
+      const ffmpegArgs = buildRenditionArgs(timeline, targets, { overwrite, gapFill }, sourceAudioMap, sourceActualDurationMap);
+      await runFFmpegGraph(ffmpegPath, ffmpegArgs, onProgress);
+      return {
+        success: true,
+        message: `Exported ${targets.length} renditions: ${targets.map((t) => t.outputPath).join(", ")}`,
+        outputPath: finalOutputPath,
+        renditions: targets.map((t) => ({ outputPath: t.outputPath, format: t.format, resolution: t.settings.resolution })),
+      };
+    }
+
+    // Smart render: stream-copy matching footage, re-encode only the rest.
+    // Falls through to the chunked/single-pass export when nothing can be
+    // copied or any step of it fails; the failure is reported on the result.
+    let smartRenderFallback: string | undefined;
+    if (smartRender && !bitrate) {
+      const existed = await access(finalOutputPath).then(() => true, () => false);
+      try {
+        const report = await smartExport(ffmpegPath, timeline, presetSettings, finalOutputPath, { overwrite, format, gapFill, jobs, onProgress }, sourceAudioMap, sourceActualDurationMap);
+        if (report) {
           return {
-            success: false,
-            message: `Source file not found: ${source.url}`,
+            success: true,
+            message: `Exported: ${outputPath} (${formatSmartRenderReport(report)})`,
+            outputPath: finalOutputPath,
+            smartRender: report,
           };
         }
+      } catch (error) {
+        smartRenderFallback = error instanceof Error ? error.message : String(error);
+        // Drop a half-written output, but never a file we were told not to replace.
+        if (!existed || overwrite) await rm(finalOutputPath, { force: true });
+      }
+    }
+    const fallbackNote = smartRenderFallback ? `smart render failed, re-encoded: ${smartRenderFallback}` : undefined;
+
+    // Chunked export: encode time ranges of the video in parallel.
+    // Falls through to the single pass when the timeline is too short to split.
+    if (jobs > 1 && format !== "gif") {
+      const report = await chunkedExport(ffmpegPath, timeline, presetSettings, finalOutputPath, { overwrite, format, gapFill, jobs, onProgress }, sourceAudioMap, sourceActualDurationMap);
+      if (report) {
+        return {
+          success: true,
+          message: `Exported: ${outputPath} (${[`${report.chunks} chunks, ${report.jobs} parallel encodes`, fallbackNote].filter(Boolean).join("; ")})`,
+          outputPath: finalOutputPath,
+          chunked: report,
+          smartRenderFallback,
+        };
       }
     }
 
     // Build FFmpeg command
-    const ffmpegArgs = buildFFmpegArgs(clips, sources, presetSettings, finalOutputPath, { overwrite, format, gapFill }, sourceAudioMap, sourceActualDurationMap);
+    const ffmpegArgs = buildFFmpegArgs(timeline, presetSettings, finalOutputPath, { overwrite, format, gapFill }, sourceAudioMap, sourceActualDurationMap);
 
     // Run FFmpeg
-    await runFFmpegProcess(ffmpegPath, ffmpegArgs, () => {});
+    await runFFmpegGraph(ffmpegPath, ffmpegArgs, onProgress);
 
     return {
       success: true,
-      message: `Exported: ${outputPath}`,
+      message: fallbackNote ? `Exported: ${outputPath} (${fallbackNote})` : `Exported: ${outputPath}`,
       outputPath: finalOutputPath,
+      smartRenderFallback,
     };
   } catch (error) {
     const errorMessage = error instanceof Error ? error.message : String(error);
@@ -203,6 +368,216 @@ export async function runExport(
   }
 }
 
+/**
+ * Smart-render the timeline's video (see `_shared/export-smart-render`) and
+ * mux it with the separately encoded audio mix. Returns null, without
+ * writing anything, when the format or codec rules it out or no segment
+ * can be stream-copied.
+ */
+async function smartExport(
+  ffmpegPath: string,
+  timeline: TimelineIndex,
+  presetSettings: PresetSettings,
+  outputPath: string,
+  options: { overwrite?: boolean; format?: string; gapFill?: GapFillStrategy; jobs?: number; onProgress?: (percent: number) => void },
+  sourceAudioMap: Map<string, boolean>,
+  sourceActualDurationMap: Map<string, number>
+): Promise<SmartRenderReport | null> {
+  if (options.format !== "mp4" && options.format !== "mov") return null;
+  const startedAt = Date.now();
+  const { video } = splitEncodeArgs(presetSettings.ffmpegArgs);
+  const codec = smartRenderCodec(video[video.indexOf("-c:v") + 1]);
+  if (!codec) return null;
+
+  const { audioClips, videoSegments } = planTimelineSegments(timeline, options.gapFill);
+  const segments = toSmartSegments(videoSegments, timeline.sourceById, sourceActualDurationMap);
+  const firstVideo = segments.find((s) => s.kind === "video");
+  if (!firstVideo) return null;
+
+  // Without an --fps override the output keeps the footage's own rate.
+  const rIdx = video.indexOf("-r");
+  const fps = rIdx !== -1 ? Number(video[rIdx + 1]) : probeFrameRate(await probeMedia(firstVideo.sourceUrl!));
+  if (!(fps > 0)) return null;
+  const [width, height] = presetSettings.resolution.split("x").map(Number);
+  const target = { codec, width, height, fps };
+
+  const copyable = await resolveCopyableSources(segments, target);
+  const pieces = planSmartRender(segments, copyable, fps);
+  const sourceFormat = copyable.values().next().value?.format;
+  if (!pieces.some((p) => p.mode === "copy")) return null;
+
+  const dir = await mkdtemp(join(tmpdir(), "vibe-export-"));
+  try {
+    let audioPath: string | undefined;
+    if (audioClips.length > 0) {
+      audioPath = join(dir, "audio.m4a");
+      const audioArgs = buildFFmpegArgs(timeline, presetSettings, audioPath, { overwrite: true, format: options.format, gapFill: options.gapFill, audioOnly: true }, sourceAudioMap, sourceActualDurationMap);
+      await runFFmpegGraph(ffmpegPath, audioArgs);
+    }
+    return await runSmartRender({
+      pieces,
+      target,
+      videoArgs: rIdx !== -1 ? [...video.slice(0, rIdx), ...video.slice(rIdx + 2)] : video,
+      audioPath,
+      outputPath,
+      overwrite: options.overwrite,
+      startedAt,
+      jobs: options.jobs,
+      format: sourceFormat,
+      onProgress: options.onProgress,
+    });
+  } finally {
+    await rm(dir, { recursive: true, force: true });
+  }
+}
+
+/**
+ * The timeline's video segments as smart-render input. Fades and
+ * freeze-frame padding are carried as filters, which keeps those segments
+ * on the re-encode path, exactly as the single-pass graph renders them.
+ */
+function toSmartSegments(
+  videoSegments: VideoSegment[],
+  sourceById: Map<string, TimelineSource>,
+  sourceActualDurationMap: Map<string, number>
+): SmartVideoSegment[] {
+  const segments: SmartVideoSegment[] = [];
+  for (const segment of videoSegments) {
+    if (segment.type === "clip" && segment.clip) {
+      const clip = segment.clip;
+      const source = sourceById.get(clip.sourceId);
+      if (!source) continue;
+      const filters: string[] = [];
+      if (source.type === "video") {
+        const sourceDuration = sourceActualDurationMap.get(source.id) || source.duration || 0;
+        const availableDuration = sourceDuration - clip.sourceStartOffset;
+        if (availableDuration > 0 && availableDuration < clip.duration - 0.1) {
+          filters.push(`tpad=stop_mode=clone:stop_duration=${(clip.duration - availableDuration).toFixed(3)}`);
+        }
+      }
+      for (const effect of clip.effects || []) {
+        if (effect.type === "fadeIn") {
+          filters.push(`fade=t=in:st=0:d=${effect.duration}`);
+        } else if (effect.type === "fadeOut") {
+          filters.push(`fade=t=out:st=${clip.duration - effect.duration}:d=${effect.duration}`);
+        }
+      }
+      segments.push({
+        kind: source.type === "image" ? "image" : "video",
+        sourceUrl: source.url,
+        sourceStart: source.type === "image" ? 0 : clip.sourceStartOffset,
+        duration: clip.duration,
+        filters,
+      });
+    } else if (segment.type === "extended" && segment.sourceUrl) {
+      segments.push({
+        kind: "video",
+        sourceUrl: segment.sourceUrl,
+        sourceStart: segment.sourceStart ?? 0,
+        duration: segment.duration ?? 0,
+        filters: [],
+      });
+    } else {
+      segments.push({ kind: "black", sourceStart: 0, duration: segment.duration ?? 0, filters: [] });
+    }
+  }
+  return segments;
+}
+
+/**
+ * Encode the timeline's video in parallel chunks (see
+ * `_shared/export-chunks`) and mux them with the audio mix, encoded once
+ * over the full duration. Returns null, without writing anything, when the
+ * timeline is too short to split.
+ */
+async function chunkedExport(
+  ffmpegPath: string,
+  timeline: TimelineIndex,
+  presetSettings: PresetSettings,
+  outputPath: string,
+  options: { overwrite?: boolean; format?: string; gapFill?: GapFillStrategy; jobs: number; onProgress?: (percent: number) => void },
+  sourceAudioMap: Map<string, boolean>,
+  sourceActualDurationMap: Map<string, number>
+): Promise<ChunkedExportReport | null> {
+  const startedAt = Date.now();
+  const { audioClips, videoSegments } = planTimelineSegments(timeline, options.gapFill);
+  const chunks = planExportChunks(videoSegments, (s) => (s.clip ? s.clip.duration : s.duration ?? 0), options.jobs);
+  if (chunks.length < 2) return null;
+
+  const { video } = splitEncodeArgs(presetSettings.ffmpegArgs);
+  const codec = smartRenderCodec(video[video.indexOf("-c:v") + 1]);
+  const threads = chunkEncoderThreads(options.jobs);
+  const progress = aggregateChunkProgress(chunks.map((c) => c.duration), options.onProgress ?? (() => {}));
+
+  const dir = await mkdtemp(join(tmpdir(), "vibe-export-"));
+  try {
+    // MPEG-TS keeps H.264/H.265 parameter sets in-band; VP9 goes in Matroska.
+    const files = chunks.map((_, i) => join(dir, `chunk-${String(i).padStart(3, "0")}.${codec ? "ts" : "mkv"}`));
+    // The audio mix is a light single-threaded encode; run it beside the chunks.
+    let audioPath: string | undefined;
+    let audio: Promise<void> = Promise.resolve();
+    if (audioClips.length > 0) {
+      audioPath = join(dir, "audio.mka");
+      const audioArgs = buildFFmpegArgs(timeline, presetSettings, audioPath, { overwrite: true, format: options.format, gapFill: options.gapFill, audioOnly: true }, sourceAudioMap, sourceActualDurationMap);
+      audio = runFFmpegGraph(ffmpegPath, audioArgs);
+    }
+    // Let every encode settle before the temp dir goes, even on failure.
+    const settled = await Promise.allSettled([
+      audio,
+      mapWithConcurrency(chunks, options.jobs, (chunk, i) =>
+        runFFmpegGraph(ffmpegPath, buildChunkArgs(timeline, chunk, presetSettings, files[i], threads, sourceActualDurationMap), (percent) => progress(i, percent), chunk.duration)
+      ),
+    ]);
+    for (const result of settled) {
+      if (result.status === "rejected") throw result.reason;
+    }
+    await joinVideoPieces({ files, listPath: join(dir, "chunks.txt"), codec, audioPath, outputPath, overwrite: options.overwrite });
+  } finally {
+    await rm(dir, { recursive: true, force: true });
+  }
+
+  return { chunks: chunks.length, jobs: Math.min(options.jobs, chunks.length), elapsedMs: Date.now() - startedAt };
+}
+
+/**
+ * FFmpeg args for one chunk of a chunked export: the chunk's video segments
+ * through the same chains as the single-pass graph, encoded with the
+ * preset's video flags on `threads` threads, without audio.
+ */
+function buildChunkArgs(
+  timeline: TimelineIndex,
+  chunk: ExportChunk<VideoSegment>,
+  presetSettings: PresetSettings,
+  outputPath: string,
+  threads: number,
+  sourceActualDurationMap: Map<string, number>
+): string[] {
+  const args: string[] = ["-y"];
+
+  // Only open the sources this chunk reads
+  const used = new Set(chunk.segments.map((s) => s.clip?.sourceId ?? s.sourceId));
+  const sourceMap = new Map<string, number>();
+  for (const source of timeline.usedSources) {
+    if (!used.has(source.id)) continue;
+    if (source.type === "image") {
+      args.push("-loop", "1");
+    }
+    args.push("-i", source.url);
+    sourceMap.set(source.id, sourceMap.size);
+  }
+
+  const [targetWidth, targetHeight] = presetSettings.resolution.split("x").map(Number);
+  const { filterParts, videoStreams } = buildVideoChains(chunk.segments, timeline, sourceMap, targetWidth, targetHeight, sourceActualDurationMap);
+  const concatVideo = concatVideoStreams(videoStreams);
+  if (concatVideo) filterParts.push(concatVideo);
+
+  args.push("-filter_complex", filterParts.join(";"));
+  args.push("-map", "[outv]", "-an");
+  args.push(...splitEncodeArgs(presetSettings.ffmpegArgs).video, "-threads", String(threads));
+  args.push(outputPath);
+  return args;
+}
+
 /**
  * Find FFmpeg executable
  */
@@ -286,9 +661,17 @@ interface GapFillPlan {
 function createGapFillPlans(
   gaps: Array<{ start: number; end: number }>,
   clips: Array<{ startTime: number; duration: number; sourceId: string; sourceStartOffset: number; sourceEndOffset: number }>,
-  sources: Array<{ id: string; url: string; type: string; duration: number }>
+  sources: Map<string, { id: string; url: string; type: string; duration: number }>
 ): GapFillPlan[] {
   const sortedClips = [...clips].sort((a, b) => a.startTime - b.startTime);
+  const clipStarts = sortedClips.map((c) => c.startTime);
+  // Clip ends are not monotonic in start order; keep them sorted alongside
+  // each clip's start-order position so "first clip in start order" wins,
+  // exactly as a linear scan would.
+  const byEnd = sortedClips
+    .map((c, order) => ({ end: c.startTime + c.duration, order }))
+    .sort((a, b) => a.end - b.end);
+  const clipEnds = byEnd.map((e) => e.end);
 
   return gaps.map((gap) => {
     const fills: GapFillPlan["fills"] = [];
@@ -296,14 +679,23 @@ function createGapFillPlans(
     let remainingEnd = gap.end;
 
     // Find clip AFTER the gap (for extending backwards)
-    const clipAfter = sortedClips.find((c) => Math.abs(c.startTime - gap.end) < 0.01);
+    const afterIdx = firstAbove(clipStarts, gap.end - 0.01);
+    const clipAfter = afterIdx < sortedClips.length && Math.abs(clipStarts[afterIdx] - gap.end) < 0.01
+      ? sortedClips[afterIdx]
+      : undefined;
 
     // Find clip BEFORE the gap (for extending forwards)
-    const clipBefore = sortedClips.find((c) => Math.abs((c.startTime + c.duration) - gap.start) < 0.01);
+    let beforeOrder = -1;
+    for (let i = firstAbove(clipEnds, gap.start - 0.01); i < byEnd.length && clipEnds[i] < gap.start + 0.01; i++) {
+      if (Math.abs(clipEnds[i] - gap.start) < 0.01 && (beforeOrder === -1 || byEnd[i].order < beforeOrder)) {
+        beforeOrder = byEnd[i].order;
+      }
+    }
+    const clipBefore = beforeOrder === -1 ? undefined : sortedClips[beforeOrder];
 
     // Try extending clip after the gap backwards first
     if (clipAfter && clipAfter.sourceStartOffset > 0.01) {
-      const source = sources.find((s) => s.id === clipAfter.sourceId);
+      const source = sources.get(clipAfter.sourceId);
       if (source && source.type === "video") {
         const availableExtension = clipAfter.sourceStartOffset;
         const extensionDuration = Math.min(availableExtension, remainingEnd - remainingStart);
@@ -331,7 +723,7 @@ function createGapFillPlans(
 
     // If there's still a gap, try extending clip before the gap forwards
     if (remainingEnd - remainingStart > 0.01 && clipBefore) {
-      const source = sources.find((s) => s.id === clipBefore.sourceId);
+      const source = sources.get(clipBefore.sourceId);
       if (source && source.type === "video") {
         const usedEndInSource = clipBefore.sourceEndOffset;
         const availableExtension = source.duration - usedEndInSource;
@@ -373,100 +765,135 @@ function createGapFillPlans(
 }
 
 /**
- * Build FFmpeg arguments for export
+ * Ordered video segments of a timeline (clips and gap fills interleaved).
+ */
+interface VideoSegment {
+  type: 'clip' | 'extended' | 'black';
+  clip?: TimelineClip;
+  sourceId?: string;
+  sourceUrl?: string;
+  startTime: number;
+  duration?: number;
+  sourceStart?: number;
+  sourceEnd?: number;
+}
+
+type TimelineClip = ReturnType<Project["getClips"]>[number];
+type TimelineSource = ReturnType<Project["getSources"]>[number];
+
+/**
+ * One export's view of the timeline, built once by {@link indexTimeline} so
+ * graph construction never scans the source list per clip.
  */
-function buildFFmpegArgs(
+export interface TimelineIndex {
+  sourceById: Map<string, TimelineSource>;
+  /** Sources referenced by at least one clip, in first-use order. */
+  usedSources: TimelineSource[];
+  /** Image and video clips, by start time. */
+  videoClips: TimelineClip[];
+  /** Clips on audio sources (narration, music), by start time. */
+  explicitAudioClips: TimelineClip[];
+  /**
+   * The clips the audio mix is built from: the explicit audio clips, or the
+   * video clips' own sound when there are none (e.g. highlight reels).
+   */
+  audioClips: TimelineClip[];
+  /** `audioClips` grouped by track, first-seen track order, by start time. */
+  audioTracks: TimelineClip[][];
+}
+
+/** Build the export's timeline index (one pass over clips and sources). */
+export function indexTimeline(
   clips: ReturnType<Project["getClips"]>,
-  sources: ReturnType<Project["getSources"]>,
-  presetSettings: PresetSettings,
-  outputPath: string,
-  options: { overwrite?: boolean; format?: string; gapFill?: GapFillStrategy },
-  sourceAudioMap: Map<string, boolean> = new Map(),
-  sourceActualDurationMap: Map<string, number> = new Map()
-): string[] {
-  const args: string[] = [];
+  sources: ReturnType<Project["getSources"]>
+): TimelineIndex {
+  const sourceById = new Map(sources.map((s) => [s.id, s]));
+  const sorted = [...clips].sort((a, b) => a.startTime - b.startTime);
+  const used = new Set<TimelineSource>();
+  const videoClips: TimelineClip[] = [];
+  const explicitAudioClips: TimelineClip[] = [];
+  const sourceVideoClips: TimelineClip[] = [];
+  for (const clip of sorted) {
+    const source = sourceById.get(clip.sourceId);
+    if (!source) continue;
+    used.add(source);
+    if (source.type === "image" || source.type === "video") videoClips.push(clip);
+    if (source.type === "video") sourceVideoClips.push(clip);
+    if (source.type === "audio") explicitAudioClips.push(clip);
+  }
+  const audioClips = explicitAudioClips.length > 0 ? explicitAudioClips : sourceVideoClips;
 
-  // Overwrite flag first
-  if (options.overwrite) {
-    args.push("-y");
+  const tracks = new Map<string, TimelineClip[]>();
+  for (const clip of audioClips) {
+    const trackId = clip.trackId || "audio-track-1";
+    let track = tracks.get(trackId);
+    if (!track) tracks.set(trackId, (track = []));
+    track.push(clip);
   }
 
-  // Add input files
-  const sourceMap = new Map<string, number>();
-  let inputIndex = 0;
+  return {
+    sourceById,
+    usedSources: [...used],
+    videoClips,
+    explicitAudioClips,
+    audioClips,
+    audioTracks: [...tracks.values()],
+  };
+}
 
-  for (const clip of clips) {
-    const source = sources.find((s) => s.id === clip.sourceId);
-    if (source && !sourceMap.has(source.id)) {
-      // Add -loop 1 before image inputs to create a continuous video stream
-      if (source.type === "image") {
-        args.push("-loop", "1");
-      }
-      args.push("-i", source.url);
-      sourceMap.set(source.id, inputIndex);
-      inputIndex++;
-    }
+/** First index in ascending `sorted` whose value is greater than `x`. */
+function firstAbove(sorted: number[], x: number): number {
+  let lo = 0;
+  let hi = sorted.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (sorted[mid] > x) hi = mid;
+    else lo = mid + 1;
   }
+  return lo;
+}
 
-  // Build filter complex
-  const filterParts: string[] = [];
-
-  // Separate clips by track type for proper timeline-based export
-  // Get track info to determine clip types
-  const videoClips = clips.filter((clip) => {
-    const source = sources.find((s) => s.id === clip.sourceId);
-    return source && (source.type === "image" || source.type === "video");
-  }).sort((a, b) => a.startTime - b.startTime);
-
-  // Include audio clips from:
-  // 1. Explicit audio sources (narration, music)
-  // 2. Video sources when there are NO separate audio clips (e.g., highlight reels)
-  const explicitAudioClips = clips.filter((clip) => {
-    const source = sources.find((s) => s.id === clip.sourceId);
-    return source && source.type === "audio";
-  }).sort((a, b) => a.startTime - b.startTime);
-
-  // If no explicit audio clips, extract audio from video clips
-  const audioClips = explicitAudioClips.length > 0
-    ? explicitAudioClips
-    : clips.filter((clip) => {
-        const source = sources.find((s) => s.id === clip.sourceId);
-        return source && source.type === "video";
-      }).sort((a, b) => a.startTime - b.startTime);
+/** Latest `startTime + duration` over `clips`, 0 when empty. */
+function clipsEnd(clips: TimelineClip[]): number {
+  let end = 0;
+  for (const clip of clips) end = Math.max(end, clip.startTime + clip.duration);
+  return end;
+}
 
-  // Get target resolution for scaling (all clips must match for concat)
-  const [targetWidth, targetHeight] = presetSettings.resolution.split("x").map(Number);
+/**
+ * Split a timeline into the video segment list and the audio clips the
+ * export mixes. Shared by the single-pass filter graph and smart render.
+ */
+function planTimelineSegments(
+  timeline: TimelineIndex,
+  gapFill?: GapFillStrategy
+): {
+  videoClips: TimelineClip[];
+  audioClips: TimelineClip[];
+  totalDuration: number | undefined;
+  videoSegments: VideoSegment[];
+} {
+  const { videoClips, explicitAudioClips, audioClips } = timeline;
 
   // Detect gaps in video timeline
   // For totalDuration, use the longest audio clip end time if explicit audio exists
   // (audio is usually the reference for timing in b-roll scenarios)
   let totalDuration: number | undefined;
   if (explicitAudioClips.length > 0) {
-    const audioEnd = Math.max(...explicitAudioClips.map(c => c.startTime + c.duration));
-    totalDuration = audioEnd;
+    totalDuration = clipsEnd(explicitAudioClips);
   }
   const videoGaps = detectTimelineGaps(videoClips, totalDuration);
 
   // Create gap fill plans based on strategy
-  const gapFillStrategy = options.gapFill || "extend";
+  const gapFillStrategy = gapFill || "extend";
   const gapFillPlans = gapFillStrategy === "extend"
-    ? createGapFillPlans(videoGaps, videoClips, sources)
+    ? createGapFillPlans(videoGaps, videoClips, timeline.sourceById)
     : videoGaps.map((gap) => ({
         gap,
         fills: [{ type: "black" as const, start: gap.start, end: gap.end }],
       }));
 
   // Build ordered list of video segments (clips and gap fills interleaved)
-  interface VideoSegment {
-    type: 'clip' | 'extended' | 'black';
-    clip?: typeof videoClips[0];
-    sourceId?: string;
-    sourceUrl?: string;
-    startTime: number;
-    duration?: number;
-    sourceStart?: number;
-    sourceEnd?: number;
-  }
   const videoSegments: VideoSegment[] = [];
 
   // Add video clips as segments
@@ -501,112 +928,126 @@ function buildFFmpegArgs(
   // Sort by start time
   videoSegments.sort((a, b) => a.startTime - b.startTime);
 
-  // Process video segments (clips, extended clips, and black frames)
-  const videoStreams: string[] = [];
-  let videoStreamIdx = 0;
+  return { videoClips, audioClips, totalDuration, videoSegments };
+}
 
-  for (const segment of videoSegments) {
-    if (segment.type === 'clip' && segment.clip) {
-      const clip = segment.clip;
-      const source = sources.find((s) => s.id === clip.sourceId);
-      if (!source) continue;
+/**
+ * Build FFmpeg arguments for export. The filter graph is passed inline;
+ * {@link runFFmpegGraph} moves it to a script file when it is large.
+ */
+export function buildFFmpegArgs(
+  timeline: TimelineIndex,
+  presetSettings: PresetSettings,
+  outputPath: string,
+  options: { overwrite?: boolean; format?: string; gapFill?: GapFillStrategy; audioOnly?: boolean },
+  sourceAudioMap: Map<string, boolean> = new Map(),
+  sourceActualDurationMap: Map<string, number> = new Map()
+): string[] {
+  const args: string[] = [];
 
-      const srcIdx = sourceMap.get(source.id);
-      if (srcIdx === undefined) continue;
+  // Overwrite flag first
+  if (options.overwrite) {
+    args.push("-y");
+  }
 
-      // Video filter chain - images need different handling than video
-      let videoFilter: string;
-      if (source.type === "image") {
-        // Images: trim from 0 to clip duration (no source offset since images are looped)
-        videoFilter = `[${srcIdx}:v]trim=start=0:end=${clip.duration},setpts=PTS-STARTPTS`;
-      } else {
-        // Video: use source offsets
-        const trimStart = clip.sourceStartOffset;
-        const trimEnd = clip.sourceStartOffset + clip.duration;
-        videoFilter = `[${srcIdx}:v]trim=start=${trimStart}:end=${trimEnd},setpts=PTS-STARTPTS`;
+  // Inputs and filter complex
+  const graph = buildExportGraph(timeline, presetSettings.resolution, options, sourceAudioMap, sourceActualDurationMap);
+  args.push(...graph.inputs);
+  args.push("-filter_complex", graph.filterParts.join(";"));
 
-        // If video source is shorter than clip duration, freeze last frame to fill
-        // This prevents black frames when narration is longer than generated video
-        // Use actual measured duration (ffprobe) over project metadata (may be stale)
-        const sourceDuration = sourceActualDurationMap.get(source.id) || source.duration || 0;
-        const availableDuration = sourceDuration - clip.sourceStartOffset;
-        if (availableDuration > 0 && availableDuration < clip.duration - 0.1) {
-          const padDuration = clip.duration - availableDuration;
-          videoFilter += `,tpad=stop_mode=clone:stop_duration=${padDuration.toFixed(3)}`;
-        }
-      }
+  // Map outputs
+  if (!options.audioOnly) {
+    args.push("-map", "[outv]");
+  }
+  if (graph.hasAudio) {
+    args.push("-map", "[outa]");
+  }
 
-      // Scale to target resolution for concat compatibility (force same size, pad if needed)
-      videoFilter += `,scale=${targetWidth}:${targetHeight}:force_original_aspect_ratio=decrease,pad=${targetWidth}:${targetHeight}:(ow-iw)/2:(oh-ih)/2,setsar=1`;
+  // Add encoding settings
+  if (options.format === "gif") {
+    // GIF: drop audio track (GIF has no audio)
+    const audioIdx = args.indexOf("[outa]");
+    if (audioIdx !== -1) {
+      const mapIdx = args.lastIndexOf("-map", audioIdx);
+      if (mapIdx !== -1) args.splice(mapIdx, 2);
+    }
+    args.push("-r", "15"); // 15fps for reasonable file size
+    args.push("-loop", "0"); // loop forever
+  } else if (options.audioOnly) {
+    args.push("-vn", ...splitEncodeArgs(presetSettings.ffmpegArgs).audio);
+  } else {
+    args.push(...presetSettings.ffmpegArgs);
+  }
 
-      // Apply effects
-      for (const effect of clip.effects || []) {
-        if (effect.type === "fadeIn") {
-          videoFilter += `,fade=t=in:st=0:d=${effect.duration}`;
-        } else if (effect.type === "fadeOut") {
-          const fadeStart = clip.duration - effect.duration;
-          videoFilter += `,fade=t=out:st=${fadeStart}:d=${effect.duration}`;
-        }
-      }
+  // Output file
+  args.push(outputPath);
 
-      videoFilter += `[v${videoStreamIdx}]`;
-      filterParts.push(videoFilter);
-      videoStreams.push(`[v${videoStreamIdx}]`);
-      videoStreamIdx++;
-    } else if (segment.type === 'extended' && segment.sourceId) {
-      // Extended segment - use source video to fill gap
-      const srcIdx = sourceMap.get(segment.sourceId);
-      if (srcIdx === undefined) {
-        // Fallback to black if source not found in input map
-        const gapFilter = `color=c=black:s=${targetWidth}x${targetHeight}:d=${segment.duration}:r=30,format=yuv420p[v${videoStreamIdx}]`;
-        filterParts.push(gapFilter);
-        videoStreams.push(`[v${videoStreamIdx}]`);
-        videoStreamIdx++;
-        continue;
-      }
+  return args;
+}
 
-      const videoFilter = `[${srcIdx}:v]trim=start=${segment.sourceStart}:end=${segment.sourceEnd},setpts=PTS-STARTPTS,scale=${targetWidth}:${targetHeight}:force_original_aspect_ratio=decrease,pad=${targetWidth}:${targetHeight}:(ow-iw)/2:(oh-ih)/2,setsar=1[v${videoStreamIdx}]`;
-      filterParts.push(videoFilter);
-      videoStreams.push(`[v${videoStreamIdx}]`);
-      videoStreamIdx++;
-    } else if (segment.type === 'black') {
-      // Generate black frame for the gap duration
-      const gapFilter = `color=c=black:s=${targetWidth}x${targetHeight}:d=${segment.duration}:r=30,format=yuv420p[v${videoStreamIdx}]`;
-      filterParts.push(gapFilter);
-      videoStreams.push(`[v${videoStreamIdx}]`);
-      videoStreamIdx++;
-    }
-  }
+/**
+ * The export's inputs and filter graph: the video composed at `resolution`
+ * into `[outv]` (unless `audioOnly`), and the audio mix into `[outa]` when
+ * the timeline has any audio.
+ */
+function buildExportGraph(
+  timeline: TimelineIndex,
+  resolution: string,
+  options: { gapFill?: GapFillStrategy; audioOnly?: boolean },
+  sourceAudioMap: Map<string, boolean>,
+  sourceActualDurationMap: Map<string, number>
+): { inputs: string[]; filterParts: string[]; hasAudio: boolean } {
+  const args: string[] = [];
 
-  // ── Multi-track audio processing ────────────────────────────────────
-  // Group audio clips by trackId, build each track as a separate stream,
-  // then mix all tracks together with amix.
+  // Add input files
+  const sourceMap = new Map<string, number>();
+  let inputIndex = 0;
 
-  // Step 1: Group audio clips by track
-  const audioTrackMap = new Map<string, typeof audioClips>();
-  for (const clip of audioClips) {
-    const trackId = clip.trackId || "audio-track-1";
-    if (!audioTrackMap.has(trackId)) {
-      audioTrackMap.set(trackId, []);
+  for (const source of timeline.usedSources) {
+    if (options.audioOnly && source.type === "image") continue;
+    // Add -loop 1 before image inputs to create a continuous video stream
+    if (source.type === "image") {
+      args.push("-loop", "1");
     }
-    audioTrackMap.get(trackId)!.push(clip);
+    args.push("-i", source.url);
+    sourceMap.set(source.id, inputIndex);
+    inputIndex++;
   }
 
+  // Build filter complex
+  const filterParts: string[] = [];
+
+  const { videoClips, audioClips, totalDuration, videoSegments } = planTimelineSegments(
+    timeline,
+    options.gapFill
+  );
+
+  // Get target resolution for scaling (all clips must match for concat)
+  const [targetWidth, targetHeight] = resolution.split("x").map(Number);
+
+  // Process video segments (clips, extended clips, and black frames)
+  const { filterParts: videoFilterParts, videoStreams } = buildVideoChains(
+    options.audioOnly ? [] : videoSegments,
+    timeline,
+    sourceMap,
+    targetWidth,
+    targetHeight,
+    sourceActualDurationMap
+  );
+  filterParts.push(...videoFilterParts);
+
+  // ── Multi-track audio processing ────────────────────────────────────
+  // Build each audio track (grouped by trackId in the timeline index) as a
+  // separate stream, then mix all tracks together with amix.
+
   // Compute total timeline duration for gap detection
-  const videoDuration = videoClips.length > 0
-    ? Math.max(...videoClips.map(c => c.startTime + c.duration))
-    : 0;
-  const audioDuration = audioClips.length > 0
-    ? Math.max(...audioClips.map(c => c.startTime + c.duration))
-    : 0;
-  const timelineDuration = totalDuration || Math.max(videoDuration, audioDuration);
-
-  // Step 2: Build each track as a concat stream
+  const timelineDuration = totalDuration || Math.max(clipsEnd(videoClips), clipsEnd(audioClips));
+
+  // Step 1: Build each track as a concat stream
   const trackOutputLabels: string[] = [];
   let audioStreamIdx = 0;
 
-  for (const [, trackClips] of audioTrackMap) {
-    const sorted = [...trackClips].sort((a, b) => a.startTime - b.startTime);
+  for (const sorted of timeline.audioTracks) {
     const trackGaps = detectTimelineGaps(sorted, timelineDuration);
 
     // Build segments for this track (clips + gaps, sorted by time)
@@ -631,7 +1072,7 @@ function buildFFmpegArgs(
     for (const segment of segments) {
       if (segment.type === 'clip' && segment.clip) {
         const clip = segment.clip;
-        const source = sources.find((s) => s.id === clip.sourceId);
+        const source = timeline.sourceById.get(clip.sourceId);
         if (!source) continue;
 
         const srcIdx = sourceMap.get(source.id);
@@ -708,15 +1149,10 @@ function buildFFmpegArgs(
   }
 
   // Concatenate video clips
-  if (videoStreams.length > 1) {
-    filterParts.push(
-      `${videoStreams.join("")}concat=n=${videoStreams.length}:v=1:a=0[outv]`
-    );
-  } else if (videoStreams.length === 1) {
-    filterParts.push(`${videoStreams[0]}copy[outv]`);
-  }
+  const concatVideo = concatVideoStreams(videoStreams);
+  if (concatVideo) filterParts.push(concatVideo);
 
-  // Step 3: Mix all audio tracks together
+  // Step 2: Mix all audio tracks together
   // amix with normalize=0 prevents auto-volume reduction
   if (trackOutputLabels.length > 1) {
     filterParts.push(
@@ -726,49 +1162,269 @@ function buildFFmpegArgs(
     filterParts.push(`${trackOutputLabels[0]}acopy[outa]`);
   }
 
-  // Add filter complex
-  args.push("-filter_complex", filterParts.join(";"));
 
-  // Map outputs
-  args.push("-map", "[outv]");
-  if (trackOutputLabels.length > 0) {
-    args.push("-map", "[outa]");
-  }
+  return { inputs: args, filterParts, hasAudio: trackOutputLabels.length > 0 };
+}
 
-  // Add encoding settings
-  if (options.format === "gif") {
-    // GIF: drop audio track (GIF has no audio)
-    const audioIdx = args.indexOf("[outa]");
-    if (audioIdx !== -1) {
-      const mapIdx = args.lastIndexOf("-map", audioIdx);
-      if (mapIdx !== -1) args.splice(mapIdx, 2);
+/**
+ * Per-segment video chains: each segment trimmed, padded or generated at the
+ * target size and labelled `[v<i>]`, ready for {@link concatVideoStreams}.
+ * `sourceMap` maps source ids to FFmpeg input indices.
+ */
+function buildVideoChains(
+  segments: VideoSegment[],
+  timeline: TimelineIndex,
+  sourceMap: Map<string, number>,
+  targetWidth: number,
+  targetHeight: number,
+  sourceActualDurationMap: Map<string, number>
+): { filterParts: string[]; videoStreams: string[] } {
+  const filterParts: string[] = [];
+  const videoStreams: string[] = [];
+  let videoStreamIdx = 0;
+
+  for (const segment of segments) {
+    if (segment.type === 'clip' && segment.clip) {
+      const clip = segment.clip;
+      const source = timeline.sourceById.get(clip.sourceId);
+      if (!source) continue;
+
+      const srcIdx = sourceMap.get(source.id);
+      if (srcIdx === undefined) continue;
+
+      // Video filter chain - images need different handling than video
+      let videoFilter: string;
+      if (source.type === "image") {
+        // Images: trim from 0 to clip duration (no source offset since images are looped)
+        videoFilter = `[${srcIdx}:v]trim=start=0:end=${clip.duration},setpts=PTS-STARTPTS`;
+      } else {
+        // Video: use source offsets
+        const trimStart = clip.sourceStartOffset;
+        const trimEnd = clip.sourceStartOffset + clip.duration;
+        videoFilter = `[${srcIdx}:v]trim=start=${trimStart}:end=${trimEnd},setpts=PTS-STARTPTS`;
+
+        // If video source is shorter than clip duration, freeze last frame to fill
+        // This prevents black frames when narration is longer than generated video
+        // Use actual measured duration (ffprobe) over project metadata (may be stale)
+        const sourceDuration = sourceActualDurationMap.get(source.id) || source.duration || 0;
+        const availableDuration = sourceDuration - clip.sourceStartOffset;
+        if (availableDuration > 0 && availableDuration < clip.duration - 0.1) {
+          const padDuration = clip.duration - availableDuration;
+          videoFilter += `,tpad=stop_mode=clone:stop_duration=${padDuration.toFixed(3)}`;
+        }
+      }
+
+      // Scale to target resolution for concat compatibility (force same size, pad if needed)
+      videoFilter += `,scale=${targetWidth}:${targetHeight}:force_original_aspect_ratio=decrease,pad=${targetWidth}:${targetHeight}:(ow-iw)/2:(oh-ih)/2,setsar=1`;
+
+      // Apply effects
+      for (const effect of clip.effects || []) {
+        if (effect.type === "fadeIn") {
+          videoFilter += `,fade=t=in:st=0:d=${effect.duration}`;
+        } else if (effect.type === "fadeOut") {
+          const fadeStart = clip.duration - effect.duration;
+          videoFilter += `,fade=t=out:st=${fadeStart}:d=${effect.duration}`;
+        }
+      }
+
+      videoFilter += `[v${videoStreamIdx}]`;
+      filterParts.push(videoFilter);
+      videoStreams.push(`[v${videoStreamIdx}]`);
+      videoStreamIdx++;
+    } else if (segment.type === 'extended' && segment.sourceId) {
+      // Extended segment - use source video to fill gap
+      const srcIdx = sourceMap.get(segment.sourceId);
+      if (srcIdx === undefined) {
+        // Fallback to black if source not found in input map
+        const gapFilter = `color=c=black:s=${targetWidth}x${targetHeight}:d=${segment.duration}:r=30,format=yuv420p[v${videoStreamIdx}]`;
+        filterParts.push(gapFilter);
+        videoStreams.push(`[v${videoStreamIdx}]`);
+        videoStreamIdx++;
+        continue;
+      }
+
+      const videoFilter = `[${srcIdx}:v]trim=start=${segment.sourceStart}:end=${segment.sourceEnd},setpts=PTS-STARTPTS,scale=${targetWidth}:${targetHeight}:force_original_aspect_ratio=decrease,pad=${targetWidth}:${targetHeight}:(ow-iw)/2:(oh-ih)/2,setsar=1[v${videoStreamIdx}]`;
+      filterParts.push(videoFilter);
+      videoStreams.push(`[v${videoStreamIdx}]`);
+      videoStreamIdx++;
+    } else if (segment.type === 'black') {
+      // Generate black frame for the gap duration
+      const gapFilter = `color=c=black:s=${targetWidth}x${targetHeight}:d=${segment.duration}:r=30,format=yuv420p[v${videoStreamIdx}]`;
+      filterParts.push(gapFilter);
+      videoStreams.push(`[v${videoStreamIdx}]`);
+      videoStreamIdx++;
     }
-    args.push("-r", "15"); // 15fps for reasonable file size
-    args.push("-loop", "0"); // loop forever
-  } else {
-    args.push(...presetSettings.ffmpegArgs);
   }
 
-  // Output file
-  args.push(outputPath);
+  return { filterParts, videoStreams };
+}
+
+/** Join labelled video chains into `[outv]`, or null when there are none. */
+function concatVideoStreams(videoStreams: string[]): string | null {
+  if (videoStreams.length > 1) {
+    return `${videoStreams.join("")}concat=n=${videoStreams.length}:v=1:a=0[outv]`;
+  }
+  if (videoStreams.length === 1) return `${videoStreams[0]}copy[outv]`;
+  return null;
+}
+
+/** One encoder output of a multi-rendition export. */
+export interface RenditionTarget {
+  outputPath: string;
+  format: string;
+  settings: PresetSettings;
+}
+
+/**
+ * FFmpeg args for a multi-rendition export. The timeline is composed once,
+ * in the first target's frame shape at the pixel count of the largest
+ * target ({@link renditionCanvas}), then `split` into a scale/centre-crop
+ * chain per distinct encode. Targets with the same size and encoder flags
+ * (e.g. MP4 and MOV copies) share one encoder through the `tee` muxer.
+ */
+export function buildRenditionArgs(
+  timeline: TimelineIndex,
+  targets: RenditionTarget[],
+  options: { overwrite?: boolean; gapFill?: GapFillStrategy },
+  sourceAudioMap: Map<string, boolean> = new Map(),
+  sourceActualDurationMap: Map<string, number> = new Map()
+): string[] {
+  const canvas = renditionCanvas(targets.map((t) => t.settings.resolution));
+  const graph = buildExportGraph(timeline, canvas, options, sourceAudioMap, sourceActualDurationMap);
 
+  const encodes = new Map<string, RenditionTarget[]>();
+  for (const target of targets) {
+    const key = JSON.stringify([target.settings.resolution, target.settings.ffmpegArgs]);
+    encodes.set(key, [...(encodes.get(key) ?? []), target]);
+  }
+  const groups = [...encodes.values()];
+
+  const filterParts = [...graph.filterParts];
+  const videoLabels = groups.length > 1 ? groups.map((_, i) => `[outv${i}]`) : ["[outv]"];
+  const audioLabels = groups.length > 1 ? groups.map((_, i) => `[outa${i}]`) : ["[outa]"];
+  if (groups.length > 1) {
+    filterParts.push(`[outv]split=${groups.length}${videoLabels.join("")}`);
+    if (graph.hasAudio) filterParts.push(`[outa]asplit=${groups.length}${audioLabels.join("")}`);
+  }
+
+  const args: string[] = [];
+  if (options.overwrite) {
+    args.push("-y");
+  }
+  args.push(...graph.inputs);
+  const outputs: string[] = [];
+  groups.forEach((group, i) => {
+    const { resolution, ffmpegArgs } = group[0].settings;
+    const [width, height] = resolution.split("x").map(Number);
+    const sizing = resolution === canvas
+      ? "copy"
+      : `scale=${width}:${height}:force_original_aspect_ratio=increase,crop=${width}:${height},setsar=1`;
+    filterParts.push(`${videoLabels[i]}${sizing}[rv${i}]`);
+
+    outputs.push("-map", `[rv${i}]`);
+    if (graph.hasAudio) outputs.push("-map", audioLabels[i]);
+    outputs.push(...ffmpegArgs);
+    if (group.length === 1) {
+      outputs.push(group[0].outputPath);
+    } else {
+      // Muxers behind tee cannot ask the encoders for global headers themselves
+      outputs.push("-flags:v", "+global_header", "-flags:a", "+global_header");
+      outputs.push("-f", "tee", group.map((t) => `[f=${t.format}]${teeEscape(t.outputPath)}`).join("|"));
+    }
+  });
+  args.push("-filter_complex", filterParts.join(";"), ...outputs);
   return args;
 }
 
+/**
+ * Size the timeline is composed at for a set of renditions: the first
+ * (main) resolution's frame shape, scaled up to the pixel count of the
+ * largest rendition so no output is upscaled more than a crop requires.
+ */
+export function renditionCanvas(resolutions: string[]): string {
+  const sizes = resolutions.map((r) => r.split("x").map(Number));
+  const [width, height] = sizes[0];
+  const largest = Math.max(...sizes.map(([w, h]) => w * h));
+  const scale = Math.max(1, Math.sqrt(largest / (width * height)));
+  const even = (n: number) => Math.round(n / 2) * 2;
+  return `${even(width * scale)}x${even(height * scale)}`;
+}
+
+/** Escape a path for a `tee` muxer slave list. */
+function teeEscape(path: string): string {
+  return path.replace(/[\\'|[\]]/g, "\\$&");
+}
+
+/** Split preset encoder flags (flag/value pairs) into video and audio halves. */
+function splitEncodeArgs(ffmpegArgs: string[]): { video: string[]; audio: string[] } {
+  const video: string[] = [];
+  const audio: string[] = [];
+  for (let i = 0; i < ffmpegArgs.length; i += 2) {
+    (ffmpegArgs[i].endsWith(":a") ? audio : video).push(ffmpegArgs[i], ffmpegArgs[i + 1]);
+  }
+  return { video, audio };
+}
+
+/**
+ * Filter graphs longer than this go to a `-filter_complex_script` file. A
+ * single argv string is capped at 128 KiB on Linux and a whole command line
+ * at 32 KiB on Windows; timelines with a few hundred clips pass either.
+ */
+const FILTER_SCRIPT_MIN_CHARS = 8 * 1024;
+
+/**
+ * Replace a large inline `-filter_complex` with `-filter_complex_script
+ * <scriptPath>`. Returns the rewritten args and the graph to write there,
+ * or null when the graph is small enough to pass inline.
+ */
+export function useFilterScript(
+  args: string[],
+  scriptPath: string
+): { args: string[]; graph: string } | null {
+  const idx = args.indexOf("-filter_complex");
+  if (idx === -1 || args[idx + 1].length < FILTER_SCRIPT_MIN_CHARS) return null;
+  const rewritten = [...args];
+  rewritten.splice(idx, 2, "-filter_complex_script", scriptPath);
+  return { args: rewritten, graph: args[idx + 1] };
+}
+
+/**
+ * Run an export graph, moving a large filter graph into a script file first.
+ * `duration` (seconds) is the output's length when the caller knows it;
+ * otherwise progress is measured against the input duration FFmpeg logs.
+ */
+async function runFFmpegGraph(
+  ffmpegPath: string,
+  args: string[],
+  onProgress: (percent: number) => void = () => {},
+  duration?: number
+): Promise<void> {
+  const scriptPath = join(tmpdir(), `vibe-export-graph-${randomUUID()}.txt`);
+  const script = useFilterScript(args, scriptPath);
+  if (!script) return runFFmpegProcess(ffmpegPath, args, onProgress, duration);
+  await writeFile(scriptPath, script.graph, "utf-8");
+  try {
+    await runFFmpegProcess(ffmpegPath, script.args, onProgress, duration);
+  } finally {
+    await rm(scriptPath, { force: true });
+  }
+}
+
 /**
  * Run FFmpeg with progress reporting
  */
 function runFFmpegProcess(
   ffmpegPath: string,
   args: string[],
-  onProgress: (percent: number) => void
+  onProgress: (percent: number) => void,
+  knownDuration?: number
 ): Promise<void> {
   return new Promise((resolve, reject) => {
     const ffmpeg = spawn(ffmpegPath, args, {
       stdio: ["pipe", "pipe", "pipe"],
     });
 
-    let duration = 0;
+    let duration = knownDuration ?? 0;
     let stderr = "";
 
     ffmpeg.stderr?.on("data", (data: Buffer) => {
@@ -777,7 +1433,7 @@ function runFFmpegProcess(
 
       // Parse duration
       const durationMatch = output.match(/Duration: (\d+):(\d+):(\d+\.\d+)/);
-      if (durationMatch) {
+      if (durationMatch && knownDuration === undefined) {
         const [, hours, minutes, seconds] = durationMatch;
         duration =
           parseInt(hours) * 3600 +
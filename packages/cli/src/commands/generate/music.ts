@@ -6,8 +6,9 @@
  */
 
 import type { Command } from "commander";
+import { randomUUID } from "node:crypto";
 import { resolve } from "node:path";
-import { writeFile } from "node:fs/promises";
+import { rename, rm, writeFile } from "node:fs/promises";
 import { existsSync } from "node:fs";
 import chalk from "chalk";
 import ora from "ora";
@@ -16,6 +17,7 @@ import {
   ReplicateProvider,
 } from "@vibeframe/ai-providers";
 import { requireApiKey, getConfiguredApiKey } from "../../utils/api-key.js";
+import { downloadToFile } from "../../utils/download.js";
 import {
   isJsonMode,
   outputSuccess,
@@ -76,7 +78,7 @@ export async function executeMusic(
       }
 
       const outputPath = resolve(process.cwd(), options.output || "music.mp3");
-      await writeFile(outputPath, result.audioBuffer);
+      await writeAudioFile(outputPath, result.audioBuffer);
 
       return { success: true, outputPath, provider: "elevenlabs", duration };
     }
@@ -114,13 +116,12 @@ export async function executeMusic(
       return { success: false, error: finalResult.error || "Music generation failed" };
     }
 
-    const response = await fetch(finalResult.audioUrl);
-    if (!response.ok)
-      return { success: false, error: "Failed to download generated audio" };
-
-    const audioBuffer = Buffer.from(await response.arrayBuffer());
     const outputPath = resolve(process.cwd(), options.output || "music.mp3");
-    await writeFile(outputPath, audioBuffer);
+    try {
+      await downloadToFile(finalResult.audioUrl, outputPath);
+    } catch {
+      return { success: false, error: "Failed to download generated audio" };
+    }
 
     return { success: true, outputPath, provider: "replicate", duration };
   } catch (error) {
@@ -213,7 +214,7 @@ export function registerMusicCommand(parent: Command): void {
           }
 
           const outputPath = resolve(process.cwd(), options.output);
-          await writeFile(outputPath, result.audioBuffer);
+          await writeAudioFile(outputPath, result.audioBuffer);
 
           spinner.succeed(chalk.green("Music generated successfully"));
 
@@ -313,16 +314,14 @@ export function registerMusicCommand(parent: Command): void {
 
           spinner.text = "Downloading generated audio...";
 
-          const response = await fetch(finalResult.audioUrl);
-          if (!response.ok) {
+          const outputPath = resolve(process.cwd(), options.output);
+          try {
+            await downloadToFile(finalResult.audioUrl, outputPath);
+          } catch {
             spinner.fail("Failed to download generated audio");
             exitWithError(apiError("Failed to download generated audio", true));
           }
 
-          const audioBuffer = Buffer.from(await response.arrayBuffer());
-          const outputPath = resolve(process.cwd(), options.output);
-          await writeFile(outputPath, audioBuffer);
-
           spinner.succeed(chalk.green("Music generated successfully"));
 
           if (isJsonMode()) {
@@ -377,3 +376,19 @@ function noWaitMusicData(provider: string, taskId: string, job: JobRecord): Reco
     providerStatusCommand: job.retryWith.find((item) => item.startsWith("vibe generate music-status")),
   };
 }
+
+/**
+ * Write `data` to a temp sibling and rename it over `outputPath`. A build's
+ * `assets/music-<beat>.mp3` is a link into the content-addressed blob store,
+ * so writing through it would change the stored blob and its cache entry.
+ */
+async function writeAudioFile(outputPath: string, data: Buffer): Promise<void> {
+  const tmp = `${outputPath}.${randomUUID().slice(0, 8)}.tmp`;
+  try {
+    await writeFile(tmp, data);
+    await rename(tmp, outputPath);
+  } catch (error) {
+    await rm(tmp, { force: true });
+    throw error;
+  }
+}
@@ -7,7 +7,6 @@
 
 import type { Command } from "commander";
 import { resolve } from "node:path";
-import { writeFile } from "node:fs/promises";
 import chalk from "chalk";
 import ora from "ora";
 import {
@@ -24,7 +23,7 @@ import {
   usageError,
 } from "../output.js";
 import { validateOutputPath } from "../validate.js";
-import { downloadVideo } from "../ai-helpers.js";
+import { downloadVideoToFile } from "../ai-helpers.js";
 
 export function registerVideoExtendCommand(parent: Command): void {
   parent
@@ -128,9 +127,8 @@ export function registerVideoExtendCommand(parent: Command): void {
           if (isJsonMode()) {
             let outputPath: string | undefined;
             if (options.output && finalResult.videoUrl) {
-              const buffer = await downloadVideo(finalResult.videoUrl, apiKey);
               outputPath = resolve(process.cwd(), options.output);
-              await writeFile(outputPath, buffer);
+              await downloadVideoToFile(finalResult.videoUrl, outputPath, apiKey);
             }
             outputSuccess({
               command: "generate video-extend",
@@ -158,9 +156,8 @@ export function registerVideoExtendCommand(parent: Command): void {
           if (options.output && finalResult.videoUrl) {
             const downloadSpinner = ora("Downloading video...").start();
             try {
-              const buffer = await downloadVideo(finalResult.videoUrl, apiKey);
               const outputPath = resolve(process.cwd(), options.output);
-              await writeFile(outputPath, buffer);
+              await downloadVideoToFile(finalResult.videoUrl, outputPath, apiKey);
               downloadSpinner.succeed(chalk.green(`Saved to: ${outputPath}`));
             } catch (err) {
               downloadSpinner.fail(
@@ -234,9 +231,8 @@ export function registerVideoExtendCommand(parent: Command): void {
           if (isJsonMode()) {
             let outputPath: string | undefined;
             if (options.output && finalResult.videoUrl) {
-              const buffer = await downloadVideo(finalResult.videoUrl, apiKey);
               outputPath = resolve(process.cwd(), options.output);
-              await writeFile(outputPath, buffer);
+              await downloadVideoToFile(finalResult.videoUrl, outputPath, apiKey);
             }
             outputSuccess({
               command: "generate video-extend",
@@ -261,9 +257,8 @@ export function registerVideoExtendCommand(parent: Command): void {
           if (options.output && finalResult.videoUrl) {
             const downloadSpinner = ora("Downloading video...").start();
             try {
-              const buffer = await downloadVideo(finalResult.videoUrl, apiKey);
               const outputPath = resolve(process.cwd(), options.output);
-              await writeFile(outputPath, buffer);
+              await downloadVideoToFile(finalResult.videoUrl, outputPath, apiKey);
               downloadSpinner.succeed(chalk.green(`Saved to: ${outputPath}`));
             } catch (err) {
               downloadSpinner.fail(
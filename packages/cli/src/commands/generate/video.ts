@@ -8,7 +8,7 @@
 
 import type { Command } from "commander";
 import { resolve } from "node:path";
-import { readFile, writeFile } from "node:fs/promises";
+import { readFile } from "node:fs/promises";
 import chalk from "chalk";
 import ora from "ora";
 import imageSize from "image-size";
@@ -37,7 +37,7 @@ import {
 import { rejectControlChars, validateOutputPath } from "../validate.js";
 import { loadProviderDefaults, resolveProvider } from "../../utils/provider-resolver.js";
 import { resolveUploadHost } from "../../utils/upload-host.js";
-import { downloadVideo } from "../ai-helpers.js";
+import { downloadVideoToFile } from "../ai-helpers.js";
 import { createAndWriteJobRecord, type JobRecord } from "../_shared/status-jobs.js";
 
 export function registerVideoCommand(parent: Command): void {
@@ -718,9 +718,8 @@ Examples:
         if (isJsonMode()) {
           let outputPath: string | undefined;
           if (options.output && finalResult.videoUrl) {
-            const buffer = await downloadVideo(finalResult.videoUrl, apiKey);
             outputPath = resolve(process.cwd(), options.output);
-            await writeFile(outputPath, buffer);
+            await downloadVideoToFile(finalResult.videoUrl, outputPath, apiKey);
           }
           const cost = realRunCost(provider, options);
           outputSuccess({
@@ -751,9 +750,15 @@ Examples:
         if (options.output && finalResult.videoUrl) {
           const downloadSpinner = ora("Downloading video...").start();
           try {
-            const buffer = await downloadVideo(finalResult.videoUrl, apiKey);
             const outputPath = resolve(process.cwd(), options.output);
-            await writeFile(outputPath, buffer);
+            await downloadVideoToFile(finalResult.videoUrl, outputPath, apiKey, {
+              onProgress: ({ bytes, totalBytes }) => {
+                const mb = (bytes / 1e6).toFixed(1);
+                downloadSpinner.text = totalBytes
+                  ? `Downloading video... ${mb}/${(totalBytes / 1e6).toFixed(1)} MB`
+                  : `Downloading video... ${mb} MB`;
+              },
+            });
             downloadSpinner.succeed(chalk.green(`Saved to: ${outputPath}`));
           } catch (err) {
             downloadSpinner.fail(
@@ -148,6 +148,10 @@ inspectCommand
     "Write review report to this path (default: <project>/review-report.json)"
   )
   .option("--no-report", "Do not write review-report.json")
+  .option(
+    "--draft-scan",
+    "Scan a 1/4-resolution, every-3rd-frame copy for faster draft QA (may miss short defects)"
+  )
   .option("--dry-run", "Preview parameters without probing video or calling Gemini")
   .action(async (projectDirArg: string, options) => {
     const startedAt = Date.now();
@@ -163,6 +167,7 @@ inspectCommand
           writeReport: options.report !== false,
           ai: options.ai === true,
           model,
+          draftScan: options.draftScan === true,
         });
         outputSuccess({
           command: "inspect render",
@@ -174,6 +179,7 @@ inspectCommand
         return;
       }
 
+      const scanSpinner = isJsonMode() ? undefined : ora("Scanning render...").start();
       const result = await inspectRender({
         projectDir,
         beatId: options.beat,
@@ -182,7 +188,15 @@ inspectCommand
         writeReport: options.report !== false,
         ai: options.ai === true,
         model,
-      });
+        draftScan: options.draftScan === true,
+        onScanProgress: scanSpinner
+          ? ({ timeSec, durationSec }) => {
+              scanSpinner.text = durationSec
+                ? `Scanning render... ${Math.min(100, Math.round((timeSec / durationSec) * 100))}%`
+                : `Scanning render... ${timeSec.toFixed(1)}s`;
+            }
+          : undefined,
+      }).finally(() => scanSpinner?.stop());
       if (isJsonMode()) {
         outputSuccess({
           command: "inspect render",
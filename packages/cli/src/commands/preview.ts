@@ -5,6 +5,7 @@ import { resolve } from "node:path";
 
 import {
   executeSceneRender,
+  formatCaptureStats,
   type SceneRenderResult,
   type RenderFormat,
   type RenderFps,
@@ -30,7 +31,7 @@ export const previewCommand = new Command("preview")
   .option("--fps <n>", `Frames per second: ${VALID_FPS.join("|")}`, String(PREVIEW_FPS))
   .option("--quality <q>", `Quality preset: ${VALID_QUALITIES.join("|")}`, PREVIEW_QUALITY)
   .option("--format <f>", `Output container: ${VALID_FORMATS.join("|")}`, "mp4")
-  .option("--workers <n>", "Capture workers (1-16, default 1)", "1")
+  .option("--workers <n>", "Capture workers per job (1-16, 0 = auto from cores, memory and length)", "0")
   .option("--open", "Open the preview in the OS default app after render")
   .option("--reveal", "Reveal the preview in Finder/file manager after render")
   .option("--dry-run", "Preview parameters without rendering")
@@ -138,7 +139,7 @@ function printPreviewDryRun(projectDirArg: string, params: PreviewDryRunParams):
   console.log(`  Output:        ${chalk.bold(String(params.output))}`);
   console.log(`  Format:        ${chalk.bold(params.format)}`);
   console.log(`  Quality/FPS:   ${chalk.bold(`${params.quality} / ${params.fps}`)} ${chalk.dim("(draft preview)")}`);
-  console.log(`  Workers:       ${chalk.bold(String(params.workers))}`);
+  console.log(`  Workers:       ${chalk.bold(params.workers === 0 ? "auto" : String(params.workers))}`);
   if (params.openAfterRender) console.log(`  Open:          ${chalk.bold("yes")}`);
   if (params.revealInFinder) console.log(`  Reveal:        ${chalk.bold("yes")}`);
   console.log();
@@ -158,6 +159,7 @@ function printPreviewResult(spinner: ReturnType<typeof ora> | null, result: Scen
   console.log(`  FPS:       ${result.fps ?? PREVIEW_FPS}`);
   if (result.totalFrames !== undefined) console.log(`  Frames:    ${result.framesRendered ?? result.totalFrames}/${result.totalFrames}`);
   if (result.durationMs !== undefined) console.log(`  Duration:  ${(result.durationMs / 1000).toFixed(2)}s`);
+  if (result.capture) console.log(`  Capture:   ${formatCaptureStats(result.capture)}`);
   if (result.audioCount !== undefined) {
     const audio = result.audioCount > 0
       ? `${result.audioCount} track${result.audioCount === 1 ? "" : "s"} muxed`
@@ -199,8 +201,8 @@ function parseFormat(value: string): RenderFormat {
 
 function parseWorkers(value: string): number {
   const n = Number.parseInt(value, 10);
-  if (!Number.isFinite(n) || n < 1 || n > 16) {
-    exitWithError(usageError(`Invalid --workers: ${value}`, "Must be an integer between 1 and 16"));
+  if (!Number.isFinite(n) || n < 0 || n > 16) {
+    exitWithError(usageError(`Invalid --workers: ${value}`, "Must be an integer between 0 (auto) and 16"));
   }
   return n;
 }
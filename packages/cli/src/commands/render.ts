@@ -5,11 +5,18 @@ import { resolve } from "node:path";
 
 import {
   executeSceneRender,
+  formatCaptureStats,
   type SceneRenderResult,
   type RenderFormat,
   type RenderFps,
   type RenderQuality,
 } from "./_shared/scene-render.js";
+import { readProjectConfig } from "./_shared/project-config.js";
+import {
+  renderCacheMaxBytes,
+  renderCacheStats,
+  type RenderCacheStats,
+} from "./_shared/render-cache.js";
 import { exitWithError, generalError, isJsonMode, isQuietMode, outputSuccess, usageError } from "./output.js";
 
 const VALID_FPS: RenderFps[] = [24, 30, 60];
@@ -26,10 +33,13 @@ export const renderCommand = new Command("render")
   .option("--fps <n>", `Frames per second: ${VALID_FPS.join("|")}`, "30")
   .option("--quality <q>", `Quality preset: ${VALID_QUALITIES.join("|")}`, "standard")
   .option("--format <f>", `Output container: ${VALID_FORMATS.join("|")}`, "mp4")
-  .option("--workers <n>", "Capture workers (1-16, default 1)", "1")
+  .option("--workers <n>", "Capture workers per job (1-16, 0 = auto from cores, memory and length)", "0")
+  .option("--shards <n>", "Render beats as parallel shards joined losslessly, n at once (0 = auto)")
   .option("--open", "Open the rendered video in the OS default app after render")
   .option("--reveal", "Reveal the rendered video in Finder/file manager after render")
   .option("--silent", "Emit silent video (skip audio mux); add audio later with `vibe assemble`")
+  .option("--no-cache", "Always capture; skip the .vibeframe/cache/render lookup and store")
+  .option("--cache-stats", "Report render cache size and hit/miss counts without rendering")
   .option("--dry-run", "Preview parameters without rendering")
   .addHelpText("after", `
 Examples:
@@ -40,10 +50,24 @@ Alias note: this is the project-level entrypoint for \`vibe scene render\`.`)
   .action(async (projectDirArg: string, options) => {
     const startedAt = Date.now();
     const projectDir = resolve(projectDirArg);
+    if (options.cacheStats) {
+      const projectConfig = await readProjectConfig(projectDir);
+      const stats = await renderCacheStats(
+        projectDir,
+        renderCacheMaxBytes(projectConfig.config.composition.renderCacheMaxMb)
+      );
+      if (isJsonMode() || isQuietMode()) {
+        outputSuccess({ command: "render", startedAt, data: { cacheStats: stats } });
+        return;
+      }
+      printRenderCacheStats(stats);
+      return;
+    }
     const fps = parseFps(String(options.fps));
     const quality = parseQuality(String(options.quality));
     const format = parseFormat(String(options.format));
     const workers = parseWorkers(String(options.workers));
+    const shards = options.shards === undefined ? undefined : parseShards(String(options.shards));
     const output = options.output ?? options.out;
     if (options.out !== undefined && options.output === undefined && !isJsonMode() && !isQuietMode()) {
       console.error(chalk.yellow("--out is deprecated; use -o, --output"));
@@ -58,6 +82,8 @@ Alias note: this is the project-level entrypoint for \`vibe scene render\`.`)
       quality,
       format,
       workers,
+      shards,
+      noCache: options.cache === false,
       openAfterRender: Boolean(options.open),
       revealInFinder: Boolean(options.reveal),
       silent: Boolean(options.silent),
@@ -87,6 +113,8 @@ Alias note: this is the project-level entrypoint for \`vibe scene render\`.`)
       quality,
       format,
       workers,
+      shards,
+      noCache: options.cache === false,
       openAfterRender: Boolean(options.open),
       revealInFinder: Boolean(options.reveal),
       silent: Boolean(options.silent),
@@ -122,6 +150,8 @@ type RenderDryRunParams = {
   quality: RenderQuality;
   format: RenderFormat;
   workers: number;
+  shards?: number;
+  noCache: boolean;
   openAfterRender: boolean;
   revealInFinder: boolean;
   silent: boolean;
@@ -137,16 +167,33 @@ function printRenderDryRun(projectDirArg: string, params: RenderDryRunParams): v
   console.log(`  Output:        ${chalk.bold(String(params.output ?? `renders/<name>-<timestamp>.${params.format}`))}`);
   console.log(`  Format:        ${chalk.bold(params.format)}`);
   console.log(`  Quality/FPS:   ${chalk.bold(`${params.quality} / ${params.fps}`)}`);
-  console.log(`  Workers:       ${chalk.bold(String(params.workers))}`);
+  console.log(`  Workers:       ${chalk.bold(params.workers === 0 ? "auto" : String(params.workers))}`);
+  if (params.shards !== undefined) console.log(`  Shards:        ${chalk.bold(params.shards === 0 ? "auto" : String(params.shards))}`);
   if (params.silent) console.log(`  Audio:         ${chalk.bold("silent (skip mux)")}`);
+  if (params.noCache) console.log(`  Cache:         ${chalk.bold("off")}`);
   if (params.openAfterRender) console.log(`  Open:          ${chalk.bold("yes")}`);
   if (params.revealInFinder) console.log(`  Reveal:        ${chalk.bold("yes")}`);
   console.log();
   console.log(chalk.dim("No browser capture, FFmpeg mux, or video files were created."));
 }
 
+function printRenderCacheStats(stats: RenderCacheStats): void {
+  const mb = (bytes: number) => `${(bytes / 1024 / 1024).toFixed(1)} MB`;
+  const lookups = stats.hits + stats.misses;
+  console.log();
+  console.log(chalk.bold.cyan("Render cache"));
+  console.log(chalk.dim("-".repeat(60)));
+  console.log(`  Dir:       ${stats.dir}`);
+  console.log(`  Size:      ${chalk.bold(mb(stats.bytes))} / ${mb(stats.maxBytes)}`);
+  console.log(`  Renders:   ${stats.renders}`);
+  console.log(`  Segments:  ${stats.segments}`);
+  console.log(`  Hits:      ${stats.hits}/${lookups}${lookups > 0 ? ` (${Math.round((stats.hits / lookups) * 100)}%)` : ""}`);
+  console.log(`  Evicted:   ${stats.evictions}`);
+}
+
 function printRenderResult(spinner: ReturnType<typeof ora> | null, result: SceneRenderResult): void {
-  spinner?.succeed(chalk.green(`Render complete: ${result.outputPath}`));
+  const reuse = result.cacheHit ? " (cached)" : result.segmentReused ? " (reused beat segment)" : "";
+  spinner?.succeed(chalk.green(`Render complete${reuse}: ${result.outputPath}`));
   console.log();
   console.log(chalk.bold.cyan("Output"));
   console.log(chalk.dim("-".repeat(60)));
@@ -157,7 +204,9 @@ function printRenderResult(spinner: ReturnType<typeof ora> | null, result: Scene
   console.log(`  Quality:   ${result.quality ?? "standard"}`);
   console.log(`  FPS:       ${result.fps ?? 30}`);
   if (result.totalFrames !== undefined) console.log(`  Frames:    ${result.framesRendered ?? result.totalFrames}/${result.totalFrames}`);
+  if (result.shards) console.log(`  Shards:    ${result.shards.rendered} rendered, ${result.shards.reused} reused (${result.shards.concurrency} at once)`);
   if (result.durationMs !== undefined) console.log(`  Duration:  ${(result.durationMs / 1000).toFixed(2)}s`);
+  if (result.capture) console.log(`  Capture:   ${formatCaptureStats(result.capture)}`);
   if (result.audioCount !== undefined) {
     const audio = result.audioCount > 0
       ? `${result.audioCount} track${result.audioCount === 1 ? "" : "s"} muxed`
@@ -197,8 +246,16 @@ function parseFormat(value: string): RenderFormat {
 
 function parseWorkers(value: string): number {
   const n = Number.parseInt(value, 10);
-  if (!Number.isFinite(n) || n < 1 || n > 16) {
-    exitWithError(usageError(`Invalid --workers: ${value}`, "Must be an integer between 1 and 16"));
+  if (!Number.isFinite(n) || n < 0 || n > 16) {
+    exitWithError(usageError(`Invalid --workers: ${value}`, "Must be an integer between 0 (auto) and 16"));
+  }
+  return n;
+}
+
+function parseShards(value: string): number {
+  const n = Number.parseInt(value, 10);
+  if (!Number.isFinite(n) || n < 0 || n > 16) {
+    exitWithError(usageError(`Invalid --shards: ${value}`, "Must be an integer between 0 (auto) and 16"));
   }
   return n;
 }
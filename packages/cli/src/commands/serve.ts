@@ -0,0 +1,149 @@
+/**
+ * @module commands/serve
+ *
+ * `vibe serve` — opt-in warm daemon for agent hosts. While it runs, `vibe`
+ * invocations with piped stdio are forwarded to a pre-booted runner instead
+ * of paying Node startup and module loading each time. See
+ * `_shared/serve-daemon.ts` for what stays warm and why.
+ */
+
+import { Command } from "commander";
+import chalk from "chalk";
+import { realpathSync } from "node:fs";
+import { dirname } from "node:path";
+
+import pkg from "../../package.json" with { type: "json" };
+import { applyTier } from "./_shared/cost-tier.js";
+import { startServeDaemon, type ServeDaemon } from "./_shared/serve-daemon.js";
+import { requestServe, serveSocketPath } from "./_shared/serve-protocol.js";
+import { exitWithError, generalError, isJsonMode, outputSuccess, usageError } from "./output.js";
+
+const SOCKET_OPTION_DESCRIPTION =
+  "Socket path (default: $VIBE_SERVE_SOCKET, else serve.sock in the user config dir)";
+
+export const serveCommand = new Command("serve")
+  .description("Run a warm background daemon that `vibe` calls are forwarded to")
+  .addHelpText(
+    "after",
+    `
+While the daemon runs, \`vibe\` calls whose stdin, stdout and stderr are all
+piped (agent hosts, scripts) run on a pre-booted process and skip Node and
+module startup. Output and exit codes are the same as without it. Set
+VIBE_NO_SERVE=1 to bypass it for one call.
+
+Examples:
+  $ vibe serve start &                  Start the daemon in the background
+  $ vibe serve status --json
+  $ vibe serve stop
+`
+  );
+
+serveCommand
+  .command("start")
+  .description("Start the daemon in the foreground (background it with `&` or your host)")
+  .option("--socket <path>", SOCKET_OPTION_DESCRIPTION)
+  .option("--warm <n>", "Standby processes kept ready for concurrent calls", 1)
+  .option(
+    "--idle-timeout <minutes>",
+    "Exit after this many minutes without calls (0 = never)",
+    30
+  )
+  .action(async (options) => {
+    const warm = Number.parseInt(String(options.warm), 10);
+    if (!Number.isFinite(warm) || warm < 1 || warm > 8) {
+      exitWithError(
+        usageError(`Invalid --warm: ${options.warm}`, "Must be an integer between 1 and 8")
+      );
+    }
+    const idleMinutes = Number(options.idleTimeout);
+    if (!Number.isFinite(idleMinutes) || idleMinutes < 0) {
+      exitWithError(
+        usageError(
+          `Invalid --idle-timeout: ${options.idleTimeout}`,
+          "Must be a number of minutes >= 0"
+        )
+      );
+    }
+
+    const socketPath = options.socket ?? serveSocketPath();
+    const runnerScript = realpathSync(process.argv[1]);
+    let daemon: ServeDaemon;
+    try {
+      daemon = await startServeDaemon({
+        socketPath,
+        version: pkg.version,
+        runnerScript,
+        warm,
+        idleTimeoutMs: idleMinutes * 60_000,
+        watchPaths: [dirname(runnerScript)],
+        log: (message) => console.error(chalk.dim(`[vibe serve] ${message}`)),
+      });
+    } catch (error) {
+      exitWithError(generalError(error instanceof Error ? error.message : String(error)));
+    }
+
+    // Stderr only: stdout stays free for hosts that capture it.
+    console.error(
+      chalk.green(`vibe serve ${pkg.version} listening on ${socketPath}`) +
+        chalk.dim(` (pid ${process.pid}, ${warm} warm)`)
+    );
+    for (const signal of ["SIGINT", "SIGTERM"] as const) {
+      process.once(signal, () => void daemon.close());
+    }
+    await daemon.closed;
+  });
+applyTier(serveCommand.commands[serveCommand.commands.length - 1], "free");
+
+serveCommand
+  .command("status")
+  .description("Report whether the daemon is running, with request counts")
+  .option("--socket <path>", SOCKET_OPTION_DESCRIPTION)
+  .action(async (options) => {
+    const startedAt = Date.now();
+    const socketPath = options.socket ?? serveSocketPath();
+    const reply = await requestServe({ type: "ping" }, socketPath);
+
+    if (reply?.type !== "pong") {
+      if (isJsonMode()) {
+        outputSuccess({ command: "serve status", startedAt, data: { running: false, socketPath } });
+      } else {
+        console.log(chalk.dim(`vibe serve is not running (${socketPath})`));
+      }
+      return;
+    }
+    const { type: _type, ...stats } = reply;
+    if (isJsonMode()) {
+      outputSuccess({ command: "serve status", startedAt, data: { running: true, ...stats } });
+      return;
+    }
+    console.log(
+      chalk.green(`vibe serve ${stats.version} running`) + chalk.dim(` (pid ${stats.pid})`)
+    );
+    console.log(`  Socket:    ${stats.socketPath}`);
+    console.log(`  Since:     ${stats.startedAt}`);
+    console.log(`  Requests:  ${stats.requests} (${stats.active} active)`);
+    console.log(`  Standby:   ${stats.standby}`);
+  });
+applyTier(serveCommand.commands[serveCommand.commands.length - 1], "free");
+
+serveCommand
+  .command("stop")
+  .description("Stop a running daemon; calls in flight finish first")
+  .option("--socket <path>", SOCKET_OPTION_DESCRIPTION)
+  .action(async (options) => {
+    const startedAt = Date.now();
+    const socketPath = options.socket ?? serveSocketPath();
+    const reply = await requestServe({ type: "stop" }, socketPath);
+    const stopped = reply?.type === "stopping";
+
+    if (isJsonMode()) {
+      outputSuccess({ command: "serve stop", startedAt, data: { stopped, socketPath } });
+      return;
+    }
+    console.log(
+      stopped
+        ? chalk.green("vibe serve stopped")
+        : chalk.dim(`vibe serve is not running (${socketPath})`)
+    );
+  });
+applyTier(serveCommand.commands[serveCommand.commands.length - 1], "free");
@@ -13,38 +13,14 @@ import chalk from "chalk";
 // relative path resolution depended on the source file layout.
 import pkg from "../package.json" with { type: "json" };
 
-// Re-export engine for library usage
-export { Project, generateId, type ProjectFile } from "./engine/index.js";
-import { projectCommand } from "./commands/project.js";
-import { sceneCommand } from "./commands/scene.js";
-import { timelineCommand } from "./commands/timeline.js";
-import { generateCommand } from "./commands/generate.js";
-import { editCommand } from "./commands/edit-cmd.js";
-import { inspectCommand } from "./commands/inspect.js";
-import { audioCommand } from "./commands/audio.js";
-import { remixCommand } from "./commands/remix.js";
-import { schemaCommand } from "./commands/schema.js";
-import { mediaCommand } from "./commands/media.js";
-import { batchCommand } from "./commands/batch.js";
-import { detectCommand } from "./commands/detect.js";
-import { setupCommand } from "./commands/setup.js";
-import { initCommand } from "./commands/init.js";
-import { storyboardCommand } from "./commands/storyboard.js";
-import { designCommand } from "./commands/design.js";
-import { planCommand } from "./commands/plan.js";
-import { buildCommand } from "./commands/build.js";
-import { renderCommand } from "./commands/render.js";
-import { previewCommand } from "./commands/preview.js";
-import { assembleCommand } from "./commands/assemble.js";
-import { statusCommand } from "./commands/status.js";
-import { doctorCommand } from "./commands/doctor.js";
-import { hostCommand } from "./commands/host.js";
-import { demoCommand } from "./commands/demo.js";
-import { contextCommand } from "./commands/context.js";
-import { runCommand } from "./commands/run.js";
-import { agentCommand } from "./commands/agent.js";
-import { guideCommand, legacyGuideAliasCommand } from "./commands/walkthrough.js";
-import { completionCommand } from "./commands/completion.js";
+import { COMMAND_REGISTRY } from "./commands/_shared/command-registry.js";
+import { commandFromManifest, type CommandManifest } from "./commands/_shared/command-manifest.js";
+import {
+  SERVE_RUNNER_ENV,
+  adoptServeRequest,
+  forwardToServe,
+  shouldForwardToServe,
+} from "./commands/_shared/serve-protocol.js";
 import { ApiKeyError } from "./utils/api-key.js";
 import { isFirstRun, showFirstRunBanner, markBannerShown } from "./utils/first-run.js";
 import { exitWithError, usageError } from "./commands/output.js";
@@ -111,6 +87,41 @@ function renderCostTierFooter(prog: Command): string {
   return "\n" + lines.join("\n") + "\n";
 }
 
+/**
+ * Command manifest inlined by build.js as a JSON string. Undeclared when
+ * running from source (`pnpm vibe`, tsx), so `typeof` reads "undefined".
+ */
+declare const __VIBE_COMMAND_MANIFEST__: string | undefined;
+
+function readCommandManifest(): CommandManifest | null {
+  if (process.env.VIBE_EAGER_COMMANDS === "1") return null;
+  if (typeof __VIBE_COMMAND_MANIFEST__ !== "string") return null;
+  return JSON.parse(__VIBE_COMMAND_MANIFEST__) as CommandManifest;
+}
+
+/**
+ * Top-level commands argv dispatches to: the first positional argument
+ * (skipping root flags and the value of `--fields`), or the target of
+ * `vibe help <command>`. Aliases resolve to command names.
+ */
+function dispatchedCommandNames(argv: string[], manifest: CommandManifest): Set<string> {
+  const positionals: string[] = [];
+  for (let i = 0; i < argv.length && positionals.length < 2; i++) {
+    const arg = argv[i];
+    if (arg === "--") break;
+    if (arg === "--fields") i++;
+    else if (!arg.startsWith("-")) positionals.push(arg);
+  }
+  const names = positionals[0] === "help" ? positionals.slice(1) : positionals.slice(0, 1);
+  return new Set(
+    names.map(
+      (name) =>
+        manifest.commands.find((node) => node.name === name || node.aliases?.includes(name))
+          ?.name ?? name
+    )
+  );
+}
+
 /**
  * Read all data from stdin (non-blocking, only when stdin is piped).
  */
@@ -122,18 +133,6 @@ async function readStdin(): Promise<string> {
   return Buffer.concat(chunks).toString("utf-8").trim();
 }
 
-export { startAgent } from "./commands/agent.js";
-export { loadConfig, saveConfig, isConfigured, type VibeConfig } from "./config/index.js";
-export { AgentExecutor, ToolRegistry, ConversationMemory } from "./agent/index.js";
-export type {
-  AgentConfig,
-  AgentContext,
-  AgentMessage,
-  ToolCall,
-  ToolResult,
-  LLMAdapter,
-} from "./agent/index.js";
-
 const program = new Command();
 
 program
@@ -299,51 +298,31 @@ program.hook("preAction", async (thisCommand, actionCommand) => {
   }
 });
 
-// Main commands (visible in --help)
-program.addCommand(generateCommand);
-program.addCommand(editCommand);
-program.addCommand(inspectCommand);
-program.addCommand(audioCommand);
-program.addCommand(remixCommand);
-program.addCommand(setupCommand);
-program.addCommand(initCommand);
-program.addCommand(storyboardCommand);
-program.addCommand(designCommand);
-program.addCommand(planCommand);
-program.addCommand(buildCommand);
-program.addCommand(renderCommand);
-program.addCommand(previewCommand);
-program.addCommand(assembleCommand);
-program.addCommand(statusCommand);
-program.addCommand(doctorCommand);
-program.addCommand(hostCommand);
-program.addCommand(demoCommand, { hidden: true });
-program.addCommand(runCommand);
-program.addCommand(agentCommand);
-
-// Workflow commands
-//
-// `project`, `scene`, `timeline` are hidden from `vibe --help` because
-// their descriptions either self-deprecate ("Deprecated alias…") or
-// nudge users toward `init`/`build`/`render` ("For project flow use
-// `vibe init`…"). They still register, still show in
-// `vibe schema --list`, and tab completion still finds them — they
-// just don't take visual weight in the front-page Commands list.
-program.addCommand(projectCommand, { hidden: true });
-program.addCommand(sceneCommand, { hidden: true });
-program.addCommand(timelineCommand, { hidden: true });
-program.addCommand(detectCommand);
-program.addCommand(batchCommand, { hidden: true });
-
-// Agent integration commands
-program.addCommand(schemaCommand);
-program.addCommand(contextCommand);
-program.addCommand(guideCommand);
-program.addCommand(legacyGuideAliasCommand, { hidden: true });
-program.addCommand(completionCommand);
+// `vibe serve` daemon: forward piped, non-interactive calls to a warm
+// runner and relay its output. Runners themselves preload every command and
+// then wait here for the request they will run (see _shared/serve-protocol.ts).
+if (process.env[SERVE_RUNNER_ENV] === "1") {
+  await Promise.all(COMMAND_REGISTRY.map((entry) => entry.load()));
+  await adoptServeRequest();
+} else if (shouldForwardToServe(process.argv.slice(2))) {
+  const code = await forwardToServe(process.argv.slice(2), { version: pkg.version });
+  if (code !== null) process.exit(code);
+}
 
-// Utility commands (less commonly used directly)
-program.addCommand(mediaCommand, { hidden: true });
+// Commands load lazily: only the command argv dispatches to imports its
+// implementation; every other entry is an inert stub rebuilt from the
+// manifest build.js inlines (see _shared/command-manifest.ts). Running from
+// source there is no manifest and every command loads, as does
+// VIBE_EAGER_COMMANDS=1 (an escape hatch and the `bench:cli-startup` baseline).
+const manifest = readCommandManifest();
+const dispatched = manifest ? dispatchedCommandNames(process.argv.slice(2), manifest) : null;
+const commands = await Promise.all(
+  COMMAND_REGISTRY.map((entry) => {
+    const node = manifest?.commands.find((candidate) => candidate.name === entry.name);
+    return node && !dispatched?.has(entry.name) ? commandFromManifest(node) : entry.load();
+  })
+);
+COMMAND_REGISTRY.forEach((entry, i) => program.addCommand(commands[i], { hidden: entry.hidden }));
 
 // Propagate exitOverride and JSON-aware error output to all subcommands
 // Commander.js doesn't inherit these settings from the parent program
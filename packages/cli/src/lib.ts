@@ -0,0 +1,20 @@
+/**
+ * Library entry for `import ... from "@vibeframe/cli"`.
+ *
+ * `src/index.ts` is the `vibe` bin and runs the CLI on import, so the public
+ * exports live here. Keeping them out of the bin also keeps the agent
+ * runtime (and every tool it registers) off the CLI's startup path.
+ */
+
+export { Project, generateId, type ProjectFile } from "./engine/index.js";
+export { startAgent } from "./commands/agent.js";
+export { loadConfig, saveConfig, isConfigured, type VibeConfig } from "./config/index.js";
+export { AgentExecutor, ToolRegistry, ConversationMemory } from "./agent/index.js";
+export type {
+  AgentConfig,
+  AgentContext,
+  AgentMessage,
+  ToolCall,
+  ToolResult,
+  LLMAdapter,
+} from "./agent/index.js";
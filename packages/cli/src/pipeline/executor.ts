@@ -337,7 +337,7 @@ async function ensureActionsRegistered(): Promise<void> {
   registerAction("detect-beats", async (params, _outputDir) => {
     const { executeDetectBeats } = await import("../commands/detect.js");
     const r = await executeDetectBeats({ audioPath: params.input as string });
-    return { id: "", action: "detect-beats", success: r.success, data: { beats: r.beats }, error: r.error };
+    return { id: "", action: "detect-beats", success: r.success, data: { beats: r.beats, downbeats: r.downbeats, tempo: r.tempo }, error: r.error };
   });
 
   // Analyze
@@ -0,0 +1,26 @@
+import { describe, it, expect } from "vitest";
+import { MAX_CAPTURE_WORKERS, resolveCaptureWorkers } from "../chrome.js";
+
+const GB = 1024 ** 3;
+
+describe("resolveCaptureWorkers", () => {
+  it("honours an explicit count, clamped to the producer's range", () => {
+    expect(resolveCaptureWorkers({ requested: 4, cpuCount: 2, freeMemBytes: GB })).toBe(4);
+    expect(resolveCaptureWorkers({ requested: 64 })).toBe(MAX_CAPTURE_WORKERS);
+  });
+
+  it("sizes from cores, leaving one for the encoder", () => {
+    expect(resolveCaptureWorkers({ cpuCount: 16, freeMemBytes: 64 * GB })).toBe(15);
+    expect(resolveCaptureWorkers({ requested: 0, cpuCount: 1, freeMemBytes: 64 * GB })).toBe(1);
+  });
+
+  it("splits the budget across concurrent jobs and caps by free memory", () => {
+    expect(resolveCaptureWorkers({ jobs: 4, cpuCount: 16, freeMemBytes: 64 * GB })).toBe(3);
+    expect(resolveCaptureWorkers({ cpuCount: 16, freeMemBytes: 3 * GB })).toBe(4);
+  });
+
+  it("gives short jobs fewer workers", () => {
+    expect(resolveCaptureWorkers({ frames: 150, cpuCount: 16, freeMemBytes: 64 * GB })).toBe(1);
+    expect(resolveCaptureWorkers({ frames: 3600, cpuCount: 16, freeMemBytes: 64 * GB })).toBe(15);
+  });
+});
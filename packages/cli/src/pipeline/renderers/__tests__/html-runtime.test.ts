@@ -0,0 +1,103 @@
+import { describe, it, expect } from "vitest";
+import { RUNTIME_SCRIPT } from "../html-runtime.js";
+
+interface FakeElement {
+  style: { display?: string; opacity?: string; filter?: string };
+}
+
+interface RuntimeClip {
+  id: string;
+  startTime: number;
+  duration: number;
+  effects: unknown[];
+}
+
+/** Evaluate the runtime against a minimal DOM; returns seek plus the elements. */
+function loadRuntime(clips: RuntimeClip[]) {
+  const elements = new Map<string, FakeElement>(clips.map((c) => [c.id, { style: {} }]));
+  const window: { __hf?: { seek(t: number): void } } = {};
+  const document = { getElementById: (id: string) => elements.get(id) ?? null };
+  const script = RUNTIME_SCRIPT.replace("/*CLIPS_JSON*/[]", JSON.stringify(clips));
+  new Function("window", "document", script)(window, document);
+  return { seek: (t: number) => window.__hf!.seek(t), elements };
+}
+
+/** Back-to-back 1s clips, each blurring through three keyframes. */
+function keyframedClips(count: number): RuntimeClip[] {
+  return Array.from({ length: count }, (_, i) => ({
+    id: `clip-${i}`,
+    startTime: i,
+    duration: 1,
+    effects: [
+      {
+        type: "blur",
+        startTime: 0,
+        duration: 1,
+        params: {},
+        keyframes: [
+          { time: 0, values: { radius: 0 }, easing: "linear" },
+          { time: 0.5, values: { radius: 10 }, easing: "linear" },
+          { time: 1, values: { radius: 4 }, easing: "linear" },
+        ],
+      },
+    ],
+  }));
+}
+
+function visible(elements: Map<string, FakeElement>): string[] {
+  return [...elements].filter(([, el]) => el.style.display === "block").map(([id]) => id);
+}
+
+describe("RUNTIME_SCRIPT seek", () => {
+  it("shows exactly the clips active at t and hides the ones that ended", () => {
+    const { seek, elements } = loadRuntime([
+      { id: "a", startTime: 0, duration: 2, effects: [] },
+      { id: "b", startTime: 1, duration: 2, effects: [] },
+      { id: "c", startTime: 600, duration: 1, effects: [] },
+    ]);
+
+    seek(0.5);
+    expect(visible(elements)).toEqual(["a"]);
+    seek(1.5);
+    expect(visible(elements)).toEqual(["a", "b"]);
+    seek(2);
+    expect(visible(elements)).toEqual(["b"]);
+    seek(600.25);
+    expect(visible(elements)).toEqual(["c"]);
+    seek(0.1);
+    expect(visible(elements)).toEqual(["a"]);
+  });
+
+  it("interpolates keyframes the same for sequential and random seeks", () => {
+    const times = Array.from({ length: 320 }, (_, i) => i / 32);
+    const sequential = loadRuntime(keyframedClips(10));
+    const expected = times.map((t) => {
+      sequential.seek(t);
+      return sequential.elements.get(`clip-${Math.floor(t)}`)!.style.filter;
+    });
+
+    const shuffled = loadRuntime(keyframedClips(10));
+    const order = times.map((_, i) => (i * 97) % times.length);
+    for (const i of order) {
+      shuffled.seek(times[i]);
+      expect(shuffled.elements.get(`clip-${Math.floor(times[i])}`)!.style.filter).toBe(expected[i]);
+    }
+    expect(expected[0]).toBe("blur(0px)");
+    expect(expected[16]).toBe("blur(10px)");
+    expect(expected[24]).toBe("blur(7px)");
+  });
+
+  it("applies fades relative to the clip start", () => {
+    const { seek, elements } = loadRuntime([
+      {
+        id: "a",
+        startTime: 10,
+        duration: 2,
+        effects: [{ type: "fadeIn", startTime: 0, duration: 1, params: { intensity: 1 } }],
+      },
+    ]);
+
+    seek(10.25);
+    expect(elements.get("a")!.style.opacity).toBe("0.25");
+  });
+});
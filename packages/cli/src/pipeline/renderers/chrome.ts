@@ -8,7 +8,7 @@
  */
 
 import { existsSync } from "node:fs";
-import { homedir } from "node:os";
+import { availableParallelism, freemem, homedir } from "node:os";
 import { join } from "node:path";
 
 const CHROME_NOT_FOUND_REASON =
@@ -16,6 +16,49 @@ const CHROME_NOT_FOUND_REASON =
   "(macOS: brew install --cask google-chrome · Linux: apt install chromium). " +
   "Run `vibe doctor` for details.";
 
+/** Upper bound for `--workers`, matching what the producer accepts. */
+export const MAX_CAPTURE_WORKERS = 16;
+
+/**
+ * Rough resident cost of one capture worker (a Chrome renderer plus its
+ * frame buffers at 1080p). Deliberately pessimistic: running out of memory
+ * mid-capture costs far more than one worker fewer.
+ */
+const CAPTURE_WORKER_BYTES = 768 * 1024 ** 2;
+
+/**
+ * Each worker pays Chrome startup and page load before its first frame, so
+ * a worker that captures fewer frames than this is slower than not having
+ * it (and the producer's own auto mode times out on short comps).
+ */
+const MIN_FRAMES_PER_WORKER = 90;
+
+/**
+ * Capture workers for one producer job. An explicit `requested` count wins
+ * (clamped to 1..16). `0`/undefined sizes from the machine: one core is left
+ * for the encoder, the rest and the free memory are split across the `jobs`
+ * that capture at the same time (beat shards), and short jobs get fewer
+ * workers so each one has at least a few seconds of frames to capture.
+ */
+export function resolveCaptureWorkers(opts: {
+  requested?: number;
+  jobs?: number;
+  frames?: number;
+  cpuCount?: number;
+  freeMemBytes?: number;
+}): number {
+  if (opts.requested && opts.requested > 0) {
+    return Math.min(MAX_CAPTURE_WORKERS, Math.max(1, Math.floor(opts.requested)));
+  }
+  const jobs = Math.max(1, opts.jobs ?? 1);
+  const cpus = opts.cpuCount ?? availableParallelism();
+  const byCpu = Math.floor((cpus - 1) / jobs);
+  const byMemory = Math.floor((opts.freeMemBytes ?? freemem()) / jobs / CAPTURE_WORKER_BYTES);
+  const byFrames =
+    opts.frames !== undefined ? Math.floor(opts.frames / MIN_FRAMES_PER_WORKER) : Infinity;
+  return Math.max(1, Math.min(MAX_CAPTURE_WORKERS, byCpu, byMemory, byFrames));
+}
+
 /**
  * Walk the candidate list in priority order (env vars first, then puppeteer's
  * cache, then well-known system locations). Returns the first existing path,
@@ -133,11 +133,40 @@ export function buildMediaDeclarations(state: TimelineState): HfMediaElement[] {
     }));
 }
 
+/** Effect types `RUNTIME_SCRIPT` applies; anything else is dead weight in the page. */
+const RUNTIME_EFFECT_TYPES = new Set([
+  "fadeIn",
+  "fadeOut",
+  "blur",
+  "brightness",
+  "contrast",
+  "saturation",
+]);
+
+/**
+ * Clip timing and effects as the runtime's seek reads them: only effect
+ * types it applies, without ids, and keyframes sorted by time (the runtime
+ * binary-searches them).
+ */
 export function buildClipRuntimeData(state: TimelineState) {
   return state.clips.map((clip) => ({
     id: clip.id,
     startTime: clip.startTime,
     duration: clip.duration,
-    effects: clip.effects,
+    effects: clip.effects
+      .filter((effect) => RUNTIME_EFFECT_TYPES.has(effect.type))
+      .map((effect) => ({
+        type: effect.type,
+        startTime: effect.startTime,
+        duration: effect.duration,
+        params: effect.params,
+        ...(effect.keyframes && effect.keyframes.length > 0
+          ? {
+              keyframes: [...effect.keyframes]
+                .sort((a, b) => a.time - b.time)
+                .map(({ time, values, easing }) => ({ time, values, easing })),
+            }
+          : {}),
+      })),
   }));
 }
@@ -2,19 +2,53 @@
  * Browser-side runtime script embedded into the generated HTML.
  * Implements window.__hf.seek(t) and effect application.
  * Kept as a string template so it can be embedded inline without a bundler.
+ *
+ * The producer seeks once per captured frame, so seek cost is kept
+ * independent of timeline size: clips are indexed into fixed-width time
+ * buckets (a seek only visits clips overlapping its bucket), only clips
+ * whose visibility changed are touched, and keyframes are found by binary
+ * search with the last segment cached so sequential seeks are O(1).
  */
 
 export const RUNTIME_SCRIPT = `
 (function () {
   var CLIPS = /*CLIPS_JSON*/[];
 
+  // Interval index: BUCKETS[b] lists the clips overlapping [b, b + 1) * BUCKET_SEC.
+  var end = 0;
+  for (var ei = 0; ei < CLIPS.length; ei++) {
+    end = Math.max(end, CLIPS[ei].startTime + CLIPS[ei].duration);
+  }
+  var BUCKET_SEC = Math.max(0.25, end / 4096);
+  var BUCKETS = [];
+  for (var ci = 0; ci < CLIPS.length; ci++) {
+    var clip = CLIPS[ci];
+    var first = Math.max(0, Math.floor(clip.startTime / BUCKET_SEC));
+    var last = Math.max(first, Math.ceil((clip.startTime + clip.duration) / BUCKET_SEC) - 1);
+    for (var b = first; b <= last; b++) (BUCKETS[b] || (BUCKETS[b] = [])).push(clip);
+  }
+  var shown = [];
+
+  function segmentAt(kfs, t) {
+    var i = kfs.__seg || 0;
+    if (kfs[i].time <= t && t <= kfs[i + 1].time) return i;
+    if (i + 2 < kfs.length && kfs[i + 1].time <= t && t <= kfs[i + 2].time) return (kfs.__seg = i + 1);
+    // First keyframe at or after t; the segment ends there.
+    var lo = 1, hi = kfs.length - 1;
+    while (lo < hi) {
+      var mid = (lo + hi) >> 1;
+      if (kfs[mid].time < t) lo = mid + 1; else hi = mid;
+    }
+    return (kfs.__seg = lo - 1);
+  }
+
   function interpolate(kfs, t) {
     if (!kfs || kfs.length === 0) return null;
     if (kfs.length === 1) return kfs[0].values;
-    var prev = kfs[0], next = kfs[kfs.length - 1];
-    for (var i = 0; i < kfs.length - 1; i++) {
-      if (t >= kfs[i].time && t <= kfs[i + 1].time) { prev = kfs[i]; next = kfs[i + 1]; break; }
-    }
+    if (t <= kfs[0].time) return kfs[0].values;
+    if (t >= kfs[kfs.length - 1].time) return kfs[kfs.length - 1].values;
+    var i = segmentAt(kfs, t);
+    var prev = kfs[i], next = kfs[i + 1];
     if (t <= prev.time) return prev.values;
     if (t >= next.time) return next.values;
     var raw = (t - prev.time) / (next.time - prev.time);
@@ -62,18 +96,30 @@ export const RUNTIME_SCRIPT = `
     else el.style.filter = '';
   }
 
+  function element(c) {
+    if (c.el === undefined) c.el = document.getElementById(c.id);
+    return c.el;
+  }
+
   window.__hf = {
     duration: /*DURATION*/0,
     media: /*MEDIA_JSON*/[],
     seek: function (t) {
-      for (var i = 0; i < CLIPS.length; i++) {
-        var c = CLIPS[i];
-        var el = document.getElementById(c.id);
-        if (!el) continue;
-        var active = t >= c.startTime && t < c.startTime + c.duration;
-        el.style.display = active ? 'block' : 'none';
-        if (active) applyEffects(el, c.effects, t - c.startTime);
+      var candidates = BUCKETS[Math.floor(t / BUCKET_SEC)] || [];
+      var active = [];
+      for (var i = 0; i < candidates.length; i++) {
+        var c = candidates[i];
+        if (t >= c.startTime && t < c.startTime + c.duration && element(c)) active.push(c);
+      }
+      // Hide only what left the frame; everything else keeps its style.
+      for (var j = 0; j < shown.length; j++) {
+        if (active.indexOf(shown[j]) === -1) shown[j].el.style.display = 'none';
+      }
+      for (var k = 0; k < active.length; k++) {
+        active[k].el.style.display = 'block';
+        applyEffects(active[k].el, active[k].effects, t - active[k].startTime);
       }
+      shown = active;
     }
   };
 })();
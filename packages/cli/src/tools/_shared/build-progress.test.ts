@@ -0,0 +1,49 @@
+import { afterEach, describe, expect, it, vi } from "vitest";
+import type { SceneBuildProgressEvent } from "../../commands/_shared/scene-build.js";
+import type { LocalJobUpdate } from "./long-poll.js";
+import { createBuildProgressCoalescer } from "./build-progress.js";
+
+function cached(i: number): SceneBuildProgressEvent {
+  return { type: "narration-cached", beatId: `b${i}`, path: `assets/narration-b${i}.wav` };
+}
+
+describe("createBuildProgressCoalescer", () => {
+  afterEach(() => {
+    vi.useRealTimers();
+  });
+
+  it("throttles per-beat events but always passes phase changes and failures", () => {
+    let clock = 0;
+    const updates: LocalJobUpdate[] = [];
+    const progress = createBuildProgressCoalescer((u) => updates.push(u), 1000, () => clock);
+    progress.push({ type: "phase-start", phase: "primitives" });
+    for (let i = 0; i < 40; i++) progress.push(cached(i));
+    progress.push({ type: "backdrop-failed", beatId: "b7", error: "HTTP 500" });
+    expect(updates.map((u) => u.message)).toEqual([
+      "primitives started",
+      "backdrop-failed b7 (+40 more)",
+    ]);
+
+    clock = 1500;
+    progress.push(cached(40));
+    expect(updates.at(-1)?.message).toBe("narration-cached b40");
+  });
+
+  it("reports the last throttled event when the interval ends or the build finishes", () => {
+    vi.useFakeTimers();
+    const updates: LocalJobUpdate[] = [];
+    const progress = createBuildProgressCoalescer((u) => updates.push(u), 1000);
+    progress.push({ type: "phase-start", phase: "primitives" });
+    for (let i = 0; i < 3; i++) progress.push(cached(i));
+    expect(updates).toHaveLength(1);
+
+    vi.advanceTimersByTime(1000);
+    expect(updates.at(-1)?.message).toBe("narration-cached b2 (+2 more)");
+
+    progress.push(cached(3));
+    progress.flush();
+    expect(updates.at(-1)?.message).toBe("narration-cached b3");
+    vi.advanceTimersByTime(2000);
+    expect(updates).toHaveLength(3);
+  });
+});
@@ -0,0 +1,82 @@
+import type { SceneBuildProgressEvent } from "../../commands/_shared/scene-build.js";
+import type { LocalJobUpdate } from "./long-poll.js";
+
+/**
+ * @module tools/_shared/build-progress
+ *
+ * Progress updates for the `build` tool. A build emits several events per
+ * beat (stage start/done, each asset cached or generated), which is too
+ * chatty for MCP progress notifications on large storyboards. Phase changes
+ * and failures are always reported; everything else is throttled, with the
+ * events skipped since the last update counted into the next one and the
+ * last skipped event reported once the interval ends.
+ */
+
+/** Minimum gap between routine (per-beat) progress updates. */
+export const BUILD_PROGRESS_INTERVAL_MS = 1000;
+
+export function buildEventToUpdate(event: SceneBuildProgressEvent): LocalJobUpdate {
+  if (event.type === "phase-start") {
+    return { stage: event.phase, message: `${event.phase} started` };
+  }
+  if (event.type === "render-start") return { stage: "render", message: "render started" };
+  if (event.type === "render-done") return { stage: "render", message: "render done" };
+  const beatId = "beatId" in event ? event.beatId : undefined;
+  return { message: beatId ? `${event.type} ${beatId}` : event.type };
+}
+
+export interface BuildProgressCoalescer {
+  /** Report `event` now, or hold it until the throttle interval has passed. */
+  push(event: SceneBuildProgressEvent): void;
+  /** Report the held event, if any, right away. Call when the build ends. */
+  flush(): void;
+}
+
+/**
+ * Throttles build events into `emit`. The latest event skipped inside an
+ * interval is held and reported when the interval ends (or on `flush`), so
+ * the final state of a quiet stretch is never lost. `now` is injectable for
+ * tests.
+ */
+export function createBuildProgressCoalescer(
+  emit: (update: LocalJobUpdate) => void,
+  intervalMs: number = BUILD_PROGRESS_INTERVAL_MS,
+  now: () => number = Date.now
+): BuildProgressCoalescer {
+  let lastAt = -Infinity;
+  let skipped = 0;
+  let held: LocalJobUpdate | null = null;
+  let timer: ReturnType<typeof setTimeout> | undefined;
+
+  const send = (update: LocalJobUpdate, extra: number) => {
+    clearTimeout(timer);
+    timer = undefined;
+    held = null;
+    skipped = 0;
+    lastAt = now();
+    if (extra > 0 && update.message) update.message += ` (+${extra} more)`;
+    emit(update);
+  };
+  const flush = () => {
+    if (held) send(held, skipped - 1);
+  };
+
+  return {
+    push(event) {
+      const update = buildEventToUpdate(event);
+      const urgent = update.stage !== undefined || event.type.endsWith("-failed");
+      const wait = intervalMs - (now() - lastAt);
+      if (urgent || wait <= 0) {
+        send(update, skipped);
+        return;
+      }
+      held = update;
+      skipped += 1;
+      if (timer === undefined) {
+        timer = setTimeout(flush, wait);
+        timer.unref?.();
+      }
+    },
+    flush,
+  };
+}
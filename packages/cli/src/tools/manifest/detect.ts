@@ -23,6 +23,7 @@ export const detectScenesTool = defineTool({
     videoPath: z.string().describe("Path to the input video file"),
     threshold: z.number().optional().describe("Scene change threshold 0-1 (default: 0.3)"),
     outputPath: z.string().optional().describe("Optional: save results as JSON file"),
+    limit: z.number().int().positive().optional().describe("Stop decoding after this many scene cuts"),
   }),
   async execute(args) {
     const result = await executeDetectScenes(args);
@@ -33,6 +34,7 @@ export const detectScenesTool = defineTool({
         sceneCount: result.scenes?.length,
         totalDuration: result.totalDuration,
         scenes: result.scenes,
+        ...(result.truncated ? { truncated: true } : {}),
       },
       humanLines: [`✅ ${result.scenes?.length ?? 0} scene(s) detected`],
     };
@@ -51,13 +53,18 @@ export const detectSilenceTool = defineTool({
     noise: z.string().optional().describe("Noise threshold in dB (default: -30)"),
     duration: z.string().optional().describe("Minimum silence duration in seconds (default: 0.5)"),
     outputPath: z.string().optional().describe("Optional: save results as JSON file"),
+    limit: z.number().int().positive().optional().describe("Stop decoding after this many silence periods"),
   }),
   async execute(args) {
     const result = await executeDetectSilence(args);
     if (!result.success) return { success: false, error: result.error ?? "Silence detection failed" };
     return {
       success: true,
-      data: { silenceCount: result.silences?.length, silences: result.silences },
+      data: {
+        silenceCount: result.silences?.length,
+        silences: result.silences,
+        ...(result.truncated ? { truncated: true } : {}),
+      },
       humanLines: [`✅ ${result.silences?.length ?? 0} silence period(s) detected`],
     };
   },
@@ -70,7 +77,7 @@ export const detectBeatsTool = defineTool({
   title: "Detect Audio Beats",
   annotations: { readOnly: false, idempotent: true, openWorld: false },
   description:
-    "Detect beats in audio for music sync using FFmpeg loudness analysis. No API key needed.",
+    "Detect beats, downbeats and tempo in audio for music sync (onset tracking on FFmpeg-decoded audio). No API key needed.",
   schema: z.object({
     audioPath: z.string().describe("Path to the audio file"),
     outputPath: z.string().optional().describe("Optional: save results as JSON file"),
@@ -80,8 +87,14 @@ export const detectBeatsTool = defineTool({
     if (!result.success) return { success: false, error: result.error ?? "Beat detection failed" };
     return {
       success: true,
-      data: { beatCount: result.beatCount, beats: result.beats },
-      humanLines: [`✅ ${result.beatCount} beat(s) detected`],
+      data: {
+        beatCount: result.beatCount,
+        tempo: result.tempo,
+        confidence: result.confidence,
+        beats: result.beats,
+        downbeats: result.downbeats,
+      },
+      humanLines: [`✅ ${result.beatCount} beat(s) detected at ${result.tempo} BPM`],
     };
   },
 });
@@ -8,6 +8,7 @@ import { z } from "zod";
 import { resolve } from "node:path";
 import { defineTool, type AnyTool } from "../define-tool.js";
 import { runExport } from "../../commands/export.js";
+import { formatSmartRenderReport } from "../../commands/_shared/export-smart-render.js";
 
 export const exportVideoTool = defineTool({
   name: "export_video",
@@ -23,6 +24,27 @@ export const exportVideoTool = defineTool({
     preset: z.enum(["draft", "standard", "high", "ultra"]).optional().describe("Quality preset (default: standard)"),
     format: z.enum(["mp4", "webm", "mov"]).optional().describe("Output format (default: mp4)"),
     overwrite: z.boolean().optional().describe("Overwrite existing output file (default: false)"),
+    smartRender: z
+      .boolean()
+      .optional()
+      .describe("Stream-copy untouched footage that already matches the preset instead of re-encoding it (default: true)"),
+    jobs: z
+      .number()
+      .int()
+      .min(0)
+      .optional()
+      .describe("FFmpeg processes to encode with at once. Above 1, long timelines are split at clip boundaries and encoded in parallel chunks; 0 sizes from CPU cores (default: 1)"),
+    renditions: z
+      .array(
+        z.object({
+          outputPath: z.string().describe("Output file path for this rendition"),
+          preset: z.enum(["draft", "standard", "high", "ultra"]).optional().describe("Quality preset (default: the export's)"),
+          aspectRatio: z.enum(["16:9", "9:16", "1:1"]).optional().describe("Frame shape, centre-cropped from the timeline (default: the project's)"),
+          format: z.enum(["mp4", "webm", "mov"]).optional().describe("Output format (default: the export's)"),
+        })
+      )
+      .optional()
+      .describe("Extra outputs encoded in the same pass as outputPath, from a single decode of the timeline (e.g. a 9:16 cut and a 1:1 preview)"),
   }),
   async execute(args, ctx) {
     const projectPath = resolve(ctx.workingDirectory, args.projectPath);
@@ -31,12 +53,33 @@ export const exportVideoTool = defineTool({
       preset: args.preset,
       format: args.format,
       overwrite: args.overwrite,
+      smartRender: args.smartRender,
+      jobs: args.jobs,
+      renditions: args.renditions?.map((r) => ({ ...r, outputPath: resolve(ctx.workingDirectory, r.outputPath) })),
     });
     if (!result.success) return { success: false, error: result.message ?? "Export failed" };
     return {
       success: true,
-      data: { outputPath: result.outputPath ?? outputPath },
-      humanLines: [`✅ Exported video: ${result.outputPath ?? outputPath}`],
+      data: {
+        outputPath: result.outputPath ?? outputPath,
+        ...(result.smartRender ? { smartRender: result.smartRender } : {}),
+        ...(result.chunked ? { chunked: result.chunked } : {}),
+        ...(result.smartRenderFallback ? { smartRenderFallback: result.smartRenderFallback } : {}),
+        ...(result.renditions ? { renditions: result.renditions } : {}),
+      },
+      humanLines: [
+        `✅ Exported video: ${result.outputPath ?? outputPath}`,
+        ...(result.renditions ?? [])
+          .slice(1)
+          .map((r) => `   + ${r.outputPath} (${r.resolution} ${r.format})`),
+        ...(result.smartRender ? [`   ${formatSmartRenderReport(result.smartRender)}`] : []),
+        ...(result.chunked
+          ? [`   ${result.chunked.chunks} chunks encoded ${result.chunked.jobs} at a time in ${(result.chunked.elapsedMs / 1000).toFixed(1)}s`]
+          : []),
+        ...(result.smartRenderFallback
+          ? [`   ⚠️ Smart render failed, re-encoded everything: ${result.smartRenderFallback}`]
+          : []),
+      ],
     };
   },
 });
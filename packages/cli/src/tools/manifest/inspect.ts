@@ -75,6 +75,7 @@ export const inspectRenderTool = defineTool({
     report: z.boolean().optional().describe("Write review-report.json. Default true."),
     ai: z.boolean().optional().describe("Also run Gemini video review and merge findings into review-report.json. Default false."),
     model: z.enum(["flash", "latest", "flash-3", "flash-2.5", "pro", "pro-3.1"]).optional().describe("Gemini model variant for ai review. Default flash."),
+    draftScan: z.boolean().optional().describe("Scan a 1/4-resolution, every-3rd-frame copy for faster draft QA. Default false."),
     dryRun: z.boolean().optional().describe("Preview resolved inputs without probing video or calling Gemini."),
   }),
   async execute(args, ctx) {
@@ -88,6 +89,7 @@ export const inspectRenderTool = defineTool({
         writeReport: args.report !== false,
         ai: args.ai === true,
         model: args.model,
+        draftScan: args.draftScan === true,
       });
       return {
         success: true,
@@ -110,6 +112,7 @@ export const inspectRenderTool = defineTool({
       writeReport: args.report !== false,
       ai: args.ai === true,
       model: args.model,
+      draftScan: args.draftScan === true,
     });
     return {
       success: result.status !== "fail",
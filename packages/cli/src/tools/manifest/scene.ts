@@ -8,6 +8,7 @@ import { resolve, relative } from "node:path";
 import { defineTool, type AnyTool, type ToolExecuteResult } from "../define-tool.js";
 import { runWithMcpPromotion, type LocalJobUpdate } from "../_shared/long-poll.js";
 import { applyElicitationAnswers, planBuildElicitation } from "../_shared/elicit.js";
+import { createBuildProgressCoalescer } from "../_shared/build-progress.js";
 import { listVisualStyles, getVisualStyle } from "../../commands/_shared/visual-styles.js";
 import { scaffoldSceneProject, type SceneAspect } from "../../commands/_shared/scene-project.js";
 import { executeSceneAdd } from "../../commands/scene.js";
@@ -18,10 +19,7 @@ import {
   type RenderQuality,
   type RenderFormat,
 } from "../../commands/_shared/scene-render.js";
-import {
-  executeSceneBuild,
-  type SceneBuildProgressEvent,
-} from "../../commands/_shared/scene-build.js";
+import { executeSceneBuild } from "../../commands/_shared/scene-build.js";
 import type { ScenePreset } from "../../commands/_shared/scene-html-emit.js";
 import {
   installHyperframesSkill,
@@ -424,7 +422,22 @@ const sceneRenderSchema = z.object({
     .optional()
     .describe("Quality preset. Default 'standard'."),
   format: z.enum(["mp4", "webm", "mov"]).optional().describe("Container format. Default 'mp4'."),
-  workers: z.number().optional().describe("Capture worker count (1-16). Default 1."),
+  workers: z
+    .number()
+    .optional()
+    .describe("Capture workers per job (1-16). 0 or omitted sizes from CPU cores, memory and length."),
+  shards: z
+    .number()
+    .optional()
+    .describe(
+      "Render beats as parallel shards joined without re-encoding, this many at once (0 = auto). Unchanged beats reuse cached segments. Omit for a single-pass render."
+    ),
+  noCache: z
+    .boolean()
+    .optional()
+    .describe(
+      "Always capture. By default an unchanged project (same HTML, assets, fps, quality, format) is copied from .vibeframe/cache/render/."
+    ),
   openAfterRender: z
     .boolean()
     .optional()
@@ -465,11 +478,15 @@ function mapRenderResultToToolResult(
       audioCount: result.audioCount,
       audioMuxApplied: result.audioMuxApplied,
       audioMuxWarning: result.audioMuxWarning,
+      ...(result.cacheHit ? { cacheHit: true } : {}),
+      ...(result.segmentReused ? { segmentReused: true } : {}),
+      ...(result.shards ? { shards: result.shards } : {}),
+      ...(result.capture ? { capture: result.capture } : {}),
       ...(result.autoSyncApplied ? { autoSyncApplied: true } : {}),
       ...(result.autoSyncWarning ? { autoSyncWarning: result.autoSyncWarning } : {}),
     },
     humanLines: [
-      `✅ Render complete: ${result.absoluteOutputPath ?? result.outputPath}`,
+      `✅ Render complete${result.cacheHit ? " (cached)" : ""}: ${result.absoluteOutputPath ?? result.outputPath}`,
       ...(result.autoSyncApplied
         ? [`   auto-sync: narration-synced durations were re-applied before render`]
         : []),
@@ -511,6 +528,8 @@ export const sceneRenderTool = defineTool({
         quality: args.quality as RenderQuality | undefined,
         format: args.format as RenderFormat | undefined,
         workers: args.workers,
+        shards: args.shards,
+        noCache: args.noCache,
         openAfterRender: args.openAfterRender,
         revealInFinder: args.revealInFinder,
         onProgress: (pct, stage) => {
@@ -683,16 +702,6 @@ function mapBuildResultToToolResult(
   };
 }
 
-function buildEventToUpdate(event: SceneBuildProgressEvent): LocalJobUpdate {
-  if (event.type === "phase-start") {
-    return { stage: event.phase, message: `${event.phase} started` };
-  }
-  if (event.type === "render-start") return { stage: "render", message: "render started" };
-  if (event.type === "render-done") return { stage: "render", message: "render done" };
-  const beatId = "beatId" in event ? event.beatId : undefined;
-  return { message: beatId ? `${event.type} ${beatId}` : event.type };
-}
-
 export const sceneBuildTool = defineTool({
   name: "build",
   category: "scene",
@@ -732,8 +741,12 @@ export const sceneBuildTool = defineTool({
     const projectDir = args.projectDir
       ? resolve(ctx.workingDirectory, args.projectDir)
       : ctx.workingDirectory;
-    const runBuild = (report: (update: LocalJobUpdate) => void) =>
-      executeSceneBuild({
+    const runBuild = (report: (update: LocalJobUpdate) => void) => {
+      const progress = createBuildProgressCoalescer((update) => {
+        ctx.onProgress?.({ message: update.message ?? update.stage });
+        report(update);
+      });
+      return executeSceneBuild({
         projectDir,
         stage: args.stage,
         beatId: args.beat,
@@ -754,18 +767,16 @@ export const sceneBuildTool = defineTool({
         imageSize: args.imageSize,
         maxCostUsd: args.maxCostUsd,
         force: args.force,
-        onProgress: (event) => {
-          const update = buildEventToUpdate(event);
-          ctx.onProgress?.({ message: update.message ?? update.stage });
-          report(update);
-        },
+        onProgress: (event) => progress.push(event),
       })
+        .finally(() => progress.flush())
         .then(mapBuildResultToToolResult)
         .then((result) =>
           warnings === undefined
             ? result
             : { ...result, data: { ...result.data, elicitationWarnings: warnings } }
         );
+    };
     if (ctx.surface !== "mcp") {
       return runBuild(() => undefined);
     }
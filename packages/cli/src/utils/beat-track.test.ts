@@ -0,0 +1,63 @@
+import { describe, expect, it } from "vitest";
+import { BEAT_SAMPLE_RATE, OnsetEnvelope, trackBeats } from "./beat-track.js";
+
+/**
+ * Decaying noise bursts at `bpm`, starting at `offsetSec`, every fourth one
+ * twice as loud. Deterministic so the test never flakes.
+ */
+function clickTrack(bpm: number, seconds: number, offsetSec = 0): Float32Array {
+  const pcm = new Float32Array(Math.round(seconds * BEAT_SAMPLE_RATE));
+  let seed = 1;
+  const noise = () => ((seed = (seed * 16807) % 2147483647) / 2147483647) * 2 - 1;
+  const burst = Math.round(0.03 * BEAT_SAMPLE_RATE);
+  for (let beat = 0; ; beat++) {
+    const start = Math.round((offsetSec + (beat * 60) / bpm) * BEAT_SAMPLE_RATE);
+    if (start >= pcm.length) break;
+    const gain = beat % 4 === 0 ? 0.8 : 0.4;
+    for (let i = 0; i < burst && start + i < pcm.length; i++) {
+      pcm[start + i] = gain * noise() * Math.exp(-i / (0.006 * BEAT_SAMPLE_RATE));
+    }
+  }
+  return pcm;
+}
+
+/** Feed PCM in uneven chunks, the way ffmpeg's pipe delivers it. */
+function envelopeOf(pcm: Float32Array): OnsetEnvelope {
+  const envelope = new OnsetEnvelope(BEAT_SAMPLE_RATE);
+  for (let at = 0, size = 1000; at < pcm.length; at += size, size = (size * 7) % 5003 + 97) {
+    envelope.push(pcm.subarray(at, at + size));
+  }
+  return envelope;
+}
+
+describe("trackBeats", () => {
+  it("recovers tempo, beat times and bar phase of a click track", () => {
+    const track = trackBeats(envelopeOf(clickTrack(128, 30, 0.25)));
+    const period = 60 / 128;
+
+    expect(track.tempo).toBeGreaterThan(126);
+    expect(track.tempo).toBeLessThan(130);
+    expect(track.confidence).toBeGreaterThan(0.5);
+    expect(track.beats.length).toBeGreaterThanOrEqual(60);
+    for (const t of track.beats) {
+      const nearest = 0.25 + Math.round((t - 0.25) / period) * period;
+      expect(Math.abs(t - nearest)).toBeLessThan(0.03);
+    }
+    // Accented clicks are at beat 0, 4, 8... of the click track.
+    for (const t of track.downbeats) {
+      expect(Math.round((t - 0.25) / period) % 4).toBe(0);
+    }
+  });
+
+  it("tracks a slow tempo without doubling it", () => {
+    const track = trackBeats(envelopeOf(clickTrack(75, 40)));
+    expect(track.tempo).toBeGreaterThan(73);
+    expect(track.tempo).toBeLessThan(77);
+  });
+
+  it("finds no beats in silence", () => {
+    const track = trackBeats(envelopeOf(new Float32Array(BEAT_SAMPLE_RATE * 5)));
+    expect(track.beats).toEqual([]);
+    expect(track.confidence).toBe(0);
+  });
+});
@@ -0,0 +1,353 @@
+/**
+ * @module utils/beat-track
+ * @description Beat tracking on decoded PCM. ffmpeg streams mono float
+ * samples; an {@link OnsetEnvelope} turns them into a spectral-flux onset
+ * strength curve (Hann-windowed STFT, log magnitude, half-wave rectified
+ * frame-to-frame difference), tempo is the autocorrelation peak of that
+ * curve under a log-normal prior around 120 BPM, and beats are placed by
+ * dynamic programming (Ellis 2007): each onset frame is scored by its own
+ * strength plus the best predecessor roughly one beat period earlier.
+ *
+ * Only the onset envelope is retained (one float per 512 samples, ~170 KB
+ * for an hour of audio), never the PCM, so memory is bounded by the track
+ * length at envelope resolution.
+ */
+
+import { execStdoutChunks } from "./exec-safe.js";
+
+/** Analysis sample rate; ffmpeg resamples to this while decoding. */
+export const BEAT_SAMPLE_RATE = 22050;
+const FRAME_SIZE = 1024;
+const HOP_SIZE = 512;
+const MIN_BPM = 60;
+const MAX_BPM = 200;
+/** Centre of the tempo prior (BPM) and its spread in octaves. */
+const PRIOR_BPM = 120;
+const PRIOR_OCTAVES = 1;
+/** How strongly the DP penalises inter-beat intervals that drift from the period. */
+const TIGHTNESS = 100;
+const BEATS_PER_BAR = 4;
+
+export interface BeatTrack {
+  /** Beat times in seconds. */
+  beats: number[];
+  /** Bar starts (every 4th beat, phase chosen by accent strength). */
+  downbeats: number[];
+  /** Global tempo estimate, beats per minute. */
+  tempo: number;
+  /**
+   * 0-1: normalised autocorrelation of the onset envelope at the beat
+   * period. Near 0 for unpulsed audio (speech, ambience), near 1 for a
+   * steady click track.
+   */
+  confidence: number;
+}
+
+/** Precomputed tables for an in-place radix-2 FFT of a fixed size. */
+class Fft {
+  private readonly cos: Float32Array;
+  private readonly sin: Float32Array;
+  private readonly rev: Uint32Array;
+
+  constructor(readonly size: number) {
+    const bits = Math.log2(size);
+    this.cos = new Float32Array(size / 2);
+    this.sin = new Float32Array(size / 2);
+    for (let i = 0; i < size / 2; i++) {
+      this.cos[i] = Math.cos((2 * Math.PI * i) / size);
+      this.sin[i] = -Math.sin((2 * Math.PI * i) / size);
+    }
+    this.rev = new Uint32Array(size);
+    for (let i = 0; i < size; i++) {
+      let r = 0;
+      for (let b = 0; b < bits; b++) r |= ((i >> b) & 1) << (bits - 1 - b);
+      this.rev[i] = r;
+    }
+  }
+
+  /** Transform `re`/`im` in place. */
+  run(re: Float32Array, im: Float32Array): void {
+    const n = this.size;
+    for (let i = 0; i < n; i++) {
+      const j = this.rev[i];
+      if (j > i) {
+        const tr = re[i];
+        re[i] = re[j];
+        re[j] = tr;
+        const ti = im[i];
+        im[i] = im[j];
+        im[j] = ti;
+      }
+    }
+    for (let len = 2; len <= n; len <<= 1) {
+      const half = len >> 1;
+      const step = n / len;
+      for (let start = 0; start < n; start += len) {
+        for (let k = 0; k < half; k++) {
+          const wr = this.cos[k * step];
+          const wi = this.sin[k * step];
+          const a = start + k;
+          const b = a + half;
+          const xr = re[b] * wr - im[b] * wi;
+          const xi = re[b] * wi + im[b] * wr;
+          re[b] = re[a] - xr;
+          im[b] = im[a] - xi;
+          re[a] += xr;
+          im[a] += xi;
+        }
+      }
+    }
+  }
+}
+
+/**
+ * Streaming spectral-flux onset strength. Push PCM in any chunk size; each
+ * completed hop appends one value to the envelope. Frames are centred (the
+ * first frame is padded with half a window of silence) so envelope index
+ * `i` sits at `i * hop / sampleRate` seconds.
+ */
+export class OnsetEnvelope {
+  readonly frameRate: number;
+  private readonly fft = new Fft(FRAME_SIZE);
+  private readonly window = new Float32Array(FRAME_SIZE);
+  private readonly ring = new Float32Array(FRAME_SIZE);
+  private readonly re = new Float32Array(FRAME_SIZE);
+  private readonly im = new Float32Array(FRAME_SIZE);
+  private prevMag = new Float32Array(FRAME_SIZE / 2 + 1);
+  private curMag = new Float32Array(FRAME_SIZE / 2 + 1);
+  private values = new Float32Array(1024);
+  private count = 0;
+  private filled = FRAME_SIZE / 2;
+  private sinceHop = HOP_SIZE - 1;
+  private frames = 0;
+  private samples = 0;
+
+  constructor(readonly sampleRate: number = BEAT_SAMPLE_RATE) {
+    this.frameRate = sampleRate / HOP_SIZE;
+    for (let i = 0; i < FRAME_SIZE; i++) {
+      this.window[i] = 0.5 - 0.5 * Math.cos((2 * Math.PI * i) / FRAME_SIZE);
+    }
+  }
+
+  /** Seconds of audio consumed so far. */
+  get duration(): number {
+    return this.samples / this.sampleRate;
+  }
+
+  push(pcm: Float32Array): void {
+    this.samples += pcm.length;
+    for (let i = 0; i < pcm.length; i++) {
+      this.ring[this.filled % FRAME_SIZE] = pcm[i];
+      this.filled++;
+      if (this.filled >= FRAME_SIZE && ++this.sinceHop >= HOP_SIZE) {
+        this.sinceHop = 0;
+        this.analyse();
+      }
+    }
+  }
+
+  /** The onset strength curve, one value per hop. */
+  envelope(): Float32Array {
+    return this.values.subarray(0, this.count);
+  }
+
+  private analyse(): void {
+    // ring holds the last FRAME_SIZE samples; the oldest is at `filled`.
+    const offset = this.filled % FRAME_SIZE;
+    for (let i = 0; i < FRAME_SIZE; i++) {
+      this.re[i] = this.ring[(offset + i) % FRAME_SIZE] * this.window[i];
+      this.im[i] = 0;
+    }
+    this.fft.run(this.re, this.im);
+    let flux = 0;
+    for (let k = 0; k <= FRAME_SIZE / 2; k++) {
+      const mag = Math.log1p(1000 * Math.hypot(this.re[k], this.im[k]));
+      this.curMag[k] = mag;
+      const rise = mag - this.prevMag[k];
+      if (rise > 0) flux += rise;
+    }
+    [this.prevMag, this.curMag] = [this.curMag, this.prevMag];
+    // The first frame has no predecessor, so it carries no flux.
+    this.append(this.frames++ === 0 ? 0 : flux);
+  }
+
+  private append(value: number): void {
+    if (this.count === this.values.length) {
+      const grown = new Float32Array(this.values.length * 2);
+      grown.set(this.values);
+      this.values = grown;
+    }
+    this.values[this.count++] = value;
+  }
+}
+
+/** Remove the slow trend (local mean over ~1s) and normalise to unit deviation. */
+function normaliseEnvelope(env: Float32Array, frameRate: number): Float32Array {
+  const out = new Float32Array(env.length);
+  const radius = Math.max(1, Math.round(frameRate / 2));
+  let sum = 0;
+  let lo = 0;
+  let hi = 0;
+  for (let i = 0; i < env.length; i++) {
+    while (hi < env.length && hi <= i + radius) sum += env[hi++];
+    while (lo < i - radius) sum -= env[lo++];
+    out[i] = Math.max(0, env[i] - sum / (hi - lo));
+  }
+  let sq = 0;
+  for (let i = 0; i < out.length; i++) sq += out[i] * out[i];
+  const std = Math.sqrt(sq / Math.max(1, out.length));
+  if (std > 0) for (let i = 0; i < out.length; i++) out[i] /= std;
+  return out;
+}
+
+/**
+ * Autocorrelation tempo estimate. Returns the beat period in envelope frames
+ * (fractional, parabolic-interpolated) and the normalised correlation there.
+ */
+export function estimateTempo(
+  env: Float32Array,
+  frameRate: number
+): { period: number; confidence: number } {
+  const minLag = Math.floor((frameRate * 60) / MAX_BPM);
+  const maxLag = Math.ceil((frameRate * 60) / MIN_BPM);
+  const mean = env.reduce((a, b) => a + b, 0) / Math.max(1, env.length);
+  const centred = env.map((v) => v - mean);
+  const acf = (lag: number): number => {
+    let s = 0;
+    for (let i = lag; i < centred.length; i++) s += centred[i] * centred[i - lag];
+    return s / (centred.length - lag);
+  };
+  const zero = acf(0);
+  if (!(zero > 0) || env.length <= maxLag) {
+    return { period: (frameRate * 60) / PRIOR_BPM, confidence: 0 };
+  }
+
+  const raw = new Float64Array(maxLag + 2);
+  for (let lag = minLag - 1; lag <= maxLag + 1; lag++) raw[lag] = acf(lag);
+  let best = minLag;
+  let bestScore = -Infinity;
+  for (let lag = minLag; lag <= maxLag; lag++) {
+    const bpm = (frameRate * 60) / lag;
+    const octaves = Math.log2(bpm / PRIOR_BPM) / PRIOR_OCTAVES;
+    const score = raw[lag] * Math.exp(-0.5 * octaves * octaves);
+    if (score > bestScore) {
+      bestScore = score;
+      best = lag;
+    }
+  }
+  const [a, b, c] = [raw[best - 1], raw[best], raw[best + 1]];
+  const curvature = a - 2 * b + c;
+  const shift = curvature < 0 ? Math.max(-0.5, Math.min(0.5, (0.5 * (a - c)) / curvature)) : 0;
+  return {
+    period: best + shift,
+    confidence: Math.max(0, Math.min(1, raw[best] / zero)),
+  };
+}
+
+/**
+ * Dynamic-programming beat placement: returns envelope frame indices of
+ * the beat sequence that best balances onset strength against deviation
+ * from `period`.
+ */
+export function trackBeatFrames(env: Float32Array, period: number): number[] {
+  const n = env.length;
+  if (n === 0) return [];
+  const score = new Float32Array(n);
+  const backlink = new Int32Array(n).fill(-1);
+  const minGap = Math.max(1, Math.round(period / 2));
+  const maxGap = Math.round(period * 2);
+  const penalty = new Float32Array(maxGap + 1);
+  for (let gap = minGap; gap <= maxGap; gap++) {
+    penalty[gap] = TIGHTNESS * Math.log(gap / period) ** 2;
+  }
+  for (let t = 0; t < n; t++) {
+    let best = 0;
+    let bestPrev = -1;
+    for (let prev = Math.max(0, t - maxGap); prev <= t - minGap; prev++) {
+      const candidate = score[prev] - penalty[t - prev];
+      if (bestPrev === -1 || candidate > best) {
+        best = candidate;
+        bestPrev = prev;
+      }
+    }
+    score[t] = env[t] + (bestPrev === -1 ? 0 : best);
+    backlink[t] = bestPrev;
+  }
+
+  // The last beat is the best-scoring frame within the final period.
+  let last = Math.max(0, n - Math.ceil(period));
+  for (let t = last; t < n; t++) if (score[t] > score[last]) last = t;
+  const frames: number[] = [];
+  for (let t = last; t >= 0; t = backlink[t]) frames.push(t);
+  frames.reverse();
+
+  // Trim weak beats at the edges (leading/trailing silence).
+  const strengths = frames.map((f) => env[f]);
+  const threshold = 0.5 * Math.sqrt(strengths.reduce((s, v) => s + v * v, 0) / frames.length);
+  let start = 0;
+  let end = frames.length;
+  while (start < end && env[frames[start]] < threshold) start++;
+  while (end > start && env[frames[end - 1]] < threshold) end--;
+  return frames.slice(start, end);
+}
+
+/** Index (0-3) of the beat phase whose beats carry the most onset energy. */
+function downbeatPhase(env: Float32Array, frames: number[]): number {
+  const energy = new Float64Array(BEATS_PER_BAR);
+  for (let i = 0; i < frames.length; i++) energy[i % BEATS_PER_BAR] += env[frames[i]];
+  let phase = 0;
+  for (let p = 1; p < BEATS_PER_BAR; p++) if (energy[p] > energy[phase]) phase = p;
+  return phase;
+}
+
+/** Track beats from an onset envelope. */
+export function trackBeats(envelope: OnsetEnvelope): BeatTrack {
+  const { frameRate } = envelope;
+  const env = normaliseEnvelope(envelope.envelope(), frameRate);
+  const { period, confidence } = estimateTempo(env, frameRate);
+  const frames = confidence > 0 ? trackBeatFrames(env, period) : [];
+  const round = (t: number) => Math.round(t * 1000) / 1000;
+  const beats = frames.map((f) => round(f / frameRate));
+  const phase = downbeatPhase(env, frames);
+  return {
+    beats,
+    downbeats: beats.filter((_, i) => i % BEATS_PER_BAR === phase),
+    tempo: Math.round(((frameRate * 60) / period) * 10) / 10,
+    confidence: Math.round(confidence * 100) / 100,
+  };
+}
+
+/**
+ * Decode `absPath` to mono PCM with ffmpeg and track its beats. Chunks are
+ * consumed as they arrive; `onProgress` receives the decode position.
+ */
+export async function trackBeatsInFile(
+  absPath: string,
+  opts: { onProgress?: (timeSec: number) => void; signal?: AbortSignal } = {}
+): Promise<BeatTrack & { duration: number }> {
+  const envelope = new OnsetEnvelope(BEAT_SAMPLE_RATE);
+  let carry = Buffer.alloc(0);
+  for await (const chunk of execStdoutChunks(
+    "ffmpeg",
+    [
+      "-v", "error",
+      "-i", absPath,
+      "-vn",
+      "-ac", "1",
+      "-ar", String(BEAT_SAMPLE_RATE),
+      "-f", "f32le",
+      "-",
+    ],
+    { signal: opts.signal }
+  )) {
+    const bytes = carry.length > 0 ? Buffer.concat([carry, chunk]) : chunk;
+    const usable = bytes.length - (bytes.length % 4);
+    // Copy into an aligned buffer; Node chunks are not 4-byte aligned.
+    const pcm = new Float32Array(usable / 4);
+    new Uint8Array(pcm.buffer).set(bytes.subarray(0, usable));
+    envelope.push(pcm);
+    carry = Buffer.from(bytes.subarray(usable));
+    opts.onProgress?.(envelope.duration);
+  }
+  return { ...trackBeats(envelope), duration: envelope.duration };
+}
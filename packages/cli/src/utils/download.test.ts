@@ -0,0 +1,133 @@
+import { afterEach, beforeEach, describe, expect, it } from "vitest";
+import { createHash } from "node:crypto";
+import { existsSync, mkdtempSync, readFileSync, readdirSync, rmSync } from "node:fs";
+import { createServer, type IncomingMessage, type Server, type ServerResponse } from "node:http";
+import type { AddressInfo } from "node:net";
+import { tmpdir } from "node:os";
+import { join } from "node:path";
+import { DownloadHttpError, downloadToFile } from "./download.js";
+
+const BODY = Buffer.from(Array.from({ length: 64 * 1024 }, (_, i) => i % 251));
+const SHA256 = createHash("sha256").update(BODY).digest("hex");
+
+type Handler = (req: IncomingMessage, res: ServerResponse, hit: number) => void;
+
+let dir: string;
+let server: Server;
+let requests: IncomingMessage[];
+
+async function serve(handler: Handler): Promise<string> {
+  server = createServer((req, res) => {
+    requests.push(req);
+    handler(req, res, requests.length);
+  });
+  await new Promise<void>((resolve) => server.listen(0, "127.0.0.1", resolve));
+  return `http://127.0.0.1:${(server.address() as AddressInfo).port}/clip.mp4`;
+}
+
+/** Serve BODY, honouring `Range: bytes=N-`. */
+function sendRange(req: IncomingMessage, res: ServerResponse, opts: { cutAt?: number } = {}) {
+  const match = req.headers.range?.match(/^bytes=(\d+)-$/);
+  const start = match ? Number(match[1]) : 0;
+  const headers: Record<string, string | number> = {
+    "accept-ranges": "bytes",
+    etag: '"v1"',
+    "content-length": BODY.length - start,
+  };
+  if (match) headers["content-range"] = `bytes ${start}-${BODY.length - 1}/${BODY.length}`;
+  res.writeHead(match ? 206 : 200, headers);
+  if (opts.cutAt !== undefined) {
+    // Send part of the body, then drop the connection mid-transfer.
+    res.write(BODY.subarray(start, opts.cutAt), () => res.destroy());
+    return;
+  }
+  res.end(BODY.subarray(start));
+}
+
+beforeEach(() => {
+  dir = mkdtempSync(join(tmpdir(), "vibe-download-"));
+  requests = [];
+});
+
+afterEach(async () => {
+  server.closeAllConnections();
+  await new Promise((resolve) => server.close(resolve));
+  rmSync(dir, { recursive: true, force: true });
+});
+
+describe("downloadToFile", () => {
+  it("streams the body to disk, hashing and reporting progress", async () => {
+    const url = await serve((req, res) => sendRange(req, res));
+    const progress: number[] = [];
+    const output = join(dir, "nested", "clip.mp4");
+
+    const result = await downloadToFile(url, output, {
+      onProgress: ({ bytes, totalBytes }) => {
+        expect(totalBytes).toBe(BODY.length);
+        progress.push(bytes);
+      },
+    });
+
+    expect(result).toEqual({ path: output, bytes: BODY.length, sha256: SHA256, resumes: 0 });
+    expect(readFileSync(output).equals(BODY)).toBe(true);
+    expect(progress.at(-1)).toBe(BODY.length);
+    expect(readdirSync(join(dir, "nested"))).toEqual(["clip.mp4"]);
+  });
+
+  it("resumes an interrupted transfer with a Range request", async () => {
+    const url = await serve((req, res, hit) =>
+      sendRange(req, res, hit === 1 ? { cutAt: 20_000 } : {})
+    );
+    const output = join(dir, "clip.mp4");
+
+    const result = await downloadToFile(url, output, { retryDelayMs: 0 });
+
+    expect(result).toMatchObject({ bytes: BODY.length, sha256: SHA256, resumes: 1 });
+    expect(readFileSync(output).equals(BODY)).toBe(true);
+    expect(requests[1].headers.range).toMatch(/^bytes=\d+-$/);
+    expect(requests[1].headers["if-range"]).toBe('"v1"');
+  });
+
+  it("starts over when the server ignores the Range header", async () => {
+    const url = await serve((req, res, hit) => {
+      if (hit === 1) {
+        sendRange(req, res, { cutAt: 10_000 });
+        return;
+      }
+      res.writeHead(200, { "content-length": BODY.length });
+      res.end(BODY);
+    });
+    const output = join(dir, "clip.mp4");
+
+    const result = await downloadToFile(url, output, { retryDelayMs: 0 });
+
+    expect(result.sha256).toBe(SHA256);
+    expect(readFileSync(output).equals(BODY)).toBe(true);
+  });
+
+  it("fails on a short body and leaves nothing behind", async () => {
+    const url = await serve((req, res) => {
+      res.writeHead(200, { "content-length": BODY.length });
+      res.write(BODY.subarray(0, 1000), () => res.destroy());
+    });
+    const output = join(dir, "clip.mp4");
+
+    await expect(downloadToFile(url, output, { maxAttempts: 2, retryDelayMs: 0 })).rejects.toThrow();
+    expect(requests).toHaveLength(2);
+    expect(readdirSync(dir)).toEqual([]);
+  });
+
+  it("does not retry an HTTP client error", async () => {
+    const url = await serve((_req, res) => {
+      res.writeHead(404);
+      res.end();
+    });
+    const output = join(dir, "clip.mp4");
+
+    await expect(downloadToFile(url, output, { retryDelayMs: 0 })).rejects.toBeInstanceOf(
+      DownloadHttpError
+    );
+    expect(requests).toHaveLength(1);
+    expect(existsSync(output)).toBe(false);
+  });
+});
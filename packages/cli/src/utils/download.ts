@@ -0,0 +1,220 @@
+/**
+ * @module utils/download
+ * @description Streaming downloads for generated media. The response body is
+ * piped straight to `<output>.<id>.part` while being hashed, then renamed over
+ * the output, so a multi-hundred-MB provider result never sits in memory and
+ * a failed download never leaves a half-written file at the final path.
+ * Interrupted transfers resume with an HTTP `Range` request when the server
+ * supports it and restart from zero when it does not.
+ */
+
+import { createHash, randomUUID, type Hash } from "node:crypto";
+import { createReadStream, createWriteStream } from "node:fs";
+import { mkdir, rename, rm, stat } from "node:fs/promises";
+import { dirname } from "node:path";
+import { Readable, Transform } from "node:stream";
+import { pipeline } from "node:stream/promises";
+import type { ReadableStream as WebReadableStream } from "node:stream/web";
+
+export interface DownloadProgress {
+  /** Bytes of the final file on disk so far, including resumed bytes. */
+  bytes: number;
+  /** Expected size, when the server sent a usable Content-Length. */
+  totalBytes?: number;
+}
+
+export interface DownloadOptions {
+  headers?: Record<string, string>;
+  /** Called after every chunk is handed to the file. */
+  onProgress?: (progress: DownloadProgress) => void;
+  /** Total attempts, the first request included. Default 4. */
+  maxAttempts?: number;
+  /** Base delay before a resume attempt; doubles per attempt. Default 500ms. */
+  retryDelayMs?: number;
+  signal?: AbortSignal;
+}
+
+export interface DownloadResult {
+  path: string;
+  bytes: number;
+  /** Hex sha256 of the downloaded bytes, computed while streaming. */
+  sha256: string;
+  /** How many times the transfer was resumed or restarted. */
+  resumes: number;
+}
+
+/** Thrown for an HTTP error status. Only 5xx responses are retried. */
+export class DownloadHttpError extends Error {
+  constructor(
+    readonly status: number,
+    statusText: string
+  ) {
+    super(`Download failed (${status}): ${statusText}`);
+    this.name = "DownloadHttpError";
+  }
+}
+
+const DEFAULT_MAX_ATTEMPTS = 4;
+const DEFAULT_RETRY_DELAY_MS = 500;
+
+/**
+ * Download `url` to `outputPath` (parent directories are created). Resolves
+ * once the file is complete and in place. Rejects on an HTTP error status,
+ * when the body stays shorter than Content-Length after every attempt, or
+ * when the network keeps failing; the partial file is removed either way.
+ */
+export async function downloadToFile(
+  url: string,
+  outputPath: string,
+  opts: DownloadOptions = {}
+): Promise<DownloadResult> {
+  const maxAttempts = Math.max(1, opts.maxAttempts ?? DEFAULT_MAX_ATTEMPTS);
+  const retryDelayMs = opts.retryDelayMs ?? DEFAULT_RETRY_DELAY_MS;
+  const partPath = `${outputPath}.${randomUUID().slice(0, 8)}.part`;
+  await mkdir(dirname(outputPath), { recursive: true });
+
+  let written = 0;
+  let hash = createHash("sha256");
+  let totalBytes: number | undefined;
+  // ETag / Last-Modified of the first response, sent as If-Range so a resume
+  // never splices bytes from a different version of the file.
+  let validator: string | undefined;
+  let resumes = 0;
+  let lastError: unknown;
+
+  try {
+    for (let attempt = 0; attempt < maxAttempts; attempt++) {
+      if (attempt > 0) {
+        resumes += 1;
+        await delay(retryDelayMs * 2 ** (attempt - 1), opts.signal);
+      }
+
+      const headers: Record<string, string> = { ...opts.headers };
+      if (written > 0) {
+        headers.Range = `bytes=${written}-`;
+        if (validator) headers["If-Range"] = validator;
+      }
+
+      let response: Response;
+      try {
+        response = await fetch(url, { headers, redirect: "follow", signal: opts.signal });
+      } catch (error) {
+        if (opts.signal?.aborted) throw error;
+        lastError = error;
+        continue;
+      }
+      if (!response.ok) {
+        await response.body?.cancel().catch(() => undefined);
+        if (response.status >= 500 && attempt + 1 < maxAttempts) {
+          lastError = new DownloadHttpError(response.status, response.statusText);
+          continue;
+        }
+        throw new DownloadHttpError(response.status, response.statusText);
+      }
+      if (!response.body) throw new Error("Download failed: empty response body");
+
+      const resumed = written > 0 && response.status === 206 && rangeStart(response) === written;
+      if (!resumed && response.status === 206) {
+        // A range we did not ask for; drop the partial file and refetch it whole.
+        await response.body.cancel().catch(() => undefined);
+        written = 0;
+        hash = createHash("sha256");
+        lastError = new Error("Download failed: unexpected Content-Range");
+        continue;
+      }
+      if (!resumed) {
+        // First request, or the server ignored the Range: start over.
+        written = 0;
+        hash = createHash("sha256");
+        totalBytes = declaredLength(response);
+        validator =
+          response.headers.get("etag") ?? response.headers.get("last-modified") ?? undefined;
+      }
+
+      const file = createWriteStream(partPath, { flags: resumed ? "a" : "w" });
+      try {
+        await pipeline(
+          Readable.fromWeb(response.body as WebReadableStream<Uint8Array>),
+          new Transform({
+            transform(chunk: Buffer, _encoding, callback) {
+              hash.update(chunk);
+              written += chunk.length;
+              opts.onProgress?.({ bytes: written, totalBytes });
+              callback(null, chunk);
+            },
+          }),
+          file
+        );
+      } catch (error) {
+        if (!file.closed) await new Promise((resolve) => file.once("close", resolve));
+        if (opts.signal?.aborted) throw error;
+        lastError = error;
+        // Chunks counted by the transform may not have reached the disk before
+        // the pipeline tore down; resume from what the part file really holds.
+        ({ written, hash } = await rehashPart(partPath));
+        continue;
+      }
+
+      if (totalBytes !== undefined && written !== totalBytes) {
+        lastError = new Error(`Download truncated: got ${written} of ${totalBytes} bytes`);
+        if (written > totalBytes) {
+          written = 0;
+          hash = createHash("sha256");
+        }
+        continue;
+      }
+
+      await rename(partPath, outputPath);
+      return { path: outputPath, bytes: written, sha256: hash.digest("hex"), resumes };
+    }
+    throw lastError instanceof Error ? lastError : new Error(String(lastError));
+  } catch (error) {
+    await rm(partPath, { force: true });
+    throw error;
+  }
+}
+
+/**
+ * Length of the whole file as the server declares it: the total from
+ * Content-Range, else Content-Length. Unknown when the body is
+ * content-encoded, since fetch hands back decoded bytes.
+ */
+function declaredLength(response: Response): number | undefined {
+  const encoding = response.headers.get("content-encoding");
+  if (encoding && encoding !== "identity") return undefined;
+  const range = response.headers.get("content-range")?.match(/\/(\d+)\s*$/);
+  if (range) return Number(range[1]);
+  const length = response.headers.get("content-length");
+  return length !== null && /^\d+$/.test(length) ? Number(length) : undefined;
+}
+
+function rangeStart(response: Response): number | undefined {
+  const match = response.headers.get("content-range")?.match(/^bytes\s+(\d+)-/);
+  return match ? Number(match[1]) : undefined;
+}
+
+async function rehashPart(partPath: string): Promise<{ written: number; hash: Hash }> {
+  const hash = createHash("sha256");
+  const size = await stat(partPath).then(
+    (stats) => stats.size,
+    () => 0
+  );
+  if (size === 0) return { written: 0, hash };
+  for await (const chunk of createReadStream(partPath)) hash.update(chunk as Buffer);
+  return { written: size, hash };
+}
+
+function delay(ms: number, signal?: AbortSignal): Promise<void> {
+  if (ms <= 0) return Promise.resolve();
+  return new Promise((resolve, reject) => {
+    const timer = setTimeout(resolve, ms);
+    signal?.addEventListener(
+      "abort",
+      () => {
+        clearTimeout(timer);
+        reject(signal.reason);
+      },
+      { once: true }
+    );
+  });
+}
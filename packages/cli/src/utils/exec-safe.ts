@@ -1,5 +1,7 @@
-import { execFile, execFileSync } from "node:child_process";
+import { execFile, execFileSync, spawn } from "node:child_process";
+import { createInterface } from "node:readline";
 import { promisify } from "node:util";
+import { probeDuration, probeMedia, probeVideoSize } from "./media-probe.js";
 
 const execFileAsync = promisify(execFile);
 
@@ -16,6 +18,99 @@ export async function execSafe(
   });
 }
 
+/**
+ * Safe streaming exec — no shell, args as array. Yields stderr lines as the
+ * process writes them instead of buffering the whole log, so memory stays
+ * bounded by the longest line. `\r` also ends a line (ffmpeg rewrites its
+ * progress line in place). Breaking out of the loop kills the process.
+ *
+ * Like the `-f null` callers of {@link execSafe}, a non-zero exit is not an
+ * error: the lines seen so far are the result. Spawn failures still throw.
+ */
+export async function* execStderrLines(
+  cmd: string,
+  args: string[],
+  options?: { timeout?: number; cwd?: string; signal?: AbortSignal },
+): AsyncGenerator<string, void, undefined> {
+  const child = spawn(cmd, args, {
+    cwd: options?.cwd,
+    timeout: options?.timeout,
+    signal: options?.signal,
+    stdio: ["ignore", "ignore", "pipe"],
+  });
+  let spawnError: Error | undefined;
+  const exited = new Promise<void>((resolve) => {
+    child.once("close", () => resolve());
+    child.once("error", (err) => {
+      spawnError = err;
+      resolve();
+    });
+  });
+  const lines = createInterface({ input: child.stderr, crlfDelay: Infinity });
+  try {
+    for await (const line of lines) {
+      yield line;
+    }
+    await exited;
+    if (spawnError) throw spawnError;
+  } finally {
+    lines.close();
+    if (child.exitCode === null && child.signalCode === null) child.kill("SIGKILL");
+  }
+}
+
+/**
+ * Safe streaming exec for binary output — no shell, args as array. Yields
+ * stdout chunks as they arrive (e.g. raw PCM from `ffmpeg -f f32le -`), so
+ * the caller decides what to keep. Breaking out of the loop kills the
+ * process. Throws on spawn failure, or on a non-zero exit with the tail of
+ * stderr as the message.
+ */
+export async function* execStdoutChunks(
+  cmd: string,
+  args: string[],
+  options?: { timeout?: number; cwd?: string; signal?: AbortSignal },
+): AsyncGenerator<Buffer, void, undefined> {
+  const child = spawn(cmd, args, {
+    cwd: options?.cwd,
+    timeout: options?.timeout,
+    signal: options?.signal,
+    stdio: ["ignore", "pipe", "pipe"],
+  });
+  let stderrTail = "";
+  child.stderr.setEncoding("utf-8");
+  child.stderr.on("data", (text: string) => {
+    stderrTail = (stderrTail + text).slice(-2000);
+  });
+  let spawnError: Error | undefined;
+  const exited = new Promise<number | null>((resolve) => {
+    child.once("close", (code) => resolve(code));
+    child.once("error", (err) => {
+      spawnError = err;
+      resolve(null);
+    });
+  });
+  try {
+    try {
+      for await (const chunk of child.stdout) {
+        yield chunk as Buffer;
+      }
+    } catch (err) {
+      // A failed spawn surfaces here as a premature close; report the cause.
+      await exited;
+      throw spawnError ?? err;
+    }
+    const code = await exited;
+    if (spawnError) throw spawnError;
+    if (code !== 0) {
+      const lastLine = stderrTail.trim().split("\n").pop() || `exit code ${code}`;
+      throw new Error(`${cmd} failed: ${lastLine}`);
+    }
+  } finally {
+    if (child.exitCode === null && child.signalCode === null) child.kill("SIGKILL");
+  }
+}
+
 /** Safe sync exec — no shell, args as array */
 export function execSafeSync(
   cmd: string,
@@ -28,41 +123,16 @@ export function execSafeSync(
   });
 }
 
-/** Shorthand: ffprobe duration query */
+/** Shorthand: ffprobe duration query (cached per file, see `media-probe`) */
 export async function ffprobeDuration(filePath: string): Promise<number> {
-  const { stdout } = await execSafe("ffprobe", [
-    "-v",
-    "error",
-    "-show_entries",
-    "format=duration",
-    "-of",
-    "default=noprint_wrappers=1:nokey=1",
-    filePath,
-  ]);
-  const duration = parseFloat(stdout.trim());
-  if (isNaN(duration)) throw new Error(`Invalid duration: ${stdout}`);
-  return duration;
+  return probeDuration(await probeMedia(filePath));
 }
 
-/** Shorthand: ffprobe video dimensions */
+/** Shorthand: ffprobe video dimensions (cached per file, see `media-probe`) */
 export async function ffprobeVideoSize(
   filePath: string,
 ): Promise<{ width: number; height: number }> {
-  const { stdout } = await execSafe("ffprobe", [
-    "-v",
-    "error",
-    "-select_streams",
-    "v:0",
-    "-show_entries",
-    "stream=width,height",
-    "-of",
-    "csv=p=0:s=x",
-    filePath,
-  ]);
-  const [w, h] = stdout.trim().split("x").map(Number);
-  if (isNaN(w) || isNaN(h))
-    throw new Error(`Invalid dimensions: ${stdout.trim()}`);
-  return { width: w, height: h };
+  return probeVideoSize(await probeMedia(filePath));
 }
 
 /** Shorthand: check if a command exists */
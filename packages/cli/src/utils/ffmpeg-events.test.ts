@@ -0,0 +1,82 @@
+import { describe, expect, it } from "vitest";
+import { execStderrLines } from "./exec-safe.js";
+import { FfmpegEventParser, parseFfmpegEvents } from "./ffmpeg-events.js";
+
+describe("FfmpegEventParser", () => {
+  it("emits each event on the line that completes it", () => {
+    const parser = new FfmpegEventParser();
+
+    expect(parser.push("[silencedetect @ 0x1] silence_start: 2.5")).toEqual([]);
+    expect(parser.push("[silencedetect @ 0x1] silence_end: 4 | silence_duration: 1.5")).toEqual([
+      { type: "silence", range: { start: 2.5, end: 4, duration: 1.5 } },
+    ]);
+    expect(parser.push("[freezedetect @ 0x2] lavfi.freezedetect.freeze_start: 1")).toEqual([]);
+    expect(parser.push("[freezedetect @ 0x2] lavfi.freezedetect.freeze_end: 3.5")).toEqual([
+      { type: "freeze", range: { start: 1, end: 3.5, duration: 2.5 } },
+    ]);
+  });
+
+  it("parses scdet and select+showinfo scene cuts", () => {
+    const parser = new FfmpegEventParser();
+
+    expect(parser.push("[scdet @ 0x3] lavfi.scd.score: 42.125, lavfi.scd.time: 7.2")).toEqual([
+      { type: "scene", time: 7.2, score: 42.125 },
+    ]);
+    expect(
+      parser.push("[Parsed_showinfo_1 @ 0x4] n:   3 pts:  98304 pts_time:3.2 duration:512")
+    ).toEqual([{ type: "scene", time: 3.2 }]);
+  });
+
+  it("reports decode progress from the stats line", () => {
+    const parser = new FfmpegEventParser();
+
+    expect(parser.push("size=N/A time=00:01:02.50 bitrate=N/A speed=42x")).toEqual([
+      { type: "progress", time: 62.5 },
+    ]);
+  });
+
+  it("drops a silence end whose start line is missing", () => {
+    const out = [
+      "[silencedetect @ 0x1] silence_end: 9 | silence_duration: 2",
+      "[silencedetect @ 0x1] silence_start: 12",
+      "[silencedetect @ 0x1] silence_end: 13 | silence_duration: 1",
+    ].join("\n");
+    expect(parseFfmpegEvents(out)).toEqual([
+      { type: "silence", range: { start: 12, end: 13, duration: 1 } },
+    ]);
+  });
+});
+
+describe("execStderrLines", () => {
+  it("splits stderr on both newlines and carriage returns", async () => {
+    const lines: string[] = [];
+    for await (const line of execStderrLines(process.execPath, [
+      "-e",
+      "process.stderr.write('a\\rb\\nc\\n')",
+    ])) {
+      lines.push(line);
+    }
+    expect(lines).toEqual(["a", "b", "c"]);
+  });
+
+  it("kills the process when the consumer stops early", async () => {
+    const started = Date.now();
+    for await (const line of execStderrLines(process.execPath, [
+      "-e",
+      "process.stderr.write('first\\n'); setTimeout(() => {}, 30000)",
+    ])) {
+      expect(line).toBe("first");
+      break;
+    }
+    expect(Date.now() - started).toBeLessThan(10000);
+  });
+
+  it("throws when the command cannot be spawned", async () => {
+    const lines: string[] = [];
+    const iterate = async () => {
+      for await (const line of execStderrLines("vibe-no-such-binary", [])) lines.push(line);
+    };
+    await expect(iterate()).rejects.toThrow();
+    expect(lines).toEqual([]);
+  });
+});
@@ -0,0 +1,189 @@
+/**
+ * @module utils/ffmpeg-events
+ * @description Incremental parsers for ffmpeg analysis filters
+ * (blackdetect, freezedetect, silencedetect, scdet, select+showinfo) plus a
+ * streaming runner that turns a `-f null` decode into events as they are
+ * logged. Parser state is O(1) per filter, so memory does not grow with
+ * input length, and callers can report progress or stop the decode early.
+ */
+
+import { execStderrLines } from "./exec-safe.js";
+
+export interface FfmpegTimeRange {
+  start: number;
+  end: number;
+  duration: number;
+}
+
+export type FfmpegFilterEvent =
+  | { type: "black"; range: FfmpegTimeRange }
+  | { type: "freeze"; range: FfmpegTimeRange }
+  | { type: "silence"; range: FfmpegTimeRange }
+  | { type: "scene"; time: number; score?: number };
+
+export type FfmpegLogEvent = FfmpegFilterEvent | { type: "progress"; time: number };
+
+const NUM = "(-?\\d+(?:\\.\\d+)?)";
+const BLACK_RE = new RegExp(`black_start:${NUM}\\s+black_end:${NUM}\\s+black_duration:${NUM}`);
+const FREEZE_RE = new RegExp(`lavfi\\.freezedetect\\.freeze_(start|duration|end):\\s*${NUM}`);
+const SILENCE_START_RE = new RegExp(`silence_start:\\s*${NUM}`);
+const SILENCE_END_RE = new RegExp(`silence_end:\\s*${NUM}\\s+\\|\\s+silence_duration:\\s*${NUM}`);
+const SCDET_RE = new RegExp(`lavfi\\.scd\\.score:\\s*${NUM},\\s*lavfi\\.scd\\.time:\\s*${NUM}`);
+const SHOWINFO_RE = /^\[(?:Parsed_)?showinfo.*\bpts_time:\s*(\d+(?:\.\d+)?)/;
+const PROGRESS_RE = /\btime=(\d+):(\d{2}):(\d{2}(?:\.\d+)?)/;
+
+/**
+ * Stateful line parser. Feed ffmpeg stderr one line at a time; each call
+ * returns the events completed by that line. Ranges that span several
+ * lines (silence, freeze) are held as a single pending start.
+ */
+export class FfmpegEventParser {
+  private silenceStart: number | undefined;
+  private freezeStart: number | undefined;
+  private freezeDuration: number | undefined;
+
+  push(line: string): FfmpegLogEvent[] {
+    const events: FfmpegLogEvent[] = [];
+    let match: RegExpExecArray | null;
+
+    if ((match = BLACK_RE.exec(line))) {
+      events.push({
+        type: "black",
+        range: {
+          start: Number.parseFloat(match[1]),
+          end: Number.parseFloat(match[2]),
+          duration: Number.parseFloat(match[3]),
+        },
+      });
+    }
+
+    if ((match = FREEZE_RE.exec(line))) {
+      const value = Number.parseFloat(match[2]);
+      if (match[1] === "start") {
+        this.freezeStart = value;
+        this.freezeDuration = undefined;
+      } else if (match[1] === "duration") {
+        this.freezeDuration = value;
+      } else if (this.freezeStart !== undefined) {
+        const start = this.freezeStart;
+        events.push({
+          type: "freeze",
+          range: {
+            start,
+            end: value,
+            duration: this.freezeDuration ?? Number((value - start).toFixed(3)),
+          },
+        });
+        this.freezeStart = undefined;
+        this.freezeDuration = undefined;
+      }
+    }
+
+    if ((match = SILENCE_START_RE.exec(line))) {
+      this.silenceStart = Number.parseFloat(match[1]);
+    }
+    // An end without a start (the log was cut, or the scan began inside a
+    // silence) is dropped, as the buffered parsers always did.
+    if ((match = SILENCE_END_RE.exec(line)) && this.silenceStart !== undefined) {
+      events.push({
+        type: "silence",
+        range: {
+          start: this.silenceStart,
+          end: Number.parseFloat(match[1]),
+          duration: Number.parseFloat(match[2]),
+        },
+      });
+      this.silenceStart = undefined;
+    }
+
+    if ((match = SCDET_RE.exec(line))) {
+      events.push({
+        type: "scene",
+        time: Number.parseFloat(match[2]),
+        score: Number.parseFloat(match[1]),
+      });
+    } else if ((match = SHOWINFO_RE.exec(line))) {
+      events.push({ type: "scene", time: Number.parseFloat(match[1]) });
+    }
+
+    if ((match = PROGRESS_RE.exec(line))) {
+      events.push({
+        type: "progress",
+        time:
+          Number.parseInt(match[1], 10) * 3600 +
+          Number.parseInt(match[2], 10) * 60 +
+          Number.parseFloat(match[3]),
+      });
+    }
+
+    return events;
+  }
+}
+
+/** Parse an already-buffered ffmpeg log. Progress lines are dropped. */
+export function parseFfmpegEvents(output: string): FfmpegFilterEvent[] {
+  const parser = new FfmpegEventParser();
+  const events: FfmpegFilterEvent[] = [];
+  for (const line of output.split(/\r?\n|\r/)) {
+    for (const event of parser.push(line)) {
+      if (event.type !== "progress") events.push(event);
+    }
+  }
+  return events;
+}
+
+/** Collect the time ranges of one range-shaped event type. */
+export function eventRanges(
+  events: readonly FfmpegFilterEvent[],
+  type: "black" | "freeze" | "silence"
+): FfmpegTimeRange[] {
+  const ranges: FfmpegTimeRange[] = [];
+  for (const event of events) {
+    if (event.type === type) ranges.push(event.range);
+  }
+  return ranges;
+}
+
+export interface FfmpegEventStreamOptions {
+  /** Called for every filter event as soon as ffmpeg logs it. */
+  onEvent?: (event: FfmpegFilterEvent) => void;
+  /** Called with the decode position (seconds) from ffmpeg's progress line. */
+  onProgress?: (timeSec: number) => void;
+  /** Stop the decode once this returns true. Events seen so far are kept. */
+  stopWhen?: (event: FfmpegFilterEvent, events: readonly FfmpegFilterEvent[]) => boolean;
+  timeout?: number;
+  signal?: AbortSignal;
+}
+
+export interface FfmpegEventStreamResult {
+  events: FfmpegFilterEvent[];
+  /** True when `stopWhen` ended the decode before the input was exhausted. */
+  stopped: boolean;
+}
+
+/**
+ * Run ffmpeg and parse its stderr while the decode runs. Only the parsed
+ * events are retained, never the raw log.
+ */
+export async function streamFfmpegEvents(
+  args: string[],
+  opts: FfmpegEventStreamOptions = {}
+): Promise<FfmpegEventStreamResult> {
+  const parser = new FfmpegEventParser();
+  const events: FfmpegFilterEvent[] = [];
+  for await (const line of execStderrLines("ffmpeg", args, {
+    timeout: opts.timeout,
+    signal: opts.signal,
+  })) {
+    for (const event of parser.push(line)) {
+      if (event.type === "progress") {
+        opts.onProgress?.(event.time);
+        continue;
+      }
+      events.push(event);
+      opts.onEvent?.(event);
+      if (opts.stopWhen?.(event, events)) return { events, stopped: true };
+    }
+  }
+  return { events, stopped: false };
+}
@@ -0,0 +1,126 @@
+import { afterEach, beforeEach, describe, expect, it, vi } from "vitest";
+import { createHash } from "node:crypto";
+import { existsSync, mkdirSync, mkdtempSync, rmSync, statSync, writeFileSync } from "node:fs";
+import { tmpdir } from "node:os";
+import { join } from "node:path";
+import {
+  PROBE_CACHE_SUBDIR,
+  clearMediaProbeMemo,
+  probeDuration,
+  probeHasAudio,
+  probeMedia,
+  probeMediaBatch,
+  probeVideoSize,
+  pruneProbeCache,
+  type MediaProbe,
+} from "./media-probe.js";
+
+// ffprobe is only reached for URL inputs here; file tests use seeded entries.
+const { execFileMock } = vi.hoisted(() => ({ execFileMock: vi.fn() }));
+vi.mock("node:child_process", () => ({ execFile: execFileMock }));
+
+const SAMPLE: MediaProbe = {
+  streams: [
+    { index: 0, codec_type: "video", codec_name: "h264", width: 1920, height: 1080 },
+    { index: 1, codec_type: "audio", codec_name: "aac", channels: 2 },
+  ],
+  format: { duration: "12.500000", size: "1024" },
+};
+
+function seedEntry(projectDir: string, absPath: string, probe: MediaProbe): string {
+  const stats = statSync(absPath);
+  const key = createHash("sha256").update(absPath).digest("hex").slice(0, 32);
+  const entryPath = join(projectDir, PROBE_CACHE_SUBDIR, `${key}.json`);
+  mkdirSync(join(projectDir, PROBE_CACHE_SUBDIR), { recursive: true });
+  writeFileSync(
+    entryPath,
+    JSON.stringify({
+      version: 1,
+      path: absPath,
+      size: stats.size,
+      mtimeMs: stats.mtimeMs,
+      ino: stats.ino,
+      probedAt: new Date().toISOString(),
+      probe,
+    })
+  );
+  return entryPath;
+}
+
+describe("probe accessors", () => {
+  it("reads duration, video size and audio presence", () => {
+    expect(probeDuration(SAMPLE)).toBe(12.5);
+    expect(probeVideoSize(SAMPLE)).toEqual({ width: 1920, height: 1080 });
+    expect(probeHasAudio(SAMPLE)).toBe(true);
+  });
+
+  it("throws on missing duration or video stream", () => {
+    const audioOnly: MediaProbe = { streams: [{ codec_type: "audio" }], format: {} };
+    expect(() => probeDuration(audioOnly)).toThrow(/Invalid duration/);
+    expect(() => probeVideoSize(audioOnly)).toThrow(/no video stream/);
+  });
+});
+
+describe("probeMedia", () => {
+  it("probes URLs directly instead of statting them", async () => {
+    execFileMock.mockImplementation(
+      (_cmd: string, _args: string[], _opts: unknown, callback: (...a: unknown[]) => void) =>
+        callback(null, { stdout: JSON.stringify(SAMPLE), stderr: "" })
+    );
+
+    await expect(probeMedia("https://cdn.example.com/clip.mp4")).resolves.toEqual(SAMPLE);
+    expect(execFileMock.mock.calls[0][1]).toContain("https://cdn.example.com/clip.mp4");
+  });
+});
+
+describe("probe cache", () => {
+  let projectDir: string;
+
+  beforeEach(() => {
+    projectDir = mkdtempSync(join(tmpdir(), "media-probe-test-"));
+    writeFileSync(join(projectDir, "vibe.config.json"), "{}");
+    mkdirSync(join(projectDir, "assets"));
+    clearMediaProbeMemo();
+  });
+
+  afterEach(() => {
+    rmSync(projectDir, { recursive: true, force: true });
+  });
+
+  it("serves an unchanged file from the on-disk entry without running ffprobe", async () => {
+    const media = join(projectDir, "assets", "narration.wav");
+    writeFileSync(media, "not really audio");
+    seedEntry(projectDir, media, SAMPLE);
+
+    await expect(probeMedia(media)).resolves.toEqual(SAMPLE);
+  });
+
+  it("returns per-file errors from a batch instead of failing it", async () => {
+    const media = join(projectDir, "assets", "a.wav");
+    const missing = join(projectDir, "assets", "missing.wav");
+    writeFileSync(media, "a");
+    seedEntry(projectDir, media, SAMPLE);
+
+    const results = await probeMediaBatch([media, missing, media]);
+    expect(results.size).toBe(2);
+    expect(results.get(media)).toEqual(SAMPLE);
+    expect(results.get(missing)).toBeInstanceOf(Error);
+  });
+
+  it("evicts entries whose source changed or disappeared", async () => {
+    const kept = join(projectDir, "assets", "kept.wav");
+    const changed = join(projectDir, "assets", "changed.wav");
+    const removed = join(projectDir, "assets", "removed.wav");
+    for (const file of [kept, changed, removed]) writeFileSync(file, "x");
+    const keptEntry = seedEntry(projectDir, kept, SAMPLE);
+    const changedEntry = seedEntry(projectDir, changed, SAMPLE);
+    const removedEntry = seedEntry(projectDir, removed, SAMPLE);
+    writeFileSync(changed, "grown since probe");
+    rmSync(removed);
+
+    await expect(pruneProbeCache(projectDir)).resolves.toBe(2);
+    expect(existsSync(keptEntry)).toBe(true);
+    expect(existsSync(changedEntry)).toBe(false);
+    expect(existsSync(removedEntry)).toBe(false);
+  });
+});
@@ -0,0 +1,278 @@
+/**
+ * @module utils/media-probe
+ * @description Cached ffprobe. Each file is probed once for its full format
+ * and stream info; the result is reused for as long as the file's path, size,
+ * mtime and inode are unchanged. Results live in an in-process memo and, for
+ * files inside a scene project, on disk under `.vibeframe/cache/probe/` so
+ * repeated `vibe build` / `render` / `inspect` runs skip the subprocess.
+ */
+
+import { execFile } from "node:child_process";
+import { createHash } from "node:crypto";
+import { existsSync } from "node:fs";
+import { mkdir, readFile, readdir, rename, rm, stat, writeFile } from "node:fs/promises";
+import { dirname, join, resolve } from "node:path";
+import { promisify } from "node:util";
+import { mapWithConcurrency } from "./concurrency.js";
+import { LEGACY_SCENE_CONFIG_FILENAME, SCENE_CONFIG_FILENAME } from "./project-resolver.js";
+
+const execFileAsync = promisify(execFile);
+
+export interface MediaProbeStream {
+  index?: number;
+  codec_type?: string;
+  codec_name?: string;
+  width?: number;
+  height?: number;
+  pix_fmt?: string;
+  r_frame_rate?: string;
+  avg_frame_rate?: string;
+  sample_rate?: string;
+  channels?: number;
+  duration?: string;
+  [key: string]: unknown;
+}
+
+export interface MediaProbeFormat {
+  filename?: string;
+  format_name?: string;
+  duration?: string;
+  size?: string;
+  bit_rate?: string;
+  [key: string]: unknown;
+}
+
+/** `ffprobe -print_format json -show_format -show_streams` output. */
+export interface MediaProbe {
+  streams?: MediaProbeStream[];
+  format?: MediaProbeFormat;
+}
+
+interface FileIdentity {
+  size: number;
+  mtimeMs: number;
+  ino: number;
+}
+
+interface ProbeCacheEntry extends FileIdentity {
+  version: number;
+  path: string;
+  probedAt: string;
+  probe: MediaProbe;
+}
+
+export const PROBE_CACHE_SUBDIR = join(".vibeframe", "cache", "probe");
+const PROBE_CACHE_VERSION = 1;
+const DEFAULT_BATCH_CONCURRENCY = 4;
+/** `scheme://…` inputs ffprobe opens itself; a Windows drive path has no `//`. */
+const URL_INPUT_PATTERN = /^[a-z][a-z0-9+.-]*:\/\//i;
+
+const memo = new Map<string, { identity: FileIdentity; probe: MediaProbe }>();
+const inflight = new Map<string, Promise<MediaProbe>>();
+const projectRootByDir = new Map<string, string | null>();
+
+/**
+ * Probe `filePath`, reusing a previous result when the file is unchanged.
+ * Throws when the file is missing or ffprobe cannot read it; failures are
+ * not cached. URLs (`http://`, `https://`, …) have no file identity to key
+ * on and are always probed directly.
+ */
+export async function probeMedia(filePath: string): Promise<MediaProbe> {
+  if (URL_INPUT_PATTERN.test(filePath)) return runFfprobe(filePath);
+  const absPath = resolve(filePath);
+  const identity = fileIdentity(await stat(absPath));
+  const hit = memo.get(absPath);
+  if (hit && sameIdentity(hit.identity, identity)) return hit.probe;
+
+  const key = `${absPath}\0${identity.size}\0${identity.mtimeMs}\0${identity.ino}`;
+  const pending = inflight.get(key);
+  if (pending) return pending;
+
+  const task = loadOrProbe(absPath, identity).finally(() => inflight.delete(key));
+  inflight.set(key, task);
+  return task;
+}
+
+/**
+ * Probe many files at once. Cache hits are answered without spawning
+ * ffprobe; misses are probed with bounded concurrency. Per-file failures are
+ * returned as `Error` values so one unreadable input does not fail the batch.
+ */
+export async function probeMediaBatch(
+  filePaths: readonly string[],
+  opts: { concurrency?: number } = {}
+): Promise<Map<string, MediaProbe | Error>> {
+  const unique = [...new Set(filePaths)];
+  const results = new Map<string, MediaProbe | Error>();
+  await mapWithConcurrency(
+    unique,
+    opts.concurrency ?? DEFAULT_BATCH_CONCURRENCY,
+    async (filePath) => {
+      try {
+        results.set(filePath, await probeMedia(filePath));
+      } catch (error) {
+        results.set(filePath, error instanceof Error ? error : new Error(String(error)));
+      }
+    }
+  );
+  return results;
+}
+
+/** Container duration in seconds. Throws when ffprobe reported none. */
+export function probeDuration(probe: MediaProbe): number {
+  const duration = Number.parseFloat(probe.format?.duration ?? "");
+  if (Number.isNaN(duration)) throw new Error(`Invalid duration: ${probe.format?.duration ?? ""}`);
+  return duration;
+}
+
+/** Dimensions of the first video stream. Throws when there is none. */
+export function probeVideoSize(probe: MediaProbe): { width: number; height: number } {
+  const video = probe.streams?.find((stream) => stream.codec_type === "video");
+  const width = Number(video?.width);
+  const height = Number(video?.height);
+  if (!video || Number.isNaN(width) || Number.isNaN(height)) {
+    const found = video ? `${video.width}x${video.height}` : "no video stream";
+    throw new Error(`Invalid dimensions: ${found}`);
+  }
+  return { width, height };
+}
+
+export function probeHasAudio(probe: MediaProbe): boolean {
+  return probe.streams?.some((stream) => stream.codec_type === "audio") ?? false;
+}
+
+/**
+ * Remove on-disk entries under `<projectDir>/.vibeframe/cache/probe/` whose
+ * source file is gone or has changed since it was probed. Unreadable entries
+ * are removed too. Returns the number of entries evicted.
+ */
+export async function pruneProbeCache(projectDir: string): Promise<number> {
+  const cacheDir = resolve(projectDir, PROBE_CACHE_SUBDIR);
+  let names: string[];
+  try {
+    names = await readdir(cacheDir);
+  } catch {
+    return 0;
+  }
+  let evicted = 0;
+  for (const name of names) {
+    if (!name.endsWith(".json")) continue;
+    const entryPath = join(cacheDir, name);
+    const entry = await readEntry(entryPath);
+    let live = false;
+    if (entry) {
+      try {
+        live = sameIdentity(entry, fileIdentity(await stat(entry.path)));
+      } catch {
+        live = false;
+      }
+    }
+    if (!live) {
+      await rm(entryPath, { force: true });
+      evicted += 1;
+    }
+  }
+  return evicted;
+}
+
+/** Drop the in-process memo. Intended for tests. */
+export function clearMediaProbeMemo(): void {
+  memo.clear();
+  projectRootByDir.clear();
+}
+
+async function loadOrProbe(absPath: string, identity: FileIdentity): Promise<MediaProbe> {
+  const entryPath = probeCacheEntryPath(absPath);
+  if (entryPath) {
+    const entry = await readEntry(entryPath);
+    if (entry && entry.path === absPath && sameIdentity(entry, identity)) {
+      memo.set(absPath, { identity, probe: entry.probe });
+      return entry.probe;
+    }
+  }
+
+  const probe = await runFfprobe(absPath);
+  memo.set(absPath, { identity, probe });
+  if (entryPath) {
+    // Same key as any stale entry for this path, so the write also evicts it.
+    await writeEntry(entryPath, {
+      version: PROBE_CACHE_VERSION,
+      path: absPath,
+      ...identity,
+      probedAt: new Date().toISOString(),
+      probe,
+    }).catch(() => undefined);
+  }
+  return probe;
+}
+
+async function runFfprobe(input: string): Promise<MediaProbe> {
+  const { stdout } = await execFileAsync(
+    "ffprobe",
+    ["-v", "error", "-print_format", "json", "-show_format", "-show_streams", input],
+    { maxBuffer: 16 * 1024 * 1024 }
+  );
+  return JSON.parse(stdout) as MediaProbe;
+}
+
+/**
+ * On-disk entry path for a file, or null when it is not inside a scene
+ * project (the memo still applies; nothing is written next to arbitrary
+ * media).
+ */
+function probeCacheEntryPath(absPath: string): string | null {
+  const root = findProjectRoot(dirname(absPath));
+  if (!root) return null;
+  const key = createHash("sha256").update(absPath).digest("hex").slice(0, 32);
+  return join(root, PROBE_CACHE_SUBDIR, `${key}.json`);
+}
+
+function findProjectRoot(startDir: string): string | null {
+  const visited: string[] = [];
+  let dir = startDir;
+  let root: string | null = null;
+  for (;;) {
+    const known = projectRootByDir.get(dir);
+    if (known !== undefined) {
+      root = known;
+      break;
+    }
+    visited.push(dir);
+    if (
+      existsSync(join(dir, SCENE_CONFIG_FILENAME)) ||
+      existsSync(join(dir, LEGACY_SCENE_CONFIG_FILENAME))
+    ) {
+      root = dir;
+      break;
+    }
+    const parent = dirname(dir);
+    if (parent === dir) break;
+    dir = parent;
+  }
+  for (const visitedDir of visited) projectRootByDir.set(visitedDir, root);
+  return root;
+}
+
+async function readEntry(entryPath: string): Promise<ProbeCacheEntry | null> {
+  try {
+    const entry = JSON.parse(await readFile(entryPath, "utf-8")) as ProbeCacheEntry;
+    return entry.version === PROBE_CACHE_VERSION && typeof entry.path === "string" ? entry : null;
+  } catch {
+    return null;
+  }
+}
+
+async function writeEntry(entryPath: string, entry: ProbeCacheEntry): Promise<void> {
+  await mkdir(dirname(entryPath), { recursive: true });
+  const tmp = `${entryPath}.${process.pid}.tmp`;
+  await writeFile(tmp, JSON.stringify(entry), "utf-8");
+  await rename(tmp, entryPath);
+}
+
+function fileIdentity(stats: { size: number; mtimeMs: number; ino: number }): FileIdentity {
+  return { size: stats.size, mtimeMs: stats.mtimeMs, ino: stats.ino };
+}
+
+function sameIdentity(a: FileIdentity, b: FileIdentity): boolean {
+  return a.size === b.size && a.mtimeMs === b.mtimeMs && a.ino === b.ino;
+}
@@ -88,6 +88,27 @@ export async function buildServerBundle({ outDir = "dist", bundleHostDeps = fals
     plugins: [cliSourceAliasPlugin],
   });
 
+  // Kokoro TTS worker pool entry. The pool spawns `./kokoro-worker.js`
+  // relative to the bundle; without it local TTS stays on the main thread.
+  await build({
+    entryPoints: [resolve(root, "packages/ai-providers/src/kokoro/kokoro-worker.ts")],
+    bundle: true,
+    platform: "node",
+    target: "node18",
+    format: "esm",
+    outfile: join(outDir, "kokoro-worker.js"),
+    banner: {
+      js: [
+        "import { createRequire as __vfCreateRequire } from 'node:module';",
+        "const require = __vfCreateRequire(import.meta.url);",
+      ].join("\n"),
+    },
+    external: ["kokoro-js", "@huggingface/transformers", "onnxruntime-node", "onnxruntime-node/*", "sharp"],
+    sourcemap: false,
+    minify: false,
+    treeShaking: true,
+  });
+
   // The bundled @hyperframes/producer resolves its verified Hyperframe runtime
   // (hyperframe.manifest.json + the iife artifact it names) as SIBLINGS of its
   // own module file. After bundling, import.meta.url points at <outDir>/index.js,
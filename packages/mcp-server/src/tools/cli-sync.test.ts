@@ -67,7 +67,8 @@ const CLI_TREE: Record<string, string[]> = {
 // "manifest-as-tool" mold.
 const CLI_ONLY_TOP_LEVEL = new Set([
   "setup", "init", "build", "render", "doctor", "demo", "agent", "run",
-  "batch", "schema", "context", "media", "help", "plan",
+  "batch", "schema", "context", "media", "help", "plan", "cache",
+  "serve",
 ]);
 
 // CLI subcommands → expected manifest tool name (or null = intentionally
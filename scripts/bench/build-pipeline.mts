@@ -0,0 +1,98 @@
+/**
+ * Wall-time benchmark for the per-beat build pipeline: barrier phases (all
+ * assets, then all transcripts) against transcripts started as each beat's
+ * narration lands. Providers are stubbed with timed delays and dispatched
+ * through the real BuildScheduler lanes and BeatStageTracker.
+ *
+ *     pnpm bench:build-pipeline                         # 40 beats, one slow video
+ *     pnpm bench:build-pipeline -- --beats 80 --slow-video-ms 20000
+ *
+ * Delays are scaled-down stand-ins for TTS, image, video submit and Whisper
+ * latencies; only the relative wall time between the two modes matters.
+ */
+
+import { parseArgs } from "node:util";
+
+const { BuildScheduler } = await import(
+  "../../packages/cli/src/commands/_shared/build-scheduler.js"
+);
+const { BeatStageTracker } = await import(
+  "../../packages/cli/src/commands/_shared/build-pipeline.js"
+);
+
+const { values } = parseArgs({
+  options: {
+    beats: { type: "string", default: "40" },
+    "tts-ms": { type: "string", default: "300" },
+    "image-ms": { type: "string", default: "600" },
+    "video-ms": { type: "string", default: "900" },
+    "slow-video-ms": { type: "string", default: "8000" },
+    "transcript-ms": { type: "string", default: "400" },
+  },
+});
+
+const beatCount = Math.max(1, Number(values.beats));
+const ttsMs = Number(values["tts-ms"]);
+const imageMs = Number(values["image-ms"]);
+const videoMs = Number(values["video-ms"]);
+const slowVideoMs = Number(values["slow-video-ms"]);
+const transcriptMs = Number(values["transcript-ms"]);
+// Beat 3 stands in for the slow Veo clip that used to hold up every beat.
+const SLOW_BEAT = Math.min(2, beatCount - 1);
+
+const sleep = (ms: number) => new Promise<void>((resolve) => setTimeout(resolve, ms));
+
+async function run(pipelined: boolean): Promise<{ wallMs: number; overlappedMs: number }> {
+  const scheduler = new BuildScheduler();
+  const tracker = new BeatStageTracker(() => {});
+  const transcripts: Array<Promise<void>> = [];
+  const transcribe = (beatId: string) =>
+    tracker.track(beatId, "transcript", () =>
+      scheduler.run("transcribe", "openai", () => sleep(transcriptMs))
+    );
+
+  const started = performance.now();
+  await Promise.all(
+    Array.from({ length: beatCount }, async (_, index) => {
+      const beatId = `beat-${index + 1}`;
+      const narration = tracker.track(beatId, "narration", async () => {
+        await scheduler.run("tts", "elevenlabs", () => sleep(ttsMs));
+        if (pipelined) transcripts.push(transcribe(beatId));
+      });
+      const visual = tracker.track(beatId, "visual", async () => {
+        await scheduler.run("image", "openai", () => sleep(imageMs), { priority: 2 });
+        await scheduler.run(
+          "video",
+          "veo",
+          () => sleep(index === SLOW_BEAT ? slowVideoMs : videoMs),
+          { priority: 3 }
+        );
+      });
+      const backdrop = tracker.track(beatId, "backdrop", () =>
+        scheduler.run("image", "openai", () => sleep(imageMs))
+      );
+      await Promise.all([narration, visual, backdrop]);
+    })
+  );
+  if (!pipelined) {
+    for (let index = 0; index < beatCount; index += 1) {
+      transcripts.push(transcribe(`beat-${index + 1}`));
+    }
+  }
+  await Promise.all(transcripts);
+  const wallMs = performance.now() - started;
+  return { wallMs, overlappedMs: tracker.summarize().overlappedMs };
+}
+
+console.log(
+  `${beatCount} beats; tts ${ttsMs}ms, image ${imageMs}ms, video ${videoMs}ms ` +
+    `(one at ${slowVideoMs}ms), transcript ${transcriptMs}ms`
+);
+const barrier = await run(false);
+const pipelined = await run(true);
+console.log(`barrier phases   ${(barrier.wallMs / 1000).toFixed(2)}s`);
+console.log(
+  `pipelined        ${(pipelined.wallMs / 1000).toFixed(2)}s ` +
+    `(${(pipelined.overlappedMs / 1000).toFixed(2)}s of transcript hidden under assets)`
+);
+console.log(`speedup          ${(barrier.wallMs / pipelined.wallMs).toFixed(2)}x`);
@@ -0,0 +1,93 @@
+/**
+ * Cold-start benchmark for the built `vibe` bin: lazy command loading (the
+ * default) against every command module imported up front
+ * (`VIBE_EAGER_COMMANDS=1`, the pre-manifest behaviour).
+ *
+ *     pnpm -F @vibeframe/cli build && pnpm bench:cli-startup
+ *     pnpm bench:cli-startup -- --runs 20
+ *
+ * Each case is a fresh `node` process, as agent hosts spawn it. Exits 1 when
+ * a lazy median exceeds its budget in STARTUP_BUDGET_MS, so a command module
+ * that sneaks back onto the startup path shows up here.
+ */
+
+import { execFileSync } from "node:child_process";
+import { existsSync } from "node:fs";
+import { mkdtemp, rm } from "node:fs/promises";
+import { tmpdir } from "node:os";
+import { join } from "node:path";
+import { fileURLToPath } from "node:url";
+import { parseArgs } from "node:util";
+
+const { values } = parseArgs({
+  options: {
+    runs: { type: "string", default: "10" },
+  },
+});
+
+const runs = Math.max(1, Number(values.runs));
+const bin = fileURLToPath(new URL("../../packages/cli/dist/index.js", import.meta.url));
+if (!existsSync(bin)) {
+  console.error(`${bin} not found; run \`pnpm -F @vibeframe/cli build\` first.`);
+  process.exit(1);
+}
+
+/** Median wall time per case, lazy mode, on a developer laptop with headroom. */
+const STARTUP_BUDGET_MS: Record<string, number> = {
+  "--version": 250,
+  "status project --json": 400,
+  "schema --list": 400,
+};
+
+const tmp = await mkdtemp(join(tmpdir(), "vibe-bench-cli-startup-"));
+
+function median(samples: number[]): number {
+  const sorted = [...samples].sort((a, b) => a - b);
+  return sorted[Math.floor(sorted.length / 2)];
+}
+
+function time(args: string[], eager: boolean): number {
+  const samples: number[] = [];
+  for (let i = 0; i < runs; i++) {
+    const started = performance.now();
+    try {
+      execFileSync(process.execPath, [bin, ...args], {
+        stdio: "ignore",
+        env: { ...process.env, VIBE_EAGER_COMMANDS: eager ? "1" : "", NO_COLOR: "1" },
+      });
+    } catch {
+      // A non-zero exit (e.g. status on an empty directory) still measures startup.
+    }
+    samples.push(performance.now() - started);
+  }
+  return median(samples);
+}
+
+try {
+  const cases: Array<[string, string[]]> = [
+    ["--version", ["--version"]],
+    ["status project --json", ["status", "project", tmp, "--json"]],
+    ["schema --list", ["schema", "--list"]],
+  ];
+
+  let over = 0;
+  console.log(`${"case".padEnd(24)} ${"eager".padStart(8)} ${"lazy".padStart(8)}  budget`);
+  for (const [label, args] of cases) {
+    const eager = time(args, true);
+    const lazy = time(args, false);
+    const budget = STARTUP_BUDGET_MS[label];
+    const ok = lazy <= budget;
+    if (!ok) over += 1;
+    console.log(
+      `${label.padEnd(24)} ${eager.toFixed(0).padStart(6)}ms ${lazy.toFixed(0).padStart(6)}ms  ` +
+        `${budget}ms ${ok ? "ok" : "OVER"}`
+    );
+  }
+
+  if (over > 0) {
+    console.error(`\n${over} case(s) over the startup budget.`);
+    process.exitCode = 1;
+  }
+} finally {
+  await rm(tmp, { recursive: true, force: true });
+}
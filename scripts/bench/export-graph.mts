@@ -0,0 +1,98 @@
+/**
+ * Export filter-graph construction for 100, 1,000 and 10,000-clip timelines
+ * (the size jump-cut and silence-cut output reaches): time to index the
+ * timeline and build the ffmpeg arguments, graph size, and whether the graph
+ * goes inline or to a `-filter_complex_script` file.
+ *
+ *     pnpm bench:export-graph
+ *     pnpm bench:export-graph -- --sources 200 --gap-every 2
+ *
+ * Pure argument building over a synthetic timeline; ffmpeg is not run.
+ */
+
+import { parseArgs } from "node:util";
+
+const { buildFFmpegArgs, indexTimeline, useFilterScript } = await import(
+  "../../packages/cli/src/commands/export.js"
+);
+
+const { values } = parseArgs({
+  options: {
+    sources: { type: "string", default: "50" },
+    "gap-every": { type: "string", default: "3" },
+  },
+});
+
+const sourceCount = Math.max(1, Number(values.sources));
+const gapEvery = Math.max(1, Number(values["gap-every"]));
+
+type Timeline = Parameters<typeof indexTimeline>;
+
+/** Back-to-back 1.5s cuts across `sourceCount` files, a short gap every `gapEvery` clips, one music bed. */
+function timeline(count: number): Timeline {
+  const sources = Array.from({ length: sourceCount }, (_, i) => ({
+    id: `source-${i}`,
+    name: `take-${i}`,
+    type: "video",
+    url: `/footage/take-${i}.mp4`,
+    duration: 3600,
+  }));
+  sources.push({ id: "music", name: "music", type: "audio", url: "/audio/music.mp3", duration: 3600 });
+  const clips = [];
+  let t = 0;
+  for (let i = 0; i < count; i++) {
+    const offset = (i * 7) % 3000;
+    clips.push({
+      id: `clip-${i}`,
+      sourceId: `source-${i % sourceCount}`,
+      trackId: "video-track-1",
+      startTime: t,
+      duration: 1.5,
+      sourceStartOffset: offset,
+      sourceEndOffset: offset + 1.5,
+      effects: [],
+    });
+    t += 1.5 + (i % gapEvery === 0 ? 0.25 : 0);
+  }
+  clips.push({
+    id: "music-bed",
+    sourceId: "music",
+    trackId: "audio-track-1",
+    startTime: 0,
+    duration: t,
+    sourceStartOffset: 0,
+    sourceEndOffset: t,
+    effects: [],
+  });
+  return [clips, sources] as unknown as Timeline;
+}
+
+const preset = {
+  resolution: "1920x1080",
+  videoBitrate: "8M",
+  audioBitrate: "256k",
+  ffmpegArgs: ["-c:v", "libx264", "-preset", "slow", "-crf", "18", "-c:a", "aac", "-b:a", "256k"],
+};
+
+console.log(
+  `${"clips".padStart(6)} ${"index".padStart(9)} ${"build".padStart(9)} ${"graph".padStart(10)}  filter graph`
+);
+for (const count of [100, 1000, 10000]) {
+  const [clips, sources] = timeline(count);
+  // Warm once so the timings exclude JIT compilation of the builder.
+  buildFFmpegArgs(indexTimeline(clips, sources), preset, "/tmp/out.mp4", { gapFill: "extend" });
+
+  let started = performance.now();
+  const index = indexTimeline(clips, sources);
+  const indexMs = performance.now() - started;
+  started = performance.now();
+  const args = buildFFmpegArgs(index, preset, "/tmp/out.mp4", { gapFill: "extend" });
+  const buildMs = performance.now() - started;
+
+  const graph = args[args.indexOf("-filter_complex") + 1];
+  const script = useFilterScript(args, "/tmp/graph.txt");
+  console.log(
+    `${String(count).padStart(6)} ${indexMs.toFixed(2).padStart(7)}ms ${buildMs.toFixed(2).padStart(7)}ms ` +
+      `${(graph.length / 1024).toFixed(0).padStart(7)} KiB  ${script ? "-filter_complex_script" : "inline"}`
+  );
+}
@@ -0,0 +1,132 @@
+/**
+ * Per-frame seek cost of the timeline HTML runtime (`window.__hf.seek`),
+ * indexed against the previous linear-scan runtime, for 10, 100 and 1,000
+ * back-to-back clips with keyframed effects.
+ *
+ *     pnpm bench:html-seek
+ *     pnpm bench:html-seek -- --keyframes 200 --fps 60
+ *
+ * Runs headless in Node against a minimal DOM, so it measures the script's
+ * own work per seek (the part that grows with timeline size), not Chrome's
+ * style and paint. Each case sweeps the whole timeline once at `--fps`, the
+ * way the producer captures, then seeks the same frames in random order.
+ */
+
+import { parseArgs } from "node:util";
+
+const { RUNTIME_SCRIPT } = await import(
+  "../../packages/cli/src/pipeline/renderers/html-runtime.js"
+);
+
+const { values } = parseArgs({
+  options: {
+    keyframes: { type: "string", default: "40" },
+    fps: { type: "string", default: "30" },
+  },
+});
+
+const keyframeCount = Math.max(2, Number(values.keyframes));
+const fps = Number(values.fps);
+
+/** The runtime's seek before the interval index, for comparison. */
+const LINEAR_RUNTIME_SCRIPT = `
+(function () {
+  var CLIPS = /*CLIPS_JSON*/[];
+  function interpolate(kfs, t) {
+    if (!kfs || kfs.length === 0) return null;
+    if (kfs.length === 1) return kfs[0].values;
+    var prev = kfs[0], next = kfs[kfs.length - 1];
+    for (var i = 0; i < kfs.length - 1; i++) {
+      if (t >= kfs[i].time && t <= kfs[i + 1].time) { prev = kfs[i]; next = kfs[i + 1]; break; }
+    }
+    if (t <= prev.time) return prev.values;
+    if (t >= next.time) return next.values;
+    var p = (t - prev.time) / (next.time - prev.time);
+    var out = {};
+    for (var k in prev.values) out[k] = +prev.values[k] + (+next.values[k] - +prev.values[k]) * p;
+    return out;
+  }
+  function applyEffects(el, effects, clipTime) {
+    var filters = [];
+    for (var i = 0; i < effects.length; i++) {
+      var fx = effects[i];
+      var t = clipTime - fx.startTime;
+      if (t < 0 || t > fx.duration) continue;
+      var vals = fx.keyframes && fx.keyframes.length > 0 ? interpolate(fx.keyframes, t) : fx.params;
+      if (vals) filters.push('blur(' + (+vals.radius || 0) + 'px)');
+    }
+    el.style.opacity = '1';
+    el.style.filter = filters.join(' ');
+  }
+  window.__hf = {
+    seek: function (t) {
+      for (var i = 0; i < CLIPS.length; i++) {
+        var c = CLIPS[i];
+        var el = document.getElementById(c.id);
+        if (!el) continue;
+        var active = t >= c.startTime && t < c.startTime + c.duration;
+        el.style.display = active ? 'block' : 'none';
+        if (active) applyEffects(el, c.effects, t - c.startTime);
+      }
+    }
+  };
+})();
+`;
+
+function clips(count: number) {
+  return Array.from({ length: count }, (_, i) => ({
+    id: `clip-${i}`,
+    startTime: i * 2,
+    duration: 2,
+    effects: [
+      {
+        type: "blur",
+        startTime: 0,
+        duration: 2,
+        params: {},
+        keyframes: Array.from({ length: keyframeCount }, (_, k) => ({
+          time: (2 * k) / (keyframeCount - 1),
+          values: { radius: k % 7 },
+          easing: "linear",
+        })),
+      },
+    ],
+  }));
+}
+
+function load(script: string, count: number): (t: number) => void {
+  const data = clips(count);
+  const elements = new Map(data.map((c) => [c.id, { style: {} }]));
+  const window: { __hf?: { seek(t: number): void } } = {};
+  const document = { getElementById: (id: string) => elements.get(id) ?? null };
+  new Function("window", "document", script.replace("/*CLIPS_JSON*/[]", JSON.stringify(data)))(
+    window,
+    document
+  );
+  return (t) => window.__hf!.seek(t);
+}
+
+/** Mean microseconds per seek over `times`. */
+function measure(seek: (t: number) => void, times: number[]): number {
+  for (const t of times.slice(0, 200)) seek(t);
+  const started = performance.now();
+  for (const t of times) seek(t);
+  return ((performance.now() - started) * 1000) / times.length;
+}
+
+console.log(
+  `${"clips".padStart(6)} ${"frames".padStart(7)}  ${"linear seq".padStart(11)} ${"indexed seq".padStart(12)} ${"indexed rnd".padStart(12)}  speedup`
+);
+for (const count of [10, 100, 1000]) {
+  const frames = Math.round(count * 2 * fps);
+  const sweep = Array.from({ length: frames }, (_, i) => i / fps);
+  const shuffled = sweep.map((_, i) => sweep[(i * 7919) % frames]);
+  const linear = measure(load(LINEAR_RUNTIME_SCRIPT, count), sweep);
+  const indexed = measure(load(RUNTIME_SCRIPT, count), sweep);
+  const random = measure(load(RUNTIME_SCRIPT, count), shuffled);
+  console.log(
+    `${String(count).padStart(6)} ${String(frames).padStart(7)}  ` +
+      `${linear.toFixed(2).padStart(9)}µs ${indexed.toFixed(2).padStart(10)}µs ` +
+      `${random.toFixed(2).padStart(10)}µs  ${(linear / indexed).toFixed(1)}x`
+  );
+}
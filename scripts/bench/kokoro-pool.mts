@@ -0,0 +1,115 @@
+/**
+ * Per-cue latency and throughput for local Kokoro TTS: the in-process
+ * singleton (one cue at a time on the main thread) against the worker pool,
+ * cold (fresh workers, model load included) and warm (same pool, second run).
+ *
+ *     pnpm bench:kokoro-pool                       # 50-beat script, default pool size
+ *     pnpm bench:kokoro-pool -- --beats 20 --workers 4 --skip-in-process
+ *
+ * Runs the real model, so kokoro-js must be installed and the first run
+ * downloads it (~90MB). Latency is measured from submit to finished WAV, so
+ * queued cues include their wait for a free worker.
+ */
+
+import { fileURLToPath } from "node:url";
+import { parseArgs } from "node:util";
+import { Worker } from "node:worker_threads";
+
+const { KokoroProvider, KokoroWorkerPool, defaultKokoroPoolSize } = await import(
+  "../../packages/ai-providers/src/kokoro/index.js"
+);
+
+const { values } = parseArgs({
+  options: {
+    beats: { type: "string", default: "50" },
+    workers: { type: "string" },
+    "skip-in-process": { type: "boolean", default: false },
+  },
+});
+
+const beatCount = Math.max(1, Number(values.beats));
+const workerCount = values.workers ? Math.max(1, Number(values.workers)) : defaultKokoroPoolSize();
+const workerEntry = fileURLToPath(
+  new URL("../../packages/ai-providers/src/kokoro/kokoro-worker.ts", import.meta.url)
+);
+
+const SENTENCES = [
+  "Every frame in this scene was composed from a single storyboard.",
+  "The narration lands first, and the visuals follow its timing.",
+  "Local synthesis keeps the whole build offline.",
+  "Short cues matter as much as long ones.",
+  "By the end of the sequence, the camera settles on the product.",
+];
+// One to three sentences per beat, like a typical storyboard.
+const cues = Array.from({ length: beatCount }, (_, index) => {
+  const sentences = Array.from({ length: 1 + (index % 3) }, (_, k) => index + k);
+  return sentences.map((n) => SENTENCES[n % SENTENCES.length]).join(" ");
+});
+
+interface RunStats {
+  wallMs: number;
+  latencies: number[];
+  audioSec: number;
+}
+
+function wavSeconds(buffer: Buffer | undefined): number {
+  if (!buffer || buffer.length < 44) return 0;
+  return buffer.readUInt32LE(40) / buffer.readUInt32LE(28);
+}
+
+async function timed(
+  synthesize: (text: string) => Promise<{ success: boolean; audioBuffer?: Buffer; error?: string }>,
+  concurrent: boolean
+): Promise<RunStats> {
+  const latencies: number[] = [];
+  let audioSec = 0;
+  const one = async (text: string) => {
+    const submitted = performance.now();
+    const result = await synthesize(text);
+    if (!result.success) throw new Error(result.error ?? "synthesis failed");
+    latencies.push(performance.now() - submitted);
+    audioSec += wavSeconds(result.audioBuffer);
+  };
+  const started = performance.now();
+  if (concurrent) {
+    await Promise.all(cues.map(one));
+  } else {
+    for (const cue of cues) await one(cue);
+  }
+  return { wallMs: performance.now() - started, latencies, audioSec };
+}
+
+function percentile(sorted: number[], p: number): number {
+  return sorted[Math.min(sorted.length - 1, Math.floor(p * sorted.length))] ?? 0;
+}
+
+function report(label: string, stats: RunStats): void {
+  const sorted = [...stats.latencies].sort((a, b) => a - b);
+  const secs = stats.wallMs / 1000;
+  console.log(
+    `${label.padEnd(22)} wall ${secs.toFixed(1).padStart(6)}s  ` +
+      `p50 ${(percentile(sorted, 0.5) / 1000).toFixed(2)}s  ` +
+      `p95 ${(percentile(sorted, 0.95) / 1000).toFixed(2)}s  ` +
+      `${(cues.length / secs).toFixed(2)} cues/s  ` +
+      `${(stats.audioSec / secs).toFixed(1)}x realtime`
+  );
+}
+
+console.log(`${beatCount} cues, pool of ${workerCount} worker(s)\n`);
+
+if (!values["skip-in-process"]) {
+  const provider = new KokoroProvider();
+  report("in-process (cold)", await timed((text) => provider.textToSpeech(text), false));
+  report("in-process (warm)", await timed((text) => provider.textToSpeech(text), false));
+}
+
+const pool = new KokoroWorkerPool({
+  size: workerCount,
+  createWorker: () => new Worker(workerEntry) as never,
+});
+try {
+  report("worker pool (cold)", await timed((text) => pool.synthesize(text), true));
+  report("worker pool (warm)", await timed((text) => pool.synthesize(text), true));
+} finally {
+  await pool.close();
+}
@@ -0,0 +1,98 @@
+/**
+ * Wall-time benchmark for cheap render QA: the fused single-decode scan
+ * against the legacy one-decode-per-detector path, plus draft scan mode.
+ *
+ *     pnpm bench:render-inspect                 # 60s 1080p30 synthetic render
+ *     pnpm bench:render-inspect -- --duration 600 --video path/to/final.mp4
+ *
+ * Needs ffmpeg on PATH. The synthetic render mixes a black hold, a frozen
+ * frame, and a silent gap so every detector has something to report.
+ */
+
+import { execFileSync } from "node:child_process";
+import { mkdtemp, rm } from "node:fs/promises";
+import { tmpdir } from "node:os";
+import { join } from "node:path";
+import { parseArgs } from "node:util";
+
+const { scanRenderMedia } = await import(
+  "../../packages/cli/src/commands/_shared/render-inspect.js"
+);
+
+const { values } = parseArgs({
+  options: {
+    duration: { type: "string", default: "60" },
+    video: { type: "string" },
+    runs: { type: "string", default: "1" },
+  },
+});
+
+const durationSec = Number(values.duration);
+const runs = Math.max(1, Number(values.runs));
+const tmp = await mkdtemp(join(tmpdir(), "vibe-bench-render-inspect-"));
+
+function makeSyntheticRender(path: string): void {
+  execFileSync(
+    "ffmpeg",
+    [
+      "-hide_banner",
+      "-loglevel",
+      "error",
+      "-y",
+      "-f",
+      "lavfi",
+      "-i",
+      `testsrc2=s=1920x1080:r=30:d=${durationSec}`,
+      "-f",
+      "lavfi",
+      "-i",
+      `sine=frequency=440:sample_rate=48000:duration=${durationSec}`,
+      "-vf",
+      "drawbox=c=black:t=fill:enable='between(t,2,4)'",
+      "-af",
+      "volume=enable='between(t,5,8)':volume=0",
+      "-c:v",
+      "libx264",
+      "-preset",
+      "veryfast",
+      "-pix_fmt",
+      "yuv420p",
+      "-c:a",
+      "aac",
+      path,
+    ],
+    { stdio: "inherit" }
+  );
+}
+
+async function time(label: string, fn: () => Promise<unknown>): Promise<number> {
+  let best = Number.POSITIVE_INFINITY;
+  for (let i = 0; i < runs; i++) {
+    const started = performance.now();
+    await fn();
+    best = Math.min(best, performance.now() - started);
+  }
+  console.log(`${label.padEnd(28)} ${(best / 1000).toFixed(2)}s`);
+  return best;
+}
+
+try {
+  const videoPath = values.video ?? join(tmp, "synthetic.mp4");
+  if (!values.video) {
+    console.log(`Encoding ${durationSec}s 1080p30 synthetic render...`);
+    makeSyntheticRender(videoPath);
+  }
+
+  const split = await time("split (3 decodes)", () =>
+    scanRenderMedia(videoPath, { audio: true, fused: false })
+  );
+  const fused = await time("fused (1 decode)", () => scanRenderMedia(videoPath, { audio: true }));
+  const draft = await time("fused draft scan", () =>
+    scanRenderMedia(videoPath, { audio: true, mode: "draft" })
+  );
+
+  console.log(`\nfused speedup: ${(split / fused).toFixed(2)}x`);
+  console.log(`draft speedup: ${(split / draft).toFixed(2)}x`);
+} finally {
+  await rm(tmp, { recursive: true, force: true });
+}
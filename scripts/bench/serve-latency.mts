@@ -0,0 +1,110 @@
+/**
+ * Per-call latency of the built `vibe` bin run in-process against the same
+ * call forwarded to a `vibe serve` daemon's standby runner.
+ *
+ *     pnpm -F @vibeframe/cli build && pnpm bench:serve-latency
+ *     pnpm bench:serve-latency -- --runs 20
+ *
+ * Every call pipes all three streams, as agent hosts do, so it qualifies for
+ * forwarding. The daemon runs on a private socket and is stopped at the end.
+ * Between forwarded calls the bench waits for the replacement standby, so
+ * each sample measures a warm runner rather than a fork in progress.
+ */
+
+import { execFileSync, spawn } from "node:child_process";
+import { existsSync } from "node:fs";
+import { mkdtemp, rm } from "node:fs/promises";
+import { tmpdir } from "node:os";
+import { join } from "node:path";
+import { setTimeout as sleep } from "node:timers/promises";
+import { fileURLToPath } from "node:url";
+import { parseArgs } from "node:util";
+
+const { values } = parseArgs({
+  options: {
+    runs: { type: "string", default: "10" },
+  },
+});
+
+const runs = Math.max(1, Number(values.runs));
+const bin = fileURLToPath(new URL("../../packages/cli/dist/index.js", import.meta.url));
+if (!existsSync(bin)) {
+  console.error(`${bin} not found; run \`pnpm -F @vibeframe/cli build\` first.`);
+  process.exit(1);
+}
+
+const tmp = await mkdtemp(join(tmpdir(), "vibe-bench-serve-"));
+const socketPath = join(tmp, "serve.sock");
+const baseEnv = { ...process.env, VIBE_SERVE_SOCKET: socketPath, NO_COLOR: "1" };
+
+function median(samples: number[]): number {
+  const sorted = [...samples].sort((a, b) => a - b);
+  return sorted[Math.floor(sorted.length / 2)];
+}
+
+function run(args: string[], env: NodeJS.ProcessEnv): string {
+  try {
+    return execFileSync(process.execPath, [bin, ...args], { stdio: "pipe", env, encoding: "utf-8" });
+  } catch (error) {
+    // A non-zero exit (e.g. status on an empty directory) still measures the call.
+    return String((error as { stdout?: string }).stdout ?? "");
+  }
+}
+
+/** Standby runners the daemon has ready, -1 when it is not answering. */
+function standby(): number {
+  const out = run(["serve", "status", "--json"], baseEnv);
+  try {
+    const data = JSON.parse(out).data;
+    return data.running === false ? -1 : Number(data.standby);
+  } catch {
+    return -1;
+  }
+}
+
+async function waitForStandby(): Promise<void> {
+  for (let i = 0; i < 100; i++) {
+    if (standby() > 0) return;
+    await sleep(100);
+  }
+  throw new Error("vibe serve never reported a standby runner");
+}
+
+async function time(args: string[], forwarded: boolean): Promise<number> {
+  const samples: number[] = [];
+  for (let i = 0; i < runs; i++) {
+    if (forwarded) await waitForStandby();
+    const started = performance.now();
+    run(args, { ...baseEnv, VIBE_NO_SERVE: forwarded ? "" : "1" });
+    samples.push(performance.now() - started);
+  }
+  return median(samples);
+}
+
+const daemon = spawn(process.execPath, [bin, "serve", "start", "--socket", socketPath], {
+  stdio: "ignore",
+  env: baseEnv,
+});
+
+try {
+  await waitForStandby();
+  const cases: Array<[string, string[]]> = [
+    ["--version", ["--version"]],
+    ["status project --json", ["status", "project", tmp, "--json"]],
+    ["schema --list", ["schema", "--list"]],
+  ];
+
+  console.log(`${"case".padEnd(24)} ${"in-process".padStart(10)} ${"serve".padStart(8)}  speedup`);
+  for (const [label, args] of cases) {
+    const direct = await time(args, false);
+    const served = await time(args, true);
+    console.log(
+      `${label.padEnd(24)} ${direct.toFixed(0).padStart(8)}ms ${served.toFixed(0).padStart(6)}ms  ` +
+        `${(direct / served).toFixed(1)}x`
+    );
+  }
+} finally {
+  run(["serve", "stop", "--json"], baseEnv);
+  daemon.kill();
+  await rm(tmp, { recursive: true, force: true });
+}
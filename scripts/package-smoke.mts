@@ -198,6 +198,8 @@ const mcpDir = resolve(root, "packages/mcp-server");
 assertPackFiles(packDryRun(cliDir), [
   "dist/index.js",
   "dist/index.d.ts",
+  "dist/lib.js",
+  "dist/lib.d.ts",
   "dist/engine/index.js",
   "dist/engine/index.d.ts",
   "dist/tools/manifest/index.js",
@@ -215,6 +217,7 @@ assertExportTargets(cliDir);
 assertPackFiles(packDryRun(mcpDir), ["dist/index.js", "package.json"]);
 assertExportTargets(mcpDir);
 
+await smokeImport("@vibeframe/cli", resolve(cliDir, "dist/lib.js"));
 await smokeImport("@vibeframe/cli/engine", resolve(cliDir, "dist/engine/index.js"));
 await smokeImport("@vibeframe/cli/tools/manifest", resolve(cliDir, "dist/tools/manifest/index.js"));
 await smokeImport("@vibeframe/cli/tools/define-tool", resolve(cliDir, "dist/tools/define-tool.js"));